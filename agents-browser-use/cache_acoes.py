@@ -0,0 +1,215 @@
+"""
+Cache de ações para tarefas repetidas de browser-use.
+
+A mesma tarefa (ex.: listar o trending do Google Trends de hora em hora) fazia o
+LLM replanejar cada clique a cada execução. Aqui a primeira execução bem-sucedida
+grava a sequência de ações do histórico do agente (`save_to_file`), sob uma chave
+de tarefa + URL inicial. Nas seguintes, as ações são reexecutadas direto
+(`load_and_rerun`): antes de cada passo o browser-use confere se o elemento
+gravado (hash do nó no DOM) ainda existe na página e corrige o índice se ele mudou
+de lugar. Só quando um passo falha a gravação é descartada e o agente volta ao
+LLM, gravando a nova sequência.
+
+A ação final `done` não é reexecutada (ela traria a resposta antiga): com
+`reextrair=True` (padrão) um agente curto lê a página já posicionada e responde
+com os dados atuais, em geral em um passo; tarefas só de ação podem usar
+`reextrair=False` e não chamam o LLM.
+
+Uso:
+    uv run agents-browser-use/cache_acoes.py "tarefa com URL" [--gemini] [--sem-reextrair]
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from typing import Any, Optional
+
+from browser_use import Agent
+
+from executor_agentes import ExecutorAgentes, criar_llm
+
+PASTA_PADRAO = "cache_acoes"
+
+
+def _normalizar(tarefa: str) -> str:
+    return re.sub(r"\s+", " ", tarefa).strip().casefold()
+
+
+def url_inicial(tarefa: str) -> Optional[str]:
+    """Primeira URL citada na tarefa (a página onde o agente começa)."""
+    encontrada = re.search(r"https?://\S+", tarefa)
+    return encontrada.group(0).rstrip(".,;)") if encontrada else None
+
+
+def _passos_reexecutaveis(dados: dict) -> dict:
+    """
+    Histórico (JSON do `save_to_file`) só com o que vale reexecutar.
+
+    Tira os passos que deram erro (o agente se corrigiu depois), os sem ação e as
+    ações `done`, mantendo `interacted_element` alinhado com as ações.
+    """
+    passos = []
+    for passo in dados["history"]:
+        saida = passo.get("model_output")
+        if not saida or not saida.get("action"):
+            continue
+        if any(resultado.get("error") for resultado in passo.get("result", [])):
+            continue
+        elementos = passo["state"].get("interacted_element") or [None] * len(saida["action"])
+        mantidas = [(acao, elemento) for acao, elemento in zip(saida["action"], elementos)
+                    if acao and "done" not in acao]
+        if not mantidas:
+            continue
+        saida["action"] = [acao for acao, _ in mantidas]
+        passo["state"]["interacted_element"] = [elemento for _, elemento in mantidas]
+        passos.append(passo)
+    return {**dados, "history": passos}
+
+
+class CacheAcoes:
+    """
+    Gravações de sequências de ações, uma por (tarefa, URL inicial).
+
+    Args:
+        pasta: Diretório dos históricos gravados (padrão: "cache_acoes")
+    """
+
+    def __init__(self, pasta: str = PASTA_PADRAO):
+        self.pasta = pasta
+        os.makedirs(pasta, exist_ok=True)
+        self.estatisticas = {"replay": 0, "llm": 0, "invalidado": 0}
+
+    def chave(self, tarefa: str, url: Optional[str] = None) -> str:
+        url = url or url_inicial(tarefa) or ""
+        return hashlib.sha256(f"{_normalizar(tarefa)}|{url}".encode()).hexdigest()[:16]
+
+    def _arquivos(self, chave: str) -> tuple[str, str]:
+        base = os.path.join(self.pasta, chave)
+        return f"{base}.json", f"{base}.meta.json"
+
+    def obter(self, tarefa: str, url: Optional[str] = None) -> Optional[tuple[str, dict]]:
+        """(arquivo do histórico, metadados) gravados para a tarefa, ou None."""
+        historico, meta = self._arquivos(self.chave(tarefa, url))
+        if not os.path.exists(historico) or not os.path.exists(meta):
+            return None
+        with open(meta, "r", encoding="utf-8") as f:
+            return historico, json.load(f)
+
+    def gravar(self, tarefa: str, historico, url: Optional[str] = None) -> Optional[str]:
+        """
+        Grava as ações de um histórico bem-sucedido.
+
+        Args:
+            tarefa: Instrução do agente
+            historico: AgentHistoryList da execução
+            url: URL inicial (padrão: a primeira URL da tarefa)
+
+        Returns:
+            Arquivo gravado, ou None se a execução não teve sucesso ou não tinha ações
+        """
+        if not historico.is_successful():
+            return None
+        arquivo, arquivo_meta = self._arquivos(self.chave(tarefa, url))
+        historico.save_to_file(arquivo)
+        with open(arquivo, "r", encoding="utf-8") as f:
+            dados = _passos_reexecutaveis(json.load(f))
+        if not dados["history"]:
+            os.remove(arquivo)
+            return None
+        with open(arquivo, "w", encoding="utf-8") as f:
+            json.dump(dados, f, indent=2)
+        with open(arquivo_meta, "w", encoding="utf-8") as f:
+            json.dump({
+                "tarefa": tarefa.strip(),
+                "url": url or url_inicial(tarefa),
+                "passos": len(dados["history"]),
+                "resultado": historico.final_result(),
+                "gravado_em": time.time(),
+            }, f, ensure_ascii=False, indent=2)
+        return arquivo
+
+    def invalidar(self, tarefa: str, url: Optional[str] = None) -> None:
+        for arquivo in self._arquivos(self.chave(tarefa, url)):
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+        self.estatisticas["invalidado"] += 1
+
+
+async def executar_com_replay(
+    executor: ExecutorAgentes,
+    tarefa: str,
+    cache: CacheAcoes,
+    url: Optional[str] = None,
+    reextrair: bool = True,
+    **opcoes_agente: Any,
+) -> dict:
+    """
+    Executa a tarefa reaproveitando a sequência gravada; cai no LLM se um passo falhar.
+
+    Args:
+        executor: Executor com a sessão de navegador (ver `executor_agentes`)
+        tarefa: Instrução do agente
+        cache: Onde ficam as sequências gravadas
+        url: URL inicial (padrão: a primeira URL da tarefa)
+        reextrair: Após o replay, um agente curto lê a página e responde com dados atuais
+        **opcoes_agente: Parâmetros extras do `browser_use.Agent`
+
+    Returns:
+        {"origem": "replay" ou "llm", "resultado": resposta final, "segundos",
+         "passos_llm": passos que chamaram o LLM}
+    """
+    inicio = time.perf_counter()
+    gravado = cache.obter(tarefa, url)
+    if gravado is not None:
+        arquivo, meta = gravado
+        browser = await executor.iniciar()
+        agente = Agent(task=tarefa, llm=executor.llm, browser_session=browser,
+                       **{**executor.opcoes_agente, **opcoes_agente})
+        try:
+            await agente.load_and_rerun(arquivo, max_retries=2, skip_failures=False, delay_between_actions=0.1)
+        except Exception as e:
+            print(f"↻ Replay falhou ({e}); voltando ao LLM")
+            cache.invalidar(tarefa, url)
+        else:
+            cache.estatisticas["replay"] += 1
+            resultado, passos_llm = meta["resultado"], 0
+            if reextrair:
+                # A página já está no ponto certo: um agente curto só lê e responde
+                historico = await executor.executar(
+                    f"{tarefa}\nA página atual já é a página final desta tarefa: não navegue, "
+                    "apenas leia o conteúdo e responda.",
+                    max_steps=3, directly_open_url=False, **opcoes_agente,
+                )
+                resultado, passos_llm = historico.final_result(), historico.number_of_steps()
+            segundos = time.perf_counter() - inicio
+            print(f"⚡ Replay de {meta['passos']} passo(s) gravados em {segundos:.1f}s ({passos_llm} passo(s) com LLM)")
+            return {"origem": "replay", "resultado": resultado, "segundos": round(segundos, 2),
+                    "passos_llm": passos_llm}
+
+    historico = await executor.executar(tarefa, **opcoes_agente)
+    cache.estatisticas["llm"] += 1
+    if cache.gravar(tarefa, historico, url):
+        print("💾 Sequência de ações gravada para as próximas execuções")
+    return {"origem": "llm", "resultado": historico.final_result(),
+            "segundos": round(time.perf_counter() - inicio, 2), "passos_llm": historico.number_of_steps()}
+
+
+async def main(tarefa: str, provider: str, reextrair: bool) -> None:
+    cache = CacheAcoes()
+    async with ExecutorAgentes(criar_llm(provider), max_steps=10) as executor:
+        saida = await executar_com_replay(executor, tarefa, cache, reextrair=reextrair)
+    print(f"\n📋 [{saida['origem']}] {saida['segundos']}s, {saida['passos_llm']} passo(s) com LLM")
+    print(saida["resultado"])
+
+
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not argumentos:
+        print("Informe a tarefa")
+        sys.exit(1)
+    asyncio.run(main(argumentos[0], "gemini" if "--gemini" in sys.argv else "ollama",
+                     "--sem-reextrair" not in sys.argv))
@@ -0,0 +1,268 @@
+"""
+Executor de agentes browser-use com perfil de velocidade.
+
+Os scripts desta pasta abriam um navegador visível (500x700) por tarefa, com as
+esperas padrão do browser-use (0,25s antes de ler a página, 0,5s de rede ociosa e
+0,5s entre ações) e o LLM "pensando" em cada passo. Aqui:
+
+- o navegador é headless por padrão (BROWSER_HEADLESS=false para depurar vendo a tela);
+- as esperas são curtas e o destaque visual dos elementos fica desligado;
+- `flash_mode` tira o raciocínio da saída do LLM e o prompt pede ações em sequência;
+- a ação `ler_pagina` entrega ao LLM só o conteúdo principal da página, destilado
+  dentro de um orçamento de tokens (`comum.destilacao`), no lugar do markdown
+  inteiro do `extract_structured_data`;
+- cada tarefa tem um orçamento de passos (`max_steps`);
+- uma única sessão do navegador (keep_alive) atende todas as tarefas, sem relançar o Chromium;
+- cada passo e cada tarefa são logados com os segundos gastos (e os tokens de entrada).
+
+Uso:
+    uv run agents-browser-use/executor_agentes.py "tarefa 1" ["tarefa 2" ...] [--gemini] [--max-steps 15]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Optional
+
+from browser_use import ActionResult, Agent, Browser, BrowserProfile, ChatGoogle, ChatOllama, Tools
+from dotenv import load_dotenv
+
+# comum/ fica na raiz do repositório (agents-browser-use/ roda como pasta de scripts)
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.insert(0, _RAIZ)
+
+from comum.destilacao import ORCAMENTO_PADRAO, destilar_html, estatisticas_destilacao  # noqa: E402
+
+load_dotenv()
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+
+# Instruções de velocidade para o modelo (o bloco que estava comentado no teste-browser.py)
+SPEED_OPTIMIZATION_PROMPT = """
+Speed optimization instructions:
+- Be extremely concise and direct in your responses
+- Get to the goal as quickly as possible
+- Use multi-action sequences whenever possible to reduce steps
+"""
+
+# Leitura de conteúdo pela ação destilada
+PROMPT_LEITURA = """
+- To read or summarize the page content, use ler_pagina instead of extract_structured_data
+"""
+
+# Esperas do browser-use ajustadas para páginas que já carregam rápido
+PERFIL_RAPIDO = {
+    "minimum_wait_page_load_time": 0.1,
+    "wait_for_network_idle_page_load_time": 0.25,
+    "wait_between_actions": 0.1,
+    "highlight_elements": False,
+    "window_size": {"width": 1280, "height": 900},
+}
+
+
+def criar_perfil(headless: Optional[bool] = None, **ajustes: Any) -> BrowserProfile:
+    """
+    Perfil de navegador rápido e reaproveitável entre agentes.
+
+    Args:
+        headless: Sem janela (padrão: env BROWSER_HEADLESS, que por padrão é true)
+        **ajustes: Campos do BrowserProfile que sobrepõem `PERFIL_RAPIDO`
+
+    Returns:
+        BrowserProfile com keep_alive, para a sessão sobreviver ao fim de cada agente
+    """
+    if headless is None:
+        headless = os.getenv("BROWSER_HEADLESS", "true").lower() != "false"
+    return BrowserProfile(**{**PERFIL_RAPIDO, "headless": headless, "keep_alive": True, **ajustes})
+
+
+def criar_llm(provider: str = "ollama", modelo: Optional[str] = None):
+    """
+    LLM do browser-use: Ollama local (padrão) ou Gemini.
+
+    Args:
+        provider: "ollama" ou "gemini"
+        modelo: Nome do modelo (padrão: qwen3:1.7b no Ollama, gemini-2.5-flash no Gemini)
+    """
+    if provider == "gemini":
+        return ChatGoogle(model=modelo or "gemini-2.5-flash", api_key=os.getenv("GOOGLE_API_KEY"))
+    if provider == "ollama":
+        return ChatOllama(model=modelo or "qwen3:1.7b", host=OLLAMA_URL)
+    raise ValueError(f"Provider '{provider}' não suportado. Use: ollama, gemini")
+
+
+def criar_ferramentas(orcamento_tokens: int = ORCAMENTO_PADRAO) -> Tools:
+    """
+    Ações padrão do browser-use mais `ler_pagina` (conteúdo principal destilado).
+
+    Args:
+        orcamento_tokens: Máximo de tokens (estimados) do texto entregue ao LLM
+    """
+    ferramentas = Tools()
+
+    @ferramentas.action(
+        "Read the main text content of the current page (menus, footers and repeated blocks removed). "
+        "Use it to read or summarize the page."
+    )
+    async def ler_pagina(browser_session: Browser) -> ActionResult:
+        cdp = await browser_session.get_or_create_cdp_session()
+        documento = await cdp.cdp_client.send.DOM.getDocument(session_id=cdp.session_id)
+        html = (await cdp.cdp_client.send.DOM.getOuterHTML(
+            params={"backendNodeId": documento["root"]["backendNodeId"]}, session_id=cdp.session_id,
+        ))["outerHTML"]
+        destilado = destilar_html(html, orcamento_tokens)
+        url = await browser_session.get_current_page_url()
+        print(f"   📄 {url}: {destilado.tokens_originais} -> {destilado.tokens_destilados} tokens "
+              f"({destilado.reducao:.0%} a menos)")
+        return ActionResult(
+            extracted_content=destilado.texto,
+            # O texto vai para o próximo passo só uma vez, não para toda a memória do agente
+            include_extracted_content_only_once=True,
+            long_term_memory=f"Read main content of {url} ({destilado.tokens_destilados} tokens)",
+        )
+
+    return ferramentas
+
+
+def resumir_historico(tarefa: str, historico, segundos: float) -> dict:
+    """Relatório de uma tarefa (passos, segundos, sucesso, erros), logado em uma linha."""
+    relatorio = {
+        "tarefa": tarefa.strip(),
+        "passos": historico.number_of_steps(),
+        "segundos": round(segundos, 2),
+        "concluida": historico.is_done(),
+        "sucesso": historico.is_successful(),
+        "erros": [erro for erro in historico.errors() if erro],
+        "tokens_entrada": historico.usage.total_prompt_tokens if historico.usage else None,
+    }
+    situacao = "✓" if relatorio["sucesso"] else "⚠️"
+    tokens = f", {relatorio['tokens_entrada']} tokens de entrada" if relatorio["tokens_entrada"] else ""
+    print(f"{situacao} {relatorio['passos']} passos em {segundos:.1f}s{tokens}: {relatorio['tarefa'][:60]}")
+    return relatorio
+
+
+class ExecutorAgentes:
+    """
+    Roda tarefas de browser-use em sequência sobre uma mesma sessão de navegador.
+
+    Args:
+        llm: LLM do browser-use (ver `criar_llm`)
+        perfil: BrowserProfile (padrão: `criar_perfil()`)
+        max_steps: Orçamento de passos por tarefa
+        flash_mode: Desliga o raciocínio do LLM na saída (menos tokens por passo)
+        usar_visao: Envia screenshots ao LLM (modelos locais pequenos não usam)
+        orcamento_tokens: Tokens da página entregues pela ação `ler_pagina`
+        **opcoes_agente: Outros parâmetros repassados ao `browser_use.Agent`
+    """
+
+    def __init__(
+        self,
+        llm,
+        perfil: Optional[BrowserProfile] = None,
+        max_steps: int = 15,
+        flash_mode: bool = True,
+        usar_visao: bool = False,
+        orcamento_tokens: int = ORCAMENTO_PADRAO,
+        **opcoes_agente: Any,
+    ):
+        self.llm = llm
+        self.perfil = perfil or criar_perfil()
+        self.max_steps = max_steps
+        self.opcoes_agente = {
+            "flash_mode": flash_mode,
+            "use_vision": usar_visao,
+            "extend_system_message": SPEED_OPTIMIZATION_PROMPT + PROMPT_LEITURA,
+            "tools": criar_ferramentas(orcamento_tokens),
+            **opcoes_agente,
+        }
+        self.browser: Optional[Browser] = None
+        self.relatorios: list[dict] = []
+
+    async def iniciar(self) -> Browser:
+        """Abre o navegador uma vez; as tarefas seguintes reaproveitam a sessão."""
+        if self.browser is None:
+            inicio = time.perf_counter()
+            self.browser = Browser(browser_profile=self.perfil)
+            await self.browser.start()
+            print(f"🌐 Navegador iniciado em {time.perf_counter() - inicio:.1f}s "
+                  f"({'headless' if self.perfil.headless else 'com janela'})")
+        return self.browser
+
+    async def executar(self, tarefa: str, max_steps: Optional[int] = None, **opcoes_agente: Any):
+        """
+        Executa uma tarefa na sessão compartilhada.
+
+        Args:
+            tarefa: Instrução para o agente
+            max_steps: Orçamento de passos desta tarefa (padrão: o do executor)
+            **opcoes_agente: Parâmetros do `browser_use.Agent` só para esta tarefa
+
+        Returns:
+            AgentHistoryList da execução (o relatório fica em `self.relatorios`)
+        """
+        browser = await self.iniciar()
+        agente = Agent(task=tarefa, llm=self.llm, browser_session=browser,
+                       **{**self.opcoes_agente, **opcoes_agente})
+
+        inicio_passo = time.perf_counter()
+
+        async def ao_iniciar_passo(agente: Agent) -> None:
+            nonlocal inicio_passo
+            inicio_passo = time.perf_counter()
+
+        async def ao_terminar_passo(agente: Agent) -> None:
+            print(f"   passo {agente.state.n_steps}: {time.perf_counter() - inicio_passo:.1f}s")
+
+        inicio = time.perf_counter()
+        historico = await agente.run(
+            max_steps=max_steps or self.max_steps,
+            on_step_start=ao_iniciar_passo,
+            on_step_end=ao_terminar_passo,
+        )
+        segundos = time.perf_counter() - inicio
+
+        self.relatorios.append(resumir_historico(tarefa, historico, segundos))
+        return historico
+
+    async def executar_varias(self, tarefas: list[str], **opcoes_agente: Any) -> list:
+        """Executa as tarefas em sequência, na mesma sessão; devolve os históricos na ordem."""
+        return [await self.executar(tarefa, **opcoes_agente) for tarefa in tarefas]
+
+    async def fechar(self) -> None:
+        if self.browser is not None:
+            await self.browser.kill()
+            self.browser = None
+
+    async def __aenter__(self) -> "ExecutorAgentes":
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.fechar()
+
+
+async def main(tarefas: list[str], provider: str, max_steps: int) -> None:
+    async with ExecutorAgentes(criar_llm(provider), max_steps=max_steps) as executor:
+        historicos = await executor.executar_varias(tarefas)
+
+    for historico, relatorio in zip(historicos, executor.relatorios):
+        print(f"\n📋 {relatorio['tarefa'][:60]} ({relatorio['passos']} passos, {relatorio['segundos']}s)")
+        print(historico.final_result())
+    total = sum(r["segundos"] for r in executor.relatorios)
+    print(f"\n⏱️ {len(tarefas)} tarefa(s) em {total:.1f}s")
+    destilacao = estatisticas_destilacao()
+    if destilacao["paginas"]:
+        print(f"📄 {destilacao['paginas']} página(s) destilada(s): {destilacao['tokens_originais']} -> "
+              f"{destilacao['tokens_destilados']} tokens (~{destilacao['prefill_economizado_s']}s de prefill a menos)")
+
+
+if __name__ == "__main__":
+    max_steps = int(sys.argv[sys.argv.index("--max-steps") + 1]) if "--max-steps" in sys.argv else 15
+    tarefas = [a for i, a in enumerate(sys.argv[1:], 1)
+               if not a.startswith("--") and sys.argv[i - 1] != "--max-steps"]
+    if not tarefas:
+        print("Informe ao menos uma tarefa")
+        sys.exit(1)
+    asyncio.run(main(tarefas, "gemini" if "--gemini" in sys.argv else "ollama", max_steps))
@@ -0,0 +1,186 @@
+"""
+Execução paralela de agentes browser-use sobre um único navegador.
+
+Tarefas como "abra 5 páginas e resuma cada uma" faziam um agente visitar as
+páginas uma depois da outra, e o raciocínio do LLM sobre a página 2 esperava o
+da página 1. Aqui a tarefa é quebrada em subtarefas (uma URL cada) e cada uma
+ganha seu próprio `browser_use.Agent`, todos rodando ao mesmo tempo:
+
+- um só Chromium é lançado; cada agente conecta nele por CDP (`cdp_url`) com sua
+  própria sessão e trabalha em uma aba nova, fechada ao terminar;
+- um semáforo limita quantos agentes chamam o LLM ao mesmo tempo. Com Ollama o
+  limite padrão é OLLAMA_NUM_PARALLEL (requisições que o servidor atende em
+  paralelo); acima disso os pedidos só entram na fila do Ollama;
+- os históricos são juntados no fim, na ordem das subtarefas.
+
+Uso:
+    uv run agents-browser-use/executor_paralelo.py URL [URL ...] [--tarefa "Resuma {url}"] [--gemini] [--concorrencia 4]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Optional
+
+from browser_use import Agent, Browser, BrowserProfile
+from browser_use.agent.views import AgentHistoryList
+from browser_use.browser.events import CloseTabEvent
+
+from executor_agentes import (
+    PROMPT_LEITURA, SPEED_OPTIMIZATION_PROMPT, criar_ferramentas, criar_llm, criar_perfil, resumir_historico,
+)
+
+TAREFA_PADRAO = "Abra {url} e resuma em poucas frases o conteúdo principal da página (ou o post mais recente, se for um fórum)."
+
+
+def limite_ollama() -> int:
+    """Requisições que o Ollama local atende em paralelo (env OLLAMA_NUM_PARALLEL, padrão 4)."""
+    return max(1, int(os.getenv("OLLAMA_NUM_PARALLEL", "4")))
+
+
+class ExecutorParalelo:
+    """
+    Distribui subtarefas entre agentes concorrentes que compartilham um navegador.
+
+    Args:
+        llm: LLM do browser-use (ver `executor_agentes.criar_llm`)
+        concorrencia: Agentes ao mesmo tempo (padrão: `limite_ollama()`)
+        perfil: BrowserProfile (padrão: `executor_agentes.criar_perfil()`)
+        max_steps: Orçamento de passos por subtarefa
+        **opcoes_agente: Parâmetros repassados a cada `browser_use.Agent`
+    """
+
+    def __init__(
+        self,
+        llm,
+        concorrencia: Optional[int] = None,
+        perfil: Optional[BrowserProfile] = None,
+        max_steps: int = 10,
+        **opcoes_agente: Any,
+    ):
+        self.llm = llm
+        self.concorrencia = concorrencia or limite_ollama()
+        self.perfil = perfil or criar_perfil()
+        self.max_steps = max_steps
+        self.opcoes_agente = {
+            "flash_mode": True,
+            "use_vision": False,
+            "extend_system_message": SPEED_OPTIMIZATION_PROMPT + PROMPT_LEITURA,
+            "tools": criar_ferramentas(),
+            **opcoes_agente,
+        }
+        self.browser: Optional[Browser] = None
+
+    async def iniciar(self) -> Browser:
+        """Lança o navegador compartilhado (uma vez)."""
+        if self.browser is None:
+            self.browser = Browser(browser_profile=self.perfil)
+            await self.browser.start()
+        return self.browser
+
+    async def _executar_subtarefa(self, semaforo: asyncio.Semaphore, url: str, tarefa: str) -> tuple:
+        async with semaforo:
+            # Sessão própria (foco e cache de DOM separados) no mesmo Chromium, em uma aba nova
+            sessao = Browser(cdp_url=self.browser.cdp_url, browser_profile=self.perfil)
+            agente = Agent(
+                task=tarefa,
+                llm=self.llm,
+                browser_session=sessao,
+                initial_actions=[{"go_to_url": {"url": url, "new_tab": True}}],
+                **self.opcoes_agente,
+            )
+            inicio = time.perf_counter()
+            try:
+                historico = await agente.run(max_steps=self.max_steps)
+            finally:
+                if sessao.agent_focus is not None:
+                    try:
+                        await sessao.event_bus.dispatch(CloseTabEvent(target_id=sessao.agent_focus.target_id))
+                    except Exception:
+                        pass
+                await sessao.stop()
+            return historico, resumir_historico(tarefa, historico, time.perf_counter() - inicio)
+
+    async def executar(self, urls: list[str], tarefa: str = TAREFA_PADRAO) -> dict:
+        """
+        Executa uma subtarefa por URL, em paralelo até `concorrencia`.
+
+        Args:
+            urls: Páginas a visitar (uma subtarefa cada)
+            tarefa: Modelo da instrução, com `{url}` no lugar da página
+
+        Returns:
+            {"resultados": [{url, resultado, passos, segundos, sucesso, erros}],
+             "historico": AgentHistoryList com todos os passos, "segundos": tempo total}
+        """
+        await self.iniciar()
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        print(f"🗂️ {len(urls)} subtarefa(s), até {self.concorrencia} agente(s) ao mesmo tempo")
+
+        inicio = time.perf_counter()
+        saidas = await asyncio.gather(
+            *(self._executar_subtarefa(semaforo, url, tarefa.format(url=url)) for url in urls),
+            return_exceptions=True,
+        )
+        segundos = time.perf_counter() - inicio
+
+        resultados, passos = [], []
+        for url, saida in zip(urls, saidas):
+            if isinstance(saida, Exception):
+                resultados.append({"url": url, "resultado": None, "sucesso": False,
+                                   "erros": [f"{type(saida).__name__}: {saida}"]})
+                continue
+            historico, relatorio = saida
+            passos.extend(historico.history)
+            resultados.append({"url": url, "resultado": historico.final_result(), **relatorio})
+
+        soma = sum(r.get("segundos", 0) for r in resultados)
+        print(f"⏱️ {len(urls)} subtarefa(s) em {segundos:.1f}s (soma sequencial: {soma:.1f}s)")
+        return {
+            "resultados": resultados,
+            "historico": AgentHistoryList(history=passos),
+            "segundos": round(segundos, 2),
+        }
+
+    async def fechar(self) -> None:
+        if self.browser is not None:
+            await self.browser.kill()
+            self.browser = None
+
+    async def __aenter__(self) -> "ExecutorParalelo":
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.fechar()
+
+
+def _argumento(nome: str, padrao: Optional[str] = None) -> Optional[str]:
+    if nome in sys.argv:
+        return sys.argv[sys.argv.index(nome) + 1]
+    return padrao
+
+
+async def main(urls: list[str], tarefa: str, provider: str, concorrencia: Optional[int]) -> None:
+    async with ExecutorParalelo(criar_llm(provider), concorrencia=concorrencia) as executor:
+        saida = await executor.executar(urls, tarefa)
+    for resultado in saida["resultados"]:
+        print(f"\n📋 {resultado['url']}")
+        print(resultado["resultado"] or resultado["erros"])
+
+
+if __name__ == "__main__":
+    com_valor = {"--tarefa", "--concorrencia"}
+    urls = [a for i, a in enumerate(sys.argv[1:], 1)
+            if not a.startswith("--") and sys.argv[i - 1] not in com_valor]
+    if not urls:
+        print("Informe ao menos uma URL")
+        sys.exit(1)
+    concorrencia = _argumento("--concorrencia")
+    asyncio.run(main(
+        urls,
+        _argumento("--tarefa", TAREFA_PADRAO),
+        "gemini" if "--gemini" in sys.argv else "ollama",
+        int(concorrencia) if concorrencia else None,
+    ))
@@ -1,10 +1,13 @@
-from browser_use import Agent, ChatGoogle, Browser, ChatGroq
+from browser_use import ChatGoogle, ChatGroq
 #from dotenv import load_dotenv 
 #import google.generativeai as genai
 from dotenv import load_dotenv 
 import os 
 import asyncio
 
+from cache_acoes import CacheAcoes, executar_com_replay
+from executor_agentes import ExecutorAgentes
+
 
 load_dotenv() 
 
@@ -20,11 +23,8 @@ async def main():
     #     user_data_dir="~/Library/Application Support/Google/Chrome",     
     #     profile_directory="Default", )   
 
-    browser = Browser(
-        window_size={"width": 500, "height": 700},  # Set window size
-        #browser_type="chromium", 
-        headless=False)
-    
+    # Navegador headless com esperas curtas, flash_mode e orçamento de passos
+    # (BROWSER_HEADLESS=false para ver a janela ao depurar)
     llm = ChatGoogle(model="google/gemini-2.5-flash", 
                      api_key=os.getenv("GOOGLE_API_KEY"))
 
@@ -32,17 +32,18 @@ async def main():
    #                api_key=os.getenv("GROQ_API_KEY"))
     
 
-    agent = Agent(     
-        #task="Pesquise no yahoo.com.br os top 5 assuntos mais pesquisados no Brasil e me retorna em uma lista.",  
-        #task="Pesquise no X.com os 5 assuntos do momento no Brasil e me retorna em uma lista.",
-        #task="Pesquise no ifood.com.br, 5 lojas de doces no endereco Rua Pedroso Alvarenga, 1192 – Itaim Bibi, São Paulo – SP ",
-        task="Liste 5 trends no site https://trends.google.com.br/trending?geo=BR&hl=pt-BR&category=14&hours=168", 
-        llm=llm,
-
-        browser=browser,
-        #api_key=api_key,
-    )
-    await agent.run()
+    # A tarefa roda de hora em hora: a sequência de ações fica gravada em cache_acoes/
+    # e as execuções seguintes só a reexecutam (o LLM volta se a página mudar)
+    async with ExecutorAgentes(llm, max_steps=10) as executor:
+        saida = await executar_com_replay(
+            executor,
+            #"Pesquise no yahoo.com.br os top 5 assuntos mais pesquisados no Brasil e me retorna em uma lista.",  
+            #"Pesquise no X.com os 5 assuntos do momento no Brasil e me retorna em uma lista.",
+            #"Pesquise no ifood.com.br, 5 lojas de doces no endereco Rua Pedroso Alvarenga, 1192 – Itaim Bibi, São Paulo – SP ",
+            "Liste 5 trends no site https://trends.google.com.br/trending?geo=BR&hl=pt-BR&category=14&hours=168", 
+            CacheAcoes(),
+        )
+    print(saida["resultado"])
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,6 +1,9 @@
-from browser_use import Agent, ChatOllama, Browser
+from browser_use import ChatOllama
 import asyncio
 
+from executor_agentes import ExecutorAgentes
+from executor_paralelo import ExecutorParalelo
+
 	
 tarefa = """
     1. Go to reddit https://www.reddit.com/search/?q=browser+agent&type=communities 
@@ -26,20 +29,25 @@ async def example():
     #llm = ChatOllama(model="qwen3:1.7b")
     llm = ChatOllama(model="gemma3:270m") #executou com gemma mas deu muitos eeros falta GPU.
 
-
-    agent = Agent(
-        #task="Nesta pagina voce encontra o corpo docentes de um universiade https://inf.ufg.br/docentes. Quero que extrair o nome completo de 5 docentes",
-        task=tarefa,
-        #browser=browser,
-        llm=llm
-    )
-
-    history = await agent.run()
+    # Perfil rápido (headless, esperas de 0.1s, flash_mode) e sessão reaproveitada;
+    # loga os segundos de cada passo e da tarefa
+    async with ExecutorAgentes(llm, max_steps=15) as executor:
+        #history = await executor.executar("Nesta pagina voce encontra o corpo docentes de um universiade https://inf.ufg.br/docentes. Quero que extrair o nome completo de 5 docentes")
+        history = await executor.executar(tarefa)
     return history
 
+async def example_paralelo(urls: list[str]):
+    # Uma subtarefa por página, em agentes paralelos no mesmo navegador
+    # (até OLLAMA_NUM_PARALLEL ao mesmo tempo): 5 páginas levam o tempo de ~1
+    llm = ChatOllama(model="qwen3:1.7b")
+    async with ExecutorParalelo(llm) as executor:
+        saida = await executor.executar(urls, "Abra {url} e resuma o post mais recente da página")
+    return saida["historico"]
+
 if __name__ == "__main__":
+    #history = asyncio.run(example_paralelo(["https://www.reddit.com/r/AI_Agents/", "https://www.reddit.com/r/LocalLLaMA/"]))
     history = asyncio.run(example())
-    print(history)
+    print(history.final_result())
 
 
 
@@ -0,0 +1,208 @@
+"""
+Cache HTTP em disco (SQLite) com revalidação condicional.
+
+Guarda o corpo de cada URL junto com ETag, Last-Modified e a validade do
+Cache-Control. Enquanto a resposta está fresca (max-age), nem vai à rede; depois
+disso manda If-None-Match / If-Modified-Since e, se o servidor responder 304,
+reaproveita o corpo gravado. Serve tanto para coletas assíncronas (httpx.AsyncClient)
+quanto para ferramentas síncronas.
+
+Uso:
+    uv run agents-crew/cache_http.py URL [URL ...]
+"""
+
+import re
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS respostas (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    content_type TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    expira_em REAL NOT NULL,
+    obtido_em REAL NOT NULL,
+    corpo BLOB NOT NULL
+);
+"""
+
+
+@dataclass
+class RespostaCache:
+    """Resposta servida pelo cache."""
+    url: str
+    status: int
+    corpo: bytes
+    content_type: Optional[str]
+    origem: str  # "cache" (fresca), "revalidado" (304) ou "rede"
+
+    @property
+    def texto(self) -> str:
+        encontrado = re.search(r"charset=([\w-]+)", self.content_type or "")
+        return self.corpo.decode(encontrado.group(1) if encontrado else "utf-8", errors="replace")
+
+
+def _validade(cabecalhos: httpx.Headers, agora: float, ttl_padrao: float) -> Optional[float]:
+    """Instante até quando a resposta é fresca; None se não pode ser gravada."""
+    cache_control = cabecalhos.get("cache-control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return agora
+    max_age = re.search(r"max-age=(\d+)", cache_control)
+    if max_age:
+        return agora + int(max_age.group(1))
+    if cabecalhos.get("expires"):
+        try:
+            return parsedate_to_datetime(cabecalhos["expires"]).timestamp()
+        except (TypeError, ValueError):
+            return agora
+    return agora + ttl_padrao
+
+
+class CacheHTTP:
+    """
+    Cache de respostas GET em SQLite, com ETag/Last-Modified/max-age.
+
+    Args:
+        caminho_db: Arquivo SQLite (padrão: "cache_http.db")
+        ttl_padrao: Segundos de validade quando o servidor não informa nenhuma (padrão: 0,
+            ou seja, sempre revalida)
+    """
+
+    def __init__(self, caminho_db: str = "cache_http.db", ttl_padrao: float = 0.0):
+        self.ttl_padrao = ttl_padrao
+        self._conexao = sqlite3.connect(caminho_db, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.executescript(ESQUEMA)
+        self._lock = threading.Lock()
+        self._cliente: Optional[httpx.Client] = None
+        self.estatisticas = {"cache": 0, "revalidado": 0, "rede": 0}
+
+    def _ler(self, url: str) -> Optional[tuple]:
+        with self._lock:
+            return self._conexao.execute(
+                "SELECT status, content_type, etag, last_modified, expira_em, obtido_em, corpo FROM respostas WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+    def _gravar(self, url: str, resposta: httpx.Response, expira_em: float) -> None:
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO respostas "
+                "(url, status, content_type, etag, last_modified, expira_em, obtido_em, corpo) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url, resposta.status_code, resposta.headers.get("content-type"),
+                    resposta.headers.get("etag"), resposta.headers.get("last-modified"),
+                    expira_em, time.time(), resposta.content,
+                ),
+            )
+
+    def _renovar(self, url: str, expira_em: float) -> None:
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "UPDATE respostas SET expira_em = ?, obtido_em = ? WHERE url = ?", (expira_em, time.time(), url)
+            )
+
+    def _preparar(self, url: str, max_idade: Optional[float]) -> tuple[Optional[tuple], Optional[RespostaCache], dict]:
+        """Decide se a resposta gravada serve; senão devolve os cabeçalhos condicionais."""
+        gravada = self._ler(url)
+        if gravada is None:
+            return None, None, {}
+
+        status, content_type, etag, last_modified, expira_em, obtido_em, corpo = gravada
+        agora = time.time()
+        # max_idade sobrepõe a validade do servidor (ex.: uma task que aceita dados de 1 dia)
+        fresca = agora < expira_em if max_idade is None else agora - obtido_em < max_idade
+        if fresca:
+            self.estatisticas["cache"] += 1
+            return gravada, RespostaCache(url, status, corpo, content_type, "cache"), {}
+
+        condicionais = {}
+        if etag:
+            condicionais["If-None-Match"] = etag
+        if last_modified:
+            condicionais["If-Modified-Since"] = last_modified
+        return gravada, None, condicionais
+
+    def _concluir(self, url: str, gravada: Optional[tuple], resposta: httpx.Response) -> RespostaCache:
+        agora = time.time()
+        if resposta.status_code == 304 and gravada is not None:
+            self._renovar(url, _validade(resposta.headers, agora, self.ttl_padrao) or agora)
+            self.estatisticas["revalidado"] += 1
+            status, content_type, _, _, _, _, corpo = gravada
+            return RespostaCache(url, status, corpo, content_type, "revalidado")
+
+        self.estatisticas["rede"] += 1
+        expira_em = _validade(resposta.headers, agora, self.ttl_padrao)
+        if resposta.status_code == 200 and expira_em is not None:
+            self._gravar(url, resposta, expira_em)
+        return RespostaCache(url, resposta.status_code, resposta.content, resposta.headers.get("content-type"), "rede")
+
+    def buscar(
+        self,
+        url: str,
+        max_idade: Optional[float] = None,
+        timeout: float = 20.0,
+        cabecalhos: Optional[dict] = None,
+        cookies: Optional[dict] = None,
+    ) -> RespostaCache:
+        """
+        GET síncrono passando pelo cache.
+
+        Args:
+            url: Endereço
+            max_idade: Aceita a cópia gravada sem revalidar se tiver até esses segundos
+                (opcional; por padrão vale o Cache-Control do servidor)
+            timeout: Timeout da requisição em segundos
+            cabecalhos: Cabeçalhos extras da requisição (opcional)
+            cookies: Cookies da requisição (opcional)
+
+        Returns:
+            RespostaCache com o corpo e a origem ("cache", "revalidado" ou "rede")
+        """
+        gravada, pronta, condicionais = self._preparar(url, max_idade)
+        if pronta:
+            return pronta
+        if self._cliente is None:
+            self._cliente = httpx.Client(headers={"User-Agent": USER_AGENT}, follow_redirects=True)
+        cabecalhos = {**(cabecalhos or {}), **condicionais}
+        if cookies:
+            cabecalhos["Cookie"] = "; ".join(f"{nome}={valor}" for nome, valor in cookies.items())
+        resposta = self._cliente.get(url, headers=cabecalhos, timeout=timeout)
+        return self._concluir(url, gravada, resposta)
+
+    async def buscar_async(self, cliente: httpx.AsyncClient, url: str, max_idade: Optional[float] = None) -> RespostaCache:
+        """Mesmo que `buscar`, usando um `httpx.AsyncClient` (para coletas em paralelo)."""
+        gravada, pronta, condicionais = self._preparar(url, max_idade)
+        if pronta:
+            return pronta
+        resposta = await cliente.get(url, headers=condicionais)
+        return self._concluir(url, gravada, resposta)
+
+    def fechar(self) -> None:
+        if self._cliente is not None:
+            self._cliente.close()
+        self._conexao.close()
+
+
+if __name__ == "__main__":
+    cache = CacheHTTP()
+    for url in sys.argv[1:]:
+        inicio = time.perf_counter()
+        resposta = cache.buscar(url)
+        print(f"{resposta.status} {resposta.origem:>10} {len(resposta.corpo):>8} bytes "
+              f"{time.perf_counter() - inicio:.3f}s {url}")
+    print(cache.estatisticas)
@@ -0,0 +1,137 @@
+"""
+Coletor determinístico do Google Trends.
+
+Em vez de um agente LLM ler a página de trending via `ScrapeWebsiteTool` e
+redigitar os termos (minutos por execução e termos alucinados), lê o feed RSS
+de tendências e converte cada item direto em `TrendKeyword`. O LLM fica só para
+o enriquecimento opcional (`resumo`/`relevancia`).
+
+Uso:
+    uv run agents-crew/coletor_trends.py
+    uv run agents-crew/coletor_trends.py --fixture agents-crew/fixtures/trends_rss_BR_14.xml
+"""
+
+import sys
+import time
+import urllib.request
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlencode
+
+from modelos_trends import TrendKeyword
+
+URL_FEED = "https://trends.google.com/trending/rss"
+NAMESPACE_HT = "https://trends.google.com/trending/rss"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+PARAMETROS_PADRAO = {
+    "geo": "BR",
+    "hl": "pt-BR",
+    "hours": "24",
+    "category": "14",
+}
+
+
+def montar_url_feed(parametros: dict) -> str:
+    """
+    Monta a URL do feed RSS de tendências.
+
+    Args:
+        parametros: geo, hl, hours e category (mesmos da página de trending)
+
+    Returns:
+        URL do feed
+    """
+    consulta = {chave: parametros[chave] for chave in ("geo", "hl", "hours", "category") if parametros.get(chave)}
+    return f"{URL_FEED}?{urlencode(consulta)}"
+
+
+def baixar_feed(url: str, timeout: float = 10.0) -> str:
+    """Baixa o feed e retorna o XML como texto."""
+    requisicao = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+        return resposta.read().decode("utf-8")
+
+
+def _texto(elemento: ET.Element, caminho: str) -> Optional[str]:
+    encontrado = elemento.find(caminho, {"ht": NAMESPACE_HT})
+    if encontrado is None or encontrado.text is None:
+        return None
+    return encontrado.text.strip() or None
+
+
+def parse_feed(xml_texto: str) -> list[TrendKeyword]:
+    """
+    Converte o XML do feed em `TrendKeyword`s, na ordem do feed.
+
+    Args:
+        xml_texto: Conteúdo do feed RSS
+
+    Returns:
+        Lista de tendências com termo, volume, manchetes e horário de publicação
+    """
+    raiz = ET.fromstring(xml_texto)
+    keywords = []
+
+    for item in raiz.iter("item"):
+        termo = _texto(item, "title")
+        if not termo:
+            continue
+
+        noticias = [
+            titulo
+            for titulo in (_texto(noticia, "ht:news_item_title") for noticia in item.findall("ht:news_item", {"ht": NAMESPACE_HT}))
+            if titulo
+        ]
+
+        publicado = _texto(item, "pubDate")
+        dados = {
+            "termo": termo,
+            "volume": _texto(item, "ht:approx_traffic"),
+            "noticias": noticias,
+        }
+        if publicado:
+            try:
+                dados["timestamp"] = parsedate_to_datetime(publicado).isoformat()
+            except (TypeError, ValueError):
+                pass
+
+        keywords.append(TrendKeyword(**dados))
+
+    return keywords
+
+
+def coletar_trends(parametros: Optional[dict] = None, fonte: Optional[str] = None, timeout: float = 10.0) -> list[TrendKeyword]:
+    """
+    Coleta as tendências do Google Trends.
+
+    Args:
+        parametros: geo, hl, hours e category (padrão: política no Brasil, 24h)
+        fonte: Caminho de um XML gravado para usar no lugar da rede (opcional)
+        timeout: Timeout da requisição em segundos
+
+    Returns:
+        Lista de `TrendKeyword` sem resumo/relevância (ver enriquecimento)
+    """
+    if fonte:
+        with open(fonte, "r", encoding="utf-8") as f:
+            xml_texto = f.read()
+    else:
+        xml_texto = baixar_feed(montar_url_feed({**PARAMETROS_PADRAO, **(parametros or {})}), timeout)
+
+    return parse_feed(xml_texto)
+
+
+if __name__ == "__main__":
+    fixture = sys.argv[sys.argv.index("--fixture") + 1] if "--fixture" in sys.argv else None
+
+    inicio = time.perf_counter()
+    trends = coletar_trends(PARAMETROS_PADRAO, fonte=fixture)
+    segundos = time.perf_counter() - inicio
+
+    for trend in trends:
+        print(f"- {trend.termo} ({trend.volume or 's/ volume'})")
+        for noticia in trend.noticias[:2]:
+            print(f"    · {noticia}")
+    print(f"\n{len(trends)} tendências coletadas em {segundos:.3f}s")
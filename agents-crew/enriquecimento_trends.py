@@ -0,0 +1,200 @@
+"""
+Enriquecimento em lote das tendências (resumo e relevância).
+
+Substitui o agente analista (loop de raciocínio do CrewAI, uma ida e volta por
+passo) por uma única chamada estruturada ao LLM por lote de termos, com a
+resposta restrita ao schema `LoteAnalises` e validada pelo Pydantic. O resultado
+fica em cache por termo e por dia, então reexecuções no mesmo dia não chamam o LLM.
+
+Uso:
+    uv run agents-crew/enriquecimento_trends.py --fixture agents-crew/fixtures/trends_rss_BR_14.xml
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from datetime import date
+from typing import Literal, Optional
+
+from crewai import LLM
+from pydantic import BaseModel, Field, ValidationError
+
+from historico_trends import chave_termo
+from modelos_trends import TrendKeyword
+
+
+class AnaliseTrend(BaseModel):
+    """Resumo e relevância de um termo"""
+    termo: str = Field(description="Termo exatamente como recebido")
+    resumo: str = Field(description="Contexto da tendência em no máximo 50 palavras")
+    relevancia: Literal["Alta", "Média", "Baixa"] = Field(description="Impacto político da tendência")
+
+
+class LoteAnalises(BaseModel):
+    """Resposta do LLM para um lote de termos"""
+    analises: list[AnaliseTrend]
+
+
+INSTRUCOES = (
+    "Você é um analista político experiente no cenário brasileiro. "
+    "Para CADA termo recebido, escreva um resumo objetivo (máx. 50 palavras) usando as "
+    "manchetes como contexto e classifique a relevância política como Alta, Média ou Baixa, "
+    "considerando impacto político potencial, volume de buscas e atualidade. "
+    "Devolva um item por termo, com o termo exatamente como recebido."
+)
+
+
+class CacheEnriquecimento:
+    """
+    Cache de análises por (dia, termo) em SQLite.
+
+    Args:
+        caminho_db: Arquivo SQLite (padrão: "trends_historico.db", ao lado do histórico)
+    """
+
+    def __init__(self, caminho_db: str = "trends_historico.db"):
+        self._conexao = sqlite3.connect(caminho_db)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS enriquecimento ("
+            "dia TEXT NOT NULL, chave TEXT NOT NULL, resumo TEXT NOT NULL, relevancia TEXT NOT NULL, "
+            "PRIMARY KEY (dia, chave))"
+        )
+
+    def obter(self, termo: str, dia: Optional[str] = None) -> Optional[tuple[str, str]]:
+        linha = self._conexao.execute(
+            "SELECT resumo, relevancia FROM enriquecimento WHERE dia = ? AND chave = ?",
+            (dia or date.today().isoformat(), chave_termo(termo)),
+        ).fetchone()
+        return tuple(linha) if linha else None
+
+    def guardar(self, analises: list[AnaliseTrend], dia: Optional[str] = None) -> None:
+        dia = dia or date.today().isoformat()
+        with self._conexao:
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO enriquecimento (dia, chave, resumo, relevancia) VALUES (?, ?, ?, ?)",
+                [(dia, chave_termo(a.termo), a.resumo, a.relevancia) for a in analises],
+            )
+
+
+def _montar_mensagens(lote: list[TrendKeyword], erro_anterior: Optional[str] = None) -> list[dict]:
+    termos = [
+        {"termo": k.termo, "volume": k.volume, "manchetes": k.noticias[:3]}
+        for k in lote
+    ]
+    conteudo = (
+        "Termos (JSON):\n"
+        + json.dumps(termos, ensure_ascii=False)
+        + "\n\nResponda APENAS com um JSON válido neste schema:\n"
+        + json.dumps(LoteAnalises.model_json_schema(), ensure_ascii=False)
+    )
+    if erro_anterior:
+        conteudo += f"\n\nA resposta anterior foi rejeitada pela validação: {erro_anterior}"
+    return [
+        {"role": "system", "content": INSTRUCOES},
+        {"role": "user", "content": conteudo},
+    ]
+
+
+def _validar_resposta(resposta) -> LoteAnalises:
+    if isinstance(resposta, BaseModel):
+        return LoteAnalises.model_validate(resposta.model_dump())
+
+    texto = str(resposta).strip()
+    if texto.startswith("```"):
+        texto = "\n".join(texto.split("\n")[1:-1])
+    return LoteAnalises.model_validate_json(texto)
+
+
+def analisar_lote(lote: list[TrendKeyword], llm: LLM, tentativas: int = 2) -> list[AnaliseTrend]:
+    """
+    Analisa um lote de termos numa única chamada estruturada.
+
+    Args:
+        lote: Tendências a analisar
+        llm: LLM do CrewAI
+        tentativas: Chamadas permitidas se a resposta não passar na validação
+
+    Returns:
+        Análises validadas (termos que o LLM omitiu ficam de fora)
+    """
+    erro = None
+    for _ in range(tentativas):
+        try:
+            resposta = llm.call(_montar_mensagens(lote, erro), response_model=LoteAnalises)
+            return _validar_resposta(resposta).analises
+        except (ValidationError, ValueError) as e:
+            erro = str(e)[:500]
+            print(f"⚠️  Resposta do LLM rejeitada: {erro[:120]}")
+    return []
+
+
+def enriquecer_keywords(
+    keywords: list[TrendKeyword],
+    llm: LLM,
+    tamanho_lote: int = 15,
+    cache: Optional[CacheEnriquecimento] = None,
+) -> list[TrendKeyword]:
+    """
+    Preenche resumo e relevância de todas as tendências.
+
+    Termos já analisados hoje vêm do cache; os demais vão ao LLM em lotes de
+    `tamanho_lote`, uma chamada por lote.
+
+    Args:
+        keywords: Tendências a enriquecer
+        llm: LLM do CrewAI
+        tamanho_lote: Termos por chamada (padrão: 15)
+        cache: Cache por dia (opcional)
+
+    Returns:
+        As tendências na mesma ordem, com resumo/relevância quando disponíveis
+    """
+    analises: dict[str, tuple[str, str]] = {}
+    pendentes = []
+    for keyword in keywords:
+        em_cache = cache.obter(keyword.termo) if cache else None
+        if em_cache:
+            analises[chave_termo(keyword.termo)] = em_cache
+        else:
+            pendentes.append(keyword)
+
+    lotes = 0
+    inicio = time.perf_counter()
+    for i in range(0, len(pendentes), tamanho_lote):
+        lote = pendentes[i:i + tamanho_lote]
+        resultado = analisar_lote(lote, llm)
+        lotes += 1
+        # Só aceita análises de termos que estavam no lote
+        esperados = {chave_termo(k.termo) for k in lote}
+        resultado = [a for a in resultado if chave_termo(a.termo) in esperados]
+        if cache:
+            cache.guardar(resultado)
+        analises.update((chave_termo(a.termo), (a.resumo, a.relevancia)) for a in resultado)
+
+    print(
+        f"✓ Enriquecimento: {len(keywords) - len(pendentes)} do cache, "
+        f"{len(pendentes)} em {lotes} lote(s) ao LLM ({time.perf_counter() - inicio:.1f}s)"
+    )
+
+    enriquecidas = []
+    for keyword in keywords:
+        analise = analises.get(chave_termo(keyword.termo))
+        if analise:
+            keyword = keyword.model_copy(update={"resumo": analise[0], "relevancia": analise[1]})
+        enriquecidas.append(keyword)
+    return enriquecidas
+
+
+if __name__ == "__main__":
+    from coletor_trends import coletar_trends
+    from google_trends import get_llm
+
+    fixture = sys.argv[sys.argv.index("--fixture") + 1] if "--fixture" in sys.argv else None
+    provider = sys.argv[sys.argv.index("--provider") + 1] if "--provider" in sys.argv else "qwen"
+
+    trends = coletar_trends(fonte=fixture)
+    resultado = enriquecer_keywords(trends, get_llm(provider), cache=CacheEnriquecimento())
+    for trend in resultado:
+        print(f"[{trend.relevancia}] {trend.termo}: {trend.resumo}")
@@ -120,187 +120,188 @@
 
 # ================================================
 
-from crewai import Agent, Task, Crew, Process
-from crewai_tools import ScrapeWebsiteTool
-from crewai import LLM
+# Extração das informações de um curso da Escola de Pós-Graduação da UFG.
+#
+# Por padrão usa o extrator determinístico (`extrator_cursos`): baixa a página uma
+# vez, aplica as regras do template e só chama o LLM para os campos que faltarem.
+# O crew de dois agentes continua disponível com `--crew`.
+#
+# Uso:
+#     uv run agents-crew/escola-pos.py [URL] [--crew]
+
+import asyncio
 import json
-from dotenv import load_dotenv
 import os
-from pydantic import BaseModel
-from typing import List
+import sys
+
+from crewai import Agent, Task, Crew, Process
+from dotenv import load_dotenv
+
+from extrator_cursos import CursoInfo, extrair_catalogo
+from ferramenta_scrape_cache import ScrapeWebsiteCacheTool
+from instrumentacao import get_rastreador, instrumentar_crew
+from llm_provider import obter_llm
 
 # Página de exemplo (troque pela URL que desejar)
 #url = "https://escoladepos.ufg.br/cursos/atendimento-de-criancas-e-adolescentes-vitimas-ou-testemunhas-de-violencia/"
-url = "https://escoladepos.ufg.br/cursos/banco-de-dados-com-big-data/"
+URL_PADRAO = "https://escoladepos.ufg.br/cursos/banco-de-dados-com-big-data/"
 
 # Carregar variáveis de ambiente
 load_dotenv()
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 
-USE_LOCAL = os.getenv("USE_LOCAL_MODEL", "false").lower() == "true"
-
-if USE_LOCAL:
-    llm = LLM(
-        #model="ollama/gemma3:270m",
-        model="ollama/qwen3:1.7b",
-        base_url="http://localhost:11434",
-        temperature=0
+def criar_llm():
+    """LLM compartilhado e memoizado (ver `llm_provider`); USE_LOCAL_MODEL=true usa o Ollama."""
+    if os.getenv("USE_LOCAL_MODEL", "false").lower() == "true":
+        return obter_llm("qwen", temperature=0)
+    return obter_llm("gemini", temperature=0)
+
+
+def criar_crew(url: str, llm) -> Crew:
+    """Crew original: um agente extrai com a ferramenta de raspagem e outro formata o JSON."""
+    # Ferramenta para raspagem (páginas de curso mudam pouco: aceita cópia de até 1 dia)
+    scraper_tool = ScrapeWebsiteCacheTool(max_idade=24 * 3600)
+
+    # Agente de extração
+    agente_extracao = Agent(
+        role="Agente de Coleta de Informações de Cursos",
+        goal="Extrair informações detalhadas do curso de pós-graduação da UFG",
+        backstory="Especialista em web scraping focado em dados educacionais e informações acadêmicas.",
+        verbose=True,
+        memory=True,
+        llm=llm,
+        #max_rpm=1,
+        tools=[scraper_tool]
     )
-else:
-    GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-    llm = LLM(
-        model="gemini/gemini-2.0-flash",
-        temperature=0,
-        api_key=GOOGLE_API_KEY,
+
+    # Tarefa de extração
+    extrair_informacoes_site = Task(
+        description=f"""
+        Acesse o site {url} e extraia TODAS as informações do curso de pós-graduação.
+        
+        Você DEVE coletar exatamente estes campos:
+        - nome: Nome completo do curso
+        - descricao: Descrição resumida do curso
+        - carga_horaria: Carga horária total (ex: "360 horas")
+        - modalidade: Se é online, presencial ou híbrido
+        - informacoes_adicionais: Informações relevantes sobre o curso
+        - edital_disponivel: "Sim" ou "Não" se há edital disponível
+        - data_inicio: Data de início das aulas
+        - valor_mensalidade: Valor da mensalidade (ex: "R$ 500,00" ou "Gratuito")
+        
+        IMPORTANTE: Se alguma informação não estiver disponível no site, use "Não informado".
+        """,
+        expected_output="Informações estruturadas do curso em formato de dicionário Python",
+        tools=[scraper_tool],
+        agent=agente_extracao
     )
 
+    # Agente formatador
+    agente_formatador_json = Agent(
+        role="Especialista em Formatação de Dados",
+        goal="Converter as informações extraídas em formato JSON válido e bem estruturado",
+        backstory="Especialista em estruturação de dados com foco em precisão e padronização.",
+        verbose=True,
+        memory=True,
+        #max_rpm=1,
+        llm=llm
+    )
 
-# Modelo Pydantic para estruturar a saída
-class CursoInfo(BaseModel):
-    nome: str
-    descricao: str
-    carga_horaria: str
-    modalidade: str
-    informacoes_adicionais: str
-    edital_disponivel: str
-    data_inicio: str
-    valor_mensalidade: str
-
-# Ferramenta para raspagem
-scraper_tool = ScrapeWebsiteTool()
-
-# Agente de extração
-agente_extracao = Agent(
-    role="Agente de Coleta de Informações de Cursos",
-    goal="Extrair informações detalhadas do curso de pós-graduação da UFG",
-    backstory="Especialista em web scraping focado em dados educacionais e informações acadêmicas.",
-    verbose=True,
-    memory=True,
-    llm=llm,
-    #max_rpm=1,
-    tools=[scraper_tool]
-)
-
-# Tarefa de extração
-extrair_informacoes_site = Task(
-    description=f"""
-    Acesse o site {url} e extraia TODAS as informações do curso de pós-graduação.
-    
-    Você DEVE coletar exatamente estes campos:
-    - nome: Nome completo do curso
-    - descricao: Descrição resumida do curso
-    - carga_horaria: Carga horária total (ex: "360 horas")
-    - modalidade: Se é online, presencial ou híbrido
-    - informacoes_adicionais: Informações relevantes sobre o curso
-    - edital_disponivel: "Sim" ou "Não" se há edital disponível
-    - data_inicio: Data de início das aulas
-    - valor_mensalidade: Valor da mensalidade (ex: "R$ 500,00" ou "Gratuito")
-    
-    IMPORTANTE: Se alguma informação não estiver disponível no site, use "Não informado".
-    """,
-    expected_output="Informações estruturadas do curso em formato de dicionário Python",
-    tools=[scraper_tool],
-    agent=agente_extracao
-)
-
-# Agente formatador
-agente_formatador_json = Agent(
-    role="Especialista em Formatação de Dados",
-    goal="Converter as informações extraídas em formato JSON válido e bem estruturado",
-    backstory="Especialista em estruturação de dados com foco em precisão e padronização.",
-    verbose=True,
-    memory=True,
-    #max_rpm=1,
-    llm=llm
-)
-
-# Tarefa de formatação
-formatar_json = Task(
-    description="""
-    Receba as informações extraídas e formate em JSON válido.
-    
-    O JSON deve ter EXATAMENTE esta estrutura:
-    {
-        "curso": {
-            "nome": "...",
-            "descricao": "...",
-            "carga_horaria": "...",
-            "modalidade": "...",
-            "informacoes_adicionais": "...",
-            "edital_disponivel": "...",
-            "data_inicio": "...",
-            "valor_mensalidade": "..."
+    # Tarefa de formatação
+    formatar_json = Task(
+        description="""
+        Receba as informações extraídas e formate em JSON válido.
+        
+        O JSON deve ter EXATAMENTE esta estrutura:
+        {
+            "curso": {
+                "nome": "...",
+                "descricao": "...",
+                "carga_horaria": "...",
+                "modalidade": "...",
+                "informacoes_adicionais": "...",
+                "edital_disponivel": "...",
+                "data_inicio": "...",
+                "valor_mensalidade": "..."
+            }
         }
-    }
-    
-    Retorne APENAS o JSON, sem texto adicional antes ou depois.
-    Use "Não informado" para campos sem informação.
-    """,
-    expected_output="JSON válido contendo todas as informações do curso",
-    agent=agente_formatador_json,
-    output_file="resultado_scraping.json"  # Salvamento automático
-)
-
-# Criar equipe
-equipe = Crew(
-    agents=[agente_extracao, agente_formatador_json],
-    tasks=[extrair_informacoes_site, formatar_json],
-    process=Process.sequential,
-    verbose=True
-)
-
-# Executar
-print("🚀 Iniciando extração de dados...")
-resultado = equipe.kickoff(inputs={'url': url})
-
-print("\n" + "="*60)
-print("📊 RESULTADO DA EXTRAÇÃO")
-print("="*60)
-print(resultado)
-
-# Salvar resultado em JSON
-try:
-    # Tentar parsear se o resultado já for uma string JSON
-    if isinstance(resultado, str):
-        # Remover possíveis marcadores de código markdown
-        resultado_limpo = resultado.strip()
-        if resultado_limpo.startswith("```"):
-            linhas = resultado_limpo.split("\n")
-            resultado_limpo = "\n".join(linhas[1:-1])
         
-        saida_json = json.loads(resultado_limpo)
-    else:
-        # Se for objeto, converter para dict
-        saida_json = resultado if isinstance(resultado, dict) else {"resultado": str(resultado)}
-    
-    # Salvar arquivo
-    with open("resultado_scraping.json", "w", encoding="utf-8") as f:
+        Retorne APENAS o JSON, sem texto adicional antes ou depois.
+        Use "Não informado" para campos sem informação.
+        """,
+        expected_output="JSON válido contendo todas as informações do curso",
+        agent=agente_formatador_json,
+        output_file="resultado_scraping.json"  # Salvamento automático
+    )
+
+    # Criar equipe
+    return Crew(
+        agents=[agente_extracao, agente_formatador_json],
+        tasks=[extrair_informacoes_site, formatar_json],
+        process=Process.sequential,
+        verbose=True
+    )
+
+
+def executar_crew(url: str, llm) -> dict:
+    """Roda o crew e converte a resposta em dict (removendo as cercas ``` se vierem)."""
+    # Spans de LLM, ferramenta e task em crew_traces.jsonl (resumo: uv run agents-crew/instrumentacao.py)
+    crew = instrumentar_crew(criar_crew(url, llm))
+    with get_rastreador().span("crew", "escola-pos", url=url):
+        resultado = crew.kickoff(inputs={'url': url})
+    resultado_limpo = str(resultado).strip()
+    if resultado_limpo.startswith("```"):
+        linhas = resultado_limpo.split("\n")
+        resultado_limpo = "\n".join(linhas[1:-1])
+
+    try:
+        return json.loads(resultado_limpo)
+    except json.JSONDecodeError as e:
+        print(f"\n⚠️ Erro ao parsear JSON: {e}")
+        return {
+            "status": "warning",
+            "mensagem": "Resultado não estava em formato JSON válido",
+            "resultado_bruto": str(resultado)
+        }
+
+
+def extrair(url: str, llm=None) -> dict:
+    """
+    Extrai o curso com as regras do template e, se preciso, uma chamada ao LLM.
+
+    Args:
+        url: Página do curso
+        llm: LLM para os campos que as regras não acharem (opcional)
+
+    Returns:
+        {"curso": CursoInfo em dict}, no mesmo formato que o crew gerava
+    """
+    resultado = asyncio.run(extrair_catalogo(llm=llm, urls=[url]))[0]
+    if resultado.get("erro"):
+        raise RuntimeError(f"Falha ao extrair {url}: {resultado['erro']}")
+    if resultado["campos_llm"]:
+        print(f"🤖 Campos completados pelo LLM: {', '.join(resultado['campos_llm'])}")
+    return {"curso": CursoInfo(**resultado["curso"]).model_dump()}
+
+
+def salvar_resultado(saida_json: dict, arquivo: str = "resultado_scraping.json") -> None:
+    with open(arquivo, "w", encoding="utf-8") as f:
         json.dump(saida_json, f, ensure_ascii=False, indent=2)
-    
-    print("\n✅ Resultado salvo em 'resultado_scraping.json'")
-    
-    # Mostrar prévia do JSON salvo
-    print("\n📄 Prévia do JSON salvo:")
-    print(json.dumps(saida_json, ensure_ascii=False, indent=2))
+    print(f"\n✅ Resultado salvo em '{arquivo}'")
+
+
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if not a.startswith("--")]
+    url = argumentos[0] if argumentos else URL_PADRAO
 
-except json.JSONDecodeError as e:
-    print(f"\n⚠️ Erro ao parsear JSON: {e}")
-    print("Salvando resultado como texto bruto...")
-    
-    # Salvar como objeto com o resultado bruto
-    fallback_json = {
-        "status": "warning",
-        "mensagem": "Resultado não estava em formato JSON válido",
-        "resultado_bruto": str(resultado)
-    }
-    
-    with open("resultado_scraping.json", "w", encoding="utf-8") as f:
-        json.dump(fallback_json, f, ensure_ascii=False, indent=2)
-    
-    print("✅ Resultado salvo em 'resultado_scraping.json' (formato alternativo)")
-
-except Exception as e:
-    print(f"\n❌ Erro ao salvar arquivo: {e}")
-    print("Resultado bruto:")
-    print(resultado)
\ No newline at end of file
+    print("🚀 Iniciando extração de dados...")
+    if "--crew" in sys.argv:
+        saida_json = executar_crew(url, criar_llm())
+    else:
+        saida_json = extrair(url, criar_llm())
+
+    print("\n" + "="*60)
+    print("📊 RESULTADO DA EXTRAÇÃO")
+    print("="*60)
+    print(json.dumps(saida_json, ensure_ascii=False, indent=2))
+    salvar_resultado(saida_json)
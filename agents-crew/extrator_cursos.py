@@ -0,0 +1,368 @@
+"""
+Extrator determinístico dos cursos da Escola de Pós-Graduação da UFG.
+
+O `escola-pos.py` usava dois agentes LLM (extração e formatação JSON) para
+preencher os oito campos de `CursoInfo` de uma única página e ainda precisava
+limpar as cercas ``` da resposta. Aqui a página é baixada uma vez (com cache
+HTTP em disco), os campos saem de regras CSS e de rótulos do template dos cursos
+da UFG, o resultado é validado pelo `CursoInfo` e o LLM só é chamado, numa única
+chamada estruturada, para os campos que as regras não acharem.
+
+O catálogo inteiro é coletado em paralelo (asyncio + httpx), com revalidação
+por ETag/Last-Modified nas execuções seguintes.
+
+Uso:
+    uv run agents-crew/extrator_cursos.py URL_DO_CURSO [--sem-llm]
+    uv run agents-crew/extrator_cursos.py --catalogo [--sem-llm]
+"""
+
+import asyncio
+import json
+import re
+import sys
+import time
+from typing import Optional
+from urllib.parse import urljoin, urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+from pydantic import BaseModel, ValidationError, create_model
+
+from cache_http import USER_AGENT, CacheHTTP
+
+URL_CATALOGO = "https://escoladepos.ufg.br/cursos/"
+NAO_INFORMADO = "Não informado"
+
+
+class CursoInfo(BaseModel):
+    """Modelo Pydantic para estruturar a saída"""
+    nome: str
+    descricao: str
+    carga_horaria: str
+    modalidade: str
+    informacoes_adicionais: str
+    edital_disponivel: str
+    data_inicio: str
+    valor_mensalidade: str
+
+
+DESCRICOES_CAMPOS = {
+    "nome": "Nome completo do curso",
+    "descricao": "Descrição resumida do curso",
+    "carga_horaria": 'Carga horária total (ex: "360 horas")',
+    "modalidade": "Se é On-line, Presencial ou Híbrido",
+    "informacoes_adicionais": "Informações relevantes sobre o curso",
+    "edital_disponivel": '"Sim" ou "Não" se há edital disponível',
+    "data_inicio": "Data de início das aulas",
+    "valor_mensalidade": 'Valor da mensalidade (ex: "R$ 500,00" ou "Gratuito")',
+}
+
+# ==============================
+# Regras do template da UFG
+# ==============================
+
+# Seletores CSS em ordem de preferência
+SELETORES = {
+    "nome": ["h1.entry-title", "article h1", "h1", "meta[property='og:title']", "title"],
+    "descricao": [
+        "meta[name='description']", "meta[property='og:description']",
+        ".entry-content > p", "article p",
+    ],
+    "informacoes_adicionais": [".entry-content ul li", "article ul li"],
+}
+
+# Rótulos do bloco de informações ("Carga horária: 360 horas", ou o valor na linha seguinte)
+ROTULOS = {
+    "carga_horaria": r"carga\s+hor[áa]ria",
+    "modalidade": r"modalidade",
+    "data_inicio": r"(?:in[íi]cio(?:\s+das\s+aulas)?|data\s+de\s+in[íi]cio)",
+    "valor_mensalidade": r"(?:mensalidade|investimento|valor)",
+}
+
+# Formato esperado do valor de cada rótulo
+FORMATOS = {
+    "carga_horaria": re.compile(r"\d{2,4}\s*(?:h\b|horas)", re.IGNORECASE),
+    "data_inicio": re.compile(
+        r"\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}\s+de\s+[a-zç]+(?:\s+de\s+\d{4})?|[a-zç]+\s+de\s+\d{4}", re.IGNORECASE
+    ),
+    "valor_mensalidade": re.compile(r"R\$\s*[\d.]+(?:,\d{2})?(?:\s*/\s*m[êe]s(?:al)?)?|gratuit[oa]", re.IGNORECASE),
+}
+
+MODALIDADES = [
+    (re.compile(r"h[íi]brid[oa]|semipresencial", re.IGNORECASE), "Híbrido"),
+    (re.compile(r"on-?line|ead\b|a\s+dist[âa]ncia", re.IGNORECASE), "On-line"),
+    (re.compile(r"presencial", re.IGNORECASE), "Presencial"),
+]
+
+_SUFIXO_TITULO = re.compile(r"\s*[-–|]\s*(?:Escola de P[óo]s|UFG).*$", re.IGNORECASE)
+
+
+def _texto_seletor(sopa: BeautifulSoup, seletores: list[str], todos: bool = False) -> Optional[str]:
+    for seletor in seletores:
+        elementos = sopa.select(seletor) if todos else [sopa.select_one(seletor)]
+        textos = []
+        for elemento in elementos:
+            if elemento is None:
+                continue
+            texto = elemento.get("content") if elemento.name == "meta" else elemento.get_text(" ", strip=True)
+            if texto and texto.strip():
+                textos.append(" ".join(texto.split()))
+        if textos:
+            return "; ".join(textos[:8]) if todos else textos[0]
+    return None
+
+
+def _valor_do_rotulo(linhas: list[str], rotulo: str, formato: Optional[re.Pattern]) -> Optional[str]:
+    padrao = re.compile(rf"^\s*{rotulo}\s*:?\s*(.*)$", re.IGNORECASE)
+    for i, linha in enumerate(linhas):
+        encontrado = padrao.match(linha)
+        if not encontrado:
+            continue
+        # Valor na mesma linha ou na próxima não vazia (bloco rótulo / valor do template)
+        candidatos = [encontrado.group(1)] + [l for l in linhas[i + 1:i + 3] if l.strip()]
+        for candidato in candidatos:
+            if not candidato.strip():
+                continue
+            if formato is None:
+                return candidato.strip()
+            valor = formato.search(candidato)
+            if valor:
+                return valor.group(0).strip()
+    return None
+
+
+def extrair_por_regras(html: str) -> dict[str, str]:
+    """
+    Aplica as regras CSS e de rótulos à página de um curso.
+
+    Args:
+        html: HTML da página
+
+    Returns:
+        Campos encontrados (os ausentes ficam de fora)
+    """
+    sopa = BeautifulSoup(html, "html.parser")
+    campos: dict[str, str] = {}
+
+    nome = _texto_seletor(sopa, SELETORES["nome"])
+    if nome:
+        campos["nome"] = _SUFIXO_TITULO.sub("", nome)
+    descricao = _texto_seletor(sopa, SELETORES["descricao"])
+    if descricao:
+        campos["descricao"] = descricao
+    informacoes = _texto_seletor(sopa, SELETORES["informacoes_adicionais"], todos=True)
+    if informacoes:
+        campos["informacoes_adicionais"] = informacoes
+
+    for elemento in sopa(["script", "style", "noscript"]):
+        elemento.decompose()
+    linhas = [l.strip() for l in sopa.get_text("\n").split("\n") if l.strip()]
+
+    for campo, rotulo in ROTULOS.items():
+        valor = _valor_do_rotulo(linhas, rotulo, FORMATOS.get(campo))
+        if valor:
+            campos[campo] = valor
+
+    # Sem rótulo: procura o formato no texto todo
+    texto = "\n".join(linhas)
+    if "carga_horaria" not in campos:
+        valor = FORMATOS["carga_horaria"].search(texto)
+        if valor:
+            campos["carga_horaria"] = valor.group(0)
+    if "valor_mensalidade" not in campos:
+        valor = FORMATOS["valor_mensalidade"].search(texto)
+        if valor:
+            campos["valor_mensalidade"] = valor.group(0)
+
+    modalidade = campos.get("modalidade") or texto
+    for padrao, nome_modalidade in MODALIDADES:
+        if padrao.search(modalidade):
+            campos["modalidade"] = nome_modalidade
+            break
+    else:
+        campos.pop("modalidade", None)
+
+    edital = any("edital" in (a.get("href", "") + a.get_text()).lower() for a in sopa.select("a"))
+    campos["edital_disponivel"] = "Sim" if edital else "Não"
+
+    return campos
+
+
+# ==============================
+# Complemento com LLM
+# ==============================
+
+def completar_com_llm(campos: dict[str, str], html: str, llm, limite_texto: int = 6000) -> dict[str, str]:
+    """
+    Preenche, numa única chamada estruturada, só os campos que as regras não acharam.
+
+    Args:
+        campos: Campos já extraídos
+        html: HTML da página (vira texto e é truncado em `limite_texto` caracteres)
+        llm: LLM do CrewAI
+        limite_texto: Caracteres da página enviados ao LLM
+
+    Returns:
+        Os campos extraídos mais os que o LLM preencheu (respostas vazias ou
+        "Não informado" ficam de fora)
+    """
+    faltantes = [campo for campo in CursoInfo.model_fields if campo not in campos]
+    if not faltantes or llm is None:
+        return campos
+
+    Faltantes = create_model("CamposFaltantes", **{campo: (str, NAO_INFORMADO) for campo in faltantes})
+    sopa = BeautifulSoup(html, "html.parser")
+    for elemento in sopa(["script", "style", "noscript", "header", "footer", "nav"]):
+        elemento.decompose()
+    texto = " ".join(sopa.get_text(" ").split())[:limite_texto]
+
+    pedidos = "\n".join(f"- {campo}: {DESCRICOES_CAMPOS[campo]}" for campo in faltantes)
+    mensagens = [
+        {"role": "system", "content": (
+            "Você extrai dados de páginas de cursos de pós-graduação. Responda APENAS com JSON válido. "
+            f'Use "{NAO_INFORMADO}" quando a informação não estiver na página.'
+        )},
+        {"role": "user", "content": f"Campos:\n{pedidos}\n\nPágina:\n{texto}"},
+    ]
+
+    try:
+        resposta = llm.call(mensagens, response_model=Faltantes)
+        if isinstance(resposta, BaseModel):
+            preenchidos = resposta.model_dump()
+        else:
+            resposta = str(resposta).strip()
+            if resposta.startswith("```"):
+                resposta = "\n".join(resposta.split("\n")[1:-1])
+            preenchidos = Faltantes.model_validate_json(resposta).model_dump()
+    except (ValidationError, ValueError) as e:
+        print(f"⚠️  Resposta do LLM rejeitada: {e}")
+        return campos
+
+    preenchidos = {campo: valor.strip() for campo, valor in preenchidos.items()
+                   if valor and valor.strip() and valor.strip() != NAO_INFORMADO}
+    return {**campos, **preenchidos}
+
+
+def montar_curso(campos: dict[str, str]) -> CursoInfo:
+    """Valida os campos no `CursoInfo`, com "Não informado" no que faltar."""
+    return CursoInfo(**{campo: campos.get(campo) or NAO_INFORMADO for campo in CursoInfo.model_fields})
+
+
+def extrair_curso(html: str, llm=None) -> tuple[CursoInfo, list[str]]:
+    """
+    Extrai o `CursoInfo` de uma página.
+
+    Args:
+        html: HTML da página do curso
+        llm: LLM para os campos que as regras não acharem (opcional)
+
+    Returns:
+        (CursoInfo validado, campos que o LLM de fato preencheu)
+    """
+    campos = extrair_por_regras(html)
+    completados = completar_com_llm(campos, html, llm) if llm is not None else campos
+    return montar_curso(completados), [campo for campo in completados if campo not in campos]
+
+
+# ==============================
+# Catálogo
+# ==============================
+
+def listar_cursos(html: str, url_base: str = URL_CATALOGO) -> list[str]:
+    """
+    Links das páginas de curso no catálogo (ex.: /cursos/banco-de-dados-com-big-data/).
+
+    Args:
+        html: HTML da página do catálogo
+        url_base: URL do catálogo, para resolver links relativos
+
+    Returns:
+        URLs únicas, na ordem em que aparecem
+    """
+    caminho_base = urlparse(url_base).path.rstrip("/")
+    urls = []
+    for link in BeautifulSoup(html, "html.parser").select("a[href]"):
+        url = urljoin(url_base, link["href"]).split("#")[0].split("?")[0]
+        caminho = urlparse(url).path.rstrip("/")
+        # Só um nível abaixo do catálogo: /cursos/<slug>
+        if caminho.startswith(caminho_base + "/") and "/" not in caminho[len(caminho_base) + 1:]:
+            url = url if url.endswith("/") else url + "/"
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+async def extrair_catalogo(
+    url_catalogo: str = URL_CATALOGO,
+    llm=None,
+    concorrencia: int = 8,
+    cache: Optional[CacheHTTP] = None,
+    urls: Optional[list[str]] = None,
+) -> list[dict]:
+    """
+    Extrai todos os cursos do catálogo em paralelo.
+
+    Args:
+        url_catalogo: Página que lista os cursos
+        llm: LLM para campos faltantes (opcional; sem ele só valem as regras)
+        concorrencia: Páginas baixadas ao mesmo tempo (padrão: 8)
+        cache: Cache HTTP em disco (padrão: "cache_http.db")
+        urls: Páginas de curso a extrair no lugar das listadas no catálogo (opcional)
+
+    Returns:
+        Um dict por curso: url, curso (CursoInfo em dict), campos_llm, origem e erro
+    """
+    cache = cache or CacheHTTP()
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async with httpx.AsyncClient(headers={"User-Agent": USER_AGENT}, timeout=20.0, follow_redirects=True) as cliente:
+        if urls is None:
+            catalogo = await cache.buscar_async(cliente, url_catalogo)
+            urls = listar_cursos(catalogo.texto, url_catalogo)
+            print(f"📚 {len(urls)} cursos no catálogo ({catalogo.origem})")
+
+        async def processar(url: str) -> dict:
+            async with semaforo:
+                try:
+                    resposta = await cache.buscar_async(cliente, url)
+                    if resposta.status != 200:
+                        return {"url": url, "erro": f"HTTP {resposta.status}"}
+                    # Parse e chamada ao LLM fora do loop de eventos
+                    curso, campos_llm = await asyncio.to_thread(extrair_curso, resposta.texto, llm)
+                    return {"url": url, "curso": curso.model_dump(), "campos_llm": campos_llm,
+                            "origem": resposta.origem, "erro": None}
+                except Exception as e:
+                    return {"url": url, "erro": f"{type(e).__name__}: {e}"}
+
+        return await asyncio.gather(*(processar(url) for url in urls))
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    llm = None
+    if "--sem-llm" not in sys.argv:
+        import os
+
+        from llm_provider import obter_llm
+
+        usar_local = os.getenv("USE_LOCAL_MODEL", "false").lower() == "true"
+        llm = obter_llm("qwen" if usar_local else "gemini", temperature=0)
+
+    inicio = time.perf_counter()
+    if "--catalogo" in sys.argv:
+        resultados = asyncio.run(extrair_catalogo(llm=llm))
+        with open("cursos_ufg.json", "w", encoding="utf-8") as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        erros = sum(1 for r in resultados if r.get("erro"))
+        print(f"✅ {len(resultados) - erros} cursos extraídos ({erros} erros) em "
+              f"{time.perf_counter() - inicio:.1f}s -> cursos_ufg.json")
+    else:
+        urls = [a for a in sys.argv[1:] if not a.startswith("--")] or [
+            "https://escoladepos.ufg.br/cursos/banco-de-dados-com-big-data/"
+        ]
+        resultados = asyncio.run(extrair_catalogo(llm=llm, urls=urls))
+        for resultado in resultados:
+            print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        print(f"\n⏱️  {time.perf_counter() - inicio:.1f}s")
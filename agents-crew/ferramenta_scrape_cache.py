@@ -0,0 +1,133 @@
+"""
+`ScrapeWebsiteTool` com cache HTTP.
+
+Cada execução de crew (e às vezes o mesmo agente, várias vezes na mesma
+execução) baixava a página de novo. Esta ferramenta tem a mesma interface e a
+mesma saída do `ScrapeWebsiteTool`, mas:
+
+- repete chamadas da mesma execução direto da memória;
+- entre execuções usa o cache em disco (`cache_http.CacheHTTP`), que respeita
+  max-age e revalida com ETag/Last-Modified;
+- aceita `max_idade` por instância, então cada task pode dizer quão recente o
+  conteúdo precisa ser (ex.: tendências 5 min, páginas de curso 1 dia);
+- com `orcamento_tokens`, entrega ao agente só o conteúdo principal da página
+  (`comum.destilacao`), sem menus, rodapés e blocos repetidos;
+- com `verbose=True`, imprime latência, origem e tokens de cada chamada junto
+  com a saída verbose do crew.
+
+Uso:
+    Task(..., tools=[ScrapeWebsiteCacheTool(max_idade=24 * 3600)])
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
+from crewai_tools import ScrapeWebsiteTool
+
+from cache_http import CacheHTTP
+
+# comum/ fica na raiz do repositório (agents-crew/ roda como pasta de scripts)
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.insert(0, _RAIZ)
+
+from comum.destilacao import destilar_html, estimar_tokens  # noqa: E402
+
+# Compartilhados por todas as instâncias do processo (uma execução de crew)
+_caches: dict[str, CacheHTTP] = {}
+_memoria: dict[str, tuple[str, float]] = {}
+_lock = threading.Lock()
+_estatisticas = {
+    "chamadas": 0, "memoria": 0, "cache": 0, "revalidado": 0, "rede": 0, "segundos": 0.0,
+    "tokens_originais": 0, "tokens_enviados": 0,
+}
+
+
+def _get_cache(caminho_db: str) -> CacheHTTP:
+    with _lock:
+        if caminho_db not in _caches:
+            _caches[caminho_db] = CacheHTTP(caminho_db)
+        return _caches[caminho_db]
+
+
+def estatisticas_scrape() -> dict:
+    """Chamadas por origem (memoria, cache, revalidado, rede), tempo total e tokens brutos x enviados."""
+    with _lock:
+        return dict(_estatisticas)
+
+
+class ScrapeWebsiteCacheTool(ScrapeWebsiteTool):
+    """
+    `ScrapeWebsiteTool` com cache em memória e em disco.
+
+    Args:
+        website_url: URL fixa (opcional, como no `ScrapeWebsiteTool`)
+        max_idade: Segundos que um conteúdo já baixado continua valendo para esta
+            instância, sem revalidar (opcional; por padrão vale o Cache-Control do servidor)
+        caminho_cache: Arquivo SQLite do cache em disco (padrão: "cache_http.db")
+        orcamento_tokens: Destila a página até esse número de tokens (padrão: 1500;
+            None devolve o texto inteiro, como o `ScrapeWebsiteTool`)
+        verbose: Imprime latência e origem de cada chamada (padrão: True)
+    """
+
+    max_idade: Optional[float] = None
+    caminho_cache: str = "cache_http.db"
+    orcamento_tokens: Optional[int] = 1500
+    verbose: bool = True
+
+    def _run(self, **kwargs: Any) -> Any:
+        website_url: Optional[str] = kwargs.get("website_url", self.website_url)
+        if website_url is None:
+            raise ValueError("Website URL must be provided.")
+
+        inicio = time.perf_counter()
+        with _lock:
+            guardado = _memoria.get(website_url)
+        if guardado and (self.max_idade is None or time.time() - guardado[1] < self.max_idade):
+            html, origem = guardado[0], "memoria"
+        else:
+            resposta = _get_cache(self.caminho_cache).buscar(
+                website_url, max_idade=self.max_idade, timeout=15, cabecalhos=self.headers, cookies=self.cookies,
+            )
+            html, origem = resposta.texto, resposta.origem
+            if resposta.status == 200:
+                with _lock:
+                    _memoria[website_url] = (html, time.time())
+
+        texto_bruto = self._extrair_texto(html)
+        texto = texto_bruto
+        if self.orcamento_tokens and not html.lstrip().startswith(("<?xml", "<rss", "<feed")):
+            texto = "The following text is scraped website content:\n\n" + destilar_html(html, self.orcamento_tokens).texto
+        tokens_originais, tokens_enviados = estimar_tokens(texto_bruto), estimar_tokens(texto)
+
+        segundos = time.perf_counter() - inicio
+        with _lock:
+            _estatisticas["chamadas"] += 1
+            _estatisticas[origem] += 1
+            _estatisticas["segundos"] += segundos
+            _estatisticas["tokens_originais"] += tokens_originais
+            _estatisticas["tokens_enviados"] += tokens_enviados
+            resumo = dict(_estatisticas)
+
+        if self.verbose:
+            print(
+                f"🗄️  {self.name}: {website_url} -> {origem} em {segundos:.3f}s, "
+                f"{tokens_originais} -> {tokens_enviados} tokens "
+                f"(memória {resumo['memoria']}, disco {resumo['cache']}, "
+                f"revalidado {resumo['revalidado']}, rede {resumo['rede']})"
+            )
+        return texto
+
+    @staticmethod
+    def _extrair_texto(html: str) -> str:
+        # Mesmo formato de saída do ScrapeWebsiteTool
+        parsed = BeautifulSoup(html, "html.parser")
+        text = "The following text is scraped website content:\n\n"
+        text += parsed.get_text(" ")
+        text = re.sub("[ \t]+", " ", text)
+        return re.sub("\\s+\n\\s+", "\n", text)
@@ -0,0 +1,261 @@
+"""
+Coleta de tendências em várias fontes ao mesmo tempo.
+
+O `TrendsAnalysisCrew` só lia o Google Trends, e o `extrator-trends.py` abria um
+navegador visível guiado por um agente LLM só para listar cinco termos. Aqui cada
+fonte é uma requisição HTTP assíncrona (todas em paralelo, com timeout próprio),
+então coletar de cinco fontes leva o tempo da mais lenta, não a soma. Os termos
+são normalizados (sem acento, caixa, stopwords e plural do português) para juntar
+o mesmo assunto vindo de fontes diferentes, e o ranking final usa Reciprocal Rank
+Fusion (soma de 1 / (k + posição) em cada fonte).
+
+Fontes são configuráveis por dicionário (ou por um JSON com `--config`):
+    {"nome": "google_24h", "tipo": "google_trends", "parametros": {"hours": "24"}}
+    {"nome": "g1", "tipo": "rss", "url": "https://g1.globo.com/rss/g1/politica/"}
+    {"nome": "x", "tipo": "trends24", "url": "https://trends24.in/brazil/"}
+Qualquer fonte aceita "arquivo" para ler uma resposta gravada no lugar da rede.
+
+Uso:
+    uv run agents-crew/fontes_trends.py [--config fontes.json]
+"""
+
+import asyncio
+import json
+import re
+import sys
+import time
+import unicodedata
+import xml.etree.ElementTree as ET
+from typing import Optional
+
+import httpx
+
+from coletor_trends import PARAMETROS_PADRAO, USER_AGENT, montar_url_feed, parse_feed
+from historico_trends import parse_volume
+from modelos_trends import TrendKeyword, TrendsReport
+
+FONTES_PADRAO = [
+    {"nome": "google_24h", "tipo": "google_trends", "parametros": {"hours": "24"}},
+    {"nome": "google_4h", "tipo": "google_trends", "parametros": {"hours": "4"}},
+    {"nome": "google_7d", "tipo": "google_trends", "parametros": {"hours": "168"}},
+    {"nome": "google_noticias", "tipo": "google_trends", "parametros": {"category": "", "hours": "24"}},
+    {"nome": "x_trends24", "tipo": "trends24", "url": "https://trends24.in/brazil/"},
+]
+
+# Palavras que não distinguem um assunto de outro ("pec da segurança" == "pec segurança")
+STOPWORDS = {
+    "a", "o", "as", "os", "e", "de", "da", "do", "das", "dos", "em", "no", "na", "nos", "nas",
+    "um", "uma", "para", "por", "com", "ao", "aos", "the", "of",
+}
+
+# Plural -> singular, do sufixo mais longo para o mais curto (redução leve, estilo RSLP)
+_SUFIXOS_PLURAL = [
+    ("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("ois", "ol"),
+    ("res", "r"), ("zes", "z"), ("ns", "m"),
+]
+
+
+def _singular(palavra: str) -> str:
+    if len(palavra) <= 3 or palavra.endswith(("ss", "us")):
+        return palavra
+    for sufixo, troca in _SUFIXOS_PLURAL:
+        # Radical de uma letra fica como está ("mais", "pais", "leis")
+        if palavra.endswith(sufixo) and len(palavra) - len(sufixo) >= 2:
+            return palavra[: -len(sufixo)] + troca
+    # "-is" sem regra própria não é plural com "-s" ("lapis", "tenis")
+    if palavra.endswith("s") and not palavra.endswith("is"):
+        return palavra[:-1]
+    return palavra
+
+
+def normalizar_termo(termo: str) -> str:
+    """
+    Chave de comparação de um termo entre fontes.
+
+    Remove acentos e caixa, pontuação e stopwords, reduz plurais e ordena as
+    palavras. Ex.: "PEC da Segurança Pública" e "segurança pública PEC" viram
+    "pec publica seguranca"; "Eleições 2026" e "eleição 2026" viram "2026 eleicao".
+    """
+    sem_acento = unicodedata.normalize("NFKD", termo).encode("ascii", "ignore").decode()
+    palavras = re.findall(r"[a-z0-9]+", sem_acento.casefold())
+    chave = sorted({_singular(p) for p in palavras if p not in STOPWORDS})
+    return " ".join(chave) or " ".join(palavras)
+
+
+# ==============================
+# Fontes
+# ==============================
+
+async def _baixar(cliente: httpx.AsyncClient, fonte: dict, url: str) -> str:
+    if fonte.get("arquivo"):
+        with open(fonte["arquivo"], "r", encoding="utf-8") as f:
+            return f.read()
+    resposta = await cliente.get(url)
+    resposta.raise_for_status()
+    return resposta.text
+
+
+async def _fonte_google_trends(cliente: httpx.AsyncClient, fonte: dict) -> list[TrendKeyword]:
+    url = montar_url_feed({**PARAMETROS_PADRAO, **fonte.get("parametros", {})})
+    return parse_feed(await _baixar(cliente, fonte, url))
+
+
+async def _fonte_rss(cliente: httpx.AsyncClient, fonte: dict) -> list[TrendKeyword]:
+    """RSS genérico: cada manchete vira um termo (útil para cruzar com as outras fontes)."""
+    raiz = ET.fromstring(await _baixar(cliente, fonte, fonte["url"]))
+    keywords = []
+    for item in raiz.iter("item"):
+        titulo = (item.findtext("title") or "").strip()
+        if titulo:
+            keywords.append(TrendKeyword(termo=titulo, noticias=[titulo]))
+    return keywords
+
+
+async def _fonte_trends24(cliente: httpx.AsyncClient, fonte: dict) -> list[TrendKeyword]:
+    """Assuntos do momento no X, pela lista mais recente do trends24.in."""
+    from bs4 import BeautifulSoup
+
+    sopa = BeautifulSoup(await _baixar(cliente, fonte, fonte["url"]), "html.parser")
+    lista = sopa.select_one(".trend-card__list") or sopa
+    keywords = []
+    for item in lista.select("li"):
+        link = item.select_one("a")
+        if not link or not link.get_text(strip=True):
+            continue
+        contagem = item.select_one(".tweet-count")
+        volume = contagem.get_text(strip=True) if contagem else None
+        keywords.append(TrendKeyword(termo=link.get_text(strip=True).lstrip("#"), volume=volume or None))
+    return keywords
+
+
+TIPOS_FONTE = {
+    "google_trends": _fonte_google_trends,
+    "rss": _fonte_rss,
+    "trends24": _fonte_trends24,
+}
+
+
+async def _coletar_fonte(cliente: httpx.AsyncClient, fonte: dict, timeout: float) -> dict:
+    inicio = time.perf_counter()
+    try:
+        keywords = await asyncio.wait_for(TIPOS_FONTE[fonte["tipo"]](cliente, fonte), timeout)
+        erro = None
+    except Exception as e:
+        keywords, erro = [], f"{type(e).__name__}: {e}"
+    return {
+        "nome": fonte["nome"],
+        "keywords": keywords,
+        "erro": erro,
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
+
+
+async def coletar_fontes(fontes: Optional[list[dict]] = None, timeout: float = 10.0) -> list[dict]:
+    """
+    Coleta todas as fontes em paralelo.
+
+    Uma fonte que falha ou estoura o timeout não derruba as outras.
+
+    Args:
+        fontes: Configuração das fontes (padrão: `FONTES_PADRAO`)
+        timeout: Segundos máximos por fonte
+
+    Returns:
+        Um dict por fonte com nome, keywords (na ordem da fonte), erro e segundos
+    """
+    fontes = fontes or FONTES_PADRAO
+    for fonte in fontes:
+        if fonte.get("tipo") not in TIPOS_FONTE:
+            raise ValueError(f"Tipo de fonte '{fonte.get('tipo')}' não suportado. Use: {', '.join(TIPOS_FONTE)}")
+
+    async with httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT}, timeout=timeout, follow_redirects=True
+    ) as cliente:
+        return await asyncio.gather(*(_coletar_fonte(cliente, fonte, timeout) for fonte in fontes))
+
+
+# ==============================
+# Fusão
+# ==============================
+
+def mesclar(resultados: list[dict], k: int = 60, limite: Optional[int] = None) -> list[TrendKeyword]:
+    """
+    Junta os termos equivalentes das várias fontes e ordena por Reciprocal Rank Fusion.
+
+    Args:
+        resultados: Saída de `coletar_fontes`
+        k: Constante do RRF; maior = posições pesam menos (padrão: 60)
+        limite: Máximo de termos no resultado (opcional)
+
+    Returns:
+        Tendências mescladas, com `fontes` preenchido, da mais forte para a mais fraca
+    """
+    grupos: dict[str, dict] = {}
+    for resultado in resultados:
+        for posicao, keyword in enumerate(resultado["keywords"], 1):
+            chave = normalizar_termo(keyword.termo)
+            grupo = grupos.setdefault(chave, {"pontuacao": 0.0, "primeira": keyword, "volume": None,
+                                              "noticias": [], "fontes": []})
+            if resultado["nome"] not in grupo["fontes"]:
+                # Conta a melhor posição de cada fonte uma vez só
+                grupo["pontuacao"] += 1.0 / (k + posicao)
+                grupo["fontes"].append(resultado["nome"])
+            # Volumes de fontes diferentes não são comparáveis (buscas x posts): vale o da primeira fonte
+            if grupo["volume"] is None and parse_volume(keyword.volume) is not None:
+                grupo["volume"] = keyword.volume
+            for noticia in keyword.noticias:
+                if noticia not in grupo["noticias"]:
+                    grupo["noticias"].append(noticia)
+
+    ordenados = sorted(grupos.values(), key=lambda g: g["pontuacao"], reverse=True)
+    if limite:
+        ordenados = ordenados[:limite]
+
+    return [
+        grupo["primeira"].model_copy(update={
+            "volume": grupo["volume"],
+            "noticias": grupo["noticias"],
+            "fontes": grupo["fontes"],
+        })
+        for grupo in ordenados
+    ]
+
+
+def coletar_relatorio(fontes: Optional[list[dict]] = None, timeout: float = 10.0, limite: Optional[int] = None) -> tuple[TrendsReport, list[dict]]:
+    """
+    Coleta as fontes em paralelo e devolve o relatório mesclado.
+
+    Args:
+        fontes: Configuração das fontes (padrão: `FONTES_PADRAO`)
+        timeout: Segundos máximos por fonte
+        limite: Máximo de termos no relatório (opcional)
+
+    Returns:
+        (TrendsReport ranqueado, status por fonte: nome, termos, erro, segundos)
+    """
+    resultados = asyncio.run(coletar_fontes(fontes, timeout))
+    status = [
+        {"nome": r["nome"], "termos": len(r["keywords"]), "erro": r["erro"], "segundos": r["segundos"]}
+        for r in resultados
+    ]
+    return TrendsReport(keywords=mesclar(resultados, limite=limite)), status
+
+
+if __name__ == "__main__":
+    fontes = None
+    if "--config" in sys.argv:
+        with open(sys.argv[sys.argv.index("--config") + 1], "r", encoding="utf-8") as f:
+            fontes = json.load(f)
+
+    inicio = time.perf_counter()
+    relatorio, status = coletar_relatorio(fontes)
+    segundos = time.perf_counter() - inicio
+
+    for fonte in status:
+        situacao = f"❌ {fonte['erro']}" if fonte["erro"] else f"✓ {fonte['termos']} termos"
+        print(f"  {fonte['nome']:>16}: {situacao} ({fonte['segundos']:.2f}s)")
+
+    print()
+    for trend in relatorio.keywords:
+        print(f"- {trend.termo} ({trend.volume or 's/ volume'}) [{', '.join(trend.fontes)}]")
+    print(f"\n{relatorio.total_trends} tendências de {len(status)} fontes em {segundos:.2f}s")
@@ -1,236 +1,49 @@
 """
 Agente CrewAI para análise de tendências políticas no Google Trends
 Busca e analisa os top trends de política das últimas 24 horas no Brasil
+
+A coleta é feita direto do feed RSS (`coletor_trends`); o LLM só é usado para
+enriquecer os termos com resumo e relevância.
 """
 
-import os
 import json
 from typing import Literal, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
-from crewai import Agent, Task, Crew, LLM, Process
-from crewai_tools import ScrapeWebsiteTool
+from crewai import LLM
 from dotenv import load_dotenv
 
+from coletor_trends import coletar_trends
+from enriquecimento_trends import CacheEnriquecimento, enriquecer_keywords
+from fontes_trends import coletar_relatorio
+from historico_trends import HistoricoTrends
+from instrumentacao import get_rastreador
+from llm_provider import obter_llm
+from modelos_trends import TrendKeyword, TrendsReport
+
 # Carregar variáveis de ambiente
 load_dotenv()
 
 
-# ==============================
-# Modelos de Dados
-# ==============================
-
-class TrendKeyword(BaseModel):
-    """Modelo para uma palavra-chave de tendência"""
-    termo: str = Field(description="Palavra-chave ou frase em alta")
-    volume: Optional[str] = Field(default=None, description="Volume de buscas estimado")
-    resumo: str = Field(description="Breve contexto sobre a tendência")
-    relevancia: str = Field(description="Nível de relevância: Alta, Média ou Baixa")
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
-
-
-class TrendsReport(BaseModel):
-    """Modelo para o relatório completo de tendências"""
-    data_coleta: str = Field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    categoria: str = Field(default="Política")
-    pais: str = Field(default="Brasil")
-    periodo: str = Field(default="24 horas")
-    keywords: list[TrendKeyword] = Field(default_factory=list)
-    total_trends: int = Field(default=0)
-
-
 # ==============================
 # Configuração de LLM
 # ==============================
 
-def get_llm(provider: Literal["gemini", "openai", "llama", "gemma"] = "gemini") -> LLM:
+def get_llm(provider: Literal["gemini", "openai", "llama", "gemma", "qwen"] = "gemini") -> LLM:
     """
-    Configura o LLM baseado no provider escolhido.
+    Retorna o LLM do provider escolhido, compartilhado via `llm_provider`.
     
     Args:
-        provider: Provedor do modelo (gemini, openai, llama, gemma)
+        provider: Provedor do modelo (gemini, openai, llama, gemma, qwen)
     
     Returns:
-        Instância configurada do LLM
+        Instância memoizada do LLM
     
     Raises:
         EnvironmentError: Se a API key não estiver configurada
         ValueError: Se o provider não for suportado
     """
-    
-    llm_configs = {
-        "gemini": {
-            "model": "gemini/gemini-2.0-flash",
-            "api_key": os.getenv("GEMINI_API_KEY"),
-            "temperature": 0.3,  # Menor temperatura para respostas mais consistentes
-        },
-        "openai": {
-            "model": "gpt-4o-mini",
-            "api_key": os.getenv("OPENAI_API_KEY"),
-            "temperature": 0.3,
-        },
-        "gemma": {
-            "model": "ollama/gemma3:270m",
-            "base_url": "http://localhost:11434",
-            "temperature": 0.3,
-        },
-        "qwen": {
-            "model": "ollama/qwen3:1.7b",
-            "base_url": "http://localhost:11434",
-            "temperature": 0.3,
-        }
-    }
-    
-    if provider not in llm_configs:
-        raise ValueError(
-            f"Provider '{provider}' não suportado. "
-            f"Use: {', '.join(llm_configs.keys())}"
-        )
-    
-    config = llm_configs[provider]
-    
-    # Verificar API key para providers cloud
-    if provider in ["gemini", "openai"]:
-        if not config["api_key"]:
-            raise EnvironmentError(
-                f"{provider.upper()}_API_KEY não configurada no arquivo .env"
-            )
-    
-    return LLM(**config)
-
-
-# ==============================
-# Ferramentas
-# ==============================
-
-def criar_ferramentas():
-    """Cria e configura as ferramentas necessárias"""
-    return [
-        ScrapeWebsiteTool(
-            #website_url="https://trends.google.com.br/trending"
-            website_url="https://trends.google.com.br/trending?geo=BR&hl=pt-BR&hours=24&category=14"
-            #url = f"https://trends.google.com.br/trending?geo={geo}&hl={hl}&hours={hours}&category={category}"
-        )
-    ]
-
-
-# ==============================
-# Agentes
-# ==============================
-
-def criar_agente_coletor(llm: LLM) -> Agent:
-    """Cria o agente responsável por coletar dados do Google Trends"""
-    return Agent(
-        name="ColetorTrends",
-        role="Especialista em Coleta de Dados de Tendências",
-        goal=(
-            "Extrair com precisão todas as palavras-chave e tendências políticas "
-            "em alta no Google Trends Brasil nas últimas 24 horas"
-        ),
-        backstory=(
-            "Você é um especialista em web scraping e análise de dados públicos. "
-            "Sua missão é coletar informações estruturadas do Google Trends, "
-            "garantindo que todos os dados relevantes sejam capturados com precisão."
-        ),
-        tools=criar_ferramentas(),
-        verbose=True,
-        allow_delegation=False,
-        max_iter=3,
-        llm=llm
-    )
-
-
-def criar_agente_analista(llm: LLM) -> Agent:
-    """Cria o agente responsável por analisar e filtrar tendências"""
-    return Agent(
-        name="AnalistaTrends",
-        role="Analista de Tendências Políticas",
-        goal=(
-            "Analisar, filtrar e classificar as tendências políticas mais relevantes, "
-            "fornecendo contexto e avaliando o impacto de cada tendência"
-        ),
-        backstory=(
-            "Você é um analista político experiente com profundo conhecimento do "
-            "cenário político brasileiro. Sua expertise permite identificar quais "
-            "tendências são verdadeiramente relevantes e fornecer contexto valioso."
-        ),
-        verbose=True,
-        allow_delegation=False,
-        max_iter=3,
-        llm=llm
-    )
-
-
-# ==============================
-# Tasks
-# ==============================
-
-def criar_task_coleta(agente: Agent, parametros: dict) -> Task:
-    """Cria a task de coleta de dados"""
-    url = (
-        f"https://trends.google.com.br/trending?"
-        f"geo={parametros['geo']}&"
-        f"hl={parametros['hl']}&"
-        f"hours={parametros['hours']}&"
-        f"category={parametros['category']}"
-    )
-    
-    return Task(
-        description=(
-            f"1. Acesse a URL: {url}\n"
-            f"2. Extraia TODAS as tendências políticas listadas\n"
-            f"3. Para cada tendência, capture:\n"
-            f"   - Termo/palavra-chave exata\n"
-            f"   - Volume de buscas (se disponível)\n"
-            f"   - Descrição ou contexto apresentado\n"
-            f"4. Organize os dados de forma estruturada\n"
-            f"5. Certifique-se de capturar no mínimo 2 tendências\n"
-        ),
-        agent=agente,
-        expected_output=(
-            "Uma lista detalhada em formato JSON contendo todas as tendências "
-            "encontradas, com os campos: termo, volume, contexto"
-        )
-    )
-
-
-def criar_task_analise(agente: Agent) -> Task:
-    """Cria a task de análise e filtragem"""
-    return Task(
-        description=(
-            "Analise as tendências coletadas e execute:\n\n"
-            "1. FILTRAGEM:\n"
-            "   - Remova duplicatas\n"
-            "   - Elimine termos irrelevantes ou muito genéricos\n"
-            "   - Foque em tendências com impacto político real\n\n"
-            "2. ENRIQUECIMENTO:\n"
-            "   - Adicione um resumo claro (máx. 50 palavras) para cada tendência\n"
-            "   - Classifique a relevância (Alta/Média/Baixa) baseado em:\n"
-            "     * Impacto político potencial\n"
-            "     * Volume de buscas\n"
-            "     * Atualidade do tema\n\n"
-            "3. PRIORIZAÇÃO:\n"
-            "   - Ordene por relevância (Alta → Baixa)\n"
-            "   - Mantenha as 15 tendências mais importantes\n\n"
-            "4. VALIDAÇÃO:\n"
-            "   - Verifique se todas as informações estão completas\n"
-            "   - Garanta que os resumos sejam informativos e objetivos\n"
-        ),
-        agent=agente,
-        expected_output=(
-            "Lista final em formato JSON com as 15 principais tendências políticas, "
-            "ordenadas por relevância, contendo: termo, volume, resumo (conciso e informativo), "
-            "relevancia (Alta/Média/Baixa). Formato:\n"
-            '[\n'
-            '  {\n'
-            '    "termo": "exemplo",\n'
-            '    "volume": "50k+",\n'
-            '    "resumo": "Breve explicação do contexto",\n'
-            '    "relevancia": "Alta"\n'
-            '  }\n'
-            ']'
-        )
-    )
+    # Menor temperatura para respostas mais consistentes
+    return obter_llm(provider, temperature=0.3)
 
 
 # ==============================
@@ -240,46 +53,51 @@ def criar_task_analise(agente: Agent) -> Task:
 class TrendsAnalysisCrew:
     """Classe principal para orquestrar a análise de tendências"""
     
-    def __init__(self, provider: str = "gemini"):
+    def __init__(self, provider: Optional[str] = "gemini", arquivo_historico: str = "trends_historico.db"):
         """
         Inicializa o crew de análise de tendências
         
         Args:
-            provider: Provedor do LLM a ser usado
+            provider: Provedor do LLM a ser usado (None para só coletar, sem LLM)
+            arquivo_historico: Banco SQLite com a série temporal das coletas
         """
-        self.llm = get_llm(provider)
-        self.agente_coletor = criar_agente_coletor(self.llm)
-        self.agente_analista = criar_agente_analista(self.llm)
+        self.historico = HistoricoTrends(arquivo_historico)
+        self.cache_enriquecimento = CacheEnriquecimento(arquivo_historico)
+        # Spans das etapas em crew_traces.jsonl (ver `instrumentacao`)
+        self.rastreador = get_rastreador()
+        self.llm = get_llm(provider) if provider else None
     
-    def criar_crew(self, parametros: dict) -> Crew:
+    def enriquecer(self, trends: list[TrendKeyword]) -> list[TrendKeyword]:
         """
-        Cria e configura o crew com as tasks necessárias
+        Preenche resumo e relevância com chamadas estruturadas em lote.
+        
+        Uma chamada ao LLM por lote de termos (ver `enriquecimento_trends`), em vez
+        do loop de raciocínio do agente analista; termos já analisados hoje vêm do cache.
         
         Args:
-            parametros: Dicionário com parâmetros de busca
+            trends: Tendências coletadas
         
         Returns:
-            Crew configurado e pronto para execução
+            Tendências enriquecidas (sem resumo as que o LLM não devolveu)
         """
-        task_coleta = criar_task_coleta(self.agente_coletor, parametros)
-        task_analise = criar_task_analise(self.agente_analista)
-        
-        return Crew(
-            #agents=[self.agente_coletor, self.agente_analista],
-            agents=[self.agente_coletor],
-            #tasks=[task_coleta, task_analise],
-            tasks=[task_coleta],
-            process=Process.sequential,
-            verbose=True,
-            memory=False,  # Desabilita memória para evitar confusão entre execuções
-        )
-    
-    def executar(self, parametros: dict) -> dict:
+        return enriquecer_keywords(trends, self.llm, cache=self.cache_enriquecimento)
+    
+    def executar(
+        self,
+        parametros: dict,
+        enriquecer: bool = True,
+        fonte: Optional[str] = None,
+        fontes: Optional[list[dict]] = None,
+    ) -> dict:
         """
         Executa a análise de tendências
         
         Args:
             parametros: Parâmetros de busca (geo, hl, hours, category)
+            enriquecer: Se True e houver LLM, preenche resumo/relevância em lote
+            fonte: XML gravado do feed para usar no lugar da rede (opcional)
+            fontes: Se informado, coleta dessas fontes em paralelo e mescla os termos
+                (ver `fontes_trends`) no lugar do feed único
         
         Returns:
             Dicionário com os resultados da análise
@@ -288,14 +106,37 @@ class TrendsAnalysisCrew:
         print("🔍 INICIANDO ANÁLISE DE TENDÊNCIAS POLÍTICAS")
         print("="*60 + "\n")
         
-        crew = self.criar_crew(parametros)
-        resultado = crew.kickoff(inputs=parametros)
+        with self.rastreador.span("etapa", "coleta", fontes=len(fontes) if fontes else 1):
+            if fontes:
+                relatorio_fontes, status = coletar_relatorio(fontes)
+                trends = relatorio_fontes.keywords
+                for item in status:
+                    print(f"  {item['nome']}: {item['erro'] or str(item['termos']) + ' termos'} ({item['segundos']:.2f}s)")
+                print(f"✓ {len(trends)} tendências mescladas de {len(status)} fontes")
+            else:
+                trends = coletar_trends(parametros, fonte=fonte)
+                print(f"✓ {len(trends)} tendências coletadas do feed")
+        
+        if enriquecer and self.llm is not None and trends:
+            # Só termos novos ou com volume alterado vão para o LLM
+            prontas, pendentes = self.historico.separar_para_analise(trends)
+            print(f"↻ {len(prontas)} reaproveitadas do histórico, {len(pendentes)} para análise")
+            analisadas = {t.termo: t for t in prontas}
+            if pendentes:
+                with self.rastreador.span("etapa", "enriquecimento", termos=len(pendentes)):
+                    analisadas.update((t.termo, t) for t in self.enriquecer(pendentes))
+            trends = [analisadas.get(t.termo, t) for t in trends]
+        
+        coletado_em = self.historico.registrar(trends)
+        relatorio = TrendsReport(keywords=trends)
         
         return {
             "status": "sucesso",
             "timestamp": datetime.now().isoformat(),
             "parametros": parametros,
-            "resultado": resultado
+            "resultado": relatorio.model_dump(),
+            "emergentes": self.historico.emergentes(coletado_em),
+            "deltas": self.historico.deltas(coletado_em)
         }
     
     def salvar_resultado(self, resultado: dict, arquivo: str = "trends_report.json"):
@@ -342,7 +183,7 @@ def main():
         print("\n" + "="*60)
         print("📊 RESULTADO DA ANÁLISE")
         print("="*60 + "\n")
-        print(resultado["resultado"])
+        print(json.dumps(resultado["resultado"], ensure_ascii=False, indent=2))
         
         # Salvar em arquivo
         trends_crew.salvar_resultado(resultado)
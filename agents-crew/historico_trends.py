@@ -0,0 +1,250 @@
+"""
+Histórico de tendências em série temporal (SQLite).
+
+`salvar_resultado` sobrescreve o `trends_report.json` a cada execução, então não
+dá para ver como o volume de um termo evolui ao longo do dia e todo termo é
+reanalisado pelo LLM. Aqui cada coleta vira um snapshot (termo, coletado_em),
+com upsert, deltas entre snapshots e a lista de termos emergentes. Termos cujo
+volume não mudou reaproveitam a análise anterior, então as chamadas ao LLM
+escalam com a rotatividade dos termos, não com o tamanho da lista.
+
+Uso:
+    uv run agents-crew/historico_trends.py [trends_historico.db]
+"""
+
+import re
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Optional
+
+from modelos_trends import TrendKeyword
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    chave TEXT NOT NULL,
+    termo TEXT NOT NULL,
+    coletado_em TEXT NOT NULL,
+    volume TEXT,
+    volume_num INTEGER,
+    resumo TEXT,
+    relevancia TEXT,
+    PRIMARY KEY (chave, coletado_em)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_coletado_em ON snapshots(coletado_em);
+"""
+
+_MULTIPLICADORES = {"k": 1_000, "mil": 1_000, "m": 1_000_000, "mi": 1_000_000, "b": 1_000_000_000, "bi": 1_000_000_000}
+_RE_VOLUME = re.compile(r"(\d+(?:[.,]\d+)*)\s*(k|mil|mi|m|bi|b)?", re.IGNORECASE)
+
+
+def chave_termo(termo: str) -> str:
+    """Chave usada para identificar o mesmo termo entre coletas."""
+    return " ".join(termo.casefold().split())
+
+
+def parse_volume(volume: Optional[str]) -> Optional[int]:
+    """
+    Converte o volume aproximado do Trends em número.
+
+    Ex.: "20.000+" -> 20000, "2 mil+" -> 2000, "50K+" -> 50000, "1,5 mi+" -> 1500000
+    """
+    if not volume:
+        return None
+    encontrado = _RE_VOLUME.search(volume)
+    if not encontrado:
+        return None
+
+    numero, sufixo = encontrado.groups()
+    if sufixo:
+        # Com sufixo, "," ou "." é separador decimal: "1,5 mi"
+        valor = float(numero.replace(".", "").replace(",", ".") if "," in numero else numero)
+        return int(valor * _MULTIPLICADORES[sufixo.lower()])
+    # Sem sufixo, "." e "," são separadores de milhar: "20.000"
+    return int(re.sub(r"[.,]", "", numero))
+
+
+class HistoricoTrends:
+    """
+    Série temporal das tendências por termo e horário de coleta.
+
+    Args:
+        caminho_db: Arquivo SQLite (padrão: "trends_historico.db")
+        limiar_variacao: Variação relativa de volume a partir da qual o termo
+            é considerado "subindo"/"caindo" e volta a ser analisado (padrão: 0.2)
+    """
+
+    def __init__(self, caminho_db: str = "trends_historico.db", limiar_variacao: float = 0.2):
+        self.caminho_db = caminho_db
+        self.limiar_variacao = limiar_variacao
+        self._conexao = sqlite3.connect(caminho_db)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.executescript(ESQUEMA)
+
+    def registrar(self, keywords: list[TrendKeyword], coletado_em: Optional[str] = None) -> str:
+        """
+        Grava (ou atualiza) o snapshot de uma coleta.
+
+        Args:
+            keywords: Tendências da coleta
+            coletado_em: ISO 8601 da coleta (padrão: agora, em segundos)
+
+        Returns:
+            O `coletado_em` usado
+        """
+        coletado_em = coletado_em or datetime.now().isoformat(timespec="seconds")
+        with self._conexao:
+            self._conexao.executemany(
+                "INSERT INTO snapshots (chave, termo, coletado_em, volume, volume_num, resumo, relevancia) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (chave, coletado_em) DO UPDATE SET "
+                "termo = excluded.termo, volume = excluded.volume, volume_num = excluded.volume_num, "
+                "resumo = excluded.resumo, relevancia = excluded.relevancia",
+                [
+                    (
+                        chave_termo(k.termo), k.termo, coletado_em, k.volume, parse_volume(k.volume),
+                        k.resumo or None, k.relevancia if k.resumo else None,
+                    )
+                    for k in keywords
+                ],
+            )
+        return coletado_em
+
+    def coletas(self, limite: Optional[int] = None) -> list[str]:
+        """Horários das coletas registradas, do mais recente para o mais antigo."""
+        sql = "SELECT DISTINCT coletado_em FROM snapshots ORDER BY coletado_em DESC"
+        if limite:
+            sql += f" LIMIT {int(limite)}"
+        return [linha[0] for linha in self._conexao.execute(sql)]
+
+    def _snapshot(self, coletado_em: str) -> dict[str, tuple]:
+        return {
+            chave: (termo, volume_num)
+            for chave, termo, volume_num in self._conexao.execute(
+                "SELECT chave, termo, volume_num FROM snapshots WHERE coletado_em = ?", (coletado_em,)
+            )
+        }
+
+    def _tendencia(self, anterior: Optional[int], atual: Optional[int]) -> str:
+        if anterior is None or atual is None:
+            return "estavel" if anterior == atual else ("subindo" if anterior is None else "caindo")
+        if anterior == 0:
+            return "subindo" if atual > 0 else "estavel"
+        variacao = (atual - anterior) / anterior
+        if variacao >= self.limiar_variacao:
+            return "subindo"
+        if variacao <= -self.limiar_variacao:
+            return "caindo"
+        return "estavel"
+
+    def deltas(self, atual: Optional[str] = None, anterior: Optional[str] = None) -> list[dict]:
+        """
+        Compara dois snapshots (por padrão, os dois mais recentes).
+
+        Returns:
+            Um dict por termo com volume anterior/atual, delta e tendência
+            ("novo", "subindo", "estavel", "caindo" ou "saiu"), ordenado por delta
+        """
+        coletas = self.coletas()
+        if atual is None:
+            if not coletas:
+                return []
+            atual = coletas[0]
+        if anterior is None:
+            anteriores = [c for c in coletas if c < atual]
+            anterior = anteriores[0] if anteriores else None
+
+        snapshot_atual = self._snapshot(atual)
+        snapshot_anterior = self._snapshot(anterior) if anterior else {}
+
+        resultado = []
+        for chave in snapshot_atual.keys() | snapshot_anterior.keys():
+            termo, volume_atual = snapshot_atual.get(chave, (None, None))
+            termo_anterior, volume_anterior = snapshot_anterior.get(chave, (None, None))
+
+            if chave not in snapshot_anterior:
+                tendencia = "novo"
+            elif chave not in snapshot_atual:
+                tendencia = "saiu"
+            else:
+                tendencia = self._tendencia(volume_anterior, volume_atual)
+
+            resultado.append({
+                "termo": termo or termo_anterior,
+                "volume_anterior": volume_anterior,
+                "volume_atual": volume_atual,
+                "delta": (volume_atual or 0) - (volume_anterior or 0),
+                "tendencia": tendencia,
+            })
+
+        return sorted(resultado, key=lambda d: d["delta"], reverse=True)
+
+    def emergentes(self, coletado_em: Optional[str] = None) -> list[str]:
+        """
+        Termos do snapshot que nunca apareceram em coletas anteriores.
+
+        Args:
+            coletado_em: Snapshot a examinar (padrão: o mais recente)
+        """
+        if coletado_em is None:
+            coletas = self.coletas(limite=1)
+            if not coletas:
+                return []
+            coletado_em = coletas[0]
+
+        return [
+            termo
+            for (termo,) in self._conexao.execute(
+                "SELECT termo FROM snapshots s WHERE coletado_em = ? AND NOT EXISTS ("
+                "  SELECT 1 FROM snapshots a WHERE a.chave = s.chave AND a.coletado_em < s.coletado_em"
+                ") ORDER BY volume_num DESC",
+                (coletado_em,),
+            )
+        ]
+
+    def separar_para_analise(self, keywords: list[TrendKeyword]) -> tuple[list[TrendKeyword], list[TrendKeyword]]:
+        """
+        Separa o que precisa ir para o LLM do que pode reaproveitar a última análise.
+
+        Um termo reaproveita a análise se já foi analisado antes e o volume não
+        variou além de `limiar_variacao` desde então.
+
+        Returns:
+            (prontas com resumo/relevância copiados, pendentes de análise)
+        """
+        prontas, pendentes = [], []
+        for keyword in keywords:
+            ultima = self._conexao.execute(
+                "SELECT volume_num, resumo, relevancia FROM snapshots "
+                "WHERE chave = ? AND resumo IS NOT NULL ORDER BY coletado_em DESC LIMIT 1",
+                (chave_termo(keyword.termo),),
+            ).fetchone()
+
+            if ultima and self._tendencia(ultima[0], parse_volume(keyword.volume)) == "estavel":
+                prontas.append(keyword.model_copy(update={"resumo": ultima[1], "relevancia": ultima[2]}))
+            else:
+                pendentes.append(keyword)
+
+        return prontas, pendentes
+
+    def serie(self, termo: str) -> list[tuple[str, Optional[int]]]:
+        """Série (coletado_em, volume) de um termo, em ordem cronológica."""
+        return self._conexao.execute(
+            "SELECT coletado_em, volume_num FROM snapshots WHERE chave = ? ORDER BY coletado_em",
+            (chave_termo(termo),),
+        ).fetchall()
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+
+if __name__ == "__main__":
+    historico = HistoricoTrends(sys.argv[1] if len(sys.argv) > 1 else "trends_historico.db")
+
+    print("📈 Variação desde a coleta anterior:")
+    for delta in historico.deltas():
+        print(f"  {delta['tendencia']:>8}  {delta['termo']}  {delta['volume_anterior']} -> {delta['volume_atual']}")
+
+    print("\n🆕 Termos emergentes:")
+    for termo in historico.emergentes():
+        print(f"  - {termo}")
@@ -0,0 +1,272 @@
+"""
+Rastreamento de custo e latência dos crews (LLM, ferramentas e tasks).
+
+Cada chamada ao LLM, cada uso de ferramenta e cada task vira um span de
+`comum.rastreamento` (o mesmo contexto pai/filho e o mesmo formato dos spans de
+captura e classificação), com `tipo`, tokens de entrada/saída e `execucao` como
+atributos. Os spans vão para `crew_traces.jsonl` e para qualquer outro destino
+ligado (`--rastrear`: histograma, `rastros.jsonl`, Prometheus). A task acumula
+os tokens e o número de chamadas ao LLM dos seus filhos: `iteracoes` acima de 1
+são as voltas do agente dentro do `max_iter` (raciocínio refeito, ferramenta
+com erro, saída fora do formato).
+
+A instrumentação só envolve métodos das instâncias (`llm.call`, `ferramenta._run`,
+`task.execute_sync`), então funciona com qualquer crew sem mudar as classes do CrewAI:
+
+    crew = instrumentar_crew(Crew(agents=[...], tasks=[...]))
+    with get_rastreador().span("etapa", "coleta"):
+        ...
+
+Resumo de um arquivo de traces (passos mais lentos e p50/p95 por tipo):
+    uv run agents-crew/instrumentacao.py [crew_traces.jsonl] [--execucao ID] [--top 10]
+"""
+
+import json
+import os
+import sys
+import uuid
+from collections import defaultdict
+from typing import Any, Optional
+
+# comum/ fica na raiz do repositório (agents-crew/ roda como pasta de scripts)
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _RAIZ not in sys.path:
+    sys.path.insert(0, _RAIZ)
+
+from comum import rastreamento  # noqa: E402
+from comum.estatisticas import percentil  # noqa: E402
+
+ARQUIVO_PADRAO = os.getenv("CREW_TRACES", "crew_traces.jsonl")
+
+
+def _somar_llm(span: Any, tokens_entrada: int, tokens_saida: int) -> None:
+    """Propaga os tokens de uma chamada ao LLM para o span e os ancestrais de crew."""
+    while span is not None:
+        atributos = span.atributos
+        if "chamadas_llm" in atributos:
+            atributos["tokens_entrada"] += tokens_entrada
+            atributos["tokens_saida"] += tokens_saida
+            atributos["chamadas_llm"] += 1
+        span = span.superior
+
+
+class Rastreador:
+    """
+    Abre spans de crews em `comum.rastreamento`, gravados em um arquivo JSONL.
+
+    Args:
+        arquivo: Arquivo de saída (padrão: env CREW_TRACES ou "crew_traces.jsonl")
+    """
+
+    def __init__(self, arquivo: str = ARQUIVO_PADRAO):
+        self.arquivo = arquivo
+        self.execucao = uuid.uuid4().hex[:12]
+        self._instrumentados: set[int] = set()
+
+    def span(self, tipo: str, nome: str, **atributos: Any):
+        """
+        Abre um span filho do span atual, gravado ao sair (com o erro, se houver).
+
+        Args:
+            tipo: Categoria do passo ("llm", "tool", "task", "etapa", ...)
+            nome: Nome do passo (modelo, ferramenta, task)
+            **atributos: Campos extras gravados junto com o span
+
+        Returns:
+            Context manager que entrega o span (`span.atributos` pode ser
+            alterado dentro do bloco)
+        """
+        # Liga o JSONL dos crews (de novo, se `rastreamento.desativar` o fechou)
+        rastreamento.destino_jsonl(self.arquivo)
+        return rastreamento.span(nome, tipo=tipo, execucao=self.execucao,
+                                 tokens_entrada=0, tokens_saida=0, chamadas_llm=0, **atributos)
+
+    def _marcar(self, objeto: Any) -> bool:
+        """True na primeira vez que o objeto é visto (evita envolver duas vezes)."""
+        if id(objeto) in self._instrumentados:
+            return False
+        self._instrumentados.add(id(objeto))
+        return True
+
+    def instrumentar_llm(self, llm: Any) -> Any:
+        """Envolve `llm.call`: um span "llm" por chamada, com os tokens gastos."""
+        if llm is None or not self._marcar(llm):
+            return llm
+        call_original = llm.call
+        nome = getattr(llm, "model", type(llm).__name__)
+
+        def call_rastreado(*args, **kwargs):
+            uso_antes = llm.get_token_usage_summary()
+            with self.span("llm", nome) as span:
+                try:
+                    return call_original(*args, **kwargs)
+                finally:
+                    uso = llm.get_token_usage_summary()
+                    tokens_entrada = uso.prompt_tokens - uso_antes.prompt_tokens
+                    tokens_saida = uso.completion_tokens - uso_antes.completion_tokens
+                    _somar_llm(span, tokens_entrada, tokens_saida)
+                    superior = span.superior
+                    if superior is not None and "chamadas_llm" in superior.atributos:
+                        span.atributos["iteracao"] = superior.atributos["chamadas_llm"]
+
+        object.__setattr__(llm, "call", call_rastreado)
+        return llm
+
+    def instrumentar_ferramenta(self, ferramenta: Any) -> Any:
+        """Envolve `ferramenta._run`: um span "tool" por uso."""
+        if not self._marcar(ferramenta):
+            return ferramenta
+        run_original = ferramenta._run
+
+        def run_rastreado(*args, **kwargs):
+            with self.span("tool", ferramenta.name, argumentos=kwargs or list(args)):
+                return run_original(*args, **kwargs)
+
+        object.__setattr__(ferramenta, "_run", run_rastreado)
+        return ferramenta
+
+    def instrumentar_agente(self, agente: Any) -> Any:
+        """Instrumenta o LLM e as ferramentas do agente."""
+        self.instrumentar_llm(agente.llm)
+        self.instrumentar_llm(getattr(agente, "function_calling_llm", None))
+        for ferramenta in agente.tools or []:
+            self.instrumentar_ferramenta(ferramenta)
+        return agente
+
+    def instrumentar_task(self, task: Any) -> Any:
+        """Envolve `task.execute_sync`: um span "task" com iterações e erros de ferramenta."""
+        if not self._marcar(task):
+            return task
+        for ferramenta in task.tools or []:
+            self.instrumentar_ferramenta(ferramenta)
+        execute_original = task.execute_sync
+
+        def execute_rastreado(*args, **kwargs):
+            agente = kwargs.get("agent") or (args[0] if args else None) or task.agent
+            if agente is not None:
+                self.instrumentar_agente(agente)
+            nome = task.name or (agente.role if agente is not None else "task")
+            erros_antes = task.tools_errors
+            with self.span("task", nome, agente=getattr(agente, "role", None),
+                           max_iter=getattr(agente, "max_iter", None)) as span:
+                try:
+                    return execute_original(*args, **kwargs)
+                finally:
+                    span.atributos["iteracoes"] = span.atributos["chamadas_llm"]
+                    span.atributos["erros_ferramenta"] = task.tools_errors - erros_antes
+
+        object.__setattr__(task, "execute_sync", execute_rastreado)
+        return task
+
+    def instrumentar_crew(self, crew: Any) -> Any:
+        """Instrumenta agentes, tasks e o LLM de gerência do crew (se houver)."""
+        for agente in crew.agents:
+            self.instrumentar_agente(agente)
+        for task in crew.tasks:
+            self.instrumentar_task(task)
+        manager_llm = getattr(crew, "manager_llm", None)
+        if manager_llm is not None and not isinstance(manager_llm, str):
+            self.instrumentar_llm(manager_llm)
+        return crew
+
+
+_rastreador: Optional[Rastreador] = None
+
+
+def get_rastreador() -> Rastreador:
+    """Rastreador compartilhado do processo (arquivo em CREW_TRACES)."""
+    global _rastreador
+    if _rastreador is None:
+        _rastreador = Rastreador()
+    return _rastreador
+
+
+def instrumentar_crew(crew: Any) -> Any:
+    """Atalho para `get_rastreador().instrumentar_crew(crew)`."""
+    return get_rastreador().instrumentar_crew(crew)
+
+
+# ==============================
+# Resumo
+# ==============================
+
+def carregar_spans(arquivo: str = ARQUIVO_PADRAO, execucao: Optional[str] = None) -> list[dict]:
+    """Lê os spans do arquivo (opcionalmente só os de uma execução de crew)."""
+    spans = []
+    with open(arquivo, "r", encoding="utf-8") as f:
+        for linha in f:
+            if not linha.strip():
+                continue
+            span = json.loads(linha)
+            if execucao is None or span.get("execucao") == execucao:
+                spans.append(span)
+    return spans
+
+
+def resumir(spans: list[dict]) -> list[dict]:
+    """
+    Agrupa os spans por (tipo, nome); spans de fora dos crews ficam com tipo "span".
+
+    Args:
+        spans: Spans lidos com `carregar_spans`
+
+    Returns:
+        Um dict por grupo com quantidade, total, p50, p95, máximo, tokens e erros,
+        do grupo com mais tempo total para o com menos
+    """
+    grupos: dict[tuple, list[dict]] = defaultdict(list)
+    for span in spans:
+        grupos[(span.get("tipo", "span"), span["nome"])].append(span)
+
+    resumo = []
+    for (tipo, nome), itens in grupos.items():
+        duracoes = sorted(s["duracao"] for s in itens)
+        resumo.append({
+            "tipo": tipo,
+            "nome": nome,
+            "quantidade": len(itens),
+            "total": sum(duracoes),
+            "p50": percentil(duracoes, 0.50),
+            "p95": percentil(duracoes, 0.95),
+            "maximo": duracoes[-1],
+            # Tokens só dos spans de LLM, para não contar de novo nos pais
+            "tokens_entrada": sum(s.get("tokens_entrada", 0) for s in itens) if tipo == "llm" else None,
+            "tokens_saida": sum(s.get("tokens_saida", 0) for s in itens) if tipo == "llm" else None,
+            "erros": sum(1 for s in itens if s["erro"]),
+        })
+    return sorted(resumo, key=lambda g: g["total"], reverse=True)
+
+
+def _argumento(nome: str, padrao: Optional[str] = None) -> Optional[str]:
+    if nome in sys.argv:
+        return sys.argv[sys.argv.index(nome) + 1]
+    return padrao
+
+
+if __name__ == "__main__":
+    posicionais = [a for i, a in enumerate(sys.argv[1:], 1)
+                   if not a.startswith("--") and not sys.argv[i - 1].startswith("--")]
+    arquivo = posicionais[0] if posicionais else ARQUIVO_PADRAO
+    top = int(_argumento("--top", "10"))
+    spans = carregar_spans(arquivo, _argumento("--execucao"))
+    if not spans:
+        print(f"Nenhum span em {arquivo}")
+        sys.exit(1)
+
+    execucoes = {s["execucao"] for s in spans if "execucao" in s}
+    print(f"📈 {len(spans)} spans de {len(execucoes)} execução(ões) em {arquivo}\n")
+
+    print(f"{'tipo':<6} {'nome':<40} {'n':>5} {'total':>9} {'p50':>8} {'p95':>8} {'máx':>8} {'tok in':>8} {'tok out':>8} {'erros':>5}")
+    for grupo in resumir(spans):
+        tokens_entrada = "" if grupo["tokens_entrada"] is None else grupo["tokens_entrada"]
+        tokens_saida = "" if grupo["tokens_saida"] is None else grupo["tokens_saida"]
+        print(f"{grupo['tipo']:<6} {grupo['nome'][:40]:<40} {grupo['quantidade']:>5} {grupo['total']:>8.2f}s "
+              f"{grupo['p50']:>7.2f}s {grupo['p95']:>7.2f}s {grupo['maximo']:>7.2f}s "
+              f"{tokens_entrada:>8} {tokens_saida:>8} {grupo['erros']:>5}")
+
+    print(f"\n🐢 {top} passos mais lentos:")
+    for span in sorted(spans, key=lambda s: s["duracao"], reverse=True)[:top]:
+        extras = f" iterações={span['iteracoes']}" if "iteracoes" in span else ""
+        erro = f" ❌ {span['erro']}" if span["erro"] else ""
+        tokens = f" (tokens {span['tokens_entrada']}/{span['tokens_saida']})" if "tokens_entrada" in span else ""
+        print(f"  {span['duracao']:>8.2f}s {span.get('tipo', 'span'):<6} {span['nome'][:50]}{tokens}{extras}{erro}")
@@ -0,0 +1,221 @@
+"""
+Registro compartilhado de LLMs.
+
+Cada `get_llm` criava um `LLM` novo a cada chamada (o `scrapeWeb.py` criava três
+para um único crew), cada um com suas próprias conexões HTTP para o Ollama ou o
+Gemini. Aqui os LLMs são memoizados por (provedor, parâmetros), o LiteLLM usa um
+pool de conexões keep-alive compartilhado, os modelos do Ollama são verificados e
+aquecidos na primeira vez que são pedidos, e cada chamada registra latência e
+tokens por provedor.
+
+Uso:
+    uv run agents-crew/llm_provider.py qwen
+"""
+
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+import httpx
+from crewai import LLM
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
+
+PROVEDORES = {
+    "gemini": {"model": "gemini/gemini-2.0-flash", "api_keys": ("GEMINI_API_KEY", "GOOGLE_API_KEY")},
+    "openai": {"model": "gpt-4o-mini", "api_keys": ("OPENAI_API_KEY",)},
+    "llama": {"model": "ollama/llama3.1:8b", "base_url": OLLAMA_URL},
+    "gemma": {"model": "ollama/gemma3:270m", "base_url": OLLAMA_URL},
+    "qwen": {"model": "ollama/qwen3:1.7b", "base_url": OLLAMA_URL},
+}
+
+
+class RegistroLLM:
+    """
+    Fábrica memoizada de LLMs com pool HTTP e métricas por provedor.
+
+    Args:
+        aquecer: Se True, verifica e carrega o modelo do Ollama na primeira
+            requisição dele (padrão: variável LLM_AQUECER, ligado)
+        keep_alive: Tempo que o Ollama mantém o modelo carregado (padrão: "30m")
+        max_conexoes: Conexões keep-alive no pool compartilhado (padrão: 10)
+    """
+
+    def __init__(self, aquecer: Optional[bool] = None, keep_alive: str = "30m", max_conexoes: int = 10):
+        if aquecer is None:
+            aquecer = os.getenv("LLM_AQUECER", "true").lower() == "true"
+        self.aquecer = aquecer
+        self.keep_alive = keep_alive
+        self._llms: dict[tuple, LLM] = {}
+        self._metricas: dict[str, dict] = {}
+        self._aquecidos: set[tuple[str, str]] = set()
+        self._trava = threading.Lock()
+
+        limites = httpx.Limits(max_connections=max_conexoes, max_keepalive_connections=max_conexoes, keepalive_expiry=300)
+        self._cliente = httpx.Client(limits=limites, timeout=httpx.Timeout(600.0, connect=5.0))
+        self._cliente_async = httpx.AsyncClient(limits=limites, timeout=httpx.Timeout(600.0, connect=5.0))
+        self._configurar_litellm()
+
+    def _configurar_litellm(self) -> None:
+        # Provedores roteados pelo LiteLLM (Ollama, e Gemini sem SDK nativo) passam a reusar o pool
+        try:
+            import litellm
+        except ImportError:
+            return
+        litellm.client_session = self._cliente
+        litellm.aclient_session = self._cliente_async
+
+    def obter(self, provider: str = "gemini", **parametros) -> LLM:
+        """
+        Retorna o LLM do provedor, criando-o só na primeira vez.
+
+        Args:
+            provider: Provedor (gemini, openai, llama, gemma, qwen)
+            **parametros: Repassados ao `LLM` (temperature, model, ...); fazem parte da chave
+
+        Returns:
+            Instância compartilhada do LLM
+
+        Raises:
+            EnvironmentError: Se a API key não estiver configurada ou o Ollama não responder
+            ValueError: Se o provider não for suportado ou o modelo não estiver no Ollama
+        """
+        if provider not in PROVEDORES:
+            raise ValueError(f"Provider '{provider}' não suportado. Use: {', '.join(PROVEDORES)}")
+
+        chave = (provider, tuple(sorted(parametros.items())))
+        with self._trava:
+            llm = self._llms.get(chave)
+            if llm is None:
+                llm = self._criar(provider, parametros)
+                self._llms[chave] = llm
+        return llm
+
+    def _criar(self, provider: str, parametros: dict) -> LLM:
+        definicao = PROVEDORES[provider]
+        config = {"model": definicao["model"]}
+        if "base_url" in definicao:
+            config["base_url"] = definicao["base_url"]
+        if "api_keys" in definicao:
+            api_key = next((os.getenv(nome) for nome in definicao["api_keys"] if os.getenv(nome)), None)
+            if not api_key and "api_key" not in parametros:
+                raise EnvironmentError(f"{definicao['api_keys'][0]} não configurada no arquivo .env")
+            config["api_key"] = api_key
+        config.update(parametros)
+
+        if config["model"].startswith("ollama/") and self.aquecer:
+            modelo = (config["model"].split("/", 1)[1], config.get("base_url", OLLAMA_URL))
+            if modelo not in self._aquecidos:
+                self.preparar_ollama(*modelo)
+                self._aquecidos.add(modelo)
+
+        llm = LLM(**config)
+        self._instrumentar(llm, provider)
+        return llm
+
+    def preparar_ollama(self, modelo: str, base_url: str = OLLAMA_URL) -> float:
+        """
+        Confere se o modelo está baixado no Ollama e o carrega na memória.
+
+        Args:
+            modelo: Nome do modelo no Ollama (ex.: "qwen3:1.7b")
+            base_url: URL do servidor Ollama
+
+        Returns:
+            Segundos gastos para carregar o modelo
+        """
+        try:
+            resposta = self._cliente.get(f"{base_url}/api/tags", timeout=5.0)
+            resposta.raise_for_status()
+        except httpx.HTTPError as e:
+            raise EnvironmentError(f"Ollama não respondeu em {base_url}: {e}") from e
+
+        disponiveis = {m["name"] for m in resposta.json().get("models", [])}
+        if modelo not in disponiveis and f"{modelo}:latest" not in disponiveis:
+            raise ValueError(f"Modelo '{modelo}' não encontrado no Ollama. Rode: ollama pull {modelo}")
+
+        # Prompt vazio só carrega o modelo; keep_alive evita que ele saia da memória entre crews
+        inicio = time.perf_counter()
+        self._cliente.post(
+            f"{base_url}/api/generate",
+            json={"model": modelo, "prompt": "", "keep_alive": self.keep_alive},
+        ).raise_for_status()
+        segundos = time.perf_counter() - inicio
+        print(f"🔥 Modelo {modelo} carregado no Ollama em {segundos:.1f}s")
+        return segundos
+
+    def _instrumentar(self, llm: LLM, provider: str) -> None:
+        """Envolve `llm.call` para medir latência e tokens de cada requisição."""
+        metricas = self._metricas.setdefault(provider, {
+            "requisicoes": 0, "falhas": 0, "segundos": 0.0, "prompt_tokens": 0, "completion_tokens": 0,
+        })
+        call_original = llm.call
+
+        def call_medido(*args, **kwargs):
+            uso_antes = llm.get_token_usage_summary()
+            inicio = time.perf_counter()
+            try:
+                return call_original(*args, **kwargs)
+            except Exception:
+                with self._trava:
+                    metricas["falhas"] += 1
+                raise
+            finally:
+                segundos = time.perf_counter() - inicio
+                uso = llm.get_token_usage_summary()
+                with self._trava:
+                    metricas["requisicoes"] += 1
+                    metricas["segundos"] += segundos
+                    metricas["prompt_tokens"] += uso.prompt_tokens - uso_antes.prompt_tokens
+                    metricas["completion_tokens"] += uso.completion_tokens - uso_antes.completion_tokens
+
+        object.__setattr__(llm, "call", call_medido)
+
+    def metricas(self) -> dict[str, dict]:
+        """
+        Métricas acumuladas por provedor.
+
+        Returns:
+            {provedor: {requisicoes, falhas, segundos, latencia_media, prompt_tokens, completion_tokens}}
+        """
+        with self._trava:
+            return {
+                provider: {**m, "latencia_media": m["segundos"] / m["requisicoes"] if m["requisicoes"] else 0.0}
+                for provider, m in self._metricas.items()
+            }
+
+    def fechar(self) -> None:
+        self._cliente.close()
+
+
+_registro: Optional[RegistroLLM] = None
+
+
+def get_registro() -> RegistroLLM:
+    """Retorna o registro compartilhado pelo processo."""
+    global _registro
+    if _registro is None:
+        _registro = RegistroLLM()
+    return _registro
+
+
+def obter_llm(provider: str = "gemini", **parametros) -> LLM:
+    """Atalho para `get_registro().obter(provider, **parametros)`."""
+    return get_registro().obter(provider, **parametros)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    provider = sys.argv[1] if len(sys.argv) > 1 else "qwen"
+
+    inicio = time.perf_counter()
+    llm = obter_llm(provider, temperature=0.3)
+    print(f"✓ {provider} pronto em {time.perf_counter() - inicio:.1f}s")
+    assert obter_llm(provider, temperature=0.3) is llm
+
+    print(llm.call("Responda apenas: ok"))
+    print(get_registro().metricas())
@@ -0,0 +1,38 @@
+"""
+Modelos de dados das tendências, compartilhados pelo crew, pelo coletor direto
+e pelos demais estágios (histórico, enriquecimento).
+
+Ficam separados de `google_trends.py` para poderem ser importados sem carregar o CrewAI.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class TrendKeyword(BaseModel):
+    """Modelo para uma palavra-chave de tendência"""
+    termo: str = Field(description="Palavra-chave ou frase em alta")
+    volume: Optional[str] = Field(default=None, description="Volume de buscas estimado")
+    resumo: str = Field(default="", description="Breve contexto sobre a tendência")
+    relevancia: str = Field(default="Não avaliada", description="Nível de relevância: Alta, Média ou Baixa")
+    noticias: list[str] = Field(default_factory=list, description="Manchetes associadas à tendência")
+    fontes: list[str] = Field(default_factory=list, description="Fontes em que o termo apareceu")
+    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+
+
+class TrendsReport(BaseModel):
+    """Modelo para o relatório completo de tendências"""
+    data_coleta: str = Field(default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    categoria: str = Field(default="Política")
+    pais: str = Field(default="Brasil")
+    periodo: str = Field(default="24 horas")
+    keywords: list[TrendKeyword] = Field(default_factory=list)
+    total_trends: int = Field(default=0)
+
+    @model_validator(mode="after")
+    def _contar_keywords(self) -> "TrendsReport":
+        # Sempre derivado da lista, para não divergir de `keywords`
+        self.total_trends = len(self.keywords)
+        return self
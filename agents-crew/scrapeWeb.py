@@ -1,65 +1,34 @@
 from pydantic import BaseModel
 from crewai import Agent, Task, Crew, LLM, Process
-from crewai_tools import ScrapeWebsiteTool
 import os
 from dotenv import load_dotenv
 
+from ferramenta_scrape_cache import ScrapeWebsiteCacheTool
+from llm_provider import obter_llm
+
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
 
 
 def get_llm(provider: str = "gemini"):
-    """Configura o LLM para usar Gemini ou OpenAI.
+    """Retorna o LLM compartilhado do provider (ver `llm_provider`).
     
     Args:
-        provider: "gemini" (padrão) ou "openai"
+        provider: "gemini" (padrão), "openai", "llama" ou "gemma"
     """
     if provider == "gemini":
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise EnvironmentError("GEMINI_API_KEY não configurada no .env")
-        
-        return LLM(
-            model="gemini/gemini-2.5-flash",
-            api_key=api_key,
-            temperature=0.7,
-        )
-    
-    elif provider == "openai":
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise EnvironmentError("OPENAI_API_KEY não configurada no .env")
-        
-        return LLM(
-            model="gpt-4o-mini",
-            api_key=api_key,
-            temperature=0.7,
-        )
-
-    elif provider == "llama":
-        return LLM(
-            model ="ollama/llama3.1:8b",
-            base_url="http://localhost:11434",
-            temperature=0.7,
-        )
-
-    elif provider == "gemma":
-        return LLM(
-            #model ="ollama/gemma3:270m",
-            model="ollama/qwen3:1.7b",
-            base_url="http://localhost:11434",
-            temperature=0.7,
-        )
-
-    else:
-        raise ValueError(f"Provider '{provider}' não suportado. Use 'gemini' ou 'openai'.")
+        return obter_llm("gemini", model="gemini/gemini-2.5-flash", temperature=0.7)
+    if provider == "gemma":
+        # Este script sempre rodou o perfil "gemma" com o qwen3:1.7b
+        return obter_llm("qwen", temperature=0.7)
+    return obter_llm(provider, temperature=0.7)
 
 
 
 # ==============================
 # 1. Ferramenta para Scraping
 # ==============================
-google_trends_tool = ScrapeWebsiteTool()
+google_trends_tool = ScrapeWebsiteCacheTool(max_idade=5 * 60)
 
 # ==============================
 # 2. Criando o agente
@@ -0,0 +1,389 @@
+"""
+Benchmark ponta a ponta das etapas de captura, extração e classificação.
+
+Nada sai para a internet: as páginas vêm de `benchmark/fixtures` (servidas por
+um HTTP local), o Ollama é substituído pelo `OllamaFalso` (latência
+configurável, resposta gravada) e as imagens são os `exemplo*.png` da raiz.
+
+Etapas:
+    screenshot   extrator.scraper_print.capturar_screenshot (navegador residente)
+    texto        extrator_instagram.instagram_scraper_completo.capturar_texto_instagram
+    gemma        extrator_instagram.instagram_scraper_completo.processar_com_gemma
+    analisar     interpretador_tela.instagram_analyzer.analisar_instagram
+    classificar  classificator.bert_classificator.FakeNewsClassifier.predict_batch
+
+Cada etapa roda em um subprocesso próprio, para que o pico de memória (RSS)
+medido seja só dela. Uma chamada de aquecimento fica fora das medidas. O
+relatório JSON tem, por etapa: vazão (itens/s), latência p50/p95 por chamada,
+pico de RSS do processo e dos filhos (Chromium) e erros. Com `--comparar`, o
+resultado é comparado a uma execução anterior e o script sai com código 1 se
+alguma etapa piorou além da tolerância.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmark.executar [--etapas gemma,analisar] [--iteracoes 10]
+        [--latencia-ollama 0.2] [--prefill-ms 5] [--lote 32]
+        [--saida benchmark_resultado.json] [--comparar anterior.json] [--tolerancia 0.15]
+"""
+
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from benchmark.servidores import OllamaFalso, ServidorFixtures
+from comum.estatisticas import percentil
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ITERACOES_PADRAO = {"screenshot": 5, "texto": 3, "gemma": 20, "analisar": 20, "classificar": 20}
+
+
+# ==============================
+# Etapas (rodam no subprocesso)
+# ==============================
+# Cada etapa é um context manager que prepara o que for preciso e entrega uma
+# função chamada(i) -> itens processados; o que acontece fora dela não é medido.
+
+def _url(config: dict, i: int) -> str:
+    """Página `i` (circular), com query única para não haver cache."""
+    paginas = config["url_fixtures"]
+    return f"{paginas[i % len(paginas)]}?i={i}"
+
+
+@contextmanager
+def _navegador():
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        navegador = p.chromium.launch(headless=True)
+        try:
+            yield navegador
+        finally:
+            navegador.close()
+
+
+@contextmanager
+def _etapa_screenshot(config: dict):
+    from extrator.scraper_print import capturar_screenshot
+
+    pasta = tempfile.mkdtemp(prefix="benchmark_")
+    with _navegador() as navegador:
+        def chamada(i: int) -> int:
+            arquivo = os.path.join(pasta, f"screenshot_{i}.png")
+            if not capturar_screenshot(_url(config, i), arquivo, tempo_espera=0, navegador=navegador):
+                raise RuntimeError("capturar_screenshot falhou")
+            return 1
+
+        yield chamada
+
+
+@contextmanager
+def _etapa_texto(config: dict):
+    from extrator_instagram.armazem_capturas import ArmazemCapturas
+    from extrator_instagram.instagram_scraper_completo import capturar_texto_instagram
+
+    armazem = ArmazemCapturas(os.path.join(tempfile.mkdtemp(prefix="benchmark_"), "capturas.db"))
+    with _navegador() as navegador:
+        def chamada(i: int) -> int:
+            if not capturar_texto_instagram(_url(config, i), armazem=armazem, navegador=navegador):
+                raise RuntimeError("capturar_texto_instagram falhou")
+            return 1
+
+        yield chamada
+
+
+@contextmanager
+def _etapa_gemma(config: dict):
+    from extrator_instagram.instagram_scraper_completo import processar_com_gemma
+
+    textos = []
+    for arquivo in sorted(glob.glob(os.path.join(RAIZ, "extrator_instagram", "texto_bruto_*.json"))):
+        with open(arquivo, "r", encoding="utf-8") as f:
+            textos.append(json.load(f)["texto_bruto"])
+
+    def chamada(i: int) -> int:
+        if not processar_com_gemma(textos[i % len(textos)]).get("usuario"):
+            raise RuntimeError("processar_com_gemma não devolveu o JSON esperado")
+        return 1
+
+    yield chamada
+
+
+@contextmanager
+def _etapa_analisar(config: dict):
+    from interpretador_tela.instagram_analyzer import analisar_instagram
+
+    imagens = sorted(glob.glob(os.path.join(RAIZ, "exemplo*.png")))
+
+    def chamada(i: int) -> int:
+        if not analisar_instagram(imagens[i % len(imagens)]).get("usuario"):
+            raise RuntimeError("analisar_instagram não devolveu o JSON esperado")
+        return 1
+
+    yield chamada
+
+
+@contextmanager
+def _etapa_classificar(config: dict):
+    from classificator.bert_classificator import FakeNewsClassifier
+
+    legendas = []
+    for arquivo in sorted(glob.glob(os.path.join(RAIZ, "exemplo*_instagram.json"))
+                          + glob.glob(os.path.join(RAIZ, "extrator_instagram", "*.json"))):
+        with open(arquivo, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+        for item in dados if isinstance(dados, list) else [dados]:
+            if isinstance(item, dict) and item.get("legenda"):
+                legendas.append(item["legenda"])
+    lote = [legendas[i % len(legendas)] for i in range(config["lote"])]
+
+    inicio = time.perf_counter()
+    classificador = FakeNewsClassifier()
+    config["carga_modelo_s"] = round(time.perf_counter() - inicio, 2)
+
+    def chamada(i: int) -> int:
+        return len(classificador.predict_batch(lote))
+
+    yield chamada
+
+
+ETAPAS = {
+    "screenshot": _etapa_screenshot,
+    "texto": _etapa_texto,
+    "gemma": _etapa_gemma,
+    "analisar": _etapa_analisar,
+    "classificar": _etapa_classificar,
+}
+
+
+def _rss_pico_mb(quem: int) -> float:
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    pico = resource.getrusage(quem).ru_maxrss
+    return round(pico / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def medir_etapa(nome: str, iteracoes: int, config: dict) -> dict:
+    """
+    Mede uma etapa no processo atual (chamado pelo subprocesso de cada etapa).
+
+    Args:
+        nome (str): Chave de ETAPAS
+        iteracoes (int): Chamadas medidas (após uma de aquecimento)
+        config (dict): URLs das fixtures, tamanho do lote etc.
+
+    Returns:
+        dict: itens, segundos, vazao_por_s, p50_ms, p95_ms, rss_pico_mb, rss_pico_filhos_mb, erros
+    """
+    latencias, itens, erros = [], 0, []
+    with ETAPAS[nome](config) as chamada:
+        chamada(0)  # aquecimento: caches, conexões, JIT do modelo
+        inicio = time.perf_counter()
+        for i in range(iteracoes):
+            antes = time.perf_counter()
+            try:
+                itens += chamada(i)
+            except Exception as e:
+                erros.append(f"{type(e).__name__}: {e}")
+            latencias.append(time.perf_counter() - antes)
+        segundos = time.perf_counter() - inicio
+
+    resultado = {
+        "iteracoes": iteracoes,
+        "itens": itens,
+        "segundos": round(segundos, 3),
+        "vazao_por_s": round(itens / segundos, 2) if segundos else None,
+        "p50_ms": round(percentil(latencias, 0.50) * 1000, 1),
+        "p95_ms": round(percentil(latencias, 0.95) * 1000, 1),
+        "rss_pico_mb": _rss_pico_mb(resource.RUSAGE_SELF),
+        "rss_pico_filhos_mb": _rss_pico_mb(resource.RUSAGE_CHILDREN),
+        "erros": len(erros),
+    }
+    if erros:
+        resultado["primeiro_erro"] = erros[0]
+    if "carga_modelo_s" in config:
+        resultado["carga_modelo_s"] = config["carga_modelo_s"]
+    return resultado
+
+
+# ==============================
+# Orquestração (processo principal)
+# ==============================
+
+def executar_benchmark(
+    etapas: list[str],
+    iteracoes: int = None,
+    latencia_ollama: float = 0.2,
+    prefill_ms: float = 0.0,
+    lote: int = 32,
+    verboso: bool = False,
+) -> dict:
+    """
+    Sobe os servidores locais e mede cada etapa em um subprocesso.
+
+    Args:
+        etapas (list[str]): Etapas a medir, na ordem
+        iteracoes (int): Chamadas por etapa (padrão: ITERACOES_PADRAO de cada uma)
+        latencia_ollama (float): Segundos fixos por chamada ao Ollama falso
+        prefill_ms (float): Milissegundos por 1000 caracteres de prompt no Ollama falso
+        lote (int): Textos por chamada do classificador
+        verboso (bool): Mostra a saída das etapas (por padrão ela é descartada)
+
+    Returns:
+        dict: {"ambiente": {...}, "etapas": {nome: resultado}}
+    """
+    relatorio = {
+        "ambiente": {
+            "data": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "maquina": platform.machine(),
+            "cpus": os.cpu_count(),
+            "latencia_ollama_s": latencia_ollama,
+            "prefill_ms_por_1k": prefill_ms,
+            "lote": lote,
+        },
+        "etapas": {},
+    }
+
+    with ServidorFixtures() as fixtures, OllamaFalso(latencia_ollama, prefill_ms) as ollama:
+        config = {"url_fixtures": [f"{fixtures.url}/{pagina}" for pagina in fixtures.paginas], "lote": lote}
+        # O cliente `ollama` lê OLLAMA_HOST ao ser importado, no subprocesso
+        ambiente = {**os.environ, "OLLAMA_HOST": ollama.url, "PYTHONPATH": RAIZ}
+
+        for nome in etapas:
+            n = iteracoes or ITERACOES_PADRAO[nome]
+            print(f"⏱️ {nome}: {n} iteração(ões)...")
+            with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as saida:
+                arquivo_saida = saida.name
+            processo = subprocess.run(
+                [sys.executable, "-m", "benchmark.executar", "--etapa", nome, "--iteracoes", str(n),
+                 "--config", json.dumps(config), "--resultado", arquivo_saida],
+                cwd=RAIZ, env=ambiente,
+                stdout=None if verboso else subprocess.DEVNULL,
+                stderr=None if verboso else subprocess.PIPE,
+                text=True,
+            )
+            if processo.returncode == 0:
+                with open(arquivo_saida, "r", encoding="utf-8") as f:
+                    resultado = json.load(f)
+                print(f"   {resultado['vazao_por_s']} itens/s | p50 {resultado['p50_ms']}ms | "
+                      f"p95 {resultado['p95_ms']}ms | RSS {resultado['rss_pico_mb']}MB | {resultado['erros']} erro(s)")
+            else:
+                detalhe = (processo.stderr or "").strip().splitlines()[-1:] or [f"código {processo.returncode}"]
+                resultado = {"falhou": detalhe[0]}
+                print(f"   ✗ {detalhe[0]}")
+            os.remove(arquivo_saida)
+            relatorio["etapas"][nome] = resultado
+
+        relatorio["ambiente"]["chamadas_ollama"] = ollama.chamadas
+    return relatorio
+
+
+# Métricas comparadas e o sentido de "pior"
+METRICAS_COMPARADAS = {"vazao_por_s": -1, "p50_ms": 1, "p95_ms": 1, "rss_pico_mb": 1, "erros": 1}
+# Métricas em que qualquer piora conta, sem tolerância (inclusive a partir de zero)
+METRICAS_SEM_TOLERANCIA = {"erros"}
+
+
+def comparar(atual: dict, anterior: dict, tolerancia: float = 0.15) -> list[dict]:
+    """
+    Compara dois relatórios e lista as regressões acima da tolerância.
+
+    Args:
+        atual (dict): Relatório desta execução
+        anterior (dict): Relatório de referência
+        tolerancia (float): Variação relativa aceita (padrão: 0.15 = 15%)
+
+    Uma etapa que funcionava na referência e falhou agora é regressão (métrica
+    "falhou"); aumento de erros também, sem tolerância.
+
+    Returns:
+        list[dict]: Uma entrada {etapa, metrica, anterior, atual, variacao} por regressão
+            (variacao None quando não há base relativa)
+    """
+    regressoes = []
+    for etapa, resultado in atual["etapas"].items():
+        referencia = anterior.get("etapas", {}).get(etapa)
+        if not referencia or "falhou" in referencia:
+            continue
+        if "falhou" in resultado:
+            regressoes.append({"etapa": etapa, "metrica": "falhou", "anterior": "ok",
+                               "atual": resultado["falhou"], "variacao": None})
+            continue
+        for metrica, sentido in METRICAS_COMPARADAS.items():
+            antes, depois = referencia.get(metrica), resultado.get(metrica)
+            if antes is None or depois is None:
+                continue
+            if metrica in METRICAS_SEM_TOLERANCIA:
+                if (depois - antes) * sentido > 0:
+                    regressoes.append({"etapa": etapa, "metrica": metrica, "anterior": antes, "atual": depois,
+                                       "variacao": round((depois - antes) / antes, 3) if antes else None})
+                continue
+            if not antes:
+                continue
+            variacao = (depois - antes) / antes
+            if variacao * sentido > tolerancia:
+                regressoes.append({"etapa": etapa, "metrica": metrica, "anterior": antes,
+                                   "atual": depois, "variacao": round(variacao, 3)})
+    return regressoes
+
+
+def _argumento(nome: str, padrao: str = None) -> str:
+    if nome in sys.argv:
+        return sys.argv[sys.argv.index(nome) + 1]
+    return padrao
+
+
+def main() -> int:
+    if "--etapa" in sys.argv:
+        # Modo subprocesso: mede uma etapa e grava o resultado
+        resultado = medir_etapa(_argumento("--etapa"), int(_argumento("--iteracoes")),
+                                json.loads(_argumento("--config")))
+        with open(_argumento("--resultado"), "w", encoding="utf-8") as f:
+            json.dump(resultado, f)
+        return 0
+
+    etapas = _argumento("--etapas", ",".join(ETAPAS)).split(",")
+    desconhecidas = [e for e in etapas if e not in ETAPAS]
+    if desconhecidas:
+        print(f"✗ Etapa(s) desconhecida(s): {', '.join(desconhecidas)}. Opções: {', '.join(ETAPAS)}")
+        return 2
+
+    iteracoes = _argumento("--iteracoes")
+    relatorio = executar_benchmark(
+        etapas,
+        int(iteracoes) if iteracoes else None,
+        float(_argumento("--latencia-ollama", "0.2")),
+        float(_argumento("--prefill-ms", "0")),
+        int(_argumento("--lote", "32")),
+        "--verboso" in sys.argv,
+    )
+
+    arquivo_saida = _argumento("--saida", "benchmark_resultado.json")
+    with open(arquivo_saida, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultado salvo em: {arquivo_saida}")
+
+    arquivo_anterior = _argumento("--comparar")
+    if arquivo_anterior:
+        with open(arquivo_anterior, "r", encoding="utf-8") as f:
+            regressoes = comparar(relatorio, json.load(f), float(_argumento("--tolerancia", "0.15")))
+        if not regressoes:
+            print(f"✓ Sem regressões em relação a {arquivo_anterior}")
+            return 0
+        print(f"⚠️ {len(regressoes)} regressão(ões) em relação a {arquivo_anterior}:")
+        for r in regressoes:
+            variacao = f" ({r['variacao']:+.0%})" if r["variacao"] is not None else ""
+            print(f"   {r['etapa']}.{r['metrica']}: {r['anterior']} -> {r['atual']}{variacao}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
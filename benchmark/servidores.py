@@ -0,0 +1,153 @@
+"""
+Servidores locais que substituem o Instagram e o Ollama nos benchmarks.
+
+- `ServidorFixtures` serve as páginas gravadas de `benchmark/fixtures`
+  (texto real de posts capturados, com o modal de login do Instagram para o
+  `fechar_popups` ter o que fechar);
+- `OllamaFalso` responde `POST /api/chat` como o Ollama, sempre com a mesma
+  resposta gravada (texto ou imagem), depois de uma latência configurável:
+  um tempo fixo por chamada mais um tempo por 1000 caracteres do prompt, que
+  imita o prefill de um modelo local.
+
+Uso isolado (para rodar um script contra o Ollama falso):
+    python -m benchmark.servidores [--latencia 0.2] [--prefill-ms 5]
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _ServidorThread:
+    """Base: ThreadingHTTPServer em uma thread daemon, numa porta livre."""
+
+    def __init__(self, handler, porta: int = 0):
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", porta), handler)
+        self.porta = self._servidor.server_address[1]
+        self.url = f"http://127.0.0.1:{self.porta}"
+
+    def iniciar(self):
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self
+
+    def fechar(self) -> None:
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
+
+
+class _HandlerFixtures(SimpleHTTPRequestHandler):
+    def log_message(self, *_) -> None:
+        pass
+
+
+class ServidorFixtures(_ServidorThread):
+    """
+    Serve os arquivos de uma pasta de fixtures por HTTP.
+
+    Args:
+        pasta (str): Pasta servida (padrão: benchmark/fixtures)
+        porta (int): Porta de escuta (padrão: 0, uma porta livre)
+    """
+
+    def __init__(self, pasta: str = PASTA_FIXTURES, porta: int = 0):
+        super().__init__(partial(_HandlerFixtures, directory=pasta), porta)
+        self.paginas = sorted(f for f in os.listdir(pasta) if f.endswith(".html"))
+
+
+def _carregar_resposta(nome: str) -> str:
+    with open(os.path.join(PASTA_FIXTURES, nome), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+class OllamaFalso(_ServidorThread):
+    """
+    Endpoint determinístico compatível com `ollama.chat` (POST /api/chat, sem stream).
+
+    Args:
+        latencia (float): Segundos fixos por chamada (padrão: 0.2)
+        prefill_ms (float): Milissegundos a mais por 1000 caracteres do prompt (padrão: 0)
+        porta (int): Porta de escuta (padrão: 0, uma porta livre)
+    """
+
+    def __init__(self, latencia: float = 0.2, prefill_ms: float = 0.0, porta: int = 0):
+        self.latencia = latencia
+        self.prefill_ms = prefill_ms
+        self.chamadas = 0
+        self._respostas = {
+            "texto": _carregar_resposta("resposta_texto.json"),
+            "imagem": _carregar_resposta("resposta_imagem.json"),
+        }
+        super().__init__(self._criar_handler(), porta)
+
+    def _criar_handler(self):
+        ollama = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *_) -> None:
+                pass
+
+            def _responder(self, status: int, corpo: dict) -> None:
+                dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(dados)))
+                self.end_headers()
+                self.wfile.write(dados)
+
+            def do_GET(self) -> None:
+                if self.path == "/api/tags":
+                    self._responder(200, {"models": []})
+                else:
+                    self._responder(404, {"error": "not found"})
+
+            def do_POST(self) -> None:
+                if self.path != "/api/chat":
+                    self._responder(404, {"error": "not found"})
+                    return
+                pedido = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                mensagens = pedido.get("messages", [])
+                caracteres = sum(len(m.get("content") or "") for m in mensagens)
+                com_imagem = any(m.get("images") for m in mensagens)
+
+                inicio = time.perf_counter()
+                time.sleep(ollama.latencia + ollama.prefill_ms * caracteres / 1_000_000)
+                ollama.chamadas += 1
+                self._responder(200, {
+                    "model": pedido.get("model", ""),
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "message": {"role": "assistant",
+                                "content": ollama._respostas["imagem" if com_imagem else "texto"]},
+                    "done": True,
+                    "done_reason": "stop",
+                    "total_duration": int((time.perf_counter() - inicio) * 1e9),
+                    "prompt_eval_count": caracteres // 4,
+                    "eval_count": 200,
+                })
+
+        return Handler
+
+
+if __name__ == "__main__":
+    latencia = float(sys.argv[sys.argv.index("--latencia") + 1]) if "--latencia" in sys.argv else 0.2
+    prefill = float(sys.argv[sys.argv.index("--prefill-ms") + 1]) if "--prefill-ms" in sys.argv else 0.0
+    with ServidorFixtures() as fixtures, OllamaFalso(latencia, prefill, porta=11435) as ollama:
+        print(f"📄 Fixtures em {fixtures.url}/ ({', '.join(fixtures.paginas)})")
+        print(f"🤖 Ollama falso em {ollama.url} (latência {latencia}s + {prefill}ms/1k caracteres)")
+        print(f"   export OLLAMA_HOST={ollama.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            print("\n👋 Servidores encerrados")
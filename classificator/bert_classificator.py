@@ -9,9 +9,19 @@ Modelo: vzani/portuguese-fake-news-classifier-bertimbau-fake-br
 Fonte: https://huggingface.co/vzani/portuguese-fake-news-classifier-bertimbau-fake-br
 """
 
+from collections import OrderedDict
 from typing import Tuple, Optional
 from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
 import logging
+import os
+import threading
+
+import numpy as np
+
+from classificator.deduplicacao import IndiceMinHash
+from classificator.indice_semantico import IndiceSemantico
+from classificator.normalizacao import normalizar_lote
+from comum.rastreamento import ativar_se_pedido, span
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
@@ -30,16 +40,44 @@ class FakeNewsClassifier:
         tokenizer: Tokenizador do modelo
         model: Modelo de classificação
         clf: Pipeline de classificação configurado
+        tamanho_cache (int): Máximo de textos normalizados com resultado guardado (LRU)
+        duplicatas (IndiceMinHash): Grupos de quase-duplicatas vistos em `predict_batch`
+            (None se desligado, o padrão); `duplicatas.maiores_grupos()` aponta campanhas coordenadas
+        indice_semantico (IndiceSemantico): Onde `predict_batch` guarda o embedding de cada
+            texto novo (None se desligado); consultado por `similares_a_fakes`
     """
     
-    def __init__(self, model_name: str = "vzani/portuguese-fake-news-classifier-bertimbau-fake-br"):
+    def __init__(
+        self,
+        model_name: str = "vzani/portuguese-fake-news-classifier-bertimbau-fake-br",
+        tamanho_cache: int = 50_000,
+        agrupar_duplicatas: bool = False,
+        max_entradas_duplicatas: int = 200_000,
+        indice_semantico: Optional[IndiceSemantico] = None,
+    ):
         """
         Inicializa o classificador carregando o modelo e tokenizador.
         
         Args:
             model_name: Nome do modelo no HuggingFace Hub
+            tamanho_cache: Resultados guardados por texto normalizado em `predict_batch` (0 desliga)
+            agrupar_duplicatas: Agrupa quase-duplicatas (MinHash-LSH) em `predict_batch`
+                e reaproveita o veredito de cópias quase exatas
+            max_entradas_duplicatas: Entradas do índice de duplicatas antes de
+                esquecer as mais antigas (limita a memória de processos residentes)
+            indice_semantico: Guarda os embeddings (média da última camada do BERT)
+                dos textos classificados em `predict_batch`
         """
         self.model_name = model_name
+        self.tamanho_cache = tamanho_cache
+        self.duplicatas = IndiceMinHash(max_entradas=max_entradas_duplicatas) if agrupar_duplicatas else None
+        self._cache: OrderedDict = OrderedDict()
+        # Veredito por entrada do índice de duplicatas (variante já classificada)
+        self._vereditos_entrada: OrderedDict = OrderedDict()
+        self._trava_cache = threading.Lock()
+        self.indice_semantico = indice_semantico
+        # Embeddings capturados pelo hook, por thread (None = não capturar)
+        self._local = threading.local()
         logger.info(f"Carregando modelo: {model_name}")
         
         try:
@@ -51,11 +89,43 @@ class FakeNewsClassifier:
                 tokenizer=self.tokenizer,
                 device=-1  # Usar GPU (device=0), ou -1 para CPU
             )
+            if indice_semantico is not None:
+                # O forward do classificador já calcula os estados ocultos: o hook
+                # aproveita essa passada em vez de rodar o BERT de novo
+                self.model.base_model.register_forward_hook(self._capturar_embedding, with_kwargs=True)
             logger.info("Modelo carregado com sucesso")
         except Exception as e:
             logger.error(f"Erro ao carregar o modelo: {e}")
             raise
     
+    def _capturar_embedding(self, modulo, args, kwargs, saida) -> None:
+        capturas = getattr(self._local, "embeddings", None)
+        if capturas is None:
+            return
+        estados = saida[0]
+        mascara = kwargs.get("attention_mask")
+        if mascara is None:
+            mascara = estados.new_ones(estados.shape[:2])
+        mascara = mascara.unsqueeze(-1).to(estados.dtype)
+        media = (estados * mascara).sum(1) / mascara.sum(1).clamp(min=1)
+        capturas.append(media.detach().float().cpu().numpy())
+    
+    def _classificar_com_embeddings(self, textos: list[str]) -> tuple[list, Optional[np.ndarray]]:
+        """Roda o pipeline e, com índice semântico, devolve também um embedding por texto."""
+        if self.indice_semantico is None:
+            return self.clf(textos), None
+        self._local.embeddings = []
+        try:
+            results = self.clf(textos)
+            embeddings = self._local.embeddings
+        finally:
+            self._local.embeddings = None
+        embeddings = np.concatenate(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32)
+        if len(embeddings) != len(textos):
+            logger.warning(f"Embeddings capturados: {len(embeddings)} para {len(textos)} textos; ignorados")
+            return results, None
+        return results, embeddings
+    
     def predict(self, text: str, return_raw: bool = False) -> Tuple[bool, float]:
         """
         Classifica um texto como notícia falsa ou verdadeira.
@@ -86,7 +156,8 @@ class FakeNewsClassifier:
             raise ValueError("O texto não pode estar vazio")
         
         try:
-            result = self.clf(text)[0]
+            with span("bert.predict", caracteres=len(text)):
+                result = self.clf(text)[0]
             
             if return_raw:
                 return result
@@ -106,28 +177,143 @@ class FakeNewsClassifier:
             logger.error(f"Erro durante a predição: {e}")
             raise
     
-    def predict_batch(self, texts: list[str]) -> list[Tuple[bool, float]]:
+    def predict_batch(self, texts: list[str], com_grupos: bool = False) -> list[tuple]:
         """
         Classifica múltiplos textos em lote (mais eficiente).
         
+        Os textos passam por `normalizar_lote` (NFKC, sem invisíveis, URLs,
+        menções e hashtags, espaços colapsados). Textos com o mesmo texto
+        normalizado, que é exatamente o que vai ao modelo, são classificados uma
+        vez só por lote, e os resultados ficam num cache LRU entre chamadas:
+        cópias de uma mesma legenda com outro caractere invisível, outras
+        hashtags ou URLs não custam nova inferência. A chave do cache é essa
+        entrada exata com ou sem `agrupar_duplicatas`: caixa diferente é outra
+        entrada (o BERTimbau é cased e pode dar outro score) e só herda um
+        veredito se for cópia quase exata de uma variante já classificada.
+        
+        Com `agrupar_duplicatas`, cada texto também entra num grupo de
+        quase-duplicatas (`IndiceMinHash`, sobre essa mesma entrada do modelo),
+        usado nas estatísticas de campanha. O cache continua sendo pela entrada
+        exata; o veredito só é reaproveitado para cópias quase exatas
+        (similaridade >= `limiar_redundante`) de uma variante já classificada.
+        O resto do grupo vai ao modelo: legendas com afirmações opostas ("é
+        segura" / "não é segura") caem no mesmo grupo.
+        
+        Com `indice_semantico`, o embedding de cada texto que foi ao modelo é
+        guardado no índice junto com o veredito (capturado pelo hook no mesmo
+        forward; textos vindos do cache não entram de novo).
+        
         Args:
             texts: Lista de textos a serem classificados
+            com_grupos: Inclui o grupo de quase-duplicatas e o tamanho atual dele
         
         Returns:
-            Lista de tuplas (is_fake, confidence) para cada texto
+            Lista de tuplas (is_fake, confidence) para cada texto, ou
+            (is_fake, confidence, grupo, tamanho_grupo) com `com_grupos`
         """
         if not texts:
             return []
         
         try:
-            results = self.clf(texts)
-            return [
-                (result["label"] == "LABEL_1", result["score"])
-                for result in results
-            ]
+            normalizadas = normalizar_lote(texts)
+            # A chave é a entrada do modelo; legenda só de entidades (ex.: só
+            # hashtags) fica com o texto original
+            entradas = [n.texto or (t or "") for n, t in zip(normalizadas, texts)]
+            # De onde vem o resultado de cada texto: a própria entrada ou a de
+            # uma variante quase exata classificada neste lote
+            fontes = list(entradas)
+            
+            grupos = representantes = None
+            conhecidos, pendentes, no_lote = {}, {}, {}
+            with self._trava_cache:
+                if self.duplicatas is not None:
+                    grupos, representantes, _ = self.duplicatas.agrupar(entradas, com_entradas=True)
+                    grupos, representantes = grupos.tolist(), representantes.tolist()
+                for i, entrada in enumerate(entradas):
+                    if entrada in self._cache:
+                        self._cache.move_to_end(entrada)
+                        conhecidos[entrada] = self._cache[entrada]
+                    elif entrada in pendentes:
+                        continue
+                    elif representantes is None:
+                        pendentes[entrada] = None
+                    # O representante é o próprio texto (variante nova) ou uma
+                    # cópia quase exata já indexada
+                    elif representantes[i] in self._vereditos_entrada:
+                        self._vereditos_entrada.move_to_end(representantes[i])
+                        conhecidos[entrada] = self._vereditos_entrada[representantes[i]]
+                    elif representantes[i] in no_lote:
+                        fontes[i] = no_lote[representantes[i]]
+                    else:
+                        pendentes[entrada] = representantes[i]
+                        no_lote[representantes[i]] = entrada
+            
+            with span("bert.predict_batch", textos=len(texts), unicos=len(pendentes)):
+                results, embeddings = self._classificar_com_embeddings(list(pendentes)) \
+                    if pendentes else ([], None)
+            
+            for entrada, result in zip(pendentes, results):
+                conhecidos[entrada] = (result["label"] == "LABEL_1", result["score"])
+            if embeddings is not None:
+                try:
+                    self.indice_semantico.adicionar(
+                        embeddings,
+                        [conhecidos[entrada][0] for entrada in pendentes],
+                        [conhecidos[entrada][1] for entrada in pendentes],
+                        textos=list(pendentes),
+                    )
+                except Exception as e:
+                    # O índice é auxiliar: uma falha nele não derruba a classificação
+                    logger.warning(f"Erro ao guardar embeddings no índice semântico: {e}")
+            if pendentes and self.tamanho_cache:
+                with self._trava_cache:
+                    for entrada, representante in pendentes.items():
+                        self._cache[entrada] = conhecidos[entrada]
+                        if representante is not None:
+                            self._vereditos_entrada[representante] = conhecidos[entrada]
+                    for cache in (self._cache, self._vereditos_entrada):
+                        while len(cache) > self.tamanho_cache:
+                            cache.popitem(last=False)
+            
+            if not com_grupos:
+                return [conhecidos[fonte] for fonte in fontes]
+            if grupos is None:
+                return [(*conhecidos[fonte], None, None) for fonte in fontes]
+            tamanhos = self.duplicatas.tamanhos(grupos).tolist()
+            return [(*conhecidos[fonte], g, tamanho) for fonte, g, tamanho in zip(fontes, grupos, tamanhos)]
         except Exception as e:
             logger.error(f"Erro durante a predição em lote: {e}")
             raise
+    
+    def similares_a_fakes(self, texts: list[str], k: int = 5) -> list[list[dict]]:
+        """
+        Busca, para cada texto, os posts já classificados como fake mais parecidos.
+        
+        O texto é normalizado como em `predict_batch` e passa pelo modelo para
+        gerar o embedding; a busca é a do `IndiceSemantico` (IVF, cosseno).
+        
+        Args:
+            texts: Textos a consultar
+            k: Resultados por texto
+        
+        Returns:
+            Por texto, lista de dicts (id, similaridade, texto, is_fake, score),
+            do mais parecido para o menos
+        
+        Raises:
+            ValueError: Se o classificador não tiver índice semântico
+        """
+        if self.indice_semantico is None:
+            raise ValueError("Classificador sem índice semântico (use indice_semantico= ou INDICE_SEMANTICO)")
+        if not texts:
+            return []
+        
+        entradas = [n.texto or (t or "") for n, t in zip(normalizar_lote(texts), texts)]
+        with span("bert.similares_a_fakes", textos=len(texts), k=k):
+            _, embeddings = self._classificar_com_embeddings(entradas)
+            if embeddings is None:
+                raise RuntimeError("Não foi possível capturar os embeddings das consultas")
+            return self.indice_semantico.buscar(embeddings, k=k, so_fakes=True)
 
 
 # Instância global para uso como servidor MCP
@@ -138,10 +324,14 @@ def get_classifier() -> FakeNewsClassifier:
     """
     Retorna a instância singleton do classificador.
     Útil para implementação de servidor MCP.
+    
+    Com a variável de ambiente INDICE_SEMANTICO=pasta, os embeddings dos textos
+    classificados são guardados num `IndiceSemantico` nessa pasta.
     """
     global _classifier
     if _classifier is None:
-        _classifier = FakeNewsClassifier()
+        pasta = os.getenv("INDICE_SEMANTICO")
+        _classifier = FakeNewsClassifier(indice_semantico=IndiceSemantico(pasta) if pasta else None)
     return _classifier
 
 
@@ -162,6 +352,8 @@ def predict(text: str) -> Tuple[bool, float]:
 
 def main():
     """Função principal para teste do classificador."""
+    # --rastrear: latência de cada predição (p50/p95)
+    histograma = ativar_se_pedido()
     classifier = FakeNewsClassifier()
     
     # Exemplos de teste
@@ -183,6 +375,9 @@ def main():
         print(f"{status} (Confiança: {confidence:.2%})")
         print(f"Texto: {text[:80]}{'...' if len(text) > 80 else ''}")
         print("-" * 70)
+    
+    if histograma:
+        histograma.imprimir()
 
 
 if __name__ == "__main__":
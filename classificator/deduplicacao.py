@@ -0,0 +1,505 @@
+"""
+Agrupamento de legendas quase idênticas com MinHash + LSH.
+
+Campanhas coordenadas de desinformação publicam centenas de cópias da mesma
+legenda com pequenas edições (uma palavra trocada, outro emoji, outras
+hashtags). Com este índice, cada legenda cai num grupo de quase-duplicatas
+(similaridade de Jaccard estimada >= `limiar`) e o tamanho de cada grupo fica
+guardado: um grupo que cresce rápido é sinal de campanha coordenada. O grupo
+não diz que as legendas afirmam a mesma coisa ("é segura" e "não é segura"
+passam de 0.8); por isso o `FakeNewsClassifier` só reaproveita o veredito de
+cópias quase exatas (>= `limiar_redundante`) de uma variante já classificada.
+
+Como funciona:
+
+1. shingles de `tamanho_shingle` caracteres da chave normalizada
+   (`classificator.normalizacao`), com hash polinomial calculado em numpy
+   para o lote inteiro de uma vez;
+2. assinatura MinHash de `num_permutacoes` valores de 32 bits (permutações
+   xor-multiplica em uint32, mínimo por legenda com `np.minimum.reduceat`);
+3. LSH: a assinatura é cortada em `bandas` faixas; legendas com uma faixa
+   igual viram candidatas e a similaridade é estimada pelas assinaturas.
+   Cada consulta custa `bandas` buscas binárias, sem depender do tamanho do
+   índice (sub-linear);
+4. armazenamento compacto em arrays: tabelas de faixas ordenadas (uint64 +
+   int32) com um pequeno delta em dicionários, mesclado de tempos em tempos;
+   assinaturas guardadas com 16 bits por valor (b-bit MinHash). Cópias quase
+   exatas (>= `limiar_redundante`) de uma entrada já indexada só contam no
+   tamanho do grupo, sem ocupar espaço: uma campanha de mil cópias ocupa o
+   espaço das suas poucas variantes;
+5. com `max_entradas` (processos residentes), ao passar do limite a metade
+   mais antiga das entradas é esquecida, com os grupos que ficaram sem
+   nenhuma entrada: a memória fica limitada e os ids seguem estáveis.
+
+Uso:
+    from classificator.deduplicacao import IndiceMinHash
+    indice = IndiceMinHash()
+    grupos = indice.agrupar(chaves)        # id do grupo de cada legenda
+    grupos, entradas, similaridades = indice.agrupar(chaves, com_entradas=True)
+    indice.tamanhos(grupos)                # tamanho atual de cada grupo
+
+    python -m classificator.deduplicacao legendas.jsonl [--campo texto] [--limiar 0.8]
+    python -m classificator.deduplicacao benchmark [--legendas 200000]
+"""
+
+import heapq
+import json
+import logging
+import random
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from classificator.normalizacao import normalizar_lote
+
+logger = logging.getLogger(__name__)
+
+SEPARADOR = "\x00"
+
+# Caracteres (de todos os textos somados) por bloco de cálculo das
+# assinaturas: limita a matriz shingles x permutações a ~32 MB
+_CARACTERES_POR_BLOCO = 32_768
+
+
+class IndiceMinHash:
+    """
+    Índice incremental de quase-duplicatas (MinHash + LSH) com grupos.
+
+    Args:
+        num_permutacoes (int): Valores por assinatura (padrão: 128)
+        bandas (int): Faixas do LSH; `num_permutacoes` precisa ser múltiplo (padrão: 16)
+        limiar (float): Jaccard estimado mínimo para entrar num grupo (padrão: 0.8)
+        tamanho_shingle (int): Caracteres por shingle (padrão: 5)
+        limiar_redundante (float): Acima disto a legenda não é indexada, só
+            conta no grupo (padrão: 0.95)
+        semente (int): Semente das permutações (padrão: 1)
+        max_entradas (int): Entradas indexadas antes de esquecer a metade mais
+            antiga (padrão: None, sem limite)
+    """
+
+    def __init__(
+        self,
+        num_permutacoes: int = 128,
+        bandas: int = 16,
+        limiar: float = 0.8,
+        tamanho_shingle: int = 5,
+        limiar_redundante: float = 0.95,
+        semente: int = 1,
+        max_entradas: Optional[int] = None,
+    ):
+        if num_permutacoes % bandas:
+            raise ValueError("num_permutacoes precisa ser múltiplo de bandas")
+        self.num_permutacoes = num_permutacoes
+        self.bandas = bandas
+        self.limiar = limiar
+        self.tamanho_shingle = tamanho_shingle
+        self.limiar_redundante = limiar_redundante
+        self.semente = semente
+        self.max_entradas = max_entradas
+
+        gerador = np.random.default_rng(semente)
+        maximo = np.iinfo(np.uint64).max
+        self._pesos_shingle = gerador.integers(1, maximo, tamanho_shingle, dtype=np.uint64) | np.uint64(1)
+        self._a = gerador.integers(1, 2**32, num_permutacoes, dtype=np.uint32) | np.uint32(1)
+        self._b = gerador.integers(0, 2**32, num_permutacoes, dtype=np.uint32)
+        self._pesos_faixa = gerador.integers(1, maximo, num_permutacoes // bandas, dtype=np.uint64) | np.uint64(1)
+
+        # Entradas indexadas: assinatura (16 bits por valor) e grupo. A posição
+        # local i é a entrada de id `esquecidas + i`
+        self._assinaturas = np.zeros((0, num_permutacoes), dtype=np.uint16)
+        self._grupo_entrada = np.zeros(0, dtype=np.int32)
+        self.entradas = 0
+        self.esquecidas = 0
+        # Grupos vivos: quantidade de legendas em cada um; `grupos` é o próximo id
+        self._tamanhos: dict[int, int] = {}
+        self.grupos = 0
+        self.legendas = 0
+
+        # Tabelas por faixa: chaves ordenadas -> entrada (primeira a chegar), mais o delta recente
+        self._chaves_faixa = [np.zeros(0, dtype=np.uint64) for _ in range(bandas)]
+        self._entradas_faixa = [np.zeros(0, dtype=np.int32) for _ in range(bandas)]
+        self._delta: list[dict[int, int]] = [{} for _ in range(bandas)]
+
+    # ------------------------------
+    # Assinaturas
+    # ------------------------------
+
+    def _assinaturas_bloco(self, textos: list[str]) -> np.ndarray:
+        k = self.tamanho_shingle
+        # Textos curtos completados com espaços: todo texto tem ao menos um shingle
+        bloco = SEPARADOR.join(t.replace(SEPARADOR, " ").ljust(k) for t in textos)
+        codigos = np.frombuffer(bloco.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+        posicoes = len(codigos) - k + 1
+        hashes = np.zeros(posicoes, dtype=np.uint64)
+        for j in range(k):
+            hashes = hashes * self._pesos_shingle[j] + codigos[j:j + posicoes]
+        hashes = ((hashes >> np.uint64(32)) ^ hashes).astype(np.uint32)
+
+        # Janelas que atravessam um separador não são shingles de ninguém
+        separadores = np.concatenate(([0], np.cumsum(codigos == 0)))
+        validos = separadores[k:k + posicoes] == separadores[:posicoes]
+        legenda = separadores[:posicoes][validos]
+        hashes = hashes[validos]
+
+        # Permutação i: (x ^ b_i) * a_i mod 2^32 (bijeção em 32 bits; os hashes
+        # já vêm misturados). Em uint32 custa 1/4 da versão em 64 bits. Uma
+        # permutação por linha, shingles nas colunas: contíguo para o reduceat
+        valores = np.empty((self.num_permutacoes, len(hashes)), dtype=np.uint32)
+        np.bitwise_xor(self._b[:, None], hashes[None, :], out=valores)
+        np.multiply(valores, self._a[:, None], out=valores)
+        inicios = np.searchsorted(legenda, np.arange(len(textos)))
+        return np.minimum.reduceat(valores, inicios, axis=1).T.copy()
+
+    def assinaturas(self, textos: list[str]) -> np.ndarray:
+        """
+        Assinaturas MinHash de um lote (sem alterar o índice).
+
+        Args:
+            textos (list[str]): Chaves normalizadas (ver `normalizar_lote`)
+
+        Returns:
+            np.ndarray: Matriz (len(textos), num_permutacoes) uint32
+        """
+        if not textos:
+            return np.zeros((0, self.num_permutacoes), dtype=np.uint32)
+        partes, atual, caracteres = [], [], 0
+        for texto in textos:
+            atual.append(texto)
+            caracteres += len(texto) + 1
+            if caracteres >= _CARACTERES_POR_BLOCO:
+                partes.append(self._assinaturas_bloco(atual))
+                atual, caracteres = [], 0
+        if atual:
+            partes.append(self._assinaturas_bloco(atual))
+        return np.concatenate(partes)
+
+    def _chaves_faixas(self, assinaturas: np.ndarray) -> np.ndarray:
+        linhas = self.num_permutacoes // self.bandas
+        faixas = assinaturas.astype(np.uint64).reshape(len(assinaturas), self.bandas, linhas)
+        return (faixas * self._pesos_faixa).sum(axis=2, dtype=np.uint64)
+
+    # ------------------------------
+    # Agrupamento
+    # ------------------------------
+
+    def _candidatas_ordenadas(self, chaves: np.ndarray) -> np.ndarray:
+        """Entrada com a mesma chave em cada faixa, nas tabelas ordenadas (-1 = nenhuma)."""
+        candidatas = np.full(chaves.shape, -1, dtype=np.int64)
+        for j in range(self.bandas):
+            tabela = self._chaves_faixa[j]
+            if not len(tabela):
+                continue
+            posicoes = np.minimum(np.searchsorted(tabela, chaves[:, j]), len(tabela) - 1)
+            iguais = tabela[posicoes] == chaves[:, j]
+            candidatas[iguais, j] = self._entradas_faixa[j][posicoes[iguais]]
+        return candidatas
+
+    def _crescer(self, entradas: int) -> None:
+        if entradas > len(self._grupo_entrada):
+            capacidade = max(entradas, 2 * len(self._grupo_entrada), 1024)
+            self._assinaturas = np.resize(self._assinaturas, (capacidade, self.num_permutacoes))
+            self._grupo_entrada = np.resize(self._grupo_entrada, capacidade)
+
+    def agrupar(self, textos: list[str], com_entradas: bool = False):
+        """
+        Põe cada texto num grupo de quase-duplicatas (existente ou novo).
+
+        Args:
+            textos (list[str]): Chaves normalizadas (ver `normalizar_lote`)
+            com_entradas (bool): Devolve também a entrada indexada que representa
+                cada texto e a similaridade com ela
+
+        Returns:
+            np.ndarray: Id do grupo de cada texto (int64); com `com_entradas`,
+            (grupos, entradas, similaridades): a entrada é a do próprio texto
+            quando ele foi indexado, ou a variante quase exata (similaridade >=
+            `limiar_redundante`) em que ele foi contado
+        """
+        assinaturas = self.assinaturas(textos)
+        curtas = assinaturas.astype(np.uint16)
+        chaves = self._chaves_faixas(assinaturas)
+        candidatas_ordenadas = self._candidatas_ordenadas(chaves).tolist()
+        chaves = chaves.tolist()
+
+        self._crescer(self.entradas + len(textos))
+        grupos = np.empty(len(textos), dtype=np.int64)
+        representantes = np.empty(len(textos), dtype=np.int64)
+        similaridades_texto = np.zeros(len(textos), dtype=np.float64)
+        for i, (chaves_item, ordenadas) in enumerate(zip(chaves, candidatas_ordenadas)):
+            candidatas = {c for c in ordenadas if c >= 0}
+            for delta, chave in zip(self._delta, chaves_item):
+                entrada = delta.get(chave)
+                if entrada is not None:
+                    candidatas.add(entrada)
+
+            grupo, similaridade, entrada = -1, 0.0, -1
+            if candidatas:
+                indices = np.fromiter(candidatas, dtype=np.int64, count=len(candidatas))
+                similaridades = (self._assinaturas[indices] == curtas[i]).mean(axis=1)
+                melhor = int(similaridades.argmax())
+                if similaridades[melhor] >= self.limiar:
+                    entrada = int(indices[melhor])
+                    grupo, similaridade = int(self._grupo_entrada[entrada]), float(similaridades[melhor])
+            if grupo < 0:
+                grupo = self.grupos
+                self.grupos += 1
+            self._tamanhos[grupo] = self._tamanhos.get(grupo, 0) + 1
+            grupos[i] = grupo
+
+            # Variante nova (ou novo grupo): entra no índice
+            if similaridade < self.limiar_redundante:
+                entrada, similaridade = self.entradas, 1.0
+                self._assinaturas[entrada] = curtas[i]
+                self._grupo_entrada[entrada] = grupo
+                self.entradas += 1
+                for delta, chave in zip(self._delta, chaves_item):
+                    delta.setdefault(chave, entrada)
+            representantes[i] = self.esquecidas + entrada
+            similaridades_texto[i] = similaridade
+
+        self.legendas += len(textos)
+        if self.max_entradas and self.entradas > self.max_entradas:
+            self._esquecer(self.max_entradas // 2)
+        elif len(self._delta[0]) > max(65_536, len(self._chaves_faixa[0]) // 4):
+            self._mesclar_delta()
+        if com_entradas:
+            return grupos, representantes, similaridades_texto
+        return grupos
+
+    def _esquecer(self, manter: int) -> None:
+        """Fica só com as `manter` entradas mais recentes e os grupos delas."""
+        self._mesclar_delta()
+        corte = self.entradas - manter
+        self._assinaturas = self._assinaturas[corte:self.entradas].copy()
+        self._grupo_entrada = self._grupo_entrada[corte:self.entradas].copy()
+        for j in range(self.bandas):
+            vivas = self._entradas_faixa[j] >= corte
+            self._chaves_faixa[j] = self._chaves_faixa[j][vivas]
+            self._entradas_faixa[j] = self._entradas_faixa[j][vivas] - corte
+        vivos = set(self._grupo_entrada.tolist())
+        self._tamanhos = {grupo: tamanho for grupo, tamanho in self._tamanhos.items() if grupo in vivos}
+        self.entradas = manter
+        self.esquecidas += corte
+        logger.info("🧬 Índice de duplicatas: %d entradas antigas esquecidas, %d grupos vivos",
+                    corte, len(self._tamanhos))
+
+    def _mesclar_delta(self) -> None:
+        """Mescla o delta nas tabelas ordenadas (a primeira entrada de cada chave fica)."""
+        for j in range(self.bandas):
+            if not self._delta[j]:
+                continue
+            chaves = np.concatenate((self._chaves_faixa[j], np.fromiter(self._delta[j].keys(), dtype=np.uint64)))
+            entradas = np.concatenate((self._entradas_faixa[j],
+                                       np.fromiter(self._delta[j].values(), dtype=np.int32)))
+            chaves, primeiras = np.unique(chaves, return_index=True)
+            self._chaves_faixa[j], self._entradas_faixa[j] = chaves, entradas[primeiras]
+            self._delta[j] = {}
+
+    # ------------------------------
+    # Consultas e persistência
+    # ------------------------------
+
+    def tamanhos(self, grupos) -> np.ndarray:
+        """
+        Tamanho atual (legendas vistas) de cada grupo.
+
+        Args:
+            grupos: Ids de grupo (como os devolvidos por `agrupar`)
+
+        Returns:
+            np.ndarray: Tamanho de cada grupo, na mesma ordem (0 para grupo esquecido)
+        """
+        return np.array([self._tamanhos.get(int(g), 0) for g in grupos], dtype=np.int64)
+
+    def maiores_grupos(self, quantidade: int = 10) -> list[tuple[int, int]]:
+        """
+        Grupos com mais legendas (candidatos a campanha coordenada).
+
+        Args:
+            quantidade (int): Quantos grupos devolver (padrão: 10)
+
+        Returns:
+            list[tuple[int, int]]: (grupo, tamanho), do maior para o menor
+        """
+        return heapq.nlargest(quantidade, self._tamanhos.items(), key=lambda item: (item[1], -item[0]))
+
+    def estatisticas(self) -> dict:
+        """Legendas, grupos, entradas indexadas e bytes ocupados pelos arrays."""
+        self._mesclar_delta()
+        bytes_arrays = (self._assinaturas[:self.entradas].nbytes + self._grupo_entrada[:self.entradas].nbytes
+                        + sys.getsizeof(self._tamanhos)
+                        + sum(c.nbytes + e.nbytes for c, e in zip(self._chaves_faixa, self._entradas_faixa)))
+        return {
+            "legendas": self.legendas,
+            "grupos": self.grupos,
+            "grupos_vivos": len(self._tamanhos),
+            "entradas_indexadas": self.entradas,
+            "bytes": bytes_arrays,
+            "bytes_por_legenda": round(bytes_arrays / self.legendas, 1) if self.legendas else 0.0,
+        }
+
+    def salvar(self, caminho: str) -> None:
+        """
+        Grava o índice em um arquivo .npz.
+
+        Args:
+            caminho (str): Arquivo de destino
+        """
+        self._mesclar_delta()
+        arrays = {f"chaves_{j}": c for j, c in enumerate(self._chaves_faixa)}
+        arrays.update({f"entradas_{j}": e for j, e in enumerate(self._entradas_faixa)})
+        parametros = [self.num_permutacoes, self.bandas, self.tamanho_shingle, self.semente, self.legendas,
+                      self.grupos, self.esquecidas, self.max_entradas or 0]
+        np.savez(
+            caminho,
+            assinaturas=self._assinaturas[:self.entradas],
+            grupo_entrada=self._grupo_entrada[:self.entradas],
+            grupos_vivos=np.fromiter(self._tamanhos.keys(), dtype=np.int64, count=len(self._tamanhos)),
+            tamanhos=np.fromiter(self._tamanhos.values(), dtype=np.int64, count=len(self._tamanhos)),
+            parametros=np.array(parametros, dtype=np.int64),
+            limiares=np.array([self.limiar, self.limiar_redundante]),
+            **arrays,
+        )
+
+    @classmethod
+    def carregar(cls, caminho: str) -> "IndiceMinHash":
+        """
+        Lê um índice gravado por `salvar`.
+
+        Args:
+            caminho (str): Arquivo .npz
+
+        Returns:
+            IndiceMinHash: Índice pronto para novas legendas
+        """
+        with np.load(caminho) as dados:
+            parametros = dados["parametros"].tolist()
+            num_permutacoes, bandas, tamanho_shingle, semente, legendas = parametros[:5]
+            limiar, limiar_redundante = dados["limiares"].tolist()
+            tamanhos = dados["tamanhos"].tolist()
+            # Arquivos antigos: todos os grupos vivos, na ordem dos ids
+            grupos_vivos = dados["grupos_vivos"].tolist() if "grupos_vivos" in dados else range(len(tamanhos))
+            grupos, esquecidas, max_entradas = parametros[5:] if len(parametros) > 5 else (len(tamanhos), 0, 0)
+            indice = cls(num_permutacoes, bandas, limiar, tamanho_shingle, limiar_redundante, semente,
+                         max_entradas or None)
+            indice._assinaturas = dados["assinaturas"].copy()
+            indice._grupo_entrada = dados["grupo_entrada"].copy()
+            indice._tamanhos = dict(zip(grupos_vivos, tamanhos))
+            indice._chaves_faixa = [dados[f"chaves_{j}"] for j in range(bandas)]
+            indice._entradas_faixa = [dados[f"entradas_{j}"] for j in range(bandas)]
+        indice.entradas = len(indice._grupo_entrada)
+        indice.grupos = grupos
+        indice.esquecidas = esquecidas
+        indice.legendas = legendas
+        return indice
+
+
+# ==============================
+# Benchmark com campanhas sintéticas
+# ==============================
+
+_VOCABULARIO = (
+    "governo vacina presidente eleição urna fraude supremo ministro congresso imposto pix banco "
+    "estudo médicos cientistas mídia esconde verdade urgente compartilhe antes apaguem brasil "
+    "saúde escola prefeitura polícia investigação dinheiro público aprovado projeto lei senado "
+    "denúncia vídeo mostra prova secreta notícia falsa real confirmado oficial agência hoje amanhã"
+).split()
+
+
+def _legendas_campanhas(quantidade: int, copias_por_campanha: int = 50, semente: int = 7) -> tuple[list, list]:
+    """Legendas originais únicas + campanhas de cópias editadas (uma palavra trocada, caixa, emoji, hashtags)."""
+    aleatorio = random.Random(semente)
+    legendas, campanha = [], []
+    while len(legendas) < quantidade:
+        base = [aleatorio.choice(_VOCABULARIO) for _ in range(aleatorio.randint(20, 45))]
+        if aleatorio.random() < 0.2:
+            id_campanha = len(legendas)
+            for _ in range(copias_por_campanha):
+                copia = list(base)
+                if aleatorio.random() < 0.5:
+                    copia[aleatorio.randrange(len(copia))] = aleatorio.choice(_VOCABULARIO)
+                texto = " ".join(copia)
+                if aleatorio.random() < 0.5:
+                    texto = "🚨 " + texto.upper()
+                texto += " #" + aleatorio.choice(_VOCABULARIO) * aleatorio.randint(1, 2)
+                legendas.append(texto)
+                campanha.append(id_campanha)
+        else:
+            legendas.append(" ".join(base))
+            campanha.append(-1)
+    return legendas[:quantidade], campanha[:quantidade]
+
+
+def benchmark(legendas: int = 200_000, tamanho_lote: int = 1000) -> dict:
+    """
+    Agrupa legendas sintéticas com campanhas conhecidas e mede vazão e qualidade.
+
+    Args:
+        legendas (int): Total de legendas (padrão: 200000)
+        tamanho_lote (int): Legendas por chamada de `agrupar` (padrão: 1000)
+
+    Returns:
+        dict: legendas/s, consulta média, pureza das campanhas, grupos e bytes por legenda
+    """
+    textos, campanhas = _legendas_campanhas(legendas)
+    chaves = [n.chave for n in normalizar_lote(textos)]
+    indice = IndiceMinHash()
+
+    grupos = []
+    inicio = time.perf_counter()
+    for i in range(0, len(chaves), tamanho_lote):
+        grupos.extend(indice.agrupar(chaves[i:i + tamanho_lote]).tolist())
+    segundos = time.perf_counter() - inicio
+
+    # Pureza: fração das cópias de cada campanha que caiu no grupo mais comum dela
+    por_campanha: dict[int, list[int]] = {}
+    for grupo, campanha in zip(grupos, campanhas):
+        if campanha >= 0:
+            por_campanha.setdefault(campanha, []).append(grupo)
+    juntas = sum(max(np.bincount(np.unique(g, return_inverse=True)[1])) for g in por_campanha.values())
+    copias = sum(len(g) for g in por_campanha.values())
+    unicas = sum(1 for c in campanhas if c < 0)
+
+    return {
+        "legendas": legendas,
+        "legendas_por_s": round(legendas / segundos),
+        "campanhas": len(por_campanha),
+        "copias_no_grupo_da_campanha": round(juntas / copias, 4) if copias else None,
+        "grupos": indice.grupos,
+        "grupos_esperados": unicas + len(por_campanha),
+        **{chave: valor for chave, valor in indice.estatisticas().items() if chave != "legendas"},
+    }
+
+
+def _argumento(nome: str, padrao: Optional[str]) -> Optional[str]:
+    if nome in sys.argv:
+        return sys.argv[sys.argv.index(nome) + 1]
+    return padrao
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m classificator.deduplicacao (legendas.jsonl [--campo texto] | benchmark [--legendas N])")
+    elif sys.argv[1] == "benchmark":
+        resultado = benchmark(int(_argumento("--legendas", "200000")))
+        print(f"🧬 {resultado['legendas']} legendas ({resultado['campanhas']} campanhas sintéticas)")
+        print(f"   {resultado['legendas_por_s']:,} legendas/s | {resultado['grupos']} grupos "
+              f"(esperados {resultado['grupos_esperados']})")
+        print(f"   Cópias no grupo da campanha: {resultado['copias_no_grupo_da_campanha']:.2%}")
+        print(f"   {resultado['entradas_indexadas']} entradas indexadas | "
+              f"{resultado['bytes'] / 1e6:.1f} MB ({resultado['bytes_por_legenda']} bytes/legenda)")
+    else:
+        campo = _argumento("--campo", "texto")
+        indice = IndiceMinHash(limiar=float(_argumento("--limiar", "0.8")))
+        with open(sys.argv[1], "r", encoding="utf-8") as f:
+            textos = [json.loads(linha).get(campo) or "" for linha in f if linha.strip()]
+        grupos = indice.agrupar([n.chave for n in normalizar_lote(textos)])
+        exemplo = {}
+        for texto, grupo in zip(textos, grupos.tolist()):
+            exemplo.setdefault(grupo, texto)
+        print(f"🧬 {len(textos)} legendas em {indice.grupos} grupos")
+        for grupo, tamanho in indice.maiores_grupos(10):
+            print(f"   {tamanho:>6}x  {exemplo[grupo][:90]}")
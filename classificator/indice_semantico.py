@@ -0,0 +1,535 @@
+"""
+Índice semântico dos posts já classificados.
+
+Para achar posts novos parecidos com desinformação já conhecida, o
+`FakeNewsClassifier` guarda aqui a representação de cada texto que classifica:
+a média (pela máscara de atenção) da última camada do BERTimbau, capturada por
+um hook no forward que o `predict_batch` já faz, sem inferência extra.
+
+Armazenamento (numa pasta):
+
+- `vetores.f16`: matriz float16 mapeada em memória (`np.memmap`), uma linha
+  normalizada por post (768 dimensões = 1,5 KB por post); cresce dobrando;
+- `metadados.db`: SQLite com texto, veredito (is_fake) e score de cada linha;
+- `ivf.npz`: índice IVF (k-means esférico): centróides e a lista de cada
+  linha. A busca compara a consulta com os centróides, varre só as `nprobe`
+  listas mais próximas (filtrando pelos fakes antes de ler os vetores) e
+  ordena os candidatos pelo cosseno.
+
+Linhas novas entram na lista do centróide mais próximo na hora. O trabalho
+pesado (treinar o IVF ao chegar a `treino_minimo` linhas, retreinar quando o
+índice cresce 4x, levar as linhas novas para a estrutura ordenada, CSR) roda
+numa thread de manutenção: k-means, atribuição e CSR são calculados sem a
+trava e trocados de uma vez no final, então `adicionar` (chamado pelo
+`predict_batch`) e `buscar` não esperam o treino. Com `treino_automatico=False`
+o treino fica só para `treinar()` ou para a linha de comando.
+
+Uso:
+    from classificator.indice_semantico import IndiceSemantico
+    indice = IndiceSemantico("indice_semantico")
+    FakeNewsClassifier(indice_semantico=indice)      # ou INDICE_SEMANTICO=pasta
+    classifier.similares_a_fakes(["texto novo"], k=5)
+
+    python -m classificator.indice_semantico pasta "texto a consultar" [--k 5]   # exige o modelo
+    python -m classificator.indice_semantico treinar pasta
+    python -m classificator.indice_semantico benchmark [--vetores 200000] [--dimensao 768]
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from comum.estatisticas import percentil
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_VETORES = "vetores.f16"
+ARQUIVO_METADADOS = "metadados.db"
+ARQUIVO_IVF = "ivf.npz"
+
+# Linhas por bloco ao atribuir listas (limita a matriz linhas x centróides)
+_LINHAS_POR_BLOCO = 65_536
+
+
+def _normalizar(vetores: np.ndarray) -> np.ndarray:
+    vetores = np.asarray(vetores, dtype=np.float32)
+    normas = np.linalg.norm(vetores, axis=1, keepdims=True)
+    return vetores / np.maximum(normas, 1e-12)
+
+
+def _csr(lista: np.ndarray, listas: int) -> tuple[np.ndarray, np.ndarray]:
+    """Linhas ordenadas por lista e onde cada lista começa."""
+    ordem = np.argsort(lista, kind="stable")
+    return ordem, np.searchsorted(lista[ordem], np.arange(listas + 1))
+
+
+def _atribuir(vetores: np.ndarray, centroides: np.ndarray, inicio: int, fim: int) -> np.ndarray:
+    """Centróide mais próximo de cada linha em [inicio, fim), em blocos."""
+    listas = np.empty(fim - inicio, dtype=np.int32)
+    for bloco in range(inicio, fim, _LINHAS_POR_BLOCO):
+        ate = min(fim, bloco + _LINHAS_POR_BLOCO)
+        listas[bloco - inicio:ate - inicio] = np.argmax(vetores[bloco:ate].astype(np.float32) @ centroides.T, axis=1)
+    return listas
+
+
+def _crescer(array: np.ndarray, tamanho: int, preencher=0) -> np.ndarray:
+    if tamanho <= len(array):
+        return array
+    novo = np.full(max(tamanho, 2 * len(array), 1024), preencher, dtype=array.dtype)
+    novo[:len(array)] = array
+    return novo
+
+
+class IndiceSemantico:
+    """
+    Vetores de posts classificados com busca aproximada (IVF) pelos mais parecidos.
+
+    Args:
+        pasta (str): Onde ficam vetores, metadados e IVF (padrão: "indice_semantico")
+        dimensao (int): Dimensão dos vetores (padrão: 768, BERTimbau base)
+        nprobe (int): Listas do IVF varridas por consulta (padrão: 16)
+        treino_minimo (int): Linhas para treinar o IVF; antes disso a busca é exata (padrão: 4096)
+        treino_automatico (bool): Treina e reorganiza o IVF numa thread de fundo
+            quando preciso (padrão: True); com False, só via `treinar()`
+    """
+
+    def __init__(
+        self,
+        pasta: str = "indice_semantico",
+        dimensao: int = 768,
+        nprobe: int = 16,
+        treino_minimo: int = 4096,
+        treino_automatico: bool = True,
+    ):
+        os.makedirs(pasta, exist_ok=True)
+        self.pasta = pasta
+        self.dimensao = dimensao
+        self.nprobe = nprobe
+        self.treino_minimo = treino_minimo
+        self.treino_automatico = treino_automatico
+        self._trava = threading.RLock()
+        # Uma manutenção (treino ou CSR) por vez; o cálculo roda fora de `_trava`
+        self._trava_manutencao = threading.Lock()
+        self._manutencao: Optional[threading.Thread] = None
+
+        self._conexao = sqlite3.connect(os.path.join(pasta, ARQUIVO_METADADOS), check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS vetores (
+                id INTEGER PRIMARY KEY,
+                texto TEXT,
+                is_fake INTEGER NOT NULL,
+                score REAL NOT NULL,
+                adicionado_em TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS config (chave TEXT PRIMARY KEY, valor TEXT NOT NULL);
+        """)
+        linha = self._conexao.execute("SELECT valor FROM config WHERE chave = 'dimensao'").fetchone()
+        if linha is None:
+            with self._conexao:
+                self._conexao.execute("INSERT INTO config VALUES ('dimensao', ?)", (str(dimensao),))
+        elif int(linha[0]) != dimensao:
+            raise ValueError(f"Índice em {pasta} tem dimensão {linha[0]}, não {dimensao}")
+
+        fakes = [f for (f,) in self._conexao.execute("SELECT is_fake FROM vetores ORDER BY id")]
+        self.total = len(fakes)
+        self._fake = _crescer(np.array(fakes, dtype=np.int8), self.total)
+        self._vetores: Optional[np.memmap] = None
+        self._abrir_vetores(max(self.total, 1024))
+
+        # IVF: centróides, lista de cada linha (-1 = sem lista) e CSR das linhas [0, _csr_ate)
+        self._centroides: Optional[np.ndarray] = None
+        self._lista = np.full(max(self.total, 1024), -1, dtype=np.int32)
+        self._ordem = np.zeros(0, dtype=np.int64)
+        self._inicios = np.zeros(1, dtype=np.int64)
+        self._csr_ate = 0
+        self._treinado_com = 0
+        self._carregar_ivf()
+
+    # ------------------------------
+    # Armazenamento
+    # ------------------------------
+
+    def _abrir_vetores(self, capacidade: int) -> None:
+        caminho = os.path.join(self.pasta, ARQUIVO_VETORES)
+        tamanho = capacidade * self.dimensao * 2
+        if not os.path.exists(caminho) or os.path.getsize(caminho) < tamanho:
+            if self._vetores is not None:
+                self._vetores.flush()
+                self._vetores = None
+            with open(caminho, "ab") as f:
+                f.truncate(tamanho)
+        else:
+            capacidade = os.path.getsize(caminho) // (self.dimensao * 2)
+        self._vetores = np.memmap(caminho, dtype=np.float16, mode="r+", shape=(capacidade, self.dimensao))
+
+    def _carregar_ivf(self) -> None:
+        caminho = os.path.join(self.pasta, ARQUIVO_IVF)
+        if not os.path.exists(caminho):
+            self._agendar_manutencao()
+            return
+        with np.load(caminho) as dados:
+            self._centroides = dados["centroides"]
+            lista = dados["lista"]
+            self._treinado_com = int(dados["treinado_com"])
+        self._lista = _crescer(self._lista, self.total, -1)
+        self._lista[:len(lista)] = lista
+        # Linhas gravadas depois do último `salvar`: entram nas listas agora
+        if len(lista) < self.total:
+            self._lista[len(lista):self.total] = _atribuir(self._vetores, self._centroides, len(lista), self.total)
+        self._ordem, self._inicios = _csr(self._lista[:self.total], len(self._centroides))
+        self._csr_ate = self.total
+        self._agendar_manutencao()
+
+    def adicionar(self, vetores, is_fake, scores, textos: Optional[list] = None) -> np.ndarray:
+        """
+        Acrescenta vetores de posts classificados.
+
+        Args:
+            vetores: Matriz (n, dimensao); é normalizada antes de gravar
+            is_fake: Veredito de cada linha
+            scores: Confiança de cada veredito
+            textos (list): Texto de cada linha (opcional, para mostrar nas buscas)
+
+        Returns:
+            np.ndarray: Ids das linhas gravadas
+        """
+        vetores = _normalizar(np.asarray(vetores).reshape(-1, self.dimensao))
+        quantidade = len(vetores)
+        is_fake = np.asarray(is_fake, dtype=np.int8).reshape(quantidade)
+        scores = np.asarray(scores, dtype=np.float64).reshape(quantidade)
+        textos = textos if textos is not None else [None] * quantidade
+        agora = datetime.now().isoformat()
+
+        with self._trava:
+            inicio, fim = self.total, self.total + quantidade
+            if fim > len(self._vetores):
+                self._abrir_vetores(max(fim, 2 * len(self._vetores)))
+            self._vetores[inicio:fim] = vetores
+            self._fake = _crescer(self._fake, fim)
+            self._fake[inicio:fim] = is_fake
+            self._lista = _crescer(self._lista, fim, -1)
+            if self._centroides is not None:
+                self._lista[inicio:fim] = np.argmax(vetores @ self._centroides.T, axis=1)
+            with self._conexao:
+                self._conexao.executemany(
+                    "INSERT INTO vetores (id, texto, is_fake, score, adicionado_em) VALUES (?, ?, ?, ?, ?)",
+                    zip(range(inicio, fim), textos, is_fake.tolist(), scores.tolist(), [agora] * quantidade),
+                )
+            self.total = fim
+            self._agendar_manutencao()
+        return np.arange(inicio, fim)
+
+    # ------------------------------
+    # IVF
+    # ------------------------------
+
+    def _manutencao_pendente(self) -> Optional[str]:
+        """Manutenção que falta: "treinar", "listas" (CSR atrasado) ou None."""
+        if self._centroides is None:
+            return "treinar" if self.total >= self.treino_minimo else None
+        if self.total >= 4 * self._treinado_com:
+            return "treinar"
+        if self.total - self._csr_ate > max(100_000, self._csr_ate // 10):
+            return "listas"
+        return None
+
+    def _agendar_manutencao(self) -> None:
+        with self._trava:
+            if not self.treino_automatico or self._manutencao_pendente() is None:
+                return
+            if self._manutencao is not None and self._manutencao.is_alive():
+                return
+            self._manutencao = threading.Thread(target=self._manter, name="indice-semantico-ivf", daemon=True)
+            self._manutencao.start()
+
+    def _manter(self) -> None:
+        try:
+            with self._trava:
+                tarefa = self._manutencao_pendente()
+            if tarefa == "treinar":
+                self.treinar()
+            elif tarefa == "listas":
+                self._remontar_listas()
+        except Exception:
+            logger.exception("Erro na manutenção do IVF em %s", self.pasta)
+
+    def aguardar_manutencao(self) -> None:
+        """Espera a thread de manutenção em andamento, se houver."""
+        manutencao = self._manutencao
+        if manutencao is not None:
+            manutencao.join()
+
+    def _remontar_listas(self) -> None:
+        """Leva as linhas da cauda para o CSR; a ordenação roda fora de `_trava`."""
+        with self._trava_manutencao:
+            with self._trava:
+                total, centroides = self.total, self._centroides
+                lista = self._lista[:total].copy()
+            ordem, inicios = _csr(lista, len(centroides))
+            with self._trava:
+                # Retreinado no meio do caminho: o CSR calculado já não vale
+                if self._centroides is centroides:
+                    self._ordem, self._inicios, self._csr_ate = ordem, inicios, total
+
+    def treinar(self, listas: Optional[int] = None, iteracoes: int = 10, semente: int = 0) -> None:
+        """
+        (Re)treina o IVF com k-means esférico sobre uma amostra das linhas.
+
+        O k-means, a atribuição de todas as linhas e o CSR são calculados sem
+        segurar a trava do índice (inserções e buscas seguem com o IVF antigo);
+        no final, as linhas inseridas durante o treino são atribuídas e o novo
+        IVF substitui o antigo de uma vez.
+
+        Args:
+            listas (int): Número de listas (padrão: ~sqrt(total), entre 16 e 4096)
+            iteracoes (int): Iterações do k-means (padrão: 10)
+            semente (int): Semente da amostra e dos centróides iniciais (padrão: 0)
+        """
+        with self._trava_manutencao:
+            with self._trava:
+                # Linhas [0, total) não mudam mais; o memmap antigo continua válido
+                # mesmo que `adicionar` abra um maior enquanto isso
+                total, vetores = self.total, self._vetores
+            if total == 0:
+                return
+            listas = listas or int(min(4096, max(16, math.sqrt(total))))
+            listas = min(listas, total)
+            inicio = time.perf_counter()
+
+            gerador = np.random.default_rng(semente)
+            amostra = np.sort(gerador.choice(total, min(total, 64 * listas), replace=False))
+            pontos = vetores[amostra].astype(np.float32)
+            centroides = pontos[gerador.choice(len(pontos), listas, replace=False)].copy()
+
+            for _ in range(iteracoes):
+                atribuicao = np.argmax(pontos @ centroides.T, axis=1)
+                ordem = np.argsort(atribuicao, kind="stable")
+                usados, inicios = np.unique(atribuicao[ordem], return_index=True)
+                centroides[usados] = np.add.reduceat(pontos[ordem], inicios, axis=0)
+                # Listas vazias recomeçam num ponto qualquer da amostra
+                vazias = np.setdiff1d(np.arange(listas), usados)
+                centroides[vazias] = pontos[gerador.choice(len(pontos), len(vazias))]
+                centroides = _normalizar(centroides)
+
+            lista = _atribuir(vetores, centroides, 0, total)
+            ordem, inicios = _csr(lista, listas)
+
+            with self._trava:
+                fim = self.total
+                nova = np.full(max(len(self._lista), fim), -1, dtype=np.int32)
+                nova[:total] = lista
+                if fim > total:
+                    nova[total:fim] = _atribuir(self._vetores, centroides, total, fim)
+                self._centroides, self._lista = centroides, nova
+                self._ordem, self._inicios, self._csr_ate = ordem, inicios, total
+                self._treinado_com = total
+            logger.info("🧭 IVF treinado: %d listas, %d linhas em %.1fs", listas, total, time.perf_counter() - inicio)
+
+    # ------------------------------
+    # Busca
+    # ------------------------------
+
+    def _candidatos(self, consulta: np.ndarray, nprobe: int) -> np.ndarray:
+        if self._centroides is None:
+            return np.arange(self.total)
+        nprobe = min(nprobe, len(self._centroides))
+        sondas = np.argpartition(-(self._centroides @ consulta), nprobe - 1)[:nprobe]
+        partes = [self._ordem[self._inicios[s]:self._inicios[s + 1]] for s in sondas]
+        cauda = np.arange(self._csr_ate, self.total)
+        partes.append(cauda[np.isin(self._lista[cauda], sondas)])
+        return np.concatenate(partes)
+
+    def buscar(self, consultas, k: int = 10, so_fakes: bool = True, nprobe: Optional[int] = None) -> list[list[dict]]:
+        """
+        Posts mais parecidos (cosseno) com cada consulta.
+
+        Args:
+            consultas: Vetor (dimensao,) ou matriz (q, dimensao)
+            k (int): Resultados por consulta (padrão: 10)
+            so_fakes (bool): Só posts classificados como fake (padrão: True)
+            nprobe (int): Listas varridas (padrão: o do índice)
+
+        Returns:
+            list[list[dict]]: Por consulta: id, similaridade, texto, is_fake e score,
+                do mais parecido para o menos
+        """
+        consultas = _normalizar(np.asarray(consultas).reshape(-1, self.dimensao))
+        achados = []
+        with self._trava:
+            for consulta in consultas:
+                candidatos = self._candidatos(consulta, nprobe or self.nprobe)
+                if so_fakes:
+                    candidatos = candidatos[self._fake[candidatos] == 1]
+                # Leitura em ordem crescente: acesso sequencial no arquivo mapeado
+                candidatos.sort()
+                similaridades = self._vetores[candidatos].astype(np.float32) @ consulta
+                melhores = np.argsort(-similaridades)[:k] if len(candidatos) <= k else \
+                    np.argpartition(-similaridades, k - 1)[:k]
+                melhores = melhores[np.argsort(-similaridades[melhores])]
+                achados.append([(int(candidatos[i]), float(similaridades[i])) for i in melhores])
+
+            ids = sorted({id_ for lista in achados for id_, _ in lista})
+            metadados = {}
+            for i in range(0, len(ids), 500):
+                parte = ids[i:i + 500]
+                metadados.update({
+                    linha[0]: linha[1:] for linha in self._conexao.execute(
+                        f"SELECT id, texto, is_fake, score FROM vetores WHERE id IN ({','.join('?' * len(parte))})",
+                        parte,
+                    )
+                })
+
+        return [
+            [{"id": id_, "similaridade": round(similaridade, 4), "texto": metadados[id_][0],
+              "is_fake": bool(metadados[id_][1]), "score": metadados[id_][2]}
+             for id_, similaridade in lista]
+            for lista in achados
+        ]
+
+    def estatisticas(self) -> dict:
+        """Linhas, fakes, listas do IVF e bytes dos vetores."""
+        return {
+            "linhas": self.total,
+            "fakes": int(self._fake[:self.total].sum()),
+            "listas": 0 if self._centroides is None else len(self._centroides),
+            "nprobe": self.nprobe,
+            "bytes_vetores": self.total * self.dimensao * 2,
+        }
+
+    def salvar(self) -> None:
+        """Grava vetores pendentes no disco e o IVF em `ivf.npz`."""
+        with self._trava:
+            self._vetores.flush()
+            if self._centroides is not None:
+                np.savez(os.path.join(self.pasta, ARQUIVO_IVF), centroides=self._centroides,
+                         lista=self._lista[:self.total], treinado_com=np.int64(self._treinado_com))
+
+    def fechar(self) -> None:
+        self.aguardar_manutencao()
+        self.salvar()
+        self._conexao.close()
+        self._vetores = None
+
+
+# ==============================
+# Benchmark com vetores sintéticos
+# ==============================
+
+def benchmark(vetores: int = 200_000, dimensao: int = 768, consultas: int = 200, k: int = 10) -> dict:
+    """
+    Mede latência e recall@k da busca de fakes parecidos num índice sintético.
+
+    Os vetores vêm de 2000 "assuntos" (centro aleatório + ruído), 30% marcados
+    como fake; as consultas são fakes do índice com ruído novo. O recall é
+    contra a busca exata sobre os mesmos fakes.
+
+    Args:
+        vetores (int): Linhas do índice (padrão: 200000)
+        dimensao (int): Dimensão (padrão: 768)
+        consultas (int): Consultas medidas (padrão: 200)
+        k (int): Resultados por consulta (padrão: 10)
+
+    Returns:
+        dict: segundos de inserção e de treino, latências p50/p95 em ms e recall@k
+    """
+    gerador = np.random.default_rng(0)
+    centros = gerador.standard_normal((2000, dimensao)).astype(np.float32)
+
+    def amostra(quantidade: int) -> np.ndarray:
+        assuntos = gerador.integers(0, len(centros), quantidade)
+        return centros[assuntos] + 0.8 * gerador.standard_normal((quantidade, dimensao)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        indice = IndiceSemantico(pasta, dimensao, treino_automatico=False)
+        inicio = time.perf_counter()
+        for i in range(0, vetores, 10_000):
+            quantidade = min(10_000, vetores - i)
+            indice.adicionar(amostra(quantidade), gerador.random(quantidade) < 0.3, np.full(quantidade, 0.9))
+        insercao = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        indice.treinar()
+        treino = time.perf_counter() - inicio
+
+        fakes = np.flatnonzero(indice._fake[:indice.total] == 1)
+        origem = indice._vetores[gerador.choice(fakes, consultas)].astype(np.float32)
+        perguntas = _normalizar(origem + 0.02 * gerador.standard_normal(origem.shape).astype(np.float32))
+
+        latencias, resultados = [], []
+        for pergunta in perguntas:
+            inicio = time.perf_counter()
+            resultados.append(indice.buscar(pergunta, k)[0])
+            latencias.append(time.perf_counter() - inicio)
+
+        # Busca exata sobre os fakes, em blocos
+        exatos = np.empty((consultas, 0), dtype=np.float32)
+        ids_exatos = np.empty((consultas, 0), dtype=np.int64)
+        for bloco in range(0, len(fakes), _LINHAS_POR_BLOCO):
+            ids = fakes[bloco:bloco + _LINHAS_POR_BLOCO]
+            similaridades = perguntas @ indice._vetores[ids].astype(np.float32).T
+            exatos = np.concatenate((exatos, similaridades), axis=1)
+            ids_exatos = np.concatenate((ids_exatos, np.broadcast_to(ids, similaridades.shape)), axis=1)
+            melhores = np.argsort(-exatos, axis=1)[:, :k]
+            exatos = np.take_along_axis(exatos, melhores, axis=1)
+            ids_exatos = np.take_along_axis(ids_exatos, melhores, axis=1)
+        recall = np.mean([len({r["id"] for r in achados} & set(ids_exatos[i].tolist())) / k
+                          for i, achados in enumerate(resultados)])
+
+        estatisticas = indice.estatisticas()
+        indice.fechar()
+
+    return {
+        "vetores": vetores,
+        "dimensao": dimensao,
+        "listas": estatisticas["listas"],
+        "insercao_s": round(insercao, 1),
+        "treino_s": round(treino, 1),
+        "p50_ms": round(percentil(latencias, 0.50) * 1000, 2),
+        "p95_ms": round(percentil(latencias, 0.95) * 1000, 2),
+        f"recall_{k}": round(float(recall), 4),
+        "mb_vetores": round(estatisticas["bytes_vetores"] / 1e6, 1),
+    }
+
+
+def _argumento(nome: str, padrao: str) -> str:
+    if nome in sys.argv:
+        return sys.argv[sys.argv.index(nome) + 1]
+    return padrao
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        resultado = benchmark(int(_argumento("--vetores", "200000")), int(_argumento("--dimensao", "768")))
+        print(f"🧭 {resultado['vetores']} vetores x {resultado['dimensao']} (float16, "
+              f"{resultado['mb_vetores']} MB), {resultado['listas']} listas IVF")
+        print(f"   Inserção: {resultado['insercao_s']}s | treino do IVF: {resultado['treino_s']}s")
+        print(f"   Busca top-10 fakes: p50 {resultado['p50_ms']}ms | p95 {resultado['p95_ms']}ms | "
+              f"recall@10 {resultado['recall_10']:.1%}")
+    elif len(sys.argv) > 2 and sys.argv[1] == "treinar":
+        from comum.registro import configurar_registro
+        configurar_registro()
+
+        indice = IndiceSemantico(sys.argv[2], treino_automatico=False)
+        indice.treinar()
+        indice.fechar()
+        print(f"🧭 {indice.estatisticas()}")
+    elif len(sys.argv) > 2:
+        from classificator.bert_classificator import FakeNewsClassifier
+
+        indice = IndiceSemantico(sys.argv[1])
+        classificador = FakeNewsClassifier(indice_semantico=indice)
+        for achado in classificador.similares_a_fakes([sys.argv[2]], k=int(_argumento("--k", "5")))[0]:
+            print(f"{achado['similaridade']:.3f}  {str(achado['texto'])[:100]}")
+    else:
+        print("Uso: python -m classificator.indice_semantico "
+              "(PASTA \"texto\" [--k 5] | treinar PASTA | benchmark [--vetores N])")
@@ -0,0 +1,249 @@
+"""
+Normalização de legendas antes da classificação.
+
+As legendas chegam com emoji, hashtags, menções, URLs, letras "estilizadas"
+(𝐁𝐎𝐌𝐁𝐀, ｕｒｇｅｎｔｅ), caracteres invisíveis e o ruído de OCR/cópia visto nas
+notas de `extrator/scraper_instagram.py` (`\\n` literal, espaços quebrados).
+Sem normalizar, cópias quase idênticas viram textos diferentes para o cache e
+para o modelo.
+
+`normalizar_lote` passa por cada legenda com regexes pré-compiladas, e cada
+etapa só roda quando a checagem barata diz que precisa: NFKC só em texto não
+ASCII que não passa em `is_normalized`, invisíveis e ruído só quando há
+caractere não imprimível (`isprintable`), cada entidade só quando o literal dela aparece
+(`://`, `www.`, `@`, `#`). Cada legenda gera uma `LegendaNormalizada` com:
+
+- `texto`: NFKC, sem ruído, sem URLs/menções/hashtags, espaços colapsados
+  (caixa original: é o que vai para o BERTimbau, que é cased, e a chave do
+  cache do classificador);
+- `chave`: `texto` em minúsculas, acentos preservados, sem emoji (calculada
+  só quando lida; usada para agrupar legendas fora do classificador);
+- `urls`, `mencoes`, `hashtags`: entidades extraídas (menções e hashtags em
+  minúsculas, sem `@`/`#`).
+
+Uso:
+    from classificator.normalizacao import normalizar, normalizar_lote
+
+    python -m classificator.normalizacao "Texto da legenda #tag @perfil"
+    python -m classificator.normalizacao benchmark [--legendas 100000]
+"""
+
+import random
+import re
+import sys
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional
+
+# Invisíveis usados para burlar filtros ("va<ZWSP>cina"): removidos
+_INVISIVEIS = re.compile("[\u200b-\u200f\u202a-\u202e\u2060-\u2064\ufeff]")
+# Quebras e espaços que o NFKC não converte em " " (a quebra de linha fica à parte)
+_QUEBRAS = re.compile("[\r\t\v\f\x85\u2028\u2029\x1c-\x1f]")
+
+# Cada padrão começa por um literal (http, www., @, #, \, dois espaços): o
+# `re` procura o literal direto em vez de testar posição a posição, o que
+# numa alternância ou classe de caracteres custa de 5 a 10 vezes mais
+_FIM_URL = r"[^\s<>\"']*[^\s<>\"'.,;:!?)\]}]"
+_URL_HTTP = re.compile(r"https?://" + _FIM_URL)
+_URL_WWW = re.compile(r"www\.(?<![/.]www\.)" + _FIM_URL)
+_MENCAO = re.compile(r"@(?<![\w@/]@)(\w(?:[\w.]{0,28}\w)?)")
+# Hashtags coladas ("#Urgente#dois") saem juntas e são separadas depois
+_HASHTAG = re.compile(r"#(?<![\w#&/]#)(\w+(?:#\w+)*)")
+# Emoji, símbolos e seletores de variação: fora da chave (ficam no texto)
+_EMOJI = re.compile(r"[\U0001F000-\U0001FAFF\u2600-\u27BF\u2B00-\u2BFF\uFE0E\uFE0F\u20E3]+ ?")
+_ESCAPES = re.compile(r"\\[nrt]")
+_ESPACOS = re.compile(r"  +")
+_LINHAS = re.compile(r"\n[ \n]*")
+
+
+@dataclass
+class LegendaNormalizada:
+    """Legenda normalizada e entidades extraídas."""
+    texto: str
+    urls: list = field(default_factory=list)
+    mencoes: list = field(default_factory=list)
+    hashtags: list = field(default_factory=list)
+
+    @cached_property
+    def chave(self) -> str:
+        """`texto` em minúsculas e sem emoji."""
+        return _EMOJI.sub("", self.texto.lower()).strip()
+
+
+def _normalizar_um(texto: Optional[str], remover_entidades: bool, preservar_linhas: bool) -> LegendaNormalizada:
+    texto = texto or ""
+    if not texto.isascii() and not unicodedata.is_normalized("NFKC", texto):
+        texto = unicodedata.normalize("NFKC", texto)
+    if "\\" in texto:
+        texto = _ESCAPES.sub("\n", texto)
+    if not preservar_linhas and "\n" in texto:
+        texto = texto.replace("\n", " ")
+    # Invisíveis e quebras não são imprimíveis: a checagem em C pula os dois
+    if not texto.isprintable():
+        texto = _QUEBRAS.sub(" ", _INVISIVEIS.sub("", texto))
+
+    urls, mencoes, hashtags = [], [], []
+    if "://" in texto:
+        urls = _URL_HTTP.findall(texto)
+        if urls and remover_entidades:
+            texto = _URL_HTTP.sub(" ", texto)
+    if "www." in texto:
+        achadas = _URL_WWW.findall(texto)
+        if achadas:
+            urls += achadas
+            if remover_entidades:
+                texto = _URL_WWW.sub(" ", texto)
+    if "@" in texto:
+        mencoes = _MENCAO.findall(texto)
+        if mencoes:
+            mencoes = [mencao.lower() for mencao in mencoes]
+            if remover_entidades:
+                texto = _MENCAO.sub(" ", texto)
+    if "#" in texto:
+        hashtags = _HASHTAG.findall(texto)
+        if hashtags:
+            hashtags = "#".join(hashtags).lower().split("#")
+            if remover_entidades:
+                texto = _HASHTAG.sub(" ", texto)
+
+    if "  " in texto:
+        texto = _ESPACOS.sub(" ", texto)
+    if preservar_linhas and "\n" in texto:
+        texto = _LINHAS.sub("\n", texto).replace(" \n", "\n")
+    return LegendaNormalizada(texto.strip(), urls, mencoes, hashtags)
+
+
+def normalizar_lote(
+    textos: list[str],
+    remover_entidades: bool = True,
+    preservar_linhas: bool = False,
+) -> list[LegendaNormalizada]:
+    """
+    Normaliza um lote de legendas.
+
+    Args:
+        textos (list[str]): Legendas (None vira "")
+        remover_entidades (bool): Tira URLs, menções e hashtags do `texto` (padrão: True)
+        preservar_linhas (bool): Colapsa espaços mas mantém quebras de linha
+            (uma por vez), para textos de página enviados a um LLM (padrão: False)
+
+    Returns:
+        list[LegendaNormalizada]: Uma por legenda, na mesma ordem
+    """
+    return [_normalizar_um(texto, remover_entidades, preservar_linhas) for texto in textos]
+
+
+def normalizar(texto: str, remover_entidades: bool = True, preservar_linhas: bool = False) -> LegendaNormalizada:
+    """
+    Normaliza uma legenda.
+
+    Args:
+        texto (str): Legenda
+        remover_entidades (bool): Tira URLs, menções e hashtags do `texto` (padrão: True)
+        preservar_linhas (bool): Mantém quebras de linha (padrão: False)
+
+    Returns:
+        LegendaNormalizada: Texto, chave e entidades
+    """
+    return _normalizar_um(texto, remover_entidades, preservar_linhas)
+
+
+# ==============================
+# Micro-benchmark
+# ==============================
+
+_FRASES = [
+    "BOMBA! O governo vai taxar o Pix a partir de janeiro.",
+    "Vacina altera o DNA, diz estudo que a mídia esconde.",
+    "O presidente Lula afirmou, neste domingo (23), que o acordo será assinado em 20 de dezembro.",
+    "Durante a audiência de custódia, o ex-presidente confirmou que tentou violar a tornozeleira.",
+    "A taxa Selic foi mantida em 11,75% ao ano pelo Banco Central.",
+    "Prefeitura inaugura nova escola no bairro São João.",
+    "A Primeira Turma do Supremo Tribunal Federal (STF) se reunirá para decidir sobre a questão.",
+    "É um acordo que envolve 722 milhões de habitantes e US$ 22 trilhões de PIB.",
+    "Compartilhe antes que apaguem!",
+    "Entenda na matéria e fique bem informado.",
+]
+_ESTILIZADAS = ["𝐔𝐑𝐆𝐄𝐍𝐓𝐄", "ＡＴＥＮÇÃＯ", "𝘃𝗲𝗷𝗮 𝗮𝗻𝘁𝗲𝘀 𝗾𝘂𝗲 𝗮𝗽𝗮𝗴𝘂𝗲𝗺"]
+_HASHTAGS = ["#urgente", "#fakenews", "#Brasil", "#política", "#STF", "#eleições2026"]
+_MENCOES = ["@agencia.brasil", "@perfil_oficial", "@g1", "@Folha"]
+_URLS = ["https://t.co/AbC123xyz", "www.exemplo.com.br/materia?id=42.", "https://bit.ly/3xYz"]
+_EMOJIS = ["🚨", "👇", "🇧🇷", "‼️", "😱"]
+
+
+def _legendas_sinteticas(quantidade: int, semente: int = 42) -> list[str]:
+    # Proporções próximas das legendas capturadas: quebras de linha na maioria,
+    # hashtags e emoji em boa parte, letras estilizadas e invisíveis raras
+    aleatorio = random.Random(semente)
+    legendas = []
+    for _ in range(quantidade):
+        partes = aleatorio.sample(_FRASES, aleatorio.randint(2, 4))
+        if aleatorio.random() < 0.05:
+            partes.insert(0, aleatorio.choice(_ESTILIZADAS))
+        if aleatorio.random() < 0.4:
+            partes.insert(0, "".join(aleatorio.sample(_EMOJIS, 2)))
+        if aleatorio.random() < 0.3:
+            partes.append(aleatorio.choice(_MENCOES))
+        if aleatorio.random() < 0.2:
+            partes.append(aleatorio.choice(_URLS))
+        legenda = "\n\n".join(partes) if aleatorio.random() < 0.6 else " ".join(partes)
+        if aleatorio.random() < 0.5:
+            legenda += "\n.\n" + " ".join(aleatorio.sample(_HASHTAGS, aleatorio.randint(1, 5)))
+        if aleatorio.random() < 0.03:
+            legenda = legenda.replace("a", "a\u200b", 1)
+        legendas.append(legenda)
+    return legendas
+
+
+def benchmark(legendas: int = 100_000, tamanho_lote: int = 1000) -> dict:
+    """
+    Mede legendas/s de `normalizar_lote` (em lotes) e de `normalizar` (uma a uma).
+
+    Args:
+        legendas (int): Legendas sintéticas (~200 caracteres, com emoji,
+            entidades, quebras de linha, letras estilizadas e invisíveis) (padrão: 100000)
+        tamanho_lote (int): Legendas por chamada de `normalizar_lote` (padrão: 1000)
+
+    Returns:
+        dict: legendas/s em cada modo e caracteres médios por legenda
+    """
+    textos = _legendas_sinteticas(legendas)
+    normalizar_lote(textos[:tamanho_lote])  # aquecimento
+
+    inicio = time.perf_counter()
+    for i in range(0, len(textos), tamanho_lote):
+        normalizar_lote(textos[i:i + tamanho_lote])
+    lote = time.perf_counter() - inicio
+
+    amostra = textos[:max(1, legendas // 10)]
+    inicio = time.perf_counter()
+    for texto in amostra:
+        normalizar(texto)
+    individual = time.perf_counter() - inicio
+
+    return {
+        "legendas": legendas,
+        "caracteres_medios": round(sum(map(len, textos)) / len(textos)),
+        "lote_por_s": round(legendas / lote),
+        "individual_por_s": round(len(amostra) / individual),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        quantidade = int(sys.argv[sys.argv.index("--legendas") + 1]) if "--legendas" in sys.argv else 100_000
+        resultado = benchmark(quantidade)
+        print(f"📏 {resultado['legendas']} legendas (~{resultado['caracteres_medios']} caracteres)")
+        print(f"   Em lote:    {resultado['lote_por_s']:>9,} legendas/s")
+        print(f"   Uma a uma:  {resultado['individual_por_s']:>9,} legendas/s")
+    elif len(sys.argv) > 1:
+        n = normalizar(" ".join(sys.argv[1:]))
+        print(f"texto:    {n.texto}")
+        print(f"chave:    {n.chave}")
+        print(f"urls:     {n.urls}")
+        print(f"mencoes:  {n.mencoes}")
+        print(f"hashtags: {n.hashtags}")
+    else:
+        print("Uso: python -m classificator.normalizacao (TEXTO | benchmark [--legendas 100000])")
@@ -0,0 +1,338 @@
+"""
+Destilação de páginas antes de mandá-las a um LLM.
+
+As ferramentas de raspagem dos crews (`ScrapeWebsiteTool`) e a extração dos
+agentes browser-use entregavam ao modelo a página inteira: menus, rodapés,
+banners de cookies, blocos repetidos e espaços em branco. Em modelos locais
+pequenos (qwen3:1.7b, gemma3:270m) o prefill desse texto é a maior parte do
+tempo de cada passo. Aqui a página passa por:
+
+1. remoção de scripts, estilos, navegação, cabeçalho/rodapé e elementos com
+   classes típicas de boilerplate (menu, cookie, share, sidebar...);
+2. escolha do bloco de conteúdo principal no estilo do Readability: cada
+   parágrafo pontua o pai (e metade ao avô) por tamanho e vírgulas, descontada
+   a densidade de links; irmãos com pontuação próxima entram junto;
+3. quebra em blocos (títulos, parágrafos, itens), espaços colapsados e blocos
+   repetidos descartados;
+4. corte no orçamento de tokens (estimado em ~4 caracteres por token).
+
+Cada chamada soma tokens originais/destilados em `estatisticas_destilacao()`,
+que também estima o tempo de prefill economizado (DESTILACAO_PREFILL_TPS
+tokens/s, padrão 200, ordem de grandeza de um modelo pequeno em CPU).
+
+Uso:
+    python -m comum.destilacao pagina.html [--orcamento 1500]
+"""
+
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from bs4 import BeautifulSoup, Tag
+
+logger = logging.getLogger(__name__)
+
+ORCAMENTO_PADRAO = 1500
+CARACTERES_POR_TOKEN = 4
+TOKENS_PREFILL_POR_S = float(os.getenv("DESTILACAO_PREFILL_TPS", "200"))
+
+REMOVER = [
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "header", "footer", "aside", "button", "select", "input", "textarea",
+]
+# Formulários só saem se, sem os controles, sobrar pouco texto ou quase só links
+# (busca, login, newsletter). Páginas ASP.NET WebForms têm um <form> em volta de tudo.
+FORMULARIO_MIN_CARACTERES = 200
+FORMULARIO_MAX_DENSIDADE_LINKS = 0.5
+PAPEIS_REMOVER = {"navigation", "banner", "contentinfo", "complementary", "search", "dialog"}
+# Palavras inteiras de class/id ("main-nav", "cookieBanner", "ads_top"), no
+# singular ou plural: "modal" não pega "modalidade" nem "nav" pega "canvas"
+NEGATIVO = re.compile(
+    r"(?<![a-z])(?:comment|cookie|consent|footer|header|menu|nav(?:bar|igation)?|sidebar|share|social|"
+    r"banner|breadcrumb|related|promo|advert|advertisement|ad|newsletter|popup|modal|widget|skip)s?(?![a-z])",
+    re.I,
+)
+POSITIVO = re.compile(r"article|content|main|post|entry|text|body|story|materia|noticia|curso", re.I)
+BLOCOS = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "pre", "blockquote", "td", "th", "dt", "dd"]
+PESO_TAG = {"article": 10, "main": 10, "section": 3, "div": 5, "pre": 3, "td": 3, "blockquote": 3,
+            "ol": -3, "ul": -3, "li": -3, "form": -3, "th": -5}
+
+_lock = threading.Lock()
+_estatisticas = {"paginas": 0, "tokens_originais": 0, "tokens_destilados": 0, "segundos": 0.0}
+
+
+@dataclass
+class Destilado:
+    """Resultado da destilação de uma página."""
+    texto: str
+    titulo: Optional[str] = None
+    tokens_originais: int = 0
+    tokens_destilados: int = 0
+    blocos: int = 0
+    cortado: bool = False
+    segundos: float = 0.0
+
+    @property
+    def reducao(self) -> float:
+        """Fração de tokens removida (0.8 = 80% a menos)."""
+        if not self.tokens_originais:
+            return 0.0
+        return 1 - self.tokens_destilados / self.tokens_originais
+
+
+def estimar_tokens(texto: str) -> int:
+    """Estimativa de tokens (~4 caracteres por token, suficiente para orçamento)."""
+    return math.ceil(len(texto) / CARACTERES_POR_TOKEN)
+
+
+def _colapsar(texto: str) -> str:
+    return re.sub(r"\s+", " ", texto).strip()
+
+
+def _classe_e_id(elemento: Tag) -> str:
+    nomes = " ".join(elemento.get("class") or []) + " " + (elemento.get("id") or "")
+    # camelCase vira palavras separadas para o NEGATIVO ("mainNav" -> "main Nav")
+    return re.sub(r"(?<=[a-z0-9])(?=[A-Z])", " ", nomes)
+
+
+def _peso_classe(elemento: Tag) -> int:
+    nomes = _classe_e_id(elemento)
+    return (25 if POSITIVO.search(nomes) else 0) - (25 if NEGATIVO.search(nomes) else 0)
+
+
+def _limpar(sopa: BeautifulSoup) -> None:
+    """Remove o que nunca é conteúdo principal."""
+    for elemento in sopa(REMOVER):
+        elemento.decompose()
+    # Internos primeiro: um formulário de busca dentro do <form> da página sai sozinho
+    for formulario in reversed(sopa.find_all("form")):
+        if (
+            len(formulario.get_text(" ", strip=True)) < FORMULARIO_MIN_CARACTERES
+            or _densidade_links(formulario) > FORMULARIO_MAX_DENSIDADE_LINKS
+        ):
+            formulario.decompose()
+    for elemento in sopa.find_all(True):
+        if elemento.decomposed or elemento.name in ("html", "body"):
+            continue
+        if (
+            elemento.get("role") in PAPEIS_REMOVER
+            or elemento.get("aria-hidden") == "true"
+            or re.search(r"display\s*:\s*none", elemento.get("style") or "")
+        ):
+            elemento.decompose()
+            continue
+        nomes = _classe_e_id(elemento)
+        if NEGATIVO.search(nomes) and not POSITIVO.search(nomes):
+            elemento.decompose()
+
+
+def _densidade_links(elemento: Tag) -> float:
+    texto = len(elemento.get_text(" ", strip=True)) or 1
+    links = sum(len(a.get_text(" ", strip=True)) for a in elemento.find_all("a"))
+    return min(1.0, links / texto)
+
+
+def _conteudo_principal(sopa: BeautifulSoup) -> list[Tag]:
+    """Bloco de maior pontuação (Readability) e os irmãos que pontuam perto dele."""
+    pontuacoes: dict[int, float] = {}
+    elementos: dict[int, Tag] = {}
+
+    def pontuar(elemento: Tag, valor: float) -> None:
+        if id(elemento) not in pontuacoes:
+            elementos[id(elemento)] = elemento
+            pontuacoes[id(elemento)] = PESO_TAG.get(elemento.name, 0) + _peso_classe(elemento)
+        pontuacoes[id(elemento)] += valor
+
+    for paragrafo in sopa.find_all(["p", "pre", "td", "blockquote"]):
+        texto = paragrafo.get_text(" ", strip=True)
+        if len(texto) < 25:
+            continue
+        valor = 1 + texto.count(",") + min(len(texto) / 100, 3)
+        pai = paragrafo.parent
+        if isinstance(pai, Tag):
+            pontuar(pai, valor)
+            if isinstance(pai.parent, Tag):
+                pontuar(pai.parent, valor / 2)
+
+    corpo = sopa.body or sopa
+    if not pontuacoes:
+        return [corpo]
+
+    finais = {chave: valor * (1 - _densidade_links(elementos[chave])) for chave, valor in pontuacoes.items()}
+    melhor_chave = max(finais, key=finais.get)
+    melhor = elementos[melhor_chave]
+    if len(melhor.get_text(" ", strip=True)) < 200:
+        return [corpo]
+
+    limite = max(10.0, finais[melhor_chave] * 0.2)
+    escolhidos = []
+    for irmao in (melhor.parent.find_all(recursive=False) if isinstance(melhor.parent, Tag) else [melhor]):
+        if irmao is melhor or finais.get(id(irmao), -math.inf) >= limite:
+            escolhidos.append(irmao)
+        elif irmao.name == "p" and len(irmao.get_text(" ", strip=True)) > 80 and _densidade_links(irmao) < 0.25:
+            escolhidos.append(irmao)
+    return escolhidos
+
+
+def _blocos(containers: list[Tag]) -> list[str]:
+    """Títulos, parágrafos e itens (folhas de bloco), na ordem da página."""
+    blocos = []
+    for container in containers:
+        folhas = [el for el in container.find_all(BLOCOS) if el.find(BLOCOS) is None]
+        if container.name in BLOCOS and not folhas:
+            folhas = [container]
+        texto_folhas = sum(len(el.get_text(" ", strip=True)) for el in folhas)
+        if texto_folhas < 0.3 * len(container.get_text(" ", strip=True)):
+            # Página feita de <div>s soltos: cai para as linhas do texto
+            blocos.extend(container.get_text("\n").split("\n"))
+            continue
+        for folha in folhas:
+            texto = _colapsar(folha.get_text(" "))
+            if texto and folha.name in ("h1", "h2", "h3", "h4", "h5", "h6"):
+                texto = "#" * int(folha.name[1]) + " " + texto
+            elif texto and folha.name == "li":
+                texto = "- " + texto
+            blocos.append(texto)
+    return blocos
+
+
+def _montar(blocos: list[str], orcamento_tokens: int) -> tuple[str, int, bool]:
+    """Colapsa, deduplica e corta os blocos no orçamento."""
+    vistos: set[str] = set()
+    saida: list[str] = []
+    limite = orcamento_tokens * CARACTERES_POR_TOKEN
+    usados = 0
+    for bloco in blocos:
+        bloco = _colapsar(bloco)
+        chave = bloco.lstrip("#- ").casefold()
+        if len(chave) < 2 or chave in vistos:
+            continue
+        vistos.add(chave)
+        if usados + len(bloco) + 1 > limite:
+            restante = limite - usados
+            if restante > 80:
+                # Corta no fim da última frase que cabe
+                trecho = bloco[:restante]
+                fim = max(trecho.rfind(". "), trecho.rfind("! "), trecho.rfind("? "))
+                saida.append((trecho[: fim + 1] if fim > 40 else trecho.rstrip()) + " [...]")
+            return "\n".join(saida), len(saida), True
+        saida.append(bloco)
+        usados += len(bloco) + 1
+    return "\n".join(saida), len(saida), False
+
+
+def _registrar(destilado: Destilado) -> Destilado:
+    with _lock:
+        _estatisticas["paginas"] += 1
+        _estatisticas["tokens_originais"] += destilado.tokens_originais
+        _estatisticas["tokens_destilados"] += destilado.tokens_destilados
+        _estatisticas["segundos"] += destilado.segundos
+    logger.debug(
+        "Destilado: %d -> %d tokens (%.0f%% a menos) em %.3fs",
+        destilado.tokens_originais, destilado.tokens_destilados, destilado.reducao * 100, destilado.segundos,
+    )
+    return destilado
+
+
+def destilar_html(html: str, orcamento_tokens: int = ORCAMENTO_PADRAO) -> Destilado:
+    """
+    Extrai o conteúdo principal de uma página dentro de um orçamento de tokens.
+
+    Args:
+        html (str): HTML da página
+        orcamento_tokens (int): Máximo de tokens (estimados) do texto devolvido
+
+    Returns:
+        Destilado: Texto destilado (título, títulos de seção com #, itens com -),
+        com tokens antes/depois
+    """
+    inicio = time.perf_counter()
+    try:
+        sopa = BeautifulSoup(html, "lxml")
+    except Exception:
+        sopa = BeautifulSoup(html, "html.parser")
+
+    titulo = _colapsar(sopa.title.get_text()) if sopa.title else None
+    # Base de comparação: o texto cru que a ferramenta mandaria (get_text com espaços colapsados)
+    tokens_originais = estimar_tokens(_colapsar((sopa.body or sopa).get_text(" ")))
+
+    _limpar(sopa)
+    blocos = _blocos(_conteudo_principal(sopa))
+    if titulo and not any(b.startswith("# ") for b in blocos):
+        blocos.insert(0, f"# {titulo}")
+    texto, quantidade, cortado = _montar(blocos, orcamento_tokens)
+
+    return _registrar(Destilado(
+        texto=texto,
+        titulo=titulo,
+        tokens_originais=tokens_originais,
+        tokens_destilados=estimar_tokens(texto),
+        blocos=quantidade,
+        cortado=cortado,
+        segundos=time.perf_counter() - inicio,
+    ))
+
+
+def destilar_texto(texto: str, orcamento_tokens: int = ORCAMENTO_PADRAO) -> Destilado:
+    """
+    Versão para texto já extraído (markdown, get_text): colapsa, deduplica linhas e corta.
+
+    Args:
+        texto (str): Texto da página
+        orcamento_tokens (int): Máximo de tokens (estimados) do texto devolvido
+
+    Returns:
+        Destilado: Texto destilado com tokens antes/depois
+    """
+    inicio = time.perf_counter()
+    destilado, quantidade, cortado = _montar(texto.split("\n"), orcamento_tokens)
+    return _registrar(Destilado(
+        texto=destilado,
+        tokens_originais=estimar_tokens(_colapsar(texto)),
+        tokens_destilados=estimar_tokens(destilado),
+        blocos=quantidade,
+        cortado=cortado,
+        segundos=time.perf_counter() - inicio,
+    ))
+
+
+def estatisticas_destilacao() -> dict:
+    """
+    Totais do processo.
+
+    Returns:
+        dict: paginas, tokens_originais, tokens_destilados, reducao, segundos (gastos
+        destilando) e prefill_economizado_s (estimativa a DESTILACAO_PREFILL_TPS tokens/s)
+    """
+    with _lock:
+        totais = dict(_estatisticas)
+    economizados = totais["tokens_originais"] - totais["tokens_destilados"]
+    totais["reducao"] = round(economizados / totais["tokens_originais"], 3) if totais["tokens_originais"] else 0.0
+    totais["prefill_economizado_s"] = round(economizados / TOKENS_PREFILL_POR_S, 1)
+    return totais
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) < 2:
+        print("Uso: python -m comum.destilacao pagina.html [--orcamento 1500]")
+        sys.exit(1)
+
+    orcamento = int(sys.argv[sys.argv.index("--orcamento") + 1]) if "--orcamento" in sys.argv else ORCAMENTO_PADRAO
+    with open(sys.argv[1], "r", encoding="utf-8", errors="replace") as f:
+        resultado = destilar_html(f.read(), orcamento)
+
+    print(resultado.texto)
+    print(
+        f"\n{resultado.tokens_originais} -> {resultado.tokens_destilados} tokens "
+        f"({resultado.reducao:.0%} a menos, {resultado.blocos} blocos"
+        f"{', cortado no orçamento' if resultado.cortado else ''}) em {resultado.segundos * 1000:.1f} ms"
+    )
+    print(estatisticas_destilacao())
@@ -0,0 +1,26 @@
+"""
+Estatísticas de latência compartilhadas pelos benchmarks e resumos de spans.
+
+Usado por `comum.rastreamento`, `servico.carga`, `servico.recursos` (`/saude`),
+`benchmark.executar` e `agents-crew/instrumentacao.py`, para que p50/p95
+signifiquem o mesmo em todos.
+"""
+
+import math
+
+
+def percentil(valores: list[float], fracao: float) -> float:
+    """
+    Percentil pelo método do posto mais próximo: o menor valor com pelo menos
+    `fracao` das amostras abaixo ou iguais a ele (p50 de 1..10 = 5, p95 de 1..20 = 19).
+
+    Args:
+        valores (list[float]): Amostras (não precisam estar ordenadas; não pode ser vazia)
+        fracao (float): Entre 0 e 1 (ex.: 0.95)
+
+    Returns:
+        float: O valor no posto ceil(fracao * n)
+    """
+    ordenados = sorted(valores)
+    indice = math.ceil(fracao * len(ordenados)) - 1
+    return ordenados[max(0, min(len(ordenados) - 1, indice))]
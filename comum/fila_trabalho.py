@@ -0,0 +1,418 @@
+"""
+Fila de trabalho durável em SQLite.
+
+Os lotes (`processar_multiplas_urls`, `capturar_multiplos_screenshots`,
+`analisar_multiplas_imagens`) recebiam uma lista e recomeçavam do zero a cada
+execução. Com esta fila, os itens ficam num banco local com estado:
+
+    pendente -> em_andamento (lease com validade) -> concluido
+                                                  -> pendente (nova tentativa)
+                                                  -> falhou (tentativas esgotadas)
+
+Vários processos podem drenar a mesma fila: a reserva é atômica (BEGIN IMMEDIATE)
+e um item cujo lease expirou (worker caiu) volta a ficar disponível.
+
+Uso:
+    python -m comum.fila_trabalho estatisticas fila.db
+    python -m comum.fila_trabalho benchmark [--itens 100000] [--workers 4]
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+ESTADOS = ("pendente", "em_andamento", "concluido", "falhou")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS itens (
+    id INTEGER PRIMARY KEY,
+    fila TEXT NOT NULL,
+    chave TEXT NOT NULL,
+    payload TEXT,
+    estado TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    max_tentativas INTEGER NOT NULL,
+    disponivel_em REAL NOT NULL,
+    lease_ate REAL,
+    worker TEXT,
+    erro TEXT,
+    criado_em REAL NOT NULL,
+    atualizado_em REAL NOT NULL,
+    UNIQUE (fila, chave)
+);
+CREATE INDEX IF NOT EXISTS idx_itens_ordem ON itens(fila, estado, id);
+CREATE INDEX IF NOT EXISTS idx_itens_lease ON itens(fila, estado, lease_ate);
+"""
+
+
+@dataclass
+class ItemFila:
+    """Item reservado por um worker."""
+    id: int
+    chave: str
+    payload: Any
+    tentativas: int
+
+
+def identificador_worker() -> str:
+    """Identificador padrão do worker: host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class FilaTrabalho:
+    """
+    Fila persistente com leases, tentativas e várias filas nomeadas por banco.
+
+    Args:
+        caminho_db (str): Arquivo SQLite (padrão: "fila_trabalho.db")
+        nome (str): Nome da fila dentro do banco (padrão: "padrao")
+        max_tentativas (int): Tentativas por item antes de marcar como falhou (padrão: 3)
+        lease (float): Segundos de validade de uma reserva (padrão: 600)
+        atraso_retry (float): Atraso base antes de uma nova tentativa, dobra a cada falha (padrão: 30)
+    """
+
+    def __init__(
+        self,
+        caminho_db: str = "fila_trabalho.db",
+        nome: str = "padrao",
+        max_tentativas: int = 3,
+        lease: float = 600.0,
+        atraso_retry: float = 30.0,
+    ):
+        self.caminho_db = caminho_db
+        self.nome = nome
+        self.max_tentativas = max_tentativas
+        self.lease = lease
+        self.atraso_retry = atraso_retry
+
+        diretorio = os.path.dirname(caminho_db)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        # isolation_level=None: as transações são controladas explicitamente
+        self._conexao = sqlite3.connect(caminho_db, timeout=30.0, isolation_level=None)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(ESQUEMA)
+
+    def _transacao(self, funcao: Callable[[sqlite3.Connection], Any]) -> Any:
+        self._conexao.execute("BEGIN IMMEDIATE")
+        try:
+            resultado = funcao(self._conexao)
+        except BaseException:
+            self._conexao.execute("ROLLBACK")
+            raise
+        self._conexao.execute("COMMIT")
+        return resultado
+
+    def adicionar(self, itens: Iterable, chave: Optional[Callable[[Any], str]] = None) -> int:
+        """
+        Enfileira itens. Itens com chave já existente na fila são ignorados.
+
+        Args:
+            itens (Iterable): Itens a enfileirar (str ou qualquer valor serializável em JSON)
+            chave (Callable): Função item -> chave única (padrão: o próprio item se for
+                str, senão o JSON do item)
+
+        Returns:
+            int: Quantidade de itens novos
+        """
+        agora = time.time()
+
+        def linhas():
+            for item in itens:
+                if chave is not None:
+                    k = chave(item)
+                elif isinstance(item, str):
+                    k = item
+                else:
+                    k = json.dumps(item, sort_keys=True, ensure_ascii=False)
+                yield (self.nome, k, json.dumps(item, ensure_ascii=False), self.max_tentativas, agora, agora, agora)
+
+        def inserir(conexao):
+            antes = conexao.total_changes
+            conexao.executemany(
+                "INSERT OR IGNORE INTO itens (fila, chave, payload, max_tentativas, disponivel_em, criado_em, atualizado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                linhas(),
+            )
+            return conexao.total_changes - antes
+
+        return self._transacao(inserir)
+
+    def reservar(self, worker: Optional[str] = None, quantidade: int = 1, lease: Optional[float] = None) -> list[ItemFila]:
+        """
+        Reserva itens disponíveis (pendentes ou com lease expirado) para um worker.
+
+        Args:
+            worker (str): Identificador do worker (padrão: host:pid)
+            quantidade (int): Máximo de itens a reservar
+            lease (float): Validade da reserva em segundos (padrão: o da fila)
+
+        Returns:
+            list[ItemFila]: Itens reservados (vazia se não houver trabalho disponível)
+        """
+        worker = worker or identificador_worker()
+        agora = time.time()
+        lease_ate = agora + (lease or self.lease)
+
+        def reservar(conexao):
+            # Leases expirados de itens sem tentativas restantes viram falha
+            conexao.execute(
+                "UPDATE itens SET estado = 'falhou', erro = 'lease expirado', atualizado_em = ? "
+                "WHERE fila = ? AND estado = 'em_andamento' AND lease_ate < ? AND tentativas >= max_tentativas",
+                (agora, self.nome, agora),
+            )
+            # Duas consultas simples, cada uma servida por um índice, em vez de um OR
+            ids = [linha[0] for linha in conexao.execute(
+                "SELECT id FROM itens WHERE fila = ? AND estado = 'em_andamento' AND lease_ate < ? LIMIT ?",
+                (self.nome, agora, quantidade),
+            )]
+            if len(ids) < quantidade:
+                ids += [linha[0] for linha in conexao.execute(
+                    "SELECT id FROM itens WHERE fila = ? AND estado = 'pendente' AND disponivel_em <= ? "
+                    "ORDER BY id LIMIT ?",
+                    (self.nome, agora, quantidade - len(ids)),
+                )]
+            if not ids:
+                return []
+            marcadores = ",".join("?" * len(ids))
+            return conexao.execute(
+                "UPDATE itens SET estado = 'em_andamento', worker = ?, lease_ate = ?, "
+                f"tentativas = tentativas + 1, atualizado_em = ? WHERE id IN ({marcadores}) "
+                "RETURNING id, chave, payload, tentativas",
+                (worker, lease_ate, agora, *ids),
+            ).fetchall()
+
+        linhas = self._transacao(reservar)
+        return [
+            ItemFila(id=i, chave=k, payload=json.loads(p) if p is not None else None, tentativas=t)
+            for i, k, p, t in sorted(linhas)
+        ]
+
+    def concluir(self, item_id: int, worker: Optional[str] = None) -> bool:
+        """
+        Marca um item como concluído.
+
+        Returns:
+            bool: False se o item não estava reservado por este worker (lease perdido)
+        """
+        worker = worker or identificador_worker()
+        cursor = self._conexao.execute(
+            "UPDATE itens SET estado = 'concluido', lease_ate = NULL, erro = NULL, atualizado_em = ? "
+            "WHERE id = ? AND worker = ? AND estado = 'em_andamento'",
+            (time.time(), item_id, worker),
+        )
+        return cursor.rowcount == 1
+
+    def falhar(self, item_id: int, erro: str = "", worker: Optional[str] = None) -> str:
+        """
+        Registra a falha de um item: volta para pendente (com atraso) ou vira falhou.
+
+        Returns:
+            str: Novo estado do item ("pendente" ou "falhou"), ou "" se o lease foi perdido
+        """
+        worker = worker or identificador_worker()
+        agora = time.time()
+
+        def falhar(conexao):
+            linha = conexao.execute(
+                "SELECT tentativas, max_tentativas FROM itens WHERE id = ? AND worker = ? AND estado = 'em_andamento'",
+                (item_id, worker),
+            ).fetchone()
+            if linha is None:
+                return ""
+            tentativas, maximo = linha
+            if tentativas >= maximo:
+                estado, disponivel_em = "falhou", agora
+            else:
+                estado, disponivel_em = "pendente", agora + self.atraso_retry * 2 ** (tentativas - 1)
+            conexao.execute(
+                "UPDATE itens SET estado = ?, erro = ?, disponivel_em = ?, lease_ate = NULL, atualizado_em = ? "
+                "WHERE id = ?",
+                (estado, erro[:2000], disponivel_em, agora, item_id),
+            )
+            return estado
+
+        return self._transacao(falhar)
+
+    def renovar(self, item_id: int, worker: Optional[str] = None, lease: Optional[float] = None) -> bool:
+        """Estende o lease de um item em processamento longo."""
+        worker = worker or identificador_worker()
+        cursor = self._conexao.execute(
+            "UPDATE itens SET lease_ate = ?, atualizado_em = ? WHERE id = ? AND worker = ? AND estado = 'em_andamento'",
+            (time.time() + (lease or self.lease), time.time(), item_id, worker),
+        )
+        return cursor.rowcount == 1
+
+    def reenfileirar_falhas(self) -> int:
+        """Volta todos os itens com falha para pendente, zerando as tentativas."""
+        agora = time.time()
+        cursor = self._conexao.execute(
+            "UPDATE itens SET estado = 'pendente', tentativas = 0, disponivel_em = ?, atualizado_em = ? "
+            "WHERE fila = ? AND estado = 'falhou'",
+            (agora, agora, self.nome),
+        )
+        return cursor.rowcount
+
+    def estatisticas(self) -> dict:
+        """Retorna a contagem de itens por estado."""
+        contagem = dict.fromkeys(ESTADOS, 0)
+        for estado, total in self._conexao.execute(
+            "SELECT estado, COUNT(*) FROM itens WHERE fila = ? GROUP BY estado", (self.nome,)
+        ):
+            contagem[estado] = total
+        return contagem
+
+    def vazia(self) -> bool:
+        """True se não há itens pendentes nem em andamento."""
+        return self._conexao.execute(
+            "SELECT 1 FROM itens WHERE fila = ? AND estado IN ('pendente', 'em_andamento') LIMIT 1",
+            (self.nome,),
+        ).fetchone() is None
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+
+def consumir(
+    fila: FilaTrabalho,
+    processar: Callable[[ItemFila], Any],
+    worker: Optional[str] = None,
+    quantidade: int = 1,
+    esperar_retentativas: bool = False,
+    intervalo: float = 1.0,
+) -> int:
+    """
+    Drena a fila chamando `processar` para cada item reservado.
+
+    Um item é concluído se `processar` retorna sem exceção; se levantar exceção,
+    a falha é registrada e o item volta para a fila conforme as tentativas restantes.
+
+    Args:
+        fila (FilaTrabalho): Fila a consumir
+        processar (Callable): Função que recebe um `ItemFila`
+        worker (str): Identificador do worker (padrão: host:pid)
+        quantidade (int): Itens reservados por vez
+        esperar_retentativas (bool): Se True, continua esperando itens em atraso ou
+            em andamento em outros workers até a fila esvaziar
+        intervalo (float): Segundos entre verificações quando não há itens disponíveis
+
+    Returns:
+        int: Quantidade de itens concluídos por este worker
+    """
+    worker = worker or identificador_worker()
+    concluidos = 0
+
+    while True:
+        itens = fila.reservar(worker, quantidade)
+        if not itens:
+            if esperar_retentativas and not fila.vazia():
+                time.sleep(intervalo)
+                continue
+            return concluidos
+
+        for item in itens:
+            try:
+                processar(item)
+            except Exception as e:
+                estado = fila.falhar(item.id, str(e), worker)
+                logger.warning("Item %s falhou (tentativa %d, agora %s): %s", item.chave, item.tentativas, estado, e)
+                continue
+            if fila.concluir(item.id, worker):
+                concluidos += 1
+            else:
+                logger.warning("Lease de %s expirou antes da conclusão", item.chave)
+
+
+# ==============================
+# Benchmark
+# ==============================
+
+def _worker_benchmark(caminho_db: str, quantidade: int, fila_resultado) -> None:
+    fila = FilaTrabalho(caminho_db, "benchmark")
+    fila_resultado.put(consumir(fila, lambda item: None, quantidade=quantidade))
+
+
+def benchmark(total: int = 100_000, workers: int = 1, quantidade: int = 100) -> dict:
+    """
+    Mede enfileiramento e drenagem de `total` itens.
+
+    Args:
+        total (int): Itens a enfileirar (padrão: 100000)
+        workers (int): Processos drenando a fila em paralelo (padrão: 1)
+        quantidade (int): Itens reservados por chamada (padrão: 100)
+
+    Returns:
+        dict: Itens/s para enfileirar e drenar
+    """
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho_db = os.path.join(pasta, "benchmark.db")
+        fila = FilaTrabalho(caminho_db, "benchmark")
+
+        inicio = time.perf_counter()
+        fila.adicionar(f"https://www.instagram.com/p/{i:011d}/" for i in range(total))
+        segundos_adicionar = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        if workers == 1:
+            concluidos = consumir(fila, lambda item: None, quantidade=quantidade)
+        else:
+            resultados = multiprocessing.Queue()
+            processos = [
+                multiprocessing.Process(target=_worker_benchmark, args=(caminho_db, quantidade, resultados))
+                for _ in range(workers)
+            ]
+            for processo in processos:
+                processo.start()
+            concluidos = sum(resultados.get() for _ in processos)
+            for processo in processos:
+                processo.join()
+        segundos_drenar = time.perf_counter() - inicio
+
+        estatisticas = fila.estatisticas()
+        fila.fechar()
+
+    return {
+        "itens": total,
+        "workers": workers,
+        "reserva_por_vez": quantidade,
+        "adicionar_itens_s": round(total / segundos_adicionar),
+        "drenar_itens_s": round(concluidos / segundos_drenar),
+        "segundos_adicionar": round(segundos_adicionar, 2),
+        "segundos_drenar": round(segundos_drenar, 2),
+        "estado_final": estatisticas,
+    }
+
+
+if __name__ == "__main__":
+    from comum.registro import configurar_registro
+    configurar_registro()
+
+    if len(sys.argv) < 2 or sys.argv[1] not in ("estatisticas", "benchmark"):
+        print("Uso: python -m comum.fila_trabalho (estatisticas ARQUIVO [FILA] | benchmark [--itens N] [--workers N] [--lote N])")
+        sys.exit(1)
+
+    if sys.argv[1] == "estatisticas":
+        fila = FilaTrabalho(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else "padrao")
+        print(fila.estatisticas())
+    else:
+        def argumento(nome: str, padrao: int) -> int:
+            return int(sys.argv[sys.argv.index(nome) + 1]) if nome in sys.argv else padrao
+
+        print(json.dumps(benchmark(
+            total=argumento("--itens", 100_000),
+            workers=argumento("--workers", 1),
+            quantidade=argumento("--lote", 100),
+        ), indent=2))
@@ -0,0 +1,421 @@
+"""
+Spans de tempo para o caminho captura -> extração -> classificação.
+
+Quando um post leva 40s, os prints não dizem se o tempo foi no carregamento da
+página, na procura de popups, nas esperas fixas, no prefill do Ollama ou no
+BERT. Aqui cada etapa abre um span (context manager com relógio monotônico):
+
+    with span("pagina.goto", url=url):
+        page.goto(url)
+
+Os spans se aninham sozinhos (o pai é o span aberto no contexto atual) e, ao
+fechar, vão para os destinos configurados:
+
+- `DestinoJSONL`: uma linha JSON por span (para análise posterior);
+- `DestinoPrometheus`: histograma por nome de span num arquivo textfile do
+  node_exporter, regravado a cada `intervalo` segundos;
+- `DestinoHistograma`: em memória, com p50/p95 por etapa e o detalhamento de
+  cada post (a árvore de spans de cada span raiz).
+
+Sem destinos (o padrão), `span()` devolve um objeto nulo compartilhado e o custo
+é uma checagem de lista vazia. Nos scripts, `--rastrear` (ou RASTREAMENTO=1)
+liga tudo com `ativar_se_pedido()`.
+
+Os spans dos crews (`agents-crew/instrumentacao.py`: LLM, ferramentas e
+tasks, com tokens) são spans daqui, com o mesmo contexto pai/filho e o mesmo
+formato de registro; só acrescentam atributos (`tipo`, tokens, `execucao`).
+
+Uso:
+    python -m comum.rastreamento rastros.jsonl   # detalhamento por post de um arquivo gravado
+"""
+
+import atexit
+import functools
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from comum.estatisticas import percentil
+
+logger = logging.getLogger(__name__)
+
+_destinos: list = []
+_span_atual: ContextVar[Optional["_Span"]] = ContextVar("span_atual", default=None)
+_ids = itertools.count(1)
+
+LIMITES_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class _SpanNulo:
+    """Span usado quando o rastreamento está desligado: não mede nada."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_SpanNulo":
+        return self
+
+    def __exit__(self, *_) -> bool:
+        return False
+
+    def atribuir(self, **atributos: Any) -> None:
+        pass
+
+
+_NULO = _SpanNulo()
+
+
+class _Span:
+    # `superior` é o span pai em si (`pai` é só o id), para quem precisa
+    # acumular valores nos ancestrais
+    __slots__ = ("nome", "atributos", "id", "pai", "superior", "rastro", "_inicio", "_relogio", "_token")
+
+    def __init__(self, nome: str, atributos: dict):
+        self.nome = nome
+        self.atributos = atributos
+
+    def atribuir(self, **atributos: Any) -> None:
+        """Acrescenta atributos conhecidos só depois do trabalho (ex.: tokens)."""
+        self.atributos.update(atributos)
+
+    def __enter__(self) -> "_Span":
+        pai = _span_atual.get()
+        self.id = f"{os.getpid()}-{next(_ids)}"
+        self.superior = pai
+        self.pai = pai.id if pai is not None else None
+        self.rastro = pai.rastro if pai is not None else self.id
+        self._token = _span_atual.set(self)
+        self._inicio = time.time()
+        self._relogio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, valor, _) -> bool:
+        duracao = time.perf_counter() - self._relogio
+        _span_atual.reset(self._token)
+        registro = {
+            "rastro": self.rastro,
+            "id": self.id,
+            "pai": self.pai,
+            "nome": self.nome,
+            "inicio": round(self._inicio, 6),
+            "duracao": round(duracao, 6),
+            "erro": f"{tipo.__name__}: {valor}" if tipo is not None else None,
+            **self.atributos,
+        }
+        for destino in _destinos:
+            try:
+                destino.registrar(registro)
+            except Exception as e:
+                logger.warning("Destino de rastreamento %s falhou: %s", type(destino).__name__, e)
+        return False
+
+
+def span(nome: str, **atributos: Any):
+    """
+    Abre um span; use como `with span("etapa", chave=valor) as s: ...`.
+
+    Args:
+        nome (str): Nome da etapa (agrupa as métricas)
+        **atributos: Valores gravados junto com a duração
+
+    Returns:
+        Context manager do span (o objeto nulo se não houver destinos)
+    """
+    if not _destinos:
+        return _NULO
+    return _Span(nome, atributos)
+
+
+def rastreado(nome: Optional[str] = None) -> Callable:
+    """
+    Decorador que mede cada chamada da função como um span.
+
+    Args:
+        nome (str): Nome do span (padrão: nome da função)
+    """
+    def decorador(funcao: Callable) -> Callable:
+        nome_span = nome or funcao.__name__
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            if not _destinos:
+                return funcao(*args, **kwargs)
+            with _Span(nome_span, {}):
+                return funcao(*args, **kwargs)
+
+        return envoltorio
+
+    return decorador
+
+
+def atributos_ollama(resposta) -> dict:
+    """
+    Tempos e tokens que o Ollama devolve em cada resposta de `ollama.chat`.
+
+    Returns:
+        dict: prefill_s (avaliação do prompt), geracao_s, carga_s, tokens_prompt, tokens_saida
+    """
+    def segundos(campo: str) -> float:
+        return round((resposta.get(campo) or 0) / 1e9, 3)
+
+    return {
+        "prefill_s": segundos("prompt_eval_duration"),
+        "geracao_s": segundos("eval_duration"),
+        "carga_s": segundos("load_duration"),
+        "tokens_prompt": resposta.get("prompt_eval_count"),
+        "tokens_saida": resposta.get("eval_count"),
+    }
+
+
+# ==============================
+# Destinos
+# ==============================
+
+class DestinoJSONL:
+    """
+    Grava uma linha JSON por span.
+
+    Args:
+        arquivo (str): Arquivo de saída, aberto em modo append (padrão: "rastros.jsonl")
+    """
+
+    def __init__(self, arquivo: str = "rastros.jsonl"):
+        self.arquivo = arquivo
+        self._saida = open(arquivo, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def registrar(self, registro: dict) -> None:
+        linha = json.dumps(registro, ensure_ascii=False, default=str)
+        with self._lock:
+            self._saida.write(linha + "\n")
+            self._saida.flush()
+
+    def fechar(self) -> None:
+        with self._lock:
+            self._saida.close()
+
+
+class DestinoPrometheus:
+    """
+    Histograma de duração por nome de span, no formato textfile do Prometheus.
+
+    Args:
+        arquivo (str): Arquivo .prom lido pelo textfile collector do node_exporter
+        limites (tuple): Limites dos buckets em segundos (padrão: LIMITES_PADRAO)
+        intervalo (float): Segundos mínimos entre duas regravações (padrão: 5)
+    """
+
+    def __init__(self, arquivo: str, limites: tuple = LIMITES_PADRAO, intervalo: float = 5.0):
+        self.arquivo = arquivo
+        self.limites = limites
+        self.intervalo = intervalo
+        self._buckets: dict[str, list[int]] = defaultdict(lambda: [0] * len(limites))
+        self._soma: dict[str, float] = defaultdict(float)
+        self._contagem: dict[str, int] = defaultdict(int)
+        self._erros: dict[str, int] = defaultdict(int)
+        self._ultima_gravacao = 0.0
+        self._lock = threading.Lock()
+
+    def registrar(self, registro: dict) -> None:
+        nome, duracao = registro["nome"], registro["duracao"]
+        with self._lock:
+            buckets = self._buckets[nome]
+            for i, limite in enumerate(self.limites):
+                if duracao <= limite:
+                    buckets[i] += 1
+            self._soma[nome] += duracao
+            self._contagem[nome] += 1
+            if registro["erro"]:
+                self._erros[nome] += 1
+            if time.monotonic() - self._ultima_gravacao >= self.intervalo:
+                self._gravar()
+
+    def _gravar(self) -> None:
+        linhas = [
+            "# HELP rastreamento_span_segundos Duração dos spans por etapa",
+            "# TYPE rastreamento_span_segundos histogram",
+        ]
+        for nome in sorted(self._contagem):
+            for limite, quantidade in zip(self.limites, self._buckets[nome]):
+                linhas.append(f'rastreamento_span_segundos_bucket{{span="{nome}",le="{limite}"}} {quantidade}')
+            linhas.append(f'rastreamento_span_segundos_bucket{{span="{nome}",le="+Inf"}} {self._contagem[nome]}')
+            linhas.append(f'rastreamento_span_segundos_sum{{span="{nome}"}} {self._soma[nome]:.6f}')
+            linhas.append(f'rastreamento_span_segundos_count{{span="{nome}"}} {self._contagem[nome]}')
+        linhas += [
+            "# HELP rastreamento_span_erros_total Spans encerrados com exceção",
+            "# TYPE rastreamento_span_erros_total counter",
+        ]
+        linhas += [f'rastreamento_span_erros_total{{span="{nome}"}} {self._erros[nome]}' for nome in sorted(self._contagem)]
+
+        # Troca atômica: o collector nunca lê um arquivo pela metade
+        temporario = f"{self.arquivo}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write("\n".join(linhas) + "\n")
+        os.replace(temporario, self.arquivo)
+        self._ultima_gravacao = time.monotonic()
+
+    def fechar(self) -> None:
+        with self._lock:
+            if self._contagem:
+                self._gravar()
+
+
+class DestinoHistograma:
+    """
+    Durações em memória: p50/p95 por etapa e a árvore de spans de cada post.
+
+    Args:
+        max_rastros (int): Quantos rastros completos (spans raiz) guardar (padrão: 1000)
+    """
+
+    def __init__(self, max_rastros: int = 1000):
+        self.duracoes: dict[str, list[float]] = defaultdict(list)
+        self.rastros: deque = deque(maxlen=max_rastros)
+        self._abertos: dict[str, list[dict]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def registrar(self, registro: dict) -> None:
+        with self._lock:
+            self.duracoes[registro["nome"]].append(registro["duracao"])
+            spans = self._abertos[registro["rastro"]]
+            spans.append(registro)
+            # O span raiz é o último a fechar: o rastro está completo
+            if registro["pai"] is None:
+                self.rastros.append(_montar_arvore(self._abertos.pop(registro["rastro"])))
+
+    def resumo(self) -> dict:
+        """
+        Estatísticas por nome de span.
+
+        Returns:
+            dict: {nome: {chamadas, total_s, p50_ms, p95_ms, max_ms}}
+        """
+        with self._lock:
+            return {nome: _estatisticas(duracoes) for nome, duracoes in self.duracoes.items()}
+
+    def imprimir(self, ultimos: int = 10) -> None:
+        """Mostra o detalhamento dos últimos posts e a tabela por etapa."""
+        for arvore in list(self.rastros)[-ultimos:]:
+            raiz = arvore[0][1]
+            descricao = " ".join(filter(None, [raiz["nome"], raiz.get("url") or raiz.get("caminho")]))
+            erro = f" ✗ {raiz['erro']}" if raiz["erro"] else ""
+            print(f"\n🔎 {descricao} — {raiz['duracao']:.2f}s{erro}")
+            for profundidade, registro in arvore[1:]:
+                parte = registro["duracao"] / raiz["duracao"] if raiz["duracao"] else 0
+                extra = f" (prefill {registro['prefill_s']}s)" if registro.get("prefill_s") else ""
+                erro = " ✗" if registro["erro"] else ""
+                print(f"   {'  ' * (profundidade - 1)}{registro['nome']:<24} {registro['duracao']:>8.3f}s "
+                      f"{parte:>5.0%}{extra}{erro}")
+
+        print(f"\n{'etapa':<26} {'chamadas':>8} {'total':>9} {'p50':>9} {'p95':>9}")
+        for nome, e in sorted(self.resumo().items(), key=lambda item: -item[1]["total_s"]):
+            print(f"{nome:<26} {e['chamadas']:>8} {e['total_s']:>8.2f}s {e['p50_ms']:>7.0f}ms {e['p95_ms']:>7.0f}ms")
+
+    def fechar(self) -> None:
+        pass
+
+
+def _estatisticas(duracoes: list[float]) -> dict:
+    ordenadas = sorted(duracoes)
+    quantidade = len(ordenadas)
+    return {
+        "chamadas": quantidade,
+        "total_s": round(sum(ordenadas), 3),
+        "p50_ms": round(percentil(ordenadas, 0.50) * 1000, 1),
+        "p95_ms": round(percentil(ordenadas, 0.95) * 1000, 1),
+        "max_ms": round(ordenadas[-1] * 1000, 1),
+    }
+
+
+def _montar_arvore(spans: list[dict]) -> list[tuple[int, dict]]:
+    """Spans de um rastro em ordem de início, com a profundidade de cada um (raiz = 0)."""
+    pais = {registro["id"]: registro["pai"] for registro in spans}
+
+    def profundidade(registro: dict) -> int:
+        nivel, pai = 0, registro["pai"]
+        while pai is not None and pai in pais:
+            nivel, pai = nivel + 1, pais[pai]
+        return nivel
+
+    return sorted(((profundidade(r), r) for r in spans), key=lambda item: (item[1]["inicio"], item[0]))
+
+
+# ==============================
+# Configuração
+# ==============================
+
+def adicionar_destino(destino) -> None:
+    """Liga o rastreamento (se ainda não estava) enviando os spans também para `destino`."""
+    _destinos.append(destino)
+
+
+def destino_jsonl(arquivo: str) -> "DestinoJSONL":
+    """
+    O `DestinoJSONL` ligado que grava em `arquivo`, criado e ligado se ainda não houver.
+
+    Args:
+        arquivo (str): Arquivo JSONL dos spans
+
+    Returns:
+        DestinoJSONL: O destino (um só por arquivo, para não duplicar linhas)
+    """
+    caminho = os.path.abspath(arquivo)
+    for destino in _destinos:
+        if isinstance(destino, DestinoJSONL) and os.path.abspath(destino.arquivo) == caminho:
+            return destino
+    destino = DestinoJSONL(arquivo)
+    adicionar_destino(destino)
+    return destino
+
+
+def desativar() -> None:
+    """Fecha os destinos (gravando o que estiver pendente) e desliga o rastreamento."""
+    while _destinos:
+        _destinos.pop().fechar()
+
+
+def ativo() -> bool:
+    return bool(_destinos)
+
+
+def ativar_se_pedido(argv: Optional[list] = None) -> Optional[DestinoHistograma]:
+    """
+    Liga o rastreamento se o script recebeu `--rastrear` ou se RASTREAMENTO=1.
+
+    Sempre usa o histograma em memória; grava JSONL em RASTREAMENTO_JSONL
+    (padrão: "rastros.jsonl") e o textfile do Prometheus se RASTREAMENTO_PROMETHEUS
+    tiver um caminho.
+
+    Returns:
+        DestinoHistograma para `imprimir()` no fim, ou None se não foi pedido
+    """
+    argv = sys.argv if argv is None else argv
+    if "--rastrear" not in argv and os.getenv("RASTREAMENTO", "").lower() not in ("1", "true", "sim"):
+        return None
+
+    histograma = DestinoHistograma()
+    adicionar_destino(histograma)
+    destino_jsonl(os.getenv("RASTREAMENTO_JSONL", "rastros.jsonl"))
+    if os.getenv("RASTREAMENTO_PROMETHEUS"):
+        adicionar_destino(DestinoPrometheus(os.getenv("RASTREAMENTO_PROMETHEUS")))
+    atexit.register(desativar)
+    logger.info("⏱️ Rastreamento ligado (spans em %s)", os.getenv("RASTREAMENTO_JSONL", "rastros.jsonl"))
+    return histograma
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Informe o arquivo JSONL de rastros")
+        sys.exit(1)
+    histograma = DestinoHistograma()
+    with open(sys.argv[1], "r", encoding="utf-8") as f:
+        for linha in f:
+            if linha.strip():
+                histograma.registrar(json.loads(linha))
+    histograma.imprimir(ultimos=int(sys.argv[sys.argv.index("--ultimos") + 1]) if "--ultimos" in sys.argv else 10)
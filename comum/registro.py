@@ -0,0 +1,267 @@
+"""
+Registro (logging) estruturado para extratores e analisadores.
+
+As funções de `extrator/`, `extrator_instagram/` e `interpretador_tela/`
+imprimiam várias linhas por item; em lotes de milhares de itens por hora isso
+enchia o stdout e deixava os laços mais lentos (cada `print` é uma escrita
+síncrona no terminal). Agora elas usam `logging` e este módulo configura:
+
+- uma fila (`QueueHandler`): quem registra só enfileira, e uma thread
+  (`QueueListener`) formata e escreve no destino;
+- nível geral (INFO por padrão: lotes não pagam uma linha por item; com
+  REGISTRO_NIVEL=ITEM elas voltam) e níveis por módulo
+  (REGISTRO_NIVEIS="extrator=WARNING,comum.fila_trabalho=DEBUG");
+- formato texto (padrão) ou JSON por linha, com os campos de `extra=`;
+- um nível ITEM (entre DEBUG e INFO) para as mensagens repetidas a cada item
+  de um lote, com amostragem (REGISTRO_AMOSTRAGEM=N: só 1 a cada N passa);
+- modo lote silencioso (`--silencioso` ou REGISTRO_SILENCIOSO=1): força INFO
+  mesmo com REGISTRO_NIVEL=ITEM/DEBUG. Em INFO as mensagens por item são
+  descartadas na checagem de nível, sem nem criar o registro; ficam resumos,
+  avisos e erros.
+
+Níveis usados nos módulos: DEBUG para o passo a passo (navegando, procurando
+popups, aguardando), ITEM para o resultado de cada item, INFO para resumos de
+lote, WARNING/ERROR para falhas.
+
+Uso:
+    from comum.registro import ITEM, configurar_registro
+    configurar_registro()
+    logger.log(ITEM, "✓ Texto capturado: %d caracteres", n)
+
+    python -m comum.registro benchmark [--itens 20000]   # custo de saída: print x logging
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Mensagens repetidas a cada item de um lote (sujeitas a amostragem)
+ITEM = 15
+logging.addLevelName(ITEM, "ITEM")
+
+# Atributos que todo LogRecord tem; o resto veio de `extra=`
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_parada_registrada = False
+
+
+class FormatadorJSON(logging.Formatter):
+    """Uma linha JSON por registro: ts, nivel, modulo, mensagem e os campos de `extra=`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        dados = {
+            "ts": round(record.created, 3),
+            "nivel": record.levelname,
+            "modulo": record.name,
+            "mensagem": record.getMessage(),
+        }
+        dados.update({chave: valor for chave, valor in vars(record).items() if chave not in _ATRIBUTOS_PADRAO})
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+class FiltroAmostragem(logging.Filter):
+    """
+    Deixa passar 1 a cada `taxa` mensagens de nível ITEM (por módulo e texto da mensagem).
+
+    Args:
+        taxa (int): 1 = todas
+    """
+
+    def __init__(self, taxa: int = 1):
+        super().__init__()
+        self.taxa = taxa
+        self._contagem: dict[tuple, int] = defaultdict(int)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != ITEM or self.taxa <= 1:
+            return True
+        chave = (record.name, record.msg)
+        self._contagem[chave] += 1
+        return (self._contagem[chave] - 1) % self.taxa == 0
+
+
+def _niveis_do_ambiente(texto: str) -> dict[str, str]:
+    niveis = {}
+    for par in filter(None, (p.strip() for p in texto.split(","))):
+        modulo, _, nivel = par.partition("=")
+        niveis[modulo.strip()] = nivel.strip().upper()
+    return niveis
+
+
+def configurar_registro(
+    nivel: Optional[str] = None,
+    niveis: Optional[dict] = None,
+    formato: Optional[str] = None,
+    amostragem: Optional[int] = None,
+    silencioso: Optional[bool] = None,
+    destino: Optional[logging.Handler] = None,
+) -> QueueListener:
+    """
+    Configura o logging do processo (pode ser chamada de novo para reconfigurar).
+
+    Args:
+        nivel (str): Nível geral (padrão: env REGISTRO_NIVEL ou "INFO")
+        niveis (dict): Nível por módulo, ex. {"extrator": "WARNING"} (padrão: env REGISTRO_NIVEIS)
+        formato (str): "texto" ou "json" (padrão: env REGISTRO_FORMATO ou "texto")
+        amostragem (int): Mensagens ITEM: 1 a cada N (padrão: env REGISTRO_AMOSTRAGEM ou 1)
+        silencioso (bool): Nível INFO, sem mensagens por item (padrão: `--silencioso` ou REGISTRO_SILENCIOSO=1)
+        destino (logging.Handler): Onde escrever (padrão: stderr, ou o arquivo em REGISTRO_ARQUIVO)
+
+    Returns:
+        QueueListener: A thread que escreve os registros (parada automaticamente ao sair)
+    """
+    global _listener, _parada_registrada
+
+    nivel = (nivel or os.getenv("REGISTRO_NIVEL", "INFO")).upper()
+    niveis = niveis if niveis is not None else _niveis_do_ambiente(os.getenv("REGISTRO_NIVEIS", ""))
+    formato = formato or os.getenv("REGISTRO_FORMATO", "texto")
+    if silencioso is None:
+        silencioso = "--silencioso" in sys.argv or os.getenv("REGISTRO_SILENCIOSO", "").lower() in ("1", "true", "sim")
+    if amostragem is None:
+        amostragem = int(os.getenv("REGISTRO_AMOSTRAGEM", "1"))
+    if silencioso and logging.getLevelName(nivel) < logging.INFO:
+        nivel = "INFO"
+
+    if destino is None:
+        arquivo = os.getenv("REGISTRO_ARQUIVO")
+        destino = logging.FileHandler(arquivo, encoding="utf-8") if arquivo else logging.StreamHandler(sys.stderr)
+    if formato == "json":
+        destino.setFormatter(FormatadorJSON())
+    else:
+        destino.setFormatter(logging.Formatter("%(asctime)s %(levelname)-7s %(name)s: %(message)s", "%H:%M:%S"))
+
+    if _listener is not None:
+        _listener.stop()
+
+    fila: queue.SimpleQueue = queue.SimpleQueue()
+    enfileirador = QueueHandler(fila)
+    # Filtra antes de enfileirar: o que é descartado não custa formatação nem I/O
+    enfileirador.addFilter(FiltroAmostragem(amostragem))
+
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+    raiz.addHandler(enfileirador)
+    raiz.setLevel(nivel)
+    for modulo, nivel_modulo in niveis.items():
+        logging.getLogger(modulo).setLevel(nivel_modulo)
+
+    _listener = QueueListener(fila, destino, respect_handler_level=True)
+    _listener.start()
+    if not _parada_registrada:
+        atexit.register(parar_registro)
+        _parada_registrada = True
+    return _listener
+
+
+def parar_registro() -> None:
+    """Esvazia a fila e para a thread de escrita."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# ==============================
+# Benchmark: custo de saída por item
+# ==============================
+
+# Um item típico dos lotes: ~8 mensagens (navegação, popups, espera, resultado)
+_MENSAGENS_ITEM = [
+    "Navegando para: %s",
+    "Verificando popups...",
+    "  Nenhum popup detectado",
+    "Aguardando carregamento completo...",
+    "📋 Selecionando todo o texto da página (Ctrl+A)...",
+    "✂️ Extraindo texto da página...",
+    "✓ Texto capturado: %d caracteres",
+    "✓ Texto bruto salvo em: %s",
+]
+
+
+def _item_com_print(i: int) -> None:
+    print(f"Navegando para: https://www.instagram.com/p/{i}/")
+    for mensagem in _MENSAGENS_ITEM[1:6]:
+        print(mensagem)
+    print(f"✓ Texto capturado: {i * 7 % 5000} caracteres")
+    print("✓ Texto bruto salvo em: capturas.db")
+
+
+def _item_com_logging(registrador: logging.Logger, i: int) -> None:
+    registrador.debug(_MENSAGENS_ITEM[0], f"https://www.instagram.com/p/{i}/")
+    for mensagem in _MENSAGENS_ITEM[1:6]:
+        registrador.debug(mensagem)
+    registrador.log(ITEM, _MENSAGENS_ITEM[6], i * 7 % 5000)
+    registrador.log(ITEM, _MENSAGENS_ITEM[7], "capturas.db")
+
+
+def benchmark(itens: int = 20000) -> dict:
+    """
+    Mede o custo de saída por item: prints (como era) contra logging em fila.
+
+    A saída vai para arquivos temporários. Os prints usam buffer de linha, como
+    num terminal; o tempo de logging inclui esvaziar a fila ao final.
+
+    Args:
+        itens (int): Itens simulados (padrão: 20000)
+
+    Returns:
+        dict: Microssegundos por item em cada modo
+    """
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        with open(os.path.join(pasta, "print.txt"), "w", encoding="utf-8", buffering=1) as saida, \
+                redirect_stdout(saida):
+            inicio = time.perf_counter()
+            for i in range(itens):
+                _item_com_print(i)
+            saida.flush()
+            resultados["print"] = (time.perf_counter() - inicio) / itens * 1e6
+
+        registrador = logging.getLogger("comum.registro.benchmark")
+        modos = {
+            "logging_padrao_info": {"nivel": "INFO"},
+            "logging_item": {"nivel": "ITEM"},
+            "logging_debug": {"nivel": "DEBUG"},
+            "logging_json": {"nivel": "ITEM", "formato": "json"},
+            "logging_amostragem_100": {"nivel": "ITEM", "amostragem": 100},
+            "logging_silencioso": {"nivel": "ITEM", "silencioso": True},
+        }
+        for modo, opcoes in modos.items():
+            destino = logging.FileHandler(os.path.join(pasta, f"{modo}.log"), encoding="utf-8")
+            configurar_registro(niveis={}, destino=destino,
+                                **{"formato": "texto", "amostragem": 1, "silencioso": False, **opcoes})
+            inicio = time.perf_counter()
+            for i in range(itens):
+                _item_com_logging(registrador, i)
+            parar_registro()
+            resultados[modo] = (time.perf_counter() - inicio) / itens * 1e6
+            destino.close()
+
+    return {modo: round(us, 2) for modo, us in resultados.items()}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        itens = int(sys.argv[sys.argv.index("--itens") + 1]) if "--itens" in sys.argv else 20000
+        resultados = benchmark(itens)
+        # O benchmark reconfigura o logging; a tabela vai direto para o stdout
+        print(f"{'modo':<26} {'µs/item':>10}")
+        for modo, us in resultados.items():
+            print(f"{modo:<26} {us:>10.2f}")
+    else:
+        print("Uso: python -m comum.registro benchmark [--itens 20000]")
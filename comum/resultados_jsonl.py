@@ -0,0 +1,323 @@
+"""
+Gravação incremental de resultados em JSONL.
+
+Os processamentos em lote acumulavam tudo numa lista e só gravavam o JSON
+completo no final: uma queda perdia a execução inteira e a memória crescia com
+o lote. Aqui cada item vira uma linha JSON compacta gravada na hora, com fsync
+em lotes (a cada N itens ou T segundos) e rotação por tamanho:
+
+    resultados.jsonl            <- arquivo ativo
+    resultados.000001.jsonl     <- segmentos rotacionados, em ordem
+
+Os leitores percorrem os segmentos em ordem, acompanham o arquivo ativo
+(`seguir`, como `tail -f`) e compactam tudo num arquivo só (`compactar`).
+
+Uso:
+    python -m comum.resultados_jsonl compactar resultados.jsonl [--chave url_original]
+    python -m comum.resultados_jsonl seguir resultados.jsonl
+"""
+
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import time
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _base_e_extensao(caminho: str) -> tuple[str, str]:
+    base, extensao = os.path.splitext(caminho)
+    return base, extensao or ".jsonl"
+
+
+def segmentos(caminho: str) -> list[str]:
+    """
+    Lista os arquivos de um resultado na ordem de gravação.
+
+    Args:
+        caminho (str): Caminho do arquivo ativo (ex.: "resultados.jsonl")
+
+    Returns:
+        list[str]: Segmentos rotacionados seguidos do arquivo ativo (se existir)
+    """
+    base, extensao = _base_e_extensao(caminho)
+    padrao = re.compile(re.escape(base) + r"\.(\d{6})" + re.escape(extensao) + "$")
+    rotacionados = sorted(
+        p for p in glob.glob(f"{glob.escape(base)}.*{extensao}") if padrao.match(p)
+    )
+    if os.path.exists(caminho):
+        rotacionados.append(caminho)
+    return rotacionados
+
+
+def caminho_do_worker(caminho: str) -> str:
+    """
+    Arquivo de resultado exclusivo do processo atual (ex.: "r.worker-4242.jsonl"),
+    para vários workers gravarem em paralelo sem disputar o mesmo arquivo.
+    """
+    base, extensao = _base_e_extensao(caminho)
+    return f"{base}.worker-{os.getpid()}{extensao}"
+
+
+class GravadorJSONL:
+    """
+    Grava um item por linha, com fsync em lotes e rotação por tamanho.
+
+    Args:
+        caminho (str): Arquivo ativo (ex.: "instagram_multiplos.jsonl")
+        fsync_a_cada (int): Itens entre fsyncs (padrão: 20)
+        fsync_intervalo (float): Segundos máximos entre fsyncs (padrão: 5.0)
+        tamanho_maximo (int): Bytes do arquivo ativo antes de rotacionar (padrão: 64 MiB)
+    """
+
+    def __init__(
+        self,
+        caminho: str,
+        fsync_a_cada: int = 20,
+        fsync_intervalo: float = 5.0,
+        tamanho_maximo: int = 64 * 1024 * 1024,
+    ):
+        self.caminho = caminho
+        self.fsync_a_cada = fsync_a_cada
+        self.fsync_intervalo = fsync_intervalo
+        self.tamanho_maximo = tamanho_maximo
+        self.itens_gravados = 0
+
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+        self._tamanho = self._arquivo.tell()
+        if self._tamanho and not self._termina_em_quebra(caminho):
+            # Linha cortada por uma queda anterior: isola para não corromper a próxima
+            self._arquivo.write("\n")
+            self._tamanho += 1
+        self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    @staticmethod
+    def _termina_em_quebra(caminho: str) -> bool:
+        with open(caminho, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def escrever(self, item: dict) -> None:
+        """Acrescenta um item como uma linha JSON compacta."""
+        linha = json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+        self._arquivo.write(linha)
+        self._arquivo.flush()
+        self._tamanho += len(linha.encode("utf-8"))
+        self._pendentes += 1
+        self.itens_gravados += 1
+
+        if (
+            self._pendentes >= self.fsync_a_cada
+            or time.monotonic() - self._ultimo_fsync >= self.fsync_intervalo
+        ):
+            self.sincronizar()
+
+        if self._tamanho >= self.tamanho_maximo:
+            self.rotacionar()
+
+    def sincronizar(self) -> None:
+        """Força a gravação em disco das linhas pendentes."""
+        if self._pendentes:
+            os.fsync(self._arquivo.fileno())
+            self._pendentes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def rotacionar(self) -> Optional[str]:
+        """
+        Fecha o arquivo ativo, renomeia para o próximo segmento e abre um novo.
+
+        Returns:
+            str: Caminho do segmento criado, ou None se o arquivo estava vazio
+        """
+        if self._tamanho == 0:
+            return None
+
+        self.sincronizar()
+        self._arquivo.close()
+
+        base, extensao = _base_e_extensao(self.caminho)
+        existentes = segmentos(self.caminho)[:-1]
+        proximo = int(existentes[-1][len(base) + 1:len(base) + 7]) + 1 if existentes else 1
+        destino = f"{base}.{proximo:06d}{extensao}"
+        os.replace(self.caminho, destino)
+        logger.info("Resultado rotacionado para %s", destino)
+
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+        self._tamanho = 0
+        return destino
+
+    def fechar(self) -> None:
+        if not self._arquivo.closed:
+            self.sincronizar()
+            self._arquivo.close()
+
+    def __enter__(self) -> "GravadorJSONL":
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fechar()
+
+
+def ler_jsonl(caminho: str) -> Iterator[dict]:
+    """
+    Lê todos os itens de um resultado (segmentos + arquivo ativo) em ordem.
+
+    Linhas inválidas (ex.: a última linha cortada por uma queda) são ignoradas.
+
+    Args:
+        caminho (str): Caminho do arquivo ativo
+
+    Yields:
+        dict: Um item por linha
+    """
+    for segmento in segmentos(caminho):
+        with open(segmento, "r", encoding="utf-8") as f:
+            for numero, linha in enumerate(f, 1):
+                if not linha.strip():
+                    continue
+                try:
+                    yield json.loads(linha)
+                except json.JSONDecodeError:
+                    logger.warning("Linha inválida ignorada em %s:%d", segmento, numero)
+
+
+def chaves_processadas(caminho: str, campo: str) -> set:
+    """
+    Retorna os valores de `campo` já gravados, para retomar um lote interrompido.
+
+    Linhas com "erro" (falhas gravadas por versões anteriores) não contam: esses
+    itens são processados de novo.
+
+    Args:
+        caminho (str): Caminho do arquivo ativo
+        campo (str): Campo que identifica o item (ex.: "url_original")
+
+    Returns:
+        set: Valores encontrados
+    """
+    return {item[campo] for item in ler_jsonl(caminho) if campo in item and "erro" not in item}
+
+
+def seguir(caminho: str, intervalo: float = 0.5, desde_inicio: bool = False) -> Iterator[dict]:
+    """
+    Acompanha o arquivo ativo como `tail -f`, inclusive após rotações.
+
+    Args:
+        caminho (str): Caminho do arquivo ativo
+        intervalo (float): Segundos entre verificações quando não há dados novos
+        desde_inicio (bool): Se True, emite também as linhas já existentes
+
+    Yields:
+        dict: Itens conforme são gravados
+    """
+    while not os.path.exists(caminho):
+        time.sleep(intervalo)
+
+    arquivo = open(caminho, "r", encoding="utf-8")
+    if not desde_inicio:
+        arquivo.seek(0, os.SEEK_END)
+    inode = os.fstat(arquivo.fileno()).st_ino
+    resto = ""
+
+    try:
+        while True:
+            bloco = arquivo.read()
+            if bloco:
+                resto += bloco
+                *linhas, resto = resto.split("\n")
+                for linha in linhas:
+                    if linha.strip():
+                        try:
+                            yield json.loads(linha)
+                        except json.JSONDecodeError:
+                            logger.warning("Linha inválida ignorada em %s", caminho)
+                continue
+
+            # Sem dados novos: verifica se o arquivo foi rotacionado
+            try:
+                rotacionado = os.stat(caminho).st_ino != inode
+            except FileNotFoundError:
+                rotacionado = False
+            if rotacionado:
+                arquivo.close()
+                arquivo = open(caminho, "r", encoding="utf-8")
+                inode = os.fstat(arquivo.fileno()).st_ino
+                resto = ""
+                continue
+
+            time.sleep(intervalo)
+    finally:
+        arquivo.close()
+
+
+def compactar(caminho: str, destino: Optional[str] = None, chave: Optional[str] = None) -> int:
+    """
+    Junta todos os segmentos num único arquivo, opcionalmente deduplicando.
+
+    Args:
+        caminho (str): Caminho do arquivo ativo
+        destino (str): Arquivo de saída (padrão: o próprio `caminho`; nesse caso
+            os segmentos rotacionados são removidos ao final)
+        chave (str): Campo de deduplicação; mantém a última ocorrência (opcional)
+
+    Returns:
+        int: Quantidade de itens no arquivo compactado
+    """
+    destino = destino or caminho
+    temporario = f"{destino}.tmp"
+    origem = segmentos(caminho)
+
+    if chave:
+        # Só as chaves e a posição da última ocorrência ficam em memória
+        ultima_posicao = {}
+        for posicao, item in enumerate(ler_jsonl(caminho)):
+            ultima_posicao[item.get(chave)] = posicao
+        manter = set(ultima_posicao.values())
+    else:
+        manter = None
+
+    total = 0
+    with open(temporario, "w", encoding="utf-8") as f:
+        for posicao, item in enumerate(ler_jsonl(caminho)):
+            if manter is not None and posicao not in manter:
+                continue
+            f.write(json.dumps(item, ensure_ascii=False, separators=(",", ":"), default=str) + "\n")
+            total += 1
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temporario, destino)
+    if destino == caminho:
+        for segmento in origem:
+            if segmento != caminho:
+                os.remove(segmento)
+
+    logger.info("%d itens compactados em %s", total, destino)
+    return total
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ("compactar", "seguir"):
+        print("Uso: python -m comum.resultados_jsonl (compactar ARQUIVO [--chave CAMPO] | seguir ARQUIVO)")
+        sys.exit(1)
+
+    if sys.argv[1] == "compactar":
+        campo = sys.argv[sys.argv.index("--chave") + 1] if "--chave" in sys.argv else None
+        compactar(sys.argv[2], chave=campo)
+    else:
+        try:
+            for item in seguir(sys.argv[2], desde_inicio=True):
+                print(json.dumps(item, ensure_ascii=False))
+        except KeyboardInterrupt:
+            pass
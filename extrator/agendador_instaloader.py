@@ -0,0 +1,517 @@
+"""
+Agendador de requisições ao Instagram via Instaloader.
+
+O `get_instagram_post_data` cria um `instaloader.Instaloader()` novo a cada URL e o
+Instagram responde 403 depois de duas extrações seguidas. Este módulo mantém um único
+contexto do Instaloader (com sessão salva/login opcional), limita a taxa com um
+token bucket e reduz a velocidade automaticamente quando recebe 403/429 (AIMD:
+aumento aditivo em caso de sucesso, redução multiplicativa + backoff exponencial
+em caso de bloqueio). Os metadados dos posts ficam em cache por shortcode.
+
+O buscador é injetável, então o agendador pode ser testado contra um servidor HTTP
+local (ver `criar_buscador_http`) sem tocar no Instagram.
+
+Outras consultas (hashtags, listas paginadas) passam pelo mesmo controle com
+`executar` e `paginar`: com o Instaloader do agendador, cada requisição que ele
+faz de fato (inclusive cada página nova) consome um token do bucket, e a pausa
+de backoff após um bloqueio vale para todas as requisições do processo.
+
+Uso:
+    python -m extrator.agendador_instaloader URL [URL ...]
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+from extrator.scraper_instagram import get_shortcode_from_url, post_para_dict
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Fim de um iterador paginado em `paginar`
+_FIM = object()
+
+
+class BloqueioInstagramError(Exception):
+    """O servidor recusou a requisição por limite de taxa (403/429)."""
+
+    def __init__(self, status: int, mensagem: str = "", retry_after: Optional[float] = None):
+        super().__init__(mensagem or f"HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket com taxa ajustável em tempo de execução.
+
+    Args:
+        taxa (float): Tokens repostos por segundo
+        capacidade (float): Máximo de tokens acumulados (tamanho da rajada)
+        relogio (Callable): Função de tempo monotônico (injetável para testes)
+        dormir (Callable): Função de espera (injetável para testes)
+    """
+
+    def __init__(
+        self,
+        taxa: float,
+        capacidade: float = 1.0,
+        relogio: Callable[[], float] = time.monotonic,
+        dormir: Callable[[float], None] = time.sleep,
+    ):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._relogio = relogio
+        self._dormir = dormir
+        self._tokens = capacidade
+        self._ultimo = relogio()
+        self._lock = threading.Lock()
+
+    def _repor(self) -> None:
+        agora = self._relogio()
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa)
+        self._ultimo = agora
+
+    def consumir(self, tokens: float = 1.0) -> float:
+        """
+        Bloqueia até haver tokens disponíveis e os consome.
+
+        Returns:
+            float: Tempo total esperado em segundos
+        """
+        esperado = 0.0
+        while True:
+            with self._lock:
+                self._repor()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return esperado
+                espera = (tokens - self._tokens) / self.taxa
+            self._dormir(espera)
+            esperado += espera
+
+    def esvaziar(self) -> None:
+        """Descarta os tokens acumulados (usado após um bloqueio)."""
+        with self._lock:
+            self._tokens = 0.0
+            self._ultimo = self._relogio()
+
+
+def criar_instaloader(
+    usuario: Optional[str] = None,
+    senha: Optional[str] = None,
+    arquivo_sessao: Optional[str] = None,
+    antes_da_consulta: Optional[Callable[[str], None]] = None,
+):
+    """
+    Cria um Instaloader que não faz esperas nem retentativas próprias.
+
+    O controle de taxa fica inteiramente com o `AgendadorInstaloader`; por isso o
+    `RateController` padrão é trocado por um que apenas repassa os 429 e avisa
+    `antes_da_consulta` antes de cada requisição.
+
+    Args:
+        usuario (str): Usuário do Instagram para reutilizar/criar sessão (opcional)
+        senha (str): Senha usada se não houver sessão salva (opcional)
+        arquivo_sessao (str): Caminho do arquivo de sessão (opcional)
+        antes_da_consulta (Callable): Chamada com o tipo da consulta antes de cada
+            requisição (o agendador consome um token aqui) (opcional)
+
+    Returns:
+        instaloader.Instaloader: Instância pronta para uso
+    """
+    import instaloader
+
+    class _RepassaLimite(instaloader.RateController):
+        def wait_before_query(self, query_type: str) -> None:
+            if antes_da_consulta is not None:
+                antes_da_consulta(query_type)
+
+        def handle_429(self, query_type: str) -> None:
+            raise BloqueioInstagramError(429, f"429 Too Many Requests ({query_type})")
+
+    L = instaloader.Instaloader(
+        quiet=True,
+        max_connection_attempts=1,
+        rate_controller=lambda contexto: _RepassaLimite(contexto),
+    )
+
+    if usuario:
+        try:
+            L.load_session_from_file(usuario, arquivo_sessao)
+            logger.info("Sessão do Instagram carregada para %s", usuario)
+        except FileNotFoundError:
+            if not senha:
+                logger.warning("Sessão de %s não encontrada; seguindo sem login", usuario)
+            else:
+                L.login(usuario, senha)
+                L.save_session_to_file(arquivo_sessao)
+                logger.info("Login realizado e sessão salva para %s", usuario)
+
+    return L
+
+
+def _classificar_erro(erro: Exception) -> Optional[BloqueioInstagramError]:
+    """Converte exceções do Instaloader em `BloqueioInstagramError` quando for 403/429."""
+    if isinstance(erro, BloqueioInstagramError):
+        return erro
+    mensagem = str(erro)
+    nome = type(erro).__name__
+    if "429" in mensagem or nome == "TooManyRequestsException":
+        return BloqueioInstagramError(429, mensagem)
+    if "403" in mensagem or nome == "QueryReturnedForbiddenException":
+        return BloqueioInstagramError(403, mensagem)
+    return None
+
+
+def criar_buscador_instaloader(L) -> Callable[[str], dict]:
+    """Retorna um buscador de metadados que reutiliza o contexto de `L`."""
+    import instaloader
+
+    def buscar(shortcode: str) -> dict:
+        try:
+            post = instaloader.Post.from_shortcode(L.context, shortcode)
+            return post_para_dict(post, shortcode)
+        except Exception as e:
+            bloqueio = _classificar_erro(e)
+            if bloqueio is not None:
+                raise bloqueio from e
+            raise
+
+    return buscar
+
+
+def criar_buscador_http(base_url: str, timeout: float = 10.0) -> Callable[[str], dict]:
+    """
+    Buscador que lê `GET {base_url}/p/{shortcode}/` e espera um JSON com os mesmos
+    campos de `post_para_dict`. Serve para testar o agendador com um servidor stub.
+
+    Args:
+        base_url (str): URL base do servidor (ex.: "http://127.0.0.1:8765")
+        timeout (float): Timeout de cada requisição em segundos
+
+    Returns:
+        Callable: Função shortcode -> dict
+    """
+    base_url = base_url.rstrip("/")
+
+    def buscar(shortcode: str) -> dict:
+        try:
+            with urllib.request.urlopen(f"{base_url}/p/{shortcode}/", timeout=timeout) as resposta:
+                return json.loads(resposta.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code in (403, 429):
+                retry_after = e.headers.get("Retry-After")
+                raise BloqueioInstagramError(
+                    e.code, str(e), float(retry_after) if retry_after else None
+                ) from e
+            raise
+
+    return buscar
+
+
+class AgendadorInstaloader:
+    """
+    Processa URLs do Instagram na maior taxa sustentável sem ser bloqueado.
+
+    Args:
+        buscador (Callable): Função shortcode -> dict. Se None, usa um Instaloader
+            compartilhado criado com `usuario`/`senha`/`arquivo_sessao`
+        taxa_inicial (float): Requisições por segundo no início (padrão: 0.2)
+        taxa_minima (float): Piso da taxa após bloqueios (padrão: 0.01)
+        taxa_maxima (float): Teto da taxa (padrão: 1.0)
+        incremento (float): Aumento aditivo da taxa por sucesso (padrão: 0.005)
+        fator_reducao (float): Multiplicador da taxa a cada bloqueio (padrão: 0.5)
+        backoff_base (float): Pausa inicial após bloqueio em segundos (padrão: 30)
+        backoff_maximo (float): Pausa máxima após bloqueios seguidos (padrão: 900)
+        max_tentativas (int): Tentativas por URL antes de desistir (padrão: 5)
+        arquivo_cache (str): JSON para persistir o cache de posts (opcional)
+    """
+
+    def __init__(
+        self,
+        buscador: Optional[Callable[[str], dict]] = None,
+        taxa_inicial: float = 0.2,
+        taxa_minima: float = 0.01,
+        taxa_maxima: float = 1.0,
+        incremento: float = 0.005,
+        fator_reducao: float = 0.5,
+        backoff_base: float = 30.0,
+        backoff_maximo: float = 900.0,
+        max_tentativas: int = 5,
+        arquivo_cache: Optional[str] = None,
+        usuario: Optional[str] = None,
+        senha: Optional[str] = None,
+        arquivo_sessao: Optional[str] = None,
+        relogio: Callable[[], float] = time.monotonic,
+        dormir: Callable[[float], None] = time.sleep,
+    ):
+        # Por thread: token já consumido por `executar` para a próxima consulta
+        self._local = threading.local()
+        if buscador is None:
+            self.instaloader = criar_instaloader(usuario, senha, arquivo_sessao, self._antes_da_consulta)
+            buscador = criar_buscador_instaloader(self.instaloader)
+        else:
+            self.instaloader = None
+
+        self._buscador = buscador
+        self._relogio = relogio
+        self._dormir = dormir
+        # Fim da pausa de backoff, compartilhada por todas as requisições
+        self._pausa_ate = 0.0
+        self.bucket = TokenBucket(taxa_inicial, capacidade=1.0, relogio=relogio, dormir=dormir)
+        self.taxa_minima = taxa_minima
+        self.taxa_maxima = taxa_maxima
+        self.incremento = incremento
+        self.fator_reducao = fator_reducao
+        self.backoff_base = backoff_base
+        self.backoff_maximo = backoff_maximo
+        self.max_tentativas = max_tentativas
+        self.arquivo_cache = arquivo_cache
+        self._bloqueios_seguidos = 0
+        self._lock = threading.Lock()
+
+        self.cache: dict[str, dict] = {}
+        if arquivo_cache and os.path.exists(arquivo_cache):
+            with open(arquivo_cache, "r", encoding="utf-8") as f:
+                self.cache = json.load(f)
+
+        self.estatisticas = {
+            "requisicoes": 0,
+            "sucessos": 0,
+            "bloqueios": 0,
+            "acertos_cache": 0,
+            "falhas": 0,
+            "segundos_espera": 0.0,
+        }
+
+    @property
+    def taxa(self) -> float:
+        return self.bucket.taxa
+
+    def _registrar_sucesso(self) -> None:
+        with self._lock:
+            self._bloqueios_seguidos = 0
+            self.bucket.taxa = min(self.taxa_maxima, self.bucket.taxa + self.incremento)
+
+    def _registrar_bloqueio(self, erro: BloqueioInstagramError) -> float:
+        """Reduz a taxa e retorna quanto tempo pausar antes da próxima tentativa."""
+        with self._lock:
+            self._bloqueios_seguidos += 1
+            self.bucket.taxa = max(self.taxa_minima, self.bucket.taxa * self.fator_reducao)
+            self.bucket.esvaziar()
+            pausa = min(
+                self.backoff_maximo,
+                self.backoff_base * (2 ** (self._bloqueios_seguidos - 1)),
+            )
+            if erro.retry_after is not None:
+                pausa = max(pausa, erro.retry_after)
+            # Jitter para não sincronizar vários processos
+            pausa *= random.uniform(0.8, 1.2)
+            self._pausa_ate = max(self._pausa_ate, self._relogio() + pausa)
+            return pausa
+
+    def _consumir_token(self) -> None:
+        """Espera a pausa de backoff (se houver) e um token do bucket."""
+        with self._lock:
+            pausa = self._pausa_ate - self._relogio()
+        if pausa > 0:
+            self._dormir(pausa)
+            self.estatisticas["segundos_espera"] += pausa
+        self.estatisticas["segundos_espera"] += self.bucket.consumir()
+        self.estatisticas["requisicoes"] += 1
+
+    def _antes_da_consulta(self, tipo: str) -> None:
+        self._local.consultas = getattr(self._local, "consultas", 0) + 1
+        # A primeira consulta dentro de `executar` usa o token que ele já consumiu
+        if getattr(self._local, "pre_pago", False):
+            self._local.pre_pago = False
+            return
+        self._consumir_token()
+
+    def executar(self, descricao: str, chamada: Callable[[], T], pre_pagar: bool = True,
+                 max_tentativas: Optional[int] = None) -> T:
+        """
+        Executa uma requisição ao Instagram sob o controle de taxa do agendador.
+
+        Sucesso aumenta a taxa; 403/429 (também as exceções equivalentes do
+        Instaloader) reduzem a taxa, marcam a pausa de backoff e repetem a chamada.
+
+        Args:
+            descricao (str): Identificação nos logs (ex.: shortcode, "#hashtag")
+            chamada (Callable): Faz a requisição e devolve o resultado
+            pre_pagar (bool): Consome um token antes da chamada (padrão: True). Com
+                False, só as consultas que o Instaloader do agendador fizer consomem
+                tokens (para chamadas que podem não tocar a rede, como `next` numa página)
+            max_tentativas (int): Tentativas antes de desistir (padrão: o do agendador)
+
+        Returns:
+            O resultado de `chamada`
+
+        Raises:
+            BloqueioInstagramError: Se continuar bloqueado após as tentativas
+        """
+        max_tentativas = max_tentativas or self.max_tentativas
+        for tentativa in range(1, max_tentativas + 1):
+            consultas = getattr(self._local, "consultas", 0)
+            if pre_pagar:
+                self._consumir_token()
+                self._local.pre_pago = True
+            try:
+                resultado = chamada()
+            except Exception as e:
+                bloqueio = _classificar_erro(e)
+                if bloqueio is None:
+                    raise
+                self.estatisticas["bloqueios"] += 1
+                pausa = self._registrar_bloqueio(bloqueio)
+                logger.warning(
+                    "HTTP %s em %s (tentativa %d/%d); taxa=%.3f req/s, pausa de %.0fs",
+                    bloqueio.status, descricao, tentativa, max_tentativas, self.taxa, pausa,
+                )
+                if tentativa == max_tentativas:
+                    if bloqueio is e:
+                        raise
+                    raise bloqueio from e
+                continue
+            finally:
+                self._local.pre_pago = False
+
+            # Sem token pago e sem consulta (item de uma página já baixada): não conta para a taxa
+            if pre_pagar or getattr(self._local, "consultas", 0) != consultas:
+                self._registrar_sucesso()
+                self.estatisticas["sucessos"] += 1
+            return resultado
+
+        raise AssertionError("inalcançável")
+
+    def paginar(self, descricao: str, iteravel: Iterable[T], limite: Optional[int] = None) -> Iterator[T]:
+        """
+        Itera uma lista paginada do Instaloader (ex.: `Hashtag.get_top_posts()`).
+
+        Cada página buscada consome um token (via `antes_da_consulta`). Um 403/429
+        no meio reduz a taxa e marca a pausa como em `executar`, e encerra a
+        iteração com os itens já entregues (o iterador do Instaloader não
+        continua depois de uma exceção).
+
+        Args:
+            descricao (str): Identificação nos logs
+            iteravel (Iterable): Iterável preguiçoso do Instaloader
+            limite (int): Máximo de itens (opcional)
+
+        Yields:
+            Os itens, na ordem
+        """
+        iterador = iter(iteravel)
+        entregues = 0
+        while limite is None or entregues < limite:
+            try:
+                item = self.executar(descricao, lambda: next(iterador, _FIM), pre_pagar=False, max_tentativas=1)
+            except BloqueioInstagramError:
+                logger.warning("Paginação de %s interrompida após %d itens", descricao, entregues)
+                return
+            if item is _FIM:
+                return
+            entregues += 1
+            yield item
+
+    def obter_post(self, url: str, max_tentativas: Optional[int] = None) -> dict:
+        """
+        Retorna os metadados do post, usando o cache ou respeitando o limite de taxa.
+
+        Args:
+            url (str): URL do post do Instagram
+            max_tentativas (int): Tentativas antes de desistir (padrão: o do agendador)
+
+        Returns:
+            dict: Mesmos campos de `get_instagram_post_data`
+
+        Raises:
+            ValueError: Se a URL não tiver shortcode
+            BloqueioInstagramError: Se continuar bloqueado após `max_tentativas`
+        """
+        shortcode = get_shortcode_from_url(url)
+        if not shortcode:
+            raise ValueError("URL de post inválida.")
+
+        if shortcode in self.cache:
+            self.estatisticas["acertos_cache"] += 1
+            return self.cache[shortcode]
+
+        dados = self.executar(shortcode, lambda: self._buscador(shortcode), max_tentativas=max_tentativas)
+        self.cache[shortcode] = dados
+        return dados
+
+    def processar_fila(self, urls: Iterable[str]) -> Iterator[tuple[str, Optional[dict], Optional[str]]]:
+        """
+        Processa URLs em sequência na taxa corrente.
+
+        Args:
+            urls (Iterable[str]): URLs a processar (pode ser um gerador infinito)
+
+        Yields:
+            tuple: (url, dados ou None, mensagem de erro ou None)
+        """
+        try:
+            for url in urls:
+                try:
+                    yield url, self.obter_post(url), None
+                except Exception as e:
+                    self.estatisticas["falhas"] += 1
+                    logger.error("Falha ao obter %s: %s", url, e)
+                    yield url, None, str(e)
+        finally:
+            self.salvar_cache()
+
+    def salvar_cache(self) -> None:
+        """Persiste o cache de posts em `arquivo_cache`, se configurado."""
+        if not self.arquivo_cache:
+            return
+        temporario = f"{self.arquivo_cache}.tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self.cache, f, ensure_ascii=False)
+        os.replace(temporario, self.arquivo_cache)
+
+
+# Instância compartilhada para quem só precisa de `obter_post`
+_agendador: Optional[AgendadorInstaloader] = None
+
+
+def get_agendador() -> AgendadorInstaloader:
+    """
+    Retorna o agendador compartilhado do processo.
+    Usa INSTAGRAM_USUARIO/INSTAGRAM_SESSAO do ambiente para reaproveitar a sessão.
+    """
+    global _agendador
+    if _agendador is None:
+        _agendador = AgendadorInstaloader(
+            usuario=os.getenv("INSTAGRAM_USUARIO"),
+            arquivo_sessao=os.getenv("INSTAGRAM_SESSAO"),
+            arquivo_cache=os.getenv("INSTAGRAM_CACHE_POSTS", "cache_posts_instagram.json"),
+        )
+    return _agendador
+
+
+if __name__ == "__main__":
+    from comum.registro import configurar_registro
+    configurar_registro()
+
+    urls = sys.argv[1:] or [
+        "https://www.instagram.com/agencia.brasil/p/DRZ9blqgEZu/",
+        "https://www.instagram.com/p/DRaYqKWjwTm",
+        "https://www.instagram.com/p/DRaKiYFDig3/",
+    ]
+
+    agendador = get_agendador()
+    for url, dados, erro in agendador.processar_fila(urls):
+        print(url, dados if dados else f"ERRO: {erro}")
+    print(agendador.estatisticas)
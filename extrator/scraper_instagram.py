@@ -11,19 +11,18 @@ def get_shortcode_from_url(url: str) -> str:
     """
     path = urlparse(url).path.strip("/")
     parts = path.split("/")
-    # Geralmente: ['p', 'SHORTCODE'] ou ['reel', 'SHORTCODE']
+    # Geralmente: ['p', 'SHORTCODE'] ou ['reel', 'SHORTCODE'],
+    # mas também ['usuario', 'p', 'SHORTCODE'] em links de perfil
+    for i, parte in enumerate(parts[:-1]):
+        if parte in ("p", "reel", "reels", "tv"):
+            return parts[i + 1]
     return parts[1] if len(parts) > 1 else None
 
-def get_instagram_post_data(url: str):
-    L = instaloader.Instaloader()
-
-    shortcode = get_shortcode_from_url(url)
-    if not shortcode:
-        raise ValueError("URL de post inválida.")
-
-    post = instaloader.Post.from_shortcode(L.context, shortcode)
-
-    data = {
+def post_para_dict(post, shortcode: str) -> dict:
+    """
+    Converte um `instaloader.Post` no dicionário de metadados usado pelo projeto.
+    """
+    return {
         "shortcode": shortcode,
         "caption": post.caption,
         "image_url": post.url,                 # thumbnail/primeira imagem
@@ -32,7 +31,24 @@ def get_instagram_post_data(url: str):
         "views": post.video_view_count if post.is_video else None,
         "date_utc": post.date_utc.isoformat()
     }
-    return data
+
+def get_instagram_post_data(url: str, L: instaloader.Instaloader = None):
+    """
+    Obtém os metadados de um post.
+
+    Para várias URLs, passe o mesmo `L` (ou use `extrator.agendador_instaloader`),
+    pois cada Instaloader novo abre outra sessão e acelera o bloqueio.
+    """
+    if L is None:
+        L = instaloader.Instaloader()
+
+    shortcode = get_shortcode_from_url(url)
+    if not shortcode:
+        raise ValueError("URL de post inválida.")
+
+    post = instaloader.Post.from_shortcode(L.context, shortcode)
+
+    return post_para_dict(post, shortcode)
 
 if __name__ == "__main__":
     #post_url = "https://www.instagram.com/p/XXXXXXXXXXX/"
@@ -5,13 +5,24 @@ Playwright gerencia automaticamente os drivers do navegador, eliminando problema
 Instalação:
     pip install playwright
     playwright install chromium
+
+Uso (a partir da raiz do projeto):
+    python -m extrator.scraper_print
 """
 
 from playwright.sync_api import sync_playwright, Page
+import logging
 import os
 import time
 
+from comum.fila_trabalho import FilaTrabalho, consumir
+from comum.rastreamento import rastreado, span
+from comum.registro import ITEM, configurar_registro
+
+logger = logging.getLogger(__name__)
+
 
+@rastreado("popups")
 def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
     """
     Tenta identificar e fechar popups comuns na página.
@@ -60,16 +71,16 @@ def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
         'button:has-text("Recusar")',
     ]
     
-    print("Verificando popups...")
+    logger.debug("Verificando popups...")
     
     for seletor in seletores_fechar:
         try:
             # Verifica se o elemento existe e está visível
             if page.locator(seletor).first.is_visible(timeout=1000):
-                print(f"  ✓ Popup encontrado: {seletor}")
+                logger.debug("  ✓ Popup encontrado: %s", seletor)
                 page.locator(seletor).first.click()
                 popup_fechado = True
-                print(f"  ✓ Popup fechado!")
+                logger.debug("  ✓ Popup fechado!")
                 time.sleep(0.5)  # Pequena pausa após fechar
                 break
         except:
@@ -79,7 +90,7 @@ def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
     # Verifica por overlays/modals e tenta pressionar ESC
     try:
         if page.locator('[role="dialog"]').first.is_visible(timeout=1000):
-            print("  ✓ Modal detectado, pressionando ESC...")
+            logger.debug("  ✓ Modal detectado, pressionando ESC...")
             page.keyboard.press('Escape')
             popup_fechado = True
             time.sleep(0.5)
@@ -87,14 +98,52 @@ def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
         pass
     
     if popup_fechado:
-        print(f"Aguardando {tempo_espera} segundos após fechar popup...")
+        logger.debug("Aguardando %s segundos após fechar popup...", tempo_espera)
         time.sleep(tempo_espera)
     else:
-        print("  Nenhum popup detectado")
+        logger.debug("  Nenhum popup detectado")
     
     return popup_fechado
 
 
+def _screenshot_da_pagina(
+    navegador,
+    url: str,
+    nome_arquivo: str,
+    tempo_espera: int,
+    largura: int,
+    altura: int,
+    pagina_completa: bool,
+    fechar_popup: bool
+) -> None:
+    """Abre a URL em uma aba nova do navegador e salva o screenshot."""
+    # Cria uma nova página com as dimensões especificadas
+    page = navegador.new_page(viewport={'width': largura, 'height': altura})
+    
+    try:
+        # Navega para a URL
+        logger.debug("Navegando para: %s", url)
+        with span("pagina.goto"):
+            page.goto(url, wait_until="networkidle")
+        
+        # Tenta fechar popups se habilitado
+        if fechar_popup:
+            fechar_popups(page, tempo_espera=1)
+        
+        # Aguarda o tempo adicional especificado
+        if tempo_espera > 0:
+            logger.debug("Aguardando %s segundos...", tempo_espera)
+            with span("espera.carregamento"):
+                time.sleep(tempo_espera)
+        
+        # Captura o screenshot
+        logger.debug("Capturando screenshot...")
+        with span("pagina.screenshot"):
+            page.screenshot(path=nome_arquivo, full_page=pagina_completa)
+    finally:
+        page.close()
+
+
 def capturar_screenshot(
     url: str, 
     nome_arquivo: str = "screenshot.png", 
@@ -102,7 +151,8 @@ def capturar_screenshot(
     largura: int = 1920,
     altura: int = 1080,
     pagina_completa: bool = False,
-    fechar_popup: bool = True
+    fechar_popup: bool = True,
+    navegador=None
 ) -> bool:
     """
     Navega até uma URL e captura um screenshot da página usando Playwright.
@@ -115,6 +165,8 @@ def capturar_screenshot(
         altura (int): Altura da janela do navegador em pixels (padrão: 1080)
         pagina_completa (bool): Se True, captura a página inteira com scroll (padrão: False)
         fechar_popup (bool): Se True, tenta detectar e fechar popups automaticamente (padrão: True)
+        navegador: Browser do Playwright já aberto (opcional; sem ele, um navegador
+            é lançado e fechado nesta chamada). Usado pelo pool do `servico`.
     
     Returns:
         bool: True se o screenshot foi capturado com sucesso, False caso contrário
@@ -125,57 +177,53 @@ def capturar_screenshot(
         diretorio = os.path.dirname(nome_arquivo)
         if diretorio and not os.path.exists(diretorio):
             os.makedirs(diretorio)
-            print(f"Diretório criado: {diretorio}")
+            logger.info("Diretório criado: %s", diretorio)
         
-        with sync_playwright() as p:
-            # Inicia o navegador Chromium em modo headless
-            print("Iniciando navegador...")
-            browser = p.chromium.launch(headless=True)
-            
-            # Cria uma nova página com as dimensões especificadas
-            page = browser.new_page(viewport={'width': largura, 'height': altura})
-            
-            # Navega para a URL
-            print(f"Navegando para: {url}")
-            page.goto(url, wait_until="networkidle")
-            
-            # Tenta fechar popups se habilitado
-            if fechar_popup:
-                fechar_popups(page, tempo_espera=1)
-            
-            # Aguarda o tempo adicional especificado
-            if tempo_espera > 0:
-                print(f"Aguardando {tempo_espera} segundos...")
-                time.sleep(tempo_espera)
-            
-            # Captura o screenshot
-            print(f"Capturando screenshot...")
-            page.screenshot(path=nome_arquivo, full_page=pagina_completa)
-            
-            # Fecha o navegador
-            browser.close()
-            
-            # Obtém o caminho completo do arquivo
-            caminho_completo = os.path.abspath(nome_arquivo)
-            print(f"✓ Screenshot salvo com sucesso em: {caminho_completo}")
-            return True
+        argumentos = (url, nome_arquivo, tempo_espera, largura, altura, pagina_completa, fechar_popup)
+        if navegador is not None:
+            _screenshot_da_pagina(navegador, *argumentos)
+        else:
+            with sync_playwright() as p:
+                # Inicia o navegador Chromium em modo headless
+                logger.debug("Iniciando navegador...")
+                browser = p.chromium.launch(headless=True)
+                _screenshot_da_pagina(browser, *argumentos)
+                
+                # Fecha o navegador
+                browser.close()
+        
+        # Obtém o caminho completo do arquivo
+        caminho_completo = os.path.abspath(nome_arquivo)
+        logger.log(ITEM, "✓ Screenshot salvo com sucesso em: %s", caminho_completo)
+        return True
         
     except Exception as e:
-        print(f"✗ Erro ao capturar screenshot: {str(e)}")
-        print("\nCertifique-se de que o Playwright está instalado:")
-        print("  pip install playwright")
-        print("  playwright install chromium")
+        logger.error(
+            "✗ Erro ao capturar screenshot de %s: %s "
+            "(certifique-se de que o Playwright está instalado: pip install playwright && playwright install chromium)",
+            url, e,
+        )
         return False
 
 
-def capturar_multiplos_screenshots(urls: list, prefixo: str = "screenshot", pasta: str = "screenshots"):
+def capturar_multiplos_screenshots(
+    urls: list,
+    prefixo: str = "screenshot",
+    pasta: str = "screenshots",
+    fila: FilaTrabalho = None
+):
     """
     Captura screenshots de múltiplas URLs.
     
+    Com `fila`, as URLs são enfileiradas e consumidas da fila persistente; vários
+    processos podem drenar a mesma fila e uma execução interrompida continua de onde
+    parou. Os arquivos passam a ser nomeados pelo id do item na fila.
+    
     Args:
         urls (list): Lista de URLs para capturar
         prefixo (str): Prefixo para os nomes dos arquivos (padrão: "screenshot")
         pasta (str): Pasta onde salvar os arquivos (padrão: "screenshots")
+        fila (FilaTrabalho): Fila persistente a consumir (opcional)
     
     Returns:
         dict: Dicionário com URLs como chaves e status (True/False) como valores
@@ -183,24 +231,37 @@ def capturar_multiplos_screenshots(urls: list, prefixo: str = "screenshot", past
     
     resultados = {}
     
+    if fila is not None:
+        if urls:
+            fila.adicionar(urls)
+        
+        def processar(item):
+            nome_arquivo = os.path.join(pasta, f"{prefixo}_{item.id}.png")
+            resultados[item.chave] = capturar_screenshot(item.chave, nome_arquivo)
+            if not resultados[item.chave]:
+                raise RuntimeError("falha ao capturar screenshot")
+        
+        consumir(fila, processar)
+        logger.info("Fila: %s", fila.estatisticas())
+        return resultados
+    
     for i, url in enumerate(urls, 1):
-        print(f"\n--- Capturando {i}/{len(urls)} ---")
+        logger.log(ITEM, "--- Capturando %d/%d ---", i, len(urls))
         nome_arquivo = os.path.join(pasta, f"{prefixo}_{i}.png")
         sucesso = capturar_screenshot(url, nome_arquivo)
         resultados[url] = sucesso
     
     # Resumo
-    print("\n" + "="*50)
-    print("RESUMO")
-    print("="*50)
     sucessos = sum(resultados.values())
-    print(f"Total: {len(urls)} | Sucesso: {sucessos} | Falha: {len(urls) - sucessos}")
+    logger.info("Resumo — Total: %d | Sucesso: %d | Falha: %d", len(urls), sucessos, len(urls) - sucessos)
     
     return resultados
 
 
 # Exemplo de uso
 if __name__ == "__main__":
+    configurar_registro()
+    
     # Exemplo 1: Capturar uma única URL
     ##url = "https://www.example.com"
     
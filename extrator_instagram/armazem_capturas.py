@@ -0,0 +1,255 @@
+"""
+Armazém de capturas brutas endereçado por conteúdo.
+
+Substitui os arquivos `texto_bruto_<timestamp>.json` (um por URL, nunca relidos)
+por um único banco SQLite com duas tabelas:
+
+    blobs     - texto comprimido em zstd (blobs antigos em zlib continuam legíveis)
+                indexado pelo SHA-256 do texto original; capturas repetidas de uma
+                página que não mudou apontam para o mesmo blob
+    capturas  - índice append-only (url, timestamp, hash, tamanho) com índice por
+                (url, timestamp) para consultas por URL e intervalo de tempo
+
+Tudo fica em um arquivo (mais o WAL), então não há pressão de inodes.
+
+Uso:
+    python -m extrator_instagram.armazem_capturas importar "texto_bruto_*.json"
+    python -m extrator_instagram.armazem_capturas buscar URL
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+from datetime import datetime
+from typing import Optional
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    tamanho INTEGER NOT NULL,
+    tamanho_comprimido INTEGER NOT NULL,
+    dados BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS capturas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    hash TEXT NOT NULL REFERENCES blobs(hash),
+    tamanho INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_capturas_url_timestamp ON capturas(url, timestamp);
+"""
+
+
+class ArmazemCapturas:
+    """
+    Guarda capturas de texto deduplicadas por hash.
+
+    Args:
+        caminho_db (str): Arquivo SQLite (padrão: "capturas.db")
+        nivel_compressao (int): Nível do zstd (padrão: 9)
+    """
+
+    def __init__(self, caminho_db: str = "capturas.db", nivel_compressao: int = 9):
+        self.caminho_db = caminho_db
+        diretorio = os.path.dirname(caminho_db)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+
+        self._conexao = sqlite3.connect(caminho_db, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(ESQUEMA)
+        self._lock = threading.Lock()
+
+        self.codec = "zstd"
+        self._compressor = zstandard.ZstdCompressor(level=nivel_compressao)
+
+    def _comprimir(self, dados: bytes) -> bytes:
+        return self._compressor.compress(dados)
+
+    def _descomprimir(self, dados: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            return zstandard.ZstdDecompressor().decompress(dados)
+        # Blobs gravados quando o zstandard era opcional
+        return zlib.decompress(dados)
+
+    def salvar(self, url: str, texto: str, timestamp: Optional[str] = None) -> dict:
+        """
+        Registra uma captura. O blob só é gravado se o conteúdo for novo.
+
+        Args:
+            url (str): URL capturada
+            texto (str): Texto bruto da página
+            timestamp (str): ISO 8601 da captura (padrão: agora)
+
+        Returns:
+            dict: hash, tamanho, timestamp e se o blob era novo
+        """
+        timestamp = timestamp or datetime.now().isoformat()
+        dados = texto.encode("utf-8")
+        chave = hashlib.sha256(dados).hexdigest()
+
+        with self._lock, self._conexao:
+            existe = self._conexao.execute(
+                "SELECT 1 FROM blobs WHERE hash = ?", (chave,)
+            ).fetchone()
+            if not existe:
+                comprimido = self._comprimir(dados)
+                self._conexao.execute(
+                    "INSERT INTO blobs (hash, codec, tamanho, tamanho_comprimido, dados) VALUES (?, ?, ?, ?, ?)",
+                    (chave, self.codec, len(dados), len(comprimido), comprimido),
+                )
+            self._conexao.execute(
+                "INSERT INTO capturas (url, timestamp, hash, tamanho) VALUES (?, ?, ?, ?)",
+                (url, timestamp, chave, len(dados)),
+            )
+
+        return {"hash": chave, "tamanho": len(dados), "timestamp": timestamp, "blob_novo": not existe}
+
+    def ler(self, chave: str) -> Optional[str]:
+        """Retorna o texto de um blob pelo hash, ou None se não existir."""
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT codec, dados FROM blobs WHERE hash = ?", (chave,)
+            ).fetchone()
+        if linha is None:
+            return None
+        return self._descomprimir(linha[1], linha[0]).decode("utf-8")
+
+    def buscar(
+        self,
+        url: str,
+        inicio: Optional[str] = None,
+        fim: Optional[str] = None,
+        limite: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Lista as capturas de uma URL, da mais recente para a mais antiga.
+
+        Args:
+            url (str): URL capturada
+            inicio (str): ISO 8601 inicial, inclusivo (opcional)
+            fim (str): ISO 8601 final, exclusivo (opcional)
+            limite (int): Máximo de registros (opcional)
+
+        Returns:
+            list[dict]: url, timestamp, hash e tamanho de cada captura (sem o texto)
+        """
+        sql = "SELECT url, timestamp, hash, tamanho FROM capturas WHERE url = ?"
+        parametros: list = [url]
+        if inicio:
+            sql += " AND timestamp >= ?"
+            parametros.append(inicio)
+        if fim:
+            sql += " AND timestamp < ?"
+            parametros.append(fim)
+        sql += " ORDER BY timestamp DESC"
+        if limite:
+            sql += " LIMIT ?"
+            parametros.append(limite)
+
+        with self._lock:
+            linhas = self._conexao.execute(sql, parametros).fetchall()
+        return [
+            {"url": u, "timestamp": t, "hash": h, "tamanho": n}
+            for u, t, h, n in linhas
+        ]
+
+    def ultima(self, url: str) -> Optional[dict]:
+        """Retorna a captura mais recente da URL com o texto, no formato de `capturar_texto_instagram`."""
+        registros = self.buscar(url, limite=1)
+        if not registros:
+            return None
+        registro = registros[0]
+        texto = self.ler(registro["hash"])
+        return {
+            "url_original": url,
+            "texto_bruto": texto,
+            "timestamp_captura": registro["timestamp"],
+            "tamanho_texto": len(texto),
+            "hash_captura": registro["hash"],
+        }
+
+    def estatisticas(self) -> dict:
+        """Retorna contagens e bytes ocupados (originais vs. comprimidos e deduplicados)."""
+        with self._lock:
+            capturas, bytes_capturados = self._conexao.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM capturas"
+            ).fetchone()
+            blobs, bytes_blobs = self._conexao.execute(
+                "SELECT COUNT(*), COALESCE(SUM(tamanho_comprimido), 0) FROM blobs"
+            ).fetchone()
+        return {
+            "capturas": capturas,
+            "blobs": blobs,
+            "bytes_capturados": bytes_capturados,
+            "bytes_armazenados": bytes_blobs,
+            "razao": bytes_capturados / bytes_blobs if bytes_blobs else None,
+        }
+
+    def importar_arquivos(self, padrao: str) -> int:
+        """
+        Importa arquivos `texto_bruto_*.json` antigos para o armazém.
+
+        Args:
+            padrao (str): Glob dos arquivos (ex.: "texto_bruto_*.json")
+
+        Returns:
+            int: Quantidade de arquivos importados
+        """
+        total = 0
+        for caminho in sorted(glob.glob(padrao)):
+            try:
+                with open(caminho, "r", encoding="utf-8") as f:
+                    dados = json.load(f)
+                self.salvar(dados["url_original"], dados["texto_bruto"], dados.get("timestamp_captura"))
+                total += 1
+            except (OSError, KeyError, json.JSONDecodeError) as e:
+                logger.warning("Ignorando %s: %s", caminho, e)
+        return total
+
+    def fechar(self) -> None:
+        with self._lock:
+            self._conexao.close()
+
+
+# Instância compartilhada do processo
+_armazem: Optional[ArmazemCapturas] = None
+
+
+def get_armazem() -> ArmazemCapturas:
+    """Retorna o armazém padrão (caminho em CAPTURAS_DB, padrão "capturas.db")."""
+    global _armazem
+    if _armazem is None:
+        _armazem = ArmazemCapturas(os.getenv("CAPTURAS_DB", "capturas.db"))
+    return _armazem
+
+
+if __name__ == "__main__":
+    from comum.registro import configurar_registro
+    configurar_registro()
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ("importar", "buscar"):
+        print("Uso: python -m extrator_instagram.armazem_capturas (importar GLOB | buscar URL)")
+        sys.exit(1)
+
+    armazem = get_armazem()
+    if sys.argv[1] == "importar":
+        print(f"Arquivos importados: {armazem.importar_arquivos(sys.argv[2])}")
+    else:
+        for registro in armazem.buscar(sys.argv[2]):
+            print(registro)
+    print(armazem.estatisticas())
@@ -0,0 +1,245 @@
+"""
+Coleta de posts em camadas: da mais barata para a mais cara.
+
+1. metadados  - JSON do Instaloader (via `extrator.agendador_instaloader`)
+2. navegador  - texto da página com Playwright + estruturação com Ollama
+3. visao      - screenshot + modelo de visão (`interpretador_tela.instagram_analyzer`)
+
+Cada camada que falha para um domínio fica "de castigo" por uma janela de tempo
+(que dobra a cada falha seguida), então as próximas URLs começam direto na camada
+que vem funcionando. Tentativas, sucessos e latência são registrados por camada.
+
+Uso:
+    python -m extrator_instagram.coleta_em_camadas URL [URL ...]
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class FalhaCamada(Exception):
+    """A camada não conseguiu extrair um resultado utilizável."""
+
+
+def _camada_metadados(url: str) -> dict:
+    from extrator.agendador_instaloader import get_agendador
+
+    # Agendador do processo (uma sessão, um limite de taxa). Uma tentativa só:
+    # se bloquear, a próxima camada assume e esta fica de castigo
+    dados = get_agendador().obter_post(url, max_tentativas=1)
+    if not dados.get("caption"):
+        raise FalhaCamada("post sem legenda nos metadados")
+
+    return {
+        "rede_social": "Instagram",
+        "legenda": dados["caption"],
+        "curtidas": dados.get("likes"),
+        "data_post": dados.get("date_utc"),
+        "image_url": dados.get("image_url"),
+        "is_video": dados.get("is_video"),
+        "shortcode": dados.get("shortcode"),
+    }
+
+
+def _camada_navegador(url: str) -> dict:
+    from extrator_instagram.instagram_scraper_completo import (
+        capturar_texto_instagram,
+        processar_com_gemma,
+    )
+
+    dados_brutos = capturar_texto_instagram(url)
+    if not dados_brutos or not dados_brutos.get("texto_bruto"):
+        raise FalhaCamada("texto da página não capturado")
+
+    dados = processar_com_gemma(dados_brutos["texto_bruto"])
+    if not dados or "erro" in dados:
+        raise FalhaCamada(dados.get("erro", "falha no processamento com Ollama") if dados else "resposta vazia")
+
+    dados["tamanho_texto_capturado"] = dados_brutos.get("tamanho_texto", 0)
+    return dados
+
+
+def _camada_visao(url: str) -> dict:
+    from extrator.scraper_print import capturar_screenshot
+    from interpretador_tela.instagram_analyzer import analisar_instagram
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "post.png")
+        if not capturar_screenshot(url, caminho):
+            raise FalhaCamada("screenshot não capturado")
+        dados = analisar_instagram(caminho)
+
+    if not dados or "erro" in dados:
+        raise FalhaCamada(dados.get("erro", "falha na análise da imagem") if dados else "resposta vazia")
+
+    dados.pop("arquivo_original", None)
+    return dados
+
+
+EXECUTORES_PADRAO: dict[str, Callable[[str], dict]] = {
+    "metadados": _camada_metadados,
+    "navegador": _camada_navegador,
+    "visao": _camada_visao,
+}
+
+
+class ColetorEmCamadas:
+    """
+    Escolhe, por domínio, a camada mais barata que provavelmente vai funcionar.
+
+    Args:
+        executores (dict): Nome da camada -> função url -> dict, na ordem de custo.
+            Por padrão usa `EXECUTORES_PADRAO`
+        janela_castigo (float): Segundos que uma camada fica pulada após uma falha
+            (dobra a cada falha seguida, até `castigo_maximo`) (padrão: 600)
+        castigo_maximo (float): Limite da janela de castigo em segundos (padrão: 3600)
+        relogio (Callable): Função de tempo monotônico (injetável para testes)
+    """
+
+    def __init__(
+        self,
+        executores: Optional[dict[str, Callable[[str], dict]]] = None,
+        janela_castigo: float = 600.0,
+        castigo_maximo: float = 3600.0,
+        relogio: Callable[[], float] = time.monotonic,
+    ):
+        self.executores = executores or dict(EXECUTORES_PADRAO)
+        self.janela_castigo = janela_castigo
+        self.castigo_maximo = castigo_maximo
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        # (dominio, camada) -> {"falhas_seguidas": int, "pular_ate": float}
+        self._memoria: dict[tuple[str, str], dict] = {}
+        self.estatisticas = {
+            camada: {"tentativas": 0, "sucessos": 0, "falhas": 0, "puladas": 0, "segundos": 0.0}
+            for camada in self.executores
+        }
+
+    def _deve_pular(self, dominio: str, camada: str) -> bool:
+        estado = self._memoria.get((dominio, camada))
+        return bool(estado) and self._relogio() < estado["pular_ate"]
+
+    def _registrar(self, dominio: str, camada: str, sucesso: bool, segundos: float) -> None:
+        with self._lock:
+            est = self.estatisticas[camada]
+            est["tentativas"] += 1
+            est["segundos"] += segundos
+            if sucesso:
+                est["sucessos"] += 1
+                self._memoria.pop((dominio, camada), None)
+                return
+
+            est["falhas"] += 1
+            estado = self._memoria.setdefault((dominio, camada), {"falhas_seguidas": 0, "pular_ate": 0.0})
+            estado["falhas_seguidas"] += 1
+            castigo = min(self.castigo_maximo, self.janela_castigo * 2 ** (estado["falhas_seguidas"] - 1))
+            estado["pular_ate"] = self._relogio() + castigo
+
+    def fetch_post(self, url: str) -> dict:
+        """
+        Extrai um post usando a camada mais barata disponível.
+
+        Args:
+            url (str): URL do post
+
+        Returns:
+            dict: Dados extraídos com `camada`, `url_original` e `tentativas_camadas`,
+                ou {} se todas as camadas falharem
+        """
+        dominio = urlparse(url).netloc.lower()
+        camadas = list(self.executores)
+        tentativas = []
+
+        for i, camada in enumerate(camadas):
+            ultima = i == len(camadas) - 1
+            # Nunca pula a última camada: sem ela o post nem seria tentado
+            if not ultima and self._deve_pular(dominio, camada):
+                with self._lock:
+                    self.estatisticas[camada]["puladas"] += 1
+                logger.debug("Camada %s pulada para %s", camada, dominio)
+                continue
+
+            inicio = time.perf_counter()
+            try:
+                dados = self.executores[camada](url)
+            except Exception as e:
+                segundos = time.perf_counter() - inicio
+                self._registrar(dominio, camada, False, segundos)
+                tentativas.append({"camada": camada, "sucesso": False, "segundos": round(segundos, 3), "erro": str(e)})
+                logger.warning("Camada %s falhou para %s em %.2fs: %s", camada, url, segundos, e)
+                continue
+
+            segundos = time.perf_counter() - inicio
+            self._registrar(dominio, camada, True, segundos)
+            tentativas.append({"camada": camada, "sucesso": True, "segundos": round(segundos, 3)})
+            logger.info("Post %s extraído pela camada %s em %.2fs", url, camada, segundos)
+
+            dados["url_original"] = url
+            dados["camada"] = camada
+            dados["tentativas_camadas"] = tentativas
+            dados["timestamp_coleta"] = datetime.now().isoformat()
+            return dados
+
+        logger.error("Nenhuma camada conseguiu extrair %s", url)
+        return {}
+
+    def resumo(self) -> dict:
+        """Retorna taxa de sucesso e latência média por camada."""
+        resumo = {}
+        for camada, est in self.estatisticas.items():
+            resumo[camada] = {
+                **est,
+                "taxa_sucesso": est["sucessos"] / est["tentativas"] if est["tentativas"] else None,
+                "latencia_media": est["segundos"] / est["tentativas"] if est["tentativas"] else None,
+            }
+        return resumo
+
+
+# Instância compartilhada do processo
+_coletor: Optional[ColetorEmCamadas] = None
+
+
+def get_coletor() -> ColetorEmCamadas:
+    """Retorna o coletor compartilhado (a memória de camadas vale para o processo todo)."""
+    global _coletor
+    if _coletor is None:
+        _coletor = ColetorEmCamadas()
+    return _coletor
+
+
+def fetch_post(url: str) -> dict:
+    """
+    Interface simplificada: extrai um post pela camada mais barata viável.
+
+    Args:
+        url (str): URL do post
+
+    Returns:
+        dict: Dados extraídos (ver `ColetorEmCamadas.fetch_post`)
+    """
+    return get_coletor().fetch_post(url)
+
+
+if __name__ == "__main__":
+    from comum.registro import configurar_registro
+    configurar_registro()
+
+    urls = sys.argv[1:] or [
+        "https://www.instagram.com/p/DRvHsdiDzSd/",
+        "https://www.instagram.com/p/DRDReOkiLJM",
+    ]
+
+    for url in urls:
+        print(json.dumps(fetch_post(url), ensure_ascii=False, indent=2))
+
+    print(json.dumps(get_coletor().resumo(), ensure_ascii=False, indent=2))
@@ -10,20 +10,34 @@ Instalação:
     pip install playwright ollama
     playwright install chromium
     ollama pull gemma3:2b
+
+Uso (a partir da raiz do projeto):
+    python -m extrator_instagram.instagram_scraper_completo
 """
 
 from playwright.sync_api import sync_playwright, Page
 import ollama
 import json
+import logging
 import os
 import time
 from datetime import datetime
 
+from classificator.normalizacao import normalizar
+from comum.fila_trabalho import FilaTrabalho, consumir
+from comum.rastreamento import ativar_se_pedido, atributos_ollama, rastreado, span
+from comum.registro import ITEM, configurar_registro
+from comum.resultados_jsonl import GravadorJSONL, caminho_do_worker, chaves_processadas
+from extrator_instagram.armazem_capturas import ArmazemCapturas, get_armazem
+
+logger = logging.getLogger(__name__)
+
 
 # Configuração global do modelo Ollama
 MODELO_OLLAMA = "gemma3:4b"  # Opções: "gemma3:2b", "llama3", "qwen3", etc.
 
 
+@rastreado("popups")
 def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
     """
     Tenta identificar e fechar popups comuns na página.
@@ -40,12 +54,12 @@ def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
         'button:has(svg[aria-label="Close"])',
     ]
     
-    print("Verificando popups...")
+    logger.debug("Verificando popups...")
     
     for seletor in seletores_fechar:
         try:
             if page.locator(seletor).first.is_visible(timeout=1000):
-                print(f"  ✓ Popup encontrado e fechado")
+                logger.debug("  ✓ Popup encontrado e fechado")
                 page.locator(seletor).first.click()
                 popup_fechado = True
                 time.sleep(0.5)
@@ -56,89 +70,107 @@ def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
     if popup_fechado:
         time.sleep(tempo_espera)
     else:
-        print("  Nenhum popup detectado")
+        logger.debug("  Nenhum popup detectado")
     
     return popup_fechado
 
 
-def capturar_texto_instagram(url: str) -> dict:
+def _texto_da_pagina(navegador, url: str) -> str:
+    """Abre a URL em uma aba nova do navegador, fecha popups e devolve o innerText."""
+    # Cria uma nova página
+    page = navegador.new_page(viewport={'width': 1920, 'height': 1080})
+    
+    try:
+        # Navega para a URL
+        logger.debug("Navegando para: %s", url)
+        with span("pagina.goto"):
+            page.goto(url, wait_until="networkidle")
+        
+        # Tenta fechar popups
+        fechar_popups(page, tempo_espera=1)
+        
+        # Aguarda carregamento completo
+        logger.debug("Aguardando carregamento completo...")
+        with span("espera.carregamento"):
+            time.sleep(3)
+        
+        with span("espera.selecao"):
+            # Seleciona todo o texto da página (Ctrl+A)
+            logger.debug("📋 Selecionando todo o texto da página (Ctrl+A)...")
+            page.keyboard.press('Control+A')
+            time.sleep(1)
+            
+            # Copia o texto selecionado (Ctrl+C)
+            logger.debug("📄 Copiando texto (Ctrl+C)...")
+            page.keyboard.press('Control+C')
+            time.sleep(1)
+        
+        # Captura o texto da página usando métodos alternativos
+        # (clipboard pode não funcionar em headless, então usamos innerText)
+        logger.debug("✂️ Extraindo texto da página...")
+        with span("pagina.texto"):
+            return page.evaluate('document.body.innerText')
+    finally:
+        page.close()
+
+
+@rastreado("captura")
+def capturar_texto_instagram(url: str, armazem: ArmazemCapturas = None, navegador=None) -> dict:
     """
     Acessa URL do Instagram, fecha popups e captura todo o texto da página.
     
     Args:
         url (str): URL do post do Instagram
+        armazem (ArmazemCapturas): Onde guardar o texto bruto (padrão: `get_armazem()`)
+        navegador: Browser do Playwright já aberto (opcional; sem ele, um navegador
+            é lançado e fechado nesta chamada). Usado pelo pool do `servico`.
     
     Returns:
         dict: Dicionário com o texto capturado e metadados
     """
     
-    print(f"🌐 Acessando URL: {url}")
+    logger.debug("🌐 Acessando URL: %s", url)
     
     try:
-        with sync_playwright() as p:
-            # Inicia o navegador
-            print("Iniciando navegador...")
-            browser = p.chromium.launch(headless=True)
-            
-            # Cria uma nova página
-            page = browser.new_page(viewport={'width': 1920, 'height': 1080})
-            
-            # Navega para a URL
-            print(f"Navegando para: {url}")
-            page.goto(url, wait_until="networkidle")
-            
-            # Tenta fechar popups
-            fechar_popups(page, tempo_espera=1)
-            
-            # Aguarda carregamento completo
-            print("Aguardando carregamento completo...")
-            time.sleep(3)
-            
-            # Seleciona todo o texto da página (Ctrl+A)
-            print("📋 Selecionando todo o texto da página (Ctrl+A)...")
-            page.keyboard.press('Control+A')
-            time.sleep(1)
-            
-            # Copia o texto selecionado (Ctrl+C)
-            print("📄 Copiando texto (Ctrl+C)...")
-            page.keyboard.press('Control+C')
-            time.sleep(1)
-            
-            # Captura o texto da página usando métodos alternativos
-            # (clipboard pode não funcionar em headless, então usamos innerText)
-            print("✂️ Extraindo texto da página...")
-            texto_pagina = page.evaluate('document.body.innerText')
-            
-            # Fecha o navegador
-            browser.close()
-            
-            print(f"✓ Texto capturado: {len(texto_pagina)} caracteres")
-            
-            # Salva o texto bruto em JSON temporário
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            arquivo_temp = f"texto_bruto_{timestamp}.json"
-            
-            dados_brutos = {
-                "url_original": url,
-                "texto_bruto": texto_pagina,
-                "timestamp_captura": datetime.now().isoformat(),
-                "tamanho_texto": len(texto_pagina)
-            }
-            
-            with open(arquivo_temp, 'w', encoding='utf-8') as f:
-                json.dump(dados_brutos, f, ensure_ascii=False, indent=2)
-            
-            print(f"✓ Texto bruto salvo em: {os.path.abspath(arquivo_temp)}")
-            
-            return dados_brutos
+        if navegador is not None:
+            texto_pagina = _texto_da_pagina(navegador, url)
+        else:
+            with sync_playwright() as p:
+                # Inicia o navegador
+                logger.debug("Iniciando navegador...")
+                with span("navegador.lancar"):
+                    browser = p.chromium.launch(headless=True)
+                texto_pagina = _texto_da_pagina(browser, url)
+                
+                # Fecha o navegador
+                browser.close()
+        
+        logger.log(ITEM, "✓ Texto capturado: %d caracteres", len(texto_pagina))
+        
+        # Salva o texto bruto no armazém de capturas (deduplicado por hash)
+        if armazem is None:
+            armazem = get_armazem()
+        with span("armazem.salvar"):
+            registro = armazem.salvar(url, texto_pagina)
+        
+        dados_brutos = {
+            "url_original": url,
+            "texto_bruto": texto_pagina,
+            "timestamp_captura": registro["timestamp"],
+            "tamanho_texto": len(texto_pagina),
+            "hash_captura": registro["hash"]
+        }
+        
+        logger.debug("✓ Texto bruto salvo em: %s (%s)", armazem.caminho_db, registro['hash'][:12])
+        
+        return dados_brutos
         
     except Exception as e:
-        print(f"✗ Erro ao capturar texto: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("✗ Erro ao capturar texto de %s: %s", url, e)
         return {}
 
 
+@rastreado("gemma")
 def processar_com_gemma(texto_bruto: str, modelo: str = MODELO_OLLAMA) -> dict:
 
     """
@@ -152,9 +184,13 @@ def processar_com_gemma(texto_bruto: str, modelo: str = MODELO_OLLAMA) -> dict:
         dict: Informações estruturadas e corrigidas
     """
     
-    print(f"\n🤖 Processando texto com {modelo}...")
+    logger.debug("🤖 Processando texto com %s...", modelo)
     
     try:
+        # NFKC, sem invisíveis e espaços repetidos (menos tokens de prefill);
+        # as entidades ficam no texto e também servem de reserva abaixo
+        legenda = normalizar(texto_bruto, remover_entidades=False, preservar_linhas=True)
+        
         # Prompt estruturado para o Gemma3:2b
         prompt = f"""Você é um assistente especializado em extrair informações de posts do Instagram.
 
@@ -167,7 +203,7 @@ IMPORTANTE:
 - Se alguma informação não estiver disponível, use "não disponível"
 
 Texto capturado:
-{texto_bruto}
+{legenda.texto}
 
 Retorne APENAS um JSON válido com esta estrutura:
 {{
@@ -185,20 +221,22 @@ Retorne APENAS um JSON válido com esta estrutura:
 
 Responda APENAS com o JSON, sem texto adicional antes ou depois."""
 
-        print("📤 Enviando para Gemma3:2b...")
+        logger.debug("📤 Enviando para %s...", modelo)
         
         # Chama o Ollama com Gemma3:2b
-        response = ollama.chat(
-            model=modelo,
-            messages=[{
-                'role': 'user',
-                'content': prompt
-            }]
-        )
+        with span("ollama.chat", modelo=modelo, caracteres_prompt=len(prompt)) as s:
+            response = ollama.chat(
+                model=modelo,
+                messages=[{
+                    'role': 'user',
+                    'content': prompt
+                }]
+            )
+            s.atribuir(**atributos_ollama(response))
         
         resposta_texto = response['message']['content']
         
-        print("✓ Resposta recebida do modelo!")
+        logger.debug("✓ Resposta recebida do modelo!")
         
         # Parse do JSON
         try:
@@ -221,11 +259,17 @@ Responda APENAS com o JSON, sem texto adicional antes ou depois."""
             dados["modelo_usado"] = modelo
             dados["metodo_extracao"] = "Captura de texto + Gemma3:2b"
             
+            # Hashtags e menções que o modelo deixou passar vêm da extração por regex
+            if not dados.get("hashtags") and legenda.hashtags:
+                dados["hashtags"] = legenda.hashtags
+            if not dados.get("mencoes") and legenda.mencoes:
+                dados["mencoes"] = [f"@{mencao}" for mencao in legenda.mencoes]
+            
             return dados
             
         except json.JSONDecodeError as e:
-            print(f"⚠️  Aviso: Resposta não está em formato JSON válido")
-            print(f"Resposta bruta:\n{resposta_texto}")
+            logger.warning("⚠️  Resposta não está em formato JSON válido")
+            logger.debug("Resposta bruta:\n%s", resposta_texto)
             
             return {
                 "timestamp_processamento": datetime.now().isoformat(),
@@ -235,9 +279,7 @@ Responda APENAS com o JSON, sem texto adicional antes ou depois."""
             }
         
     except Exception as e:
-        print(f"✗ Erro ao processar com Gemma: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("✗ Erro ao processar com Gemma: %s", e)
         return {}
 
 
@@ -255,105 +297,145 @@ def salvar_json(dados: dict, arquivo_saida: str = None) -> str:
             json.dump(dados, f, ensure_ascii=False, indent=2)
         
         caminho_completo = os.path.abspath(arquivo_saida)
-        print(f"✓ JSON salvo em: {caminho_completo}")
+        logger.info("✓ JSON salvo em: %s", caminho_completo)
         return caminho_completo
         
     except Exception as e:
-        print(f"✗ Erro ao salvar JSON: {e}")
+        logger.error("✗ Erro ao salvar JSON: %s", e)
         return ""
 
 
-def processar_url_instagram(url: str, arquivo_json: str = None) -> dict:
+def processar_url_instagram(url: str, arquivo_json: str = None, salvar: bool = True) -> dict:
     """
     Processo completo: captura texto e processa com Gemma3:2b.
     
     Args:
         url (str): URL do post do Instagram
         arquivo_json (str): Nome do arquivo JSON de saída (opcional)
+        salvar (bool): Se False, não grava o JSON individual (usado nos lotes)
     
     Returns:
         dict: Dados extraídos e processados
     """
     
-    print("="*60)
-    print("INSTAGRAM SCRAPER + GEMMA3:2B ANALYZER")
-    print("="*60)
+    logger.debug("INSTAGRAM SCRAPER + GEMMA3:2B ANALYZER: %s", url)
     
-    # 1. Captura texto da página
-    dados_brutos = capturar_texto_instagram(url)
+    # Span raiz do post: com --rastrear, o detalhamento por etapa sai no fim
+    with span("post", url=url):
+        # 1. Captura texto da página
+        dados_brutos = capturar_texto_instagram(url)
     
-    if not dados_brutos or not dados_brutos.get('texto_bruto'):
-        print("✗ Falha ao capturar texto")
-        return {}
-    
-    # 2. Processa com Gemma3:2b
-    dados_processados = processar_com_gemma(dados_brutos['texto_bruto'])
-    
-    if not dados_processados:
-        print("✗ Falha ao processar com Gemma")
-        return {}
+        if not dados_brutos or not dados_brutos.get('texto_bruto'):
+            logger.error("✗ Falha ao capturar texto: %s", url)
+            return {}
     
-    # 3. Adiciona URL original
-    dados_processados["url_original"] = url
-    dados_processados["tamanho_texto_capturado"] = dados_brutos.get('tamanho_texto', 0)
+        # 2. Processa com Gemma3:2b
+        dados_processados = processar_com_gemma(dados_brutos['texto_bruto'])
     
-    # 4. Salva JSON final (com timestamp se não especificado)
-    if arquivo_json is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        arquivo_json = f"instagram_analise_{timestamp}.json"
+        if not dados_processados:
+            logger.error("✗ Falha ao processar com Gemma: %s", url)
+            return {}
     
-    arquivo_salvo = salvar_json(dados_processados, arquivo_json)
+        # 3. Adiciona URL original
+        dados_processados["url_original"] = url
+        dados_processados["tamanho_texto_capturado"] = dados_brutos.get('tamanho_texto', 0)
     
-    # 5. Exibe resumo
-    print("\n" + "="*60)
-    print("RESUMO DA ANÁLISE")
-    print("="*60)
-    print(f"📱 Rede Social: {dados_processados.get('rede_social', 'N/A')}")
-    print(f"👤 Usuário: {dados_processados.get('usuario', 'N/A')}")
-    print(f"❤️  Curtidas: {dados_processados.get('curtidas', 'N/A')}")
-    print(f"💬 Comentários: {dados_processados.get('comentarios', 'N/A')}")
-    print(f"📅 Data: {dados_processados.get('data_post', 'N/A')}")
-    print(f"📝 Legenda: {str(dados_processados.get('legenda', 'N/A'))[:100]}...")
-    print(f"📄 JSON: {arquivo_salvo}")
-    print("="*60)
+        # 4. Salva JSON final (com timestamp se não especificado)
+        arquivo_salvo = "não salvo"
+        if salvar:
+            if arquivo_json is None:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                arquivo_json = f"instagram_analise_{timestamp}.json"
+        
+            arquivo_salvo = salvar_json(dados_processados, arquivo_json)
+    
+        # 5. Resumo do post: uma linha por item (amostrável com REGISTRO_AMOSTRAGEM)
+        logger.log(
+            ITEM,
+            "📱 %s | 👤 %s | ❤️ %s | 💬 %s | 📅 %s | 📄 %s",
+            dados_processados.get('rede_social', 'N/A'),
+            dados_processados.get('usuario', 'N/A'),
+            dados_processados.get('curtidas', 'N/A'),
+            dados_processados.get('comentarios', 'N/A'),
+            dados_processados.get('data_post', 'N/A'),
+            arquivo_salvo,
+            extra={"url": url},
+        )
+        logger.debug("📝 Legenda: %s...", str(dados_processados.get('legenda', 'N/A'))[:100])
     
-    return dados_processados
+        return dados_processados
 
 
-def processar_multiplas_urls(urls: list, arquivo_json: str = "instagram_multiplos.json") -> list:
+def processar_multiplas_urls(
+    urls: list,
+    arquivo_json: str = "instagram_multiplos.jsonl",
+    fila: FilaTrabalho = None
+) -> list:
     """
     Processa múltiplas URLs do Instagram.
     
+    Cada resultado é gravado como uma linha em `arquivo_json` assim que fica pronto,
+    então uma interrupção não perde o que já foi feito. URLs que já estão no arquivo
+    são puladas, o que permite retomar uma execução interrompida.
+    
+    Com `fila`, as URLs são enfileiradas e consumidas da fila persistente: vários
+    processos podem chamar esta função com a mesma fila (e `urls` vazia) para
+    drenar em paralelo. Nesse caso cada processo grava no próprio arquivo
+    (`<arquivo>.worker-<pid>.jsonl`).
+    
     Args:
         urls (list): Lista de URLs
-        arquivo_json (str): Arquivo JSON para salvar todos os resultados
+        arquivo_json (str): Arquivo JSONL para salvar todos os resultados
+        fila (FilaTrabalho): Fila persistente a consumir (opcional)
     
     Returns:
-        list: Lista com todos os dados extraídos
+        list: Dados extraídos de cada post processado nesta execução (as URLs
+        puladas ou que falharam não entram)
     """
     
     resultados = []
     
-    for i, url in enumerate(urls, 1):
-        print(f"\n\n{'#'*60}")
-        print(f"PROCESSANDO {i}/{len(urls)}")
-        print(f"{'#'*60}\n")
+    if fila is not None:
+        if urls:
+            logger.info("📥 %d URLs novas na fila '%s'", fila.adicionar(urls), fila.nome)
         
-        dados = processar_url_instagram(url, arquivo_json=None)
+        with GravadorJSONL(caminho_do_worker(arquivo_json)) as gravador:
+            def processar(item):
+                dados = processar_url_instagram(item.chave, salvar=False)
+                if not dados or "erro" in dados:
+                    raise RuntimeError(dados.get("erro", "falha ao extrair o post") if dados else "falha ao extrair o post")
+                gravador.escrever(dados)
+                resultados.append(dados)
+            
+            consumir(fila, processar)
         
-        if dados:
-            resultados.append(dados)
+        logger.info("✓ %d posts processados por este worker | Fila: %s", len(resultados), fila.estatisticas())
+        return resultados
     
-    # Salva todos os resultados
-    if resultados:
-        try:
-            with open(arquivo_json, 'w', encoding='utf-8') as f:
-                json.dump(resultados, f, ensure_ascii=False, indent=2)
+    ja_processadas = chaves_processadas(arquivo_json, "url_original")
+    if ja_processadas:
+        logger.info("↻ %d URLs já processadas em %s serão puladas", len(ja_processadas), arquivo_json)
+    
+    
+    with GravadorJSONL(arquivo_json) as gravador:
+        for i, url in enumerate(urls, 1):
+            if url in ja_processadas:
+                continue
+            
+            logger.log(ITEM, "PROCESSANDO %d/%d", i, len(urls))
+            
+            dados = processar_url_instagram(url, salvar=False)
             
-            print(f"\n\n✓ Todos os resultados salvos em: {os.path.abspath(arquivo_json)}")
-            print(f"Total de posts processados: {len(resultados)}")
-        except Exception as e:
-            print(f"✗ Erro ao salvar resultados consolidados: {e}")
+            # Falhas não são gravadas: a URL fica pendente para a próxima execução
+            if not dados or "erro" in dados:
+                logger.warning("✗ Falha em %s: %s", url, dados.get("erro") if dados else "sem dados")
+                continue
+            
+            gravador.escrever(dados)
+            resultados.append(dados)
+    
+    logger.info("✓ Resultados salvos em: %s | Total de posts processados: %d",
+                os.path.abspath(arquivo_json), len(resultados))
     
     return resultados
 
@@ -385,7 +467,16 @@ if __name__ == "__main__":
         "https://www.instagram.com/p/DRvRkdogCF8"        
     ]
     
+    # --silencioso / REGISTRO_*: ver comum/registro.py
+    configurar_registro()
+    
+    # --rastrear: tempo de cada etapa por post (página, popups, esperas, Ollama)
+    histograma = ativar_se_pedido()
+    
     resultado = processar_multiplas_urls(urls)
+    
+    if histograma:
+        histograma.imprimir()
 
     if resultado:
         print("\n✅ Processo concluído com sucesso!")
@@ -6,9 +6,14 @@ pip install selenium pyperclip
 """
 from playwright.sync_api import sync_playwright, Page
 import pyperclip
+import logging
 import time
 import os
 
+from comum.registro import ITEM, configurar_registro
+
+logger = logging.getLogger(__name__)
+
 
 
 
@@ -28,12 +33,12 @@ def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
         'button:has(svg[aria-label="Close"])',
     ]
     
-    print("Verificando popups...")
+    logger.debug("Verificando popups...")
     
     for seletor in seletores_fechar:
         try:
             if page.locator(seletor).first.is_visible(timeout=1000):
-                print(f"  ✓ Popup encontrado e fechado")
+                logger.debug("  ✓ Popup encontrado e fechado")
                 page.locator(seletor).first.click()
                 popup_fechado = True
                 time.sleep(0.5)
@@ -44,7 +49,7 @@ def fechar_popups(page: Page, tempo_espera: int = 2) -> bool:
     if popup_fechado:
         time.sleep(tempo_espera)
     else:
-        print("  Nenhum popup detectado")
+        logger.debug("  Nenhum popup detectado")
     
     return popup_fechado
 
@@ -66,60 +71,56 @@ def copiar_texto_url(url, nome_arquivo="texto_copiado.txt", tempo_espera=3):
     try:
         with sync_playwright() as p:
             # Inicia o navegador
-            print("Iniciando navegador...")
+            logger.debug("Iniciando navegador...")
             browser = p.chromium.launch(headless=True)
             
             # Cria uma nova página
             page = browser.new_page(viewport={'width': 1920, 'height': 1080})
             
             # Navega para a URL
-            print(f"Navegando para: {url}")
+            logger.debug("Navegando para: %s", url)
             page.goto(url, wait_until="networkidle")
             
             # Tenta fechar popups
             fechar_popups(page, tempo_espera=1)
             
             # Aguarda carregamento completo
-            print("Aguardando carregamento completo...")
+            logger.debug("Aguardando carregamento completo...")
             time.sleep(3)
             
             # Seleciona todo o texto (CTRL + A)
-            print("Selecionando todo o texto (Ctrl+A)...")
+            logger.debug("Selecionando todo o texto (Ctrl+A)...")
             page.keyboard.press('Control+A')
             time.sleep(1)
             
             # Copia o texto (CTRL + C)
-            print("Copiando texto (Ctrl+C)...")
+            logger.debug("Copiando texto (Ctrl+C)...")
             page.keyboard.press('Control+C')
             time.sleep(1)
             
             # Captura o texto da página usando innerText
-            print("✂️ Extraindo texto da página...")
+            logger.debug("✂️ Extraindo texto da página...")
             texto_copiado = page.evaluate('document.body.innerText')
 
             # Fecha o navegador
             browser.close()
             
-            print(f"✓ Texto capturado: {len(texto_copiado)} caracteres")
+            logger.debug("✓ Texto capturado: %d caracteres", len(texto_copiado))
             
             # Salva o texto no arquivo
-            print(f"Salvando texto no arquivo...")
+            logger.debug("Salvando texto no arquivo...")
             with open(nome_arquivo, 'w', encoding='utf-8') as arquivo:
                 arquivo.write(texto_copiado)
             
             caminho_completo = os.path.abspath(nome_arquivo)
             linhas = len(texto_copiado.split('\n'))
             
-            print(f"✓ Texto salvo com sucesso!")
-            print(f"  Arquivo: {caminho_completo}")
-            print(f"  Linhas: {linhas}")
-            print(f"  Caracteres: {len(texto_copiado)}")
+            logger.log(ITEM, "✓ Texto salvo com sucesso em %s (%d linhas, %d caracteres)",
+                       caminho_completo, linhas, len(texto_copiado))
             return True
         
     except Exception as e:
-        print(f"✗ Erro ao capturar texto: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("✗ Erro ao capturar texto de %s: %s", url, e)
         return False
 
 
@@ -181,6 +182,8 @@ def copiar_texto_url(url, nome_arquivo="texto_copiado.txt", tempo_espera=3):
 
 # Exemplo de uso
 if __name__ == "__main__":
+    configurar_registro()
+    
     # URL da página que você quer copiar o texto
     #url = "https://www.example.com"
     url = "https://www.instagram.com/p/DRQSqrukTEc/"
@@ -5,15 +5,29 @@ Extrai informações de posts do Instagram e exporta para JSON.
 Instalação:
     pip install ollama pillow
     ollama pull qwen3-vl:2b
+
+Uso (a partir da raiz do projeto):
+    python -m interpretador_tela.instagram_analyzer
 """
 
 import ollama
 from PIL import Image
 import json
+import logging
 import os
 import base64
 from io import BytesIO
 from datetime import datetime
+
+from comum.fila_trabalho import FilaTrabalho, consumir
+from comum.rastreamento import ativar_se_pedido, atributos_ollama, rastreado, span
+from comum.registro import ITEM, configurar_registro
+from comum.resultados_jsonl import GravadorJSONL, caminho_do_worker, chaves_processadas
+
+logger = logging.getLogger(__name__)
+
+
+@rastreado("analise_imagem")
 def analisar_instagram(caminho_imagem: str, modelo: str = "qwen3-vl:2b") -> dict:
     """
     Analisa um screenshot do Instagram e extrai informações estruturadas.
@@ -28,28 +42,29 @@ def analisar_instagram(caminho_imagem: str, modelo: str = "qwen3-vl:2b") -> dict
 
     modelo = "gemma3:4b"
     
-    print(f"Verificando imagem: {caminho_imagem}")
+    logger.debug("Verificando imagem: %s", caminho_imagem)
     
     # Verifica se o arquivo existe
     if not os.path.exists(caminho_imagem):
-        print(f"✗ Erro: Arquivo '{caminho_imagem}' não encontrado!")
+        logger.error("✗ Erro: Arquivo '%s' não encontrado!", caminho_imagem)
         return {}
     
-    print(f"✓ Imagem encontrada: {caminho_imagem}")
+    logger.debug("✓ Imagem encontrada: %s", caminho_imagem)
     
     try:
-        # Carrega a imagem e converte para base64
-        with open(caminho_imagem, 'rb') as f:
-            image_data = f.read()
-        
-        # Verifica dimensões da imagem
-        img = Image.open(caminho_imagem)
-        print(f"✓ Imagem carregada: {img.size[0]}x{img.size[1]} pixels")
+        with span("imagem.carregar", caminho=caminho_imagem):
+            # Carrega a imagem e converte para base64
+            with open(caminho_imagem, 'rb') as f:
+                image_data = f.read()
+            
+            # Verifica dimensões da imagem
+            img = Image.open(caminho_imagem)
+        logger.debug("✓ Imagem carregada: %dx%d pixels", img.size[0], img.size[1])
     except Exception as e:
-        print(f"✗ Erro ao abrir imagem: {e}")
+        logger.error("✗ Erro ao abrir imagem %s: %s", caminho_imagem, e)
         return {}
     
-    print(f"\nUsando modelo Ollama: {modelo}")
+    logger.debug("Usando modelo Ollama: %s", modelo)
     
     try:
         # Prompt estruturado para extrair informações do Instagram
@@ -70,22 +85,24 @@ def analisar_instagram(caminho_imagem: str, modelo: str = "qwen3-vl:2b") -> dict
 
 Responda APENAS com o JSON, sem texto adicional."""
         
-        print("\nProcessando imagem...")
+        logger.debug("Processando imagem...")
         
         # Gera a análise usando Ollama
-        response = ollama.chat(
-            model=modelo,
-            messages=[{
-                'role': 'user',
-                'content': prompt,
-                'images': [caminho_imagem]
-            }]
-        )
+        with span("ollama.chat", modelo=modelo, caracteres_prompt=len(prompt)) as s:
+            response = ollama.chat(
+                model=modelo,
+                messages=[{
+                    'role': 'user',
+                    'content': prompt,
+                    'images': [caminho_imagem]
+                }]
+            )
+            s.atribuir(**atributos_ollama(response))
         
         # Extrai o texto da resposta
         resposta_texto = response['message']['content']
         
-        print("✓ Análise concluída!\n")
+        logger.log(ITEM, "✓ Análise concluída: %s", caminho_imagem)
         
         # Tenta parsear o JSON da resposta
         try:
@@ -110,8 +127,8 @@ Responda APENAS com o JSON, sem texto adicional."""
             return dados
             
         except json.JSONDecodeError as e:
-            print(f"⚠️  Aviso: Resposta não está em formato JSON válido")
-            print(f"Resposta bruta: {resposta_texto}")
+            logger.warning("⚠️  Resposta não está em formato JSON válido (%s)", caminho_imagem)
+            logger.debug("Resposta bruta: %s", resposta_texto)
             
             # Retorna estrutura básica com a resposta como texto
             return {
@@ -122,9 +139,7 @@ Responda APENAS com o JSON, sem texto adicional."""
             }
         
     except Exception as e:
-        print(f"✗ Erro ao processar imagem: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("✗ Erro ao processar imagem %s: %s", caminho_imagem, e)
         return {}
 
 
@@ -151,56 +166,88 @@ def salvar_json(dados: dict, arquivo_saida: str = None) -> str:
             json.dump(dados, f, ensure_ascii=False, indent=2)
         
         caminho_completo = os.path.abspath(arquivo_saida)
-        print(f"✓ Dados salvos em: {caminho_completo}")
+        logger.log(ITEM, "✓ Dados salvos em: %s", caminho_completo)
         return caminho_completo
         
     except Exception as e:
-        print(f"✗ Erro ao salvar arquivo: {e}")
+        logger.error("✗ Erro ao salvar arquivo: %s", e)
         return ""
 
 
-def analisar_multiplas_imagens(caminhos_imagens: list, arquivo_saida: str = "instagram_posts.json") -> list:
+def analisar_multiplas_imagens(
+    caminhos_imagens: list,
+    arquivo_saida: str = "instagram_posts.jsonl",
+    fila: FilaTrabalho = None
+) -> list:
     """
     Analisa múltiplos screenshots do Instagram.
     
+    Cada resultado é gravado como uma linha em `arquivo_saida` assim que fica pronto.
+    Imagens que já estão no arquivo são puladas, o que permite retomar o lote.
+    
+    Com `fila`, os caminhos são enfileirados e consumidos da fila persistente (vários
+    processos podem drenar a mesma fila; cada um grava em `<arquivo>.worker-<pid>.jsonl`).
+    
     Args:
         caminhos_imagens (list): Lista de caminhos para as imagens
-        arquivo_saida (str): Nome do arquivo JSON para salvar todos os resultados
+        arquivo_saida (str): Nome do arquivo JSONL para salvar todos os resultados
+        fila (FilaTrabalho): Fila persistente a consumir (opcional)
     
     Returns:
-        list: Lista com os dados extraídos de cada imagem
+        list: Dados extraídos de cada imagem analisada nesta execução (as
+        puladas ou que falharam não entram)
     """
     
     resultados = []
     
-    for i, caminho in enumerate(caminhos_imagens, 1):
-        print(f"\n{'='*60}")
-        print(f"Processando imagem {i}/{len(caminhos_imagens)}")
-        print(f"{'='*60}\n")
+    if fila is not None:
+        if caminhos_imagens:
+            fila.adicionar(caminhos_imagens)
         
-        dados = analisar_instagram(caminho)
-        if dados:
-            resultados.append(dados)
+        with GravadorJSONL(caminho_do_worker(arquivo_saida)) as gravador:
+            def processar(item):
+                dados = analisar_instagram(item.chave)
+                if not dados or "erro" in dados:
+                    raise RuntimeError(dados.get("erro", "falha na análise") if dados else "falha na análise")
+                gravador.escrever(dados)
+                resultados.append(dados)
             
-            print(f"\n--- RESULTADO {i} ---")
-            print(json.dumps(dados, ensure_ascii=False, indent=2))
-            print(f"-------------------\n")
+            consumir(fila, processar)
+        
+        logger.info("✓ %d imagens analisadas por este worker | Fila: %s", len(resultados), fila.estatisticas())
+        return resultados
     
-    # Salva todos os resultados em um único arquivo
-    if resultados:
-        try:
-            with open(arquivo_saida, 'w', encoding='utf-8') as f:
-                json.dump(resultados, f, ensure_ascii=False, indent=2)
+    ja_processadas = chaves_processadas(arquivo_saida, "arquivo_original")
+    
+    with GravadorJSONL(arquivo_saida) as gravador:
+        for i, caminho in enumerate(caminhos_imagens, 1):
+            if caminho in ja_processadas:
+                continue
+            
+            logger.log(ITEM, "Processando imagem %d/%d", i, len(caminhos_imagens))
+            
+            dados = analisar_instagram(caminho)
+            # Falhas não são gravadas: a imagem fica pendente para a próxima execução
+            if not dados or "erro" in dados:
+                logger.warning("✗ Falha em %s: %s", caminho, dados.get("erro") if dados else "sem dados")
+                continue
+            
+            gravador.escrever(dados)
+            resultados.append(dados)
             
-            print(f"\n✓ Todos os resultados salvos em: {os.path.abspath(arquivo_saida)}")
-        except Exception as e:
-            print(f"✗ Erro ao salvar resultados: {e}")
+            # O JSON completo só é serializado se o nível DEBUG estiver ligado
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Resultado %d: %s", i, json.dumps(dados, ensure_ascii=False))
+    
+    logger.info("✓ Resultados salvos em: %s", os.path.abspath(arquivo_saida))
     
     return resultados
 
 
 # Exemplo de uso
 if __name__ == "__main__":
+    configurar_registro()
+    
     # Arquivo de imagem para analisar
     caminho_imagem = "exemplo5.png"
     
@@ -221,6 +268,9 @@ if __name__ == "__main__":
             print("Coloque o arquivo instagram_screenshot.png no diretório atual")
             exit(1)
     
+    # --rastrear: tempo de leitura da imagem e do Ollama (prefill e geração)
+    histograma = ativar_se_pedido()
+    
     # Analisa a imagem
     print("="*60)
     print("ANALISADOR DE POSTS DO INSTAGRAM")
@@ -247,6 +297,9 @@ if __name__ == "__main__":
     else:
         print("✗ Falha ao analisar a imagem.")
     
+    if histograma:
+        histograma.imprimir()
+    
     # Exemplo: Analisar múltiplas imagens
     # imagens = ["exemplo1.png", "exemplo2.png", "exemplo3.png"]
     # analisar_multiplas_imagens(imagens)
@@ -7,8 +7,35 @@ Instalação:
 """
 
 from transformers import pipeline
+import logging
 import os
 
+from comum.registro import ITEM, configurar_registro
+
+logger = logging.getLogger(__name__)
+
+
+# Pipeline carregado uma vez por processo (o `servico` o mantém residente)
+_pipe = None
+
+
+def get_pipeline():
+    """
+    Retorna o pipeline image-text-to-text, carregando-o na primeira chamada.
+    """
+    global _pipe
+    if _pipe is None:
+        logger.info("Carregando modelo Qwen/Qwen2.5-VL-7B-Instruct (pode levar alguns minutos na primeira vez)...")
+        
+        # Cria o pipeline para image-text-to-text
+        _pipe = pipeline(
+            "image-text-to-text",
+            #model="Qwen/Qwen2.5-VL-7B-Instruct"
+        )
+        
+        logger.info("✓ Modelo carregado com sucesso!")
+    return _pipe
+
 
 def transcrever_imagem(
     caminho_imagem: str,
@@ -25,26 +52,17 @@ def transcrever_imagem(
         str: Texto transcrito da imagem
     """
     
-    print(f"Verificando imagem: {caminho_imagem}")
+    logger.debug("Verificando imagem: %s", caminho_imagem)
     
     # Verifica se o arquivo existe
     if not os.path.exists(caminho_imagem):
-        print(f"✗ Erro: Arquivo '{caminho_imagem}' não encontrado!")
+        logger.error("✗ Erro: Arquivo '%s' não encontrado!", caminho_imagem)
         return ""
     
-    print(f"✓ Imagem encontrada: {caminho_imagem}")
-    
-    print("\nCarregando modelo Qwen/Qwen2.5-VL-7B-Instruct...")
-    print("(Isso pode levar alguns minutos na primeira vez...)")
+    logger.debug("✓ Imagem encontrada: %s", caminho_imagem)
     
     try:
-        # Cria o pipeline para image-text-to-text
-        pipe = pipeline(
-            "image-text-to-text",
-            #model="Qwen/Qwen2.5-VL-7B-Instruct"
-        )
-        
-        print("✓ Modelo carregado com sucesso!")
+        pipe = get_pipeline()
         
         # Prepara as mensagens no formato esperado
         messages = [
@@ -57,7 +75,7 @@ def transcrever_imagem(
             }
         ]
         
-        print("\nProcessando imagem...")
+        logger.debug("Processando imagem...")
         
         # Processa a imagem
         resultado = pipe(messages)
@@ -65,13 +83,11 @@ def transcrever_imagem(
         # Extrai o texto do resultado
         texto_transcrito = resultado[0]["generated_text"]
         
-        print("✓ Transcrição concluída!\n")
+        logger.log(ITEM, "✓ Transcrição concluída: %s", caminho_imagem)
         return texto_transcrito
         
     except Exception as e:
-        print(f"✗ Erro ao processar imagem: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("✗ Erro ao processar imagem %s: %s", caminho_imagem, e)
         return ""
 
 
@@ -102,16 +118,18 @@ def salvar_transcricao(caminho_imagem: str, texto: str, arquivo_saida: str = Non
             f.write("\n")
         
         caminho_completo = os.path.abspath(arquivo_saida)
-        print(f"✓ Transcrição salva em: {caminho_completo}")
+        logger.log(ITEM, "✓ Transcrição salva em: %s", caminho_completo)
         return caminho_completo
         
     except Exception as e:
-        print(f"✗ Erro ao salvar arquivo: {e}")
+        logger.error("✗ Erro ao salvar arquivo: %s", e)
         return ""
 
 
 # Exemplo de uso
 if __name__ == "__main__":
+    configurar_registro()
+    
     # Arquivo de imagem para transcrever
     caminho_imagem = "scheeshop.png"
     
@@ -0,0 +1,440 @@
+"""
+Pipeline tendência -> posts -> classificação de desinformação.
+
+Liga as peças que antes rodavam em scripts separados, em série e horas depois
+do pico da tendência:
+
+    tendencias  -> busca      (posts que mencionam o termo, ex.: hashtag no Instagram)
+                -> coleta     (texto do post via `extrator_instagram.coleta_em_camadas`)
+                -> classifica (`FakeNewsClassifier.predict_batch` em micro-lotes)
+                -> grava      (score por post e por tendência em SQLite)
+
+Cada estágio roda em suas próprias threads e se comunica com o seguinte por uma
+`queue.Queue` limitada, então um estágio lento segura os anteriores em vez de
+acumular tudo na memória. Ao final, um relatório mostra vazão e tempo ocioso
+de cada estágio.
+
+Uso:
+    python -m pipeline.tendencias_posts [--fixture agents-crew/fixtures/trends_rss_BR_14.xml] [--todas]
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+# Os módulos do crew ficam em agents-crew/ (diretório com hífen, fora dos pacotes)
+_DIR_AGENTS_CREW = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agents-crew")
+if _DIR_AGENTS_CREW not in sys.path:
+    sys.path.insert(0, _DIR_AGENTS_CREW)
+
+from historico_trends import chave_termo  # noqa: E402
+from modelos_trends import TrendKeyword  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Marca de fim de fluxo entre estágios
+_FIM = object()
+
+
+class Estagio:
+    """
+    Estágio do pipeline: consome de uma fila, aplica `funcao` e publica na próxima.
+
+    `funcao` recebe um item (ou uma lista de itens, se `tamanho_lote` > 1) e
+    devolve um iterável de saídas, o que permite fan-out (uma tendência -> vários posts).
+
+    Args:
+        nome (str): Nome usado no relatório
+        funcao (Callable): item -> iterável de saídas
+        entrada (queue.Queue): Fila de onde os itens são lidos
+        saida (queue.Queue): Fila para as saídas (None no último estágio)
+        workers (int): Threads do estágio (padrão: 1); cada uma para ao receber sua marca de fim
+        tamanho_lote (int): Itens por chamada de `funcao` (padrão: 1)
+        espera_lote (float): Segundos máximos para completar um lote (padrão: 0.5)
+    """
+
+    def __init__(
+        self,
+        nome: str,
+        funcao: Callable,
+        entrada: queue.Queue,
+        saida: Optional[queue.Queue] = None,
+        workers: int = 1,
+        tamanho_lote: int = 1,
+        espera_lote: float = 0.5,
+    ):
+        self.nome = nome
+        self.funcao = funcao
+        self.entrada = entrada
+        self.saida = saida
+        self.workers = workers
+        self.tamanho_lote = tamanho_lote
+        self.espera_lote = espera_lote
+        self.consumidores_seguintes = 1
+        self._threads: list[threading.Thread] = []
+        self._ativos = workers
+        self._lock = threading.Lock()
+        self.estatisticas = {
+            "entradas": 0, "saidas": 0, "erros": 0,
+            "segundos_ocupado": 0.0, "segundos_ocioso": 0.0, "inicio": None, "fim": None,
+        }
+
+    def iniciar(self) -> None:
+        self.estatisticas["inicio"] = time.perf_counter()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._executar, name=f"{self.nome}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def aguardar(self) -> None:
+        for thread in self._threads:
+            thread.join()
+
+    def _proximo_lote(self) -> tuple[list, bool]:
+        """Lê até `tamanho_lote` itens; retorna (itens, fim_do_fluxo)."""
+        item = self.entrada.get()
+        if item is _FIM:
+            return [], True
+
+        lote = [item]
+        limite = time.monotonic() + self.espera_lote
+        while len(lote) < self.tamanho_lote:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                break
+            try:
+                item = self.entrada.get(timeout=restante)
+            except queue.Empty:
+                break
+            if item is _FIM:
+                return lote, True
+            lote.append(item)
+        return lote, False
+
+    def _executar(self) -> None:
+        fim = False
+        while not fim:
+            espera = time.perf_counter()
+            lote, fim = self._proximo_lote()
+            inicio = time.perf_counter()
+            if not lote:
+                break
+
+            entrada = lote if self.tamanho_lote > 1 else lote[0]
+            saidas = []
+            try:
+                saidas = list(self.funcao(entrada) or [])
+            except Exception as e:
+                with self._lock:
+                    self.estatisticas["erros"] += 1
+                logger.error("Estágio %s falhou: %s", self.nome, e)
+            segundos = time.perf_counter() - inicio
+
+            with self._lock:
+                self.estatisticas["entradas"] += len(lote)
+                self.estatisticas["saidas"] += len(saidas)
+                self.estatisticas["segundos_ocupado"] += segundos
+                self.estatisticas["segundos_ocioso"] += inicio - espera
+
+            if self.saida is not None:
+                for saida in saidas:
+                    self.saida.put(saida)
+
+        self._finalizar_worker()
+
+    def _finalizar_worker(self) -> None:
+        with self._lock:
+            self._ativos -= 1
+            ultimo = self._ativos == 0
+        if ultimo:
+            self.estatisticas["fim"] = time.perf_counter()
+            # Só o último worker avisa o estágio seguinte, uma marca por worker dele
+            if self.saida is not None:
+                for _ in range(self.consumidores_seguintes):
+                    self.saida.put(_FIM)
+
+    def relatorio(self) -> dict:
+        est = self.estatisticas
+        duracao = (est["fim"] or time.perf_counter()) - (est["inicio"] or time.perf_counter())
+        return {
+            "estagio": self.nome,
+            "workers": self.workers,
+            "entradas": est["entradas"],
+            "saidas": est["saidas"],
+            "erros": est["erros"],
+            "duracao_s": round(duracao, 3),
+            "itens_por_s": round(est["entradas"] / duracao, 2) if duracao > 0 else None,
+            "ocupacao": round(est["segundos_ocupado"] / (duracao * self.workers), 3) if duracao > 0 else None,
+            "ocioso_s": round(est["segundos_ocioso"], 3),
+        }
+
+
+class ArmazemScores:
+    """
+    Scores de desinformação por post e por tendência em SQLite.
+
+    Args:
+        caminho_db (str): Arquivo SQLite (padrão: "pipeline_scores.db")
+    """
+
+    def __init__(self, caminho_db: str = "pipeline_scores.db"):
+        # Só o estágio de gravação escreve; a leitura do resumo acontece depois do join
+        self._conexao = sqlite3.connect(caminho_db, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS posts_classificados (
+                chave TEXT NOT NULL,
+                termo TEXT NOT NULL,
+                url TEXT NOT NULL,
+                texto TEXT,
+                prob_fake REAL NOT NULL,
+                is_fake INTEGER NOT NULL,
+                classificado_em TEXT NOT NULL,
+                PRIMARY KEY (chave, url)
+            );
+        """)
+
+    def registrar(self, posts: list[dict]) -> None:
+        with self._conexao:
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO posts_classificados "
+                "(chave, termo, url, texto, prob_fake, is_fake, classificado_em) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (chave_termo(p["termo"]), p["termo"], p["url"], p["texto"], p["prob_fake"],
+                     int(p["is_fake"]), p["classificado_em"])
+                    for p in posts
+                ],
+            )
+
+    def scores_por_tendencia(self) -> list[dict]:
+        """
+        Returns:
+            list[dict]: termo, posts, posts_fake, prob_fake_media e prob_fake_max,
+                do termo mais suspeito para o menos
+        """
+        linhas = self._conexao.execute(
+            "SELECT termo, COUNT(*), SUM(is_fake), AVG(prob_fake), MAX(prob_fake) "
+            "FROM posts_classificados GROUP BY chave ORDER BY AVG(prob_fake) DESC"
+        ).fetchall()
+        return [
+            {"termo": termo, "posts": posts, "posts_fake": fakes,
+             "prob_fake_media": round(media, 4), "prob_fake_max": round(maximo, 4)}
+            for termo, posts, fakes, media, maximo in linhas
+        ]
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+
+def _hashtag(termo: str) -> str:
+    """"pec da segurança pública" -> "pecdasegurancapublica" """
+    sem_acento = unicodedata.normalize("NFKD", termo).encode("ascii", "ignore").decode()
+    return re.sub(r"[^0-9a-z]", "", sem_acento.lower())
+
+
+def buscar_posts_hashtag(trend: TrendKeyword, limite: int = 10) -> list[dict]:
+    """
+    Busca os posts em destaque da hashtag do termo no Instagram.
+
+    Usa o Instaloader do agendador compartilhado: a busca da hashtag e cada
+    página de posts passam pelo token bucket e pelo backoff/AIMD dele, então o
+    fan-out de tendências não soma requisições fora do controle de taxa.
+
+    Args:
+        trend (TrendKeyword): Tendência
+        limite (int): Máximo de posts por tendência
+
+    Returns:
+        list[dict]: {"url", "texto"} por post (texto = legenda, quando veio na busca)
+    """
+    import instaloader
+
+    from extrator.agendador_instaloader import get_agendador
+
+    agendador = get_agendador()
+    nome = _hashtag(trend.termo)
+    hashtag = agendador.executar(f"#{nome}", lambda: instaloader.Hashtag.from_name(agendador.instaloader.context, nome))
+
+    return [
+        {"url": f"https://www.instagram.com/p/{post.shortcode}/", "texto": post.caption}
+        for post in agendador.paginar(f"#{nome}", hashtag.get_top_posts(), limite)
+    ]
+
+
+def coletar_texto_post(url: str) -> Optional[str]:
+    """Texto do post pela camada mais barata viável (`coleta_em_camadas`)."""
+    from extrator_instagram.coleta_em_camadas import fetch_post
+
+    dados = fetch_post(url)
+    return dados.get("legenda") or dados.get("texto_completo") or None
+
+
+def _classificador_padrao() -> Callable[[list[str]], list[tuple[bool, float]]]:
+    from classificator.bert_classificator import get_classifier
+
+    return get_classifier().predict_batch
+
+
+class PipelineTendencias:
+    """
+    Monta e executa o pipeline tendência -> posts -> scores.
+
+    Args:
+        buscar_posts (Callable): TrendKeyword -> list[{"url", "texto"?}]
+            (padrão: `buscar_posts_hashtag`)
+        coletar_texto (Callable): url -> texto, para posts que vieram sem texto
+            (padrão: `coletar_texto_post`)
+        classificar_lote (Callable): list[str] -> list[(is_fake, confiança)]
+            (padrão: `FakeNewsClassifier.predict_batch`, carregado na primeira chamada)
+        armazem (ArmazemScores): Destino dos scores (padrão: "pipeline_scores.db")
+        tamanho_fila (int): Capacidade de cada fila entre estágios (padrão: 64)
+        workers_busca (int): Threads de busca (padrão: 1, o limite de taxa é global)
+        workers_coleta (int): Threads de coleta (padrão: 4)
+        tamanho_lote (int): Textos por chamada ao classificador (padrão: 16)
+        espera_lote (float): Segundos máximos para completar um lote (padrão: 1.0)
+    """
+
+    def __init__(
+        self,
+        buscar_posts: Callable[[TrendKeyword], list[dict]] = buscar_posts_hashtag,
+        coletar_texto: Callable[[str], Optional[str]] = coletar_texto_post,
+        classificar_lote: Optional[Callable[[list[str]], list[tuple[bool, float]]]] = None,
+        armazem: Optional[ArmazemScores] = None,
+        tamanho_fila: int = 64,
+        workers_busca: int = 1,
+        workers_coleta: int = 4,
+        tamanho_lote: int = 16,
+        espera_lote: float = 1.0,
+    ):
+        self.buscar_posts = buscar_posts
+        self.coletar_texto = coletar_texto
+        self._classificar_lote = classificar_lote
+        self.armazem = armazem or ArmazemScores()
+        self.tamanho_fila = tamanho_fila
+        self.workers_busca = workers_busca
+        self.workers_coleta = workers_coleta
+        self.tamanho_lote = tamanho_lote
+        self.espera_lote = espera_lote
+        self.estagios: list[Estagio] = []
+
+    def _buscar(self, trend: TrendKeyword) -> Iterable[dict]:
+        for post in self.buscar_posts(trend):
+            yield {"termo": trend.termo, "url": post["url"], "texto": post.get("texto")}
+
+    def _coletar(self, post: dict) -> Iterable[dict]:
+        if not post["texto"]:
+            post["texto"] = self.coletar_texto(post["url"])
+        if post["texto"] and post["texto"].strip():
+            yield post
+
+    def _classificar(self, posts: list[dict]) -> Iterable[dict]:
+        if self._classificar_lote is None:
+            self._classificar_lote = _classificador_padrao()
+
+        resultados = self._classificar_lote([p["texto"] for p in posts])
+        agora = datetime.now().isoformat(timespec="seconds")
+        for post, (is_fake, confianca) in zip(posts, resultados):
+            # Probabilidade de ser fake, independente do rótulo escolhido
+            post["prob_fake"] = confianca if is_fake else 1.0 - confianca
+            post["is_fake"] = is_fake
+            post["classificado_em"] = agora
+            yield post
+
+    def _gravar(self, posts: list[dict]) -> Iterable[dict]:
+        self.armazem.registrar(posts)
+        return posts
+
+    def executar(self, tendencias: Iterable[TrendKeyword]) -> dict:
+        """
+        Processa as tendências até o fim e retorna os scores e o relatório.
+
+        Args:
+            tendencias (Iterable[TrendKeyword]): Tendências a investigar
+
+        Returns:
+            dict: {"scores": scores por tendência, "estagios": vazão por estágio, "segundos": total}
+        """
+        filas = [queue.Queue(maxsize=self.tamanho_fila) for _ in range(4)]
+        self.estagios = [
+            Estagio("busca", self._buscar, filas[0], filas[1], workers=self.workers_busca),
+            Estagio("coleta", self._coletar, filas[1], filas[2], workers=self.workers_coleta),
+            Estagio("classifica", self._classificar, filas[2], filas[3],
+                    tamanho_lote=self.tamanho_lote, espera_lote=self.espera_lote),
+            Estagio("grava", self._gravar, filas[3], None, tamanho_lote=self.tamanho_lote, espera_lote=0.2),
+        ]
+        for estagio, seguinte in zip(self.estagios, self.estagios[1:]):
+            estagio.consumidores_seguintes = seguinte.workers
+
+        inicio = time.perf_counter()
+        for estagio in self.estagios:
+            estagio.iniciar()
+
+        total = 0
+        for trend in tendencias:
+            filas[0].put(trend)
+            total += 1
+        for _ in range(self.workers_busca):
+            filas[0].put(_FIM)
+
+        for estagio in self.estagios:
+            estagio.aguardar()
+
+        segundos = time.perf_counter() - inicio
+        logger.info("%d tendências processadas em %.1fs", total, segundos)
+        return {
+            "scores": self.armazem.scores_por_tendencia(),
+            "estagios": [estagio.relatorio() for estagio in self.estagios],
+            "segundos": round(segundos, 3),
+        }
+
+
+def tendencias_emergentes(fonte: Optional[str] = None, todas: bool = False) -> list[TrendKeyword]:
+    """
+    Coleta as tendências com o `TrendsAnalysisCrew` (sem LLM) e filtra as emergentes.
+
+    Args:
+        fonte (str): XML gravado do feed para usar no lugar da rede (opcional)
+        todas (bool): Se True, devolve todas as tendências, não só as emergentes
+
+    Returns:
+        list[TrendKeyword]: Tendências a investigar
+    """
+    from coletor_trends import PARAMETROS_PADRAO
+    from google_trends import TrendsAnalysisCrew
+
+    resultado = TrendsAnalysisCrew(provider=None).executar(PARAMETROS_PADRAO, enriquecer=False, fonte=fonte)
+    emergentes = {chave_termo(termo) for termo in resultado["emergentes"]}
+    return [
+        TrendKeyword(**keyword)
+        for keyword in resultado["resultado"]["keywords"]
+        if todas or chave_termo(keyword["termo"]) in emergentes
+    ]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    fixture = sys.argv[sys.argv.index("--fixture") + 1] if "--fixture" in sys.argv else None
+    tendencias = tendencias_emergentes(fixture, todas="--todas" in sys.argv)
+    print(f"🔎 {len(tendencias)} tendências para investigar")
+
+    resultado = PipelineTendencias().executar(tendencias)
+
+    print("\n📊 Vazão por estágio:")
+    for estagio in resultado["estagios"]:
+        print(
+            f"  {estagio['estagio']:>10}: {estagio['entradas']:>5} itens, {estagio['itens_por_s']} itens/s, "
+            f"ocupação {estagio['ocupacao']}, {estagio['erros']} erros"
+        )
+
+    print("\n🚨 Scores por tendência:")
+    print(json.dumps(resultado["scores"], ensure_ascii=False, indent=2))
@@ -0,0 +1,109 @@
+"""
+Gerador de carga para o serviço de análise de posts.
+
+Dispara requisições concorrentes contra um endpoint do `servico.servidor` e
+mede vazão (RPS), latência p50/p95/p99 e erros. Com vários clientes ao mesmo
+tempo em `/classify`, dá para ver o lote dinâmico do classificador em ação
+(`GET /saude` mostra o tamanho médio dos lotes).
+
+Uso:
+    python -m servico.carga [--url http://127.0.0.1:8765] [--endpoint classify]
+                            [--concorrencia 16] [--requisicoes 200] [--corpo '{"texto": "..."}']
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+
+from comum.estatisticas import percentil
+
+CORPOS_PADRAO = {
+    "classify": {"texto": "Governo anuncia que vacina altera o DNA de quem a toma, diz estudo secreto."},
+    "classify_batch": {"textos": ["Prefeitura inaugura nova escola no bairro.",
+                                  "Cientistas confirmam que a Terra é plana."] * 4},
+}
+
+
+async def gerar_carga(
+    url: str,
+    endpoint: str = "classify",
+    corpo: dict = None,
+    concorrencia: int = 16,
+    requisicoes: int = 200,
+) -> dict:
+    """
+    Envia `requisicoes` POSTs com até `concorrencia` em voo ao mesmo tempo.
+
+    Args:
+        url (str): Endereço base do serviço
+        endpoint (str): Capacidade a exercitar (ex.: "classify")
+        corpo (dict): Corpo JSON de cada requisição (padrão: exemplo do endpoint)
+        concorrencia (int): Clientes simultâneos (padrão: 16)
+        requisicoes (int): Total de requisições (padrão: 200)
+
+    Returns:
+        dict: rps, latências p50/p95/p99 em ms, erros e segundos totais
+    """
+    corpo = corpo if corpo is not None else CORPOS_PADRAO.get(endpoint, {})
+    latencias, erros = [], 0
+    restantes = iter(range(requisicoes))
+
+    async with httpx.AsyncClient(base_url=url, timeout=300,
+                                 limits=httpx.Limits(max_connections=concorrencia)) as cliente:
+        async def cliente_virtual() -> None:
+            nonlocal erros
+            for _ in restantes:
+                inicio = time.perf_counter()
+                try:
+                    resposta = await cliente.post(f"/{endpoint}", json=corpo)
+                    if resposta.status_code != 200:
+                        erros += 1
+                except httpx.HTTPError:
+                    erros += 1
+                latencias.append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(cliente_virtual() for _ in range(concorrencia)))
+        segundos = time.perf_counter() - inicio
+
+    return {
+        "endpoint": endpoint,
+        "requisicoes": requisicoes,
+        "concorrencia": concorrencia,
+        "segundos": round(segundos, 2),
+        "rps": round(requisicoes / segundos, 1),
+        "p50_ms": round(percentil(latencias, 0.50) * 1000, 1),
+        "p95_ms": round(percentil(latencias, 0.95) * 1000, 1),
+        "p99_ms": round(percentil(latencias, 0.99) * 1000, 1),
+        "erros": erros,
+    }
+
+
+def _argumento(nome: str, padrao: str) -> str:
+    if nome in sys.argv:
+        return sys.argv[sys.argv.index(nome) + 1]
+    return padrao
+
+
+if __name__ == "__main__":
+    url = _argumento("--url", "http://127.0.0.1:8765")
+    corpo = _argumento("--corpo", None)
+    resultado = asyncio.run(gerar_carga(
+        url,
+        _argumento("--endpoint", "classify"),
+        json.loads(corpo) if corpo else None,
+        int(_argumento("--concorrencia", "16")),
+        int(_argumento("--requisicoes", "200")),
+    ))
+
+    print(f"📈 {resultado['requisicoes']} requisições a /{resultado['endpoint']} "
+          f"({resultado['concorrencia']} simultâneas) em {resultado['segundos']}s")
+    print(f"   {resultado['rps']} req/s | p50 {resultado['p50_ms']}ms | p95 {resultado['p95_ms']}ms | "
+          f"p99 {resultado['p99_ms']}ms | {resultado['erros']} erro(s)")
+    saude = httpx.get(f"{url}/saude").json()["resultado"]
+    if "lotes_classificador" in saude:
+        lotes = saude["lotes_classificador"]
+        print(f"   Classificador: {lotes['itens']} textos em {lotes['lotes']} lote(s) (média {lotes['media']})")
@@ -0,0 +1,341 @@
+"""
+Recursos residentes do serviço de análise de posts.
+
+Cada capacidade (classificador, extração de posts, análise de screenshot,
+transcrição) existia como um script `__main__` que carregava o modelo ou
+lançava o navegador a cada execução. Aqui tudo é carregado uma vez e reusado
+pelas requisições:
+
+- o classificador BERT fica em memória e as chamadas de `classify` que chegam
+  juntas são agrupadas em um único `predict_batch` (lote dinâmico: espera
+  alguns milissegundos ou até `tamanho_lote` textos);
+- um pool de navegadores Playwright (um Chromium por thread dedicada, já que a
+  API síncrona do Playwright não troca de thread) atende as capturas;
+- semáforos limitam quantas chamadas ao Ollama, ao navegador e ao pipeline de
+  transcrição rodam ao mesmo tempo; o excesso espera na fila do asyncio.
+"""
+
+import asyncio
+import base64
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from comum.estatisticas import percentil
+
+logger = logging.getLogger(__name__)
+
+
+class LoteDinamico:
+    """
+    Junta chamadas individuais em lotes para uma função que processa listas.
+
+    Args:
+        funcao_lote (Callable): Recebe uma lista de itens e devolve os resultados na mesma ordem
+        tamanho_lote (int): Máximo de itens por lote (padrão: 32)
+        espera (float): Segundos que o primeiro item aguarda companhia (padrão: 0.005)
+    """
+
+    def __init__(self, funcao_lote: Callable[[list], list], tamanho_lote: int = 32, espera: float = 0.005):
+        self.funcao_lote = funcao_lote
+        self.tamanho_lote = tamanho_lote
+        self.espera = espera
+        self._fila: Optional[asyncio.Queue] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        self.lotes = 0
+        self.itens = 0
+
+    async def submeter(self, item: Any) -> Any:
+        """Enfileira um item e espera o resultado dele."""
+        if self._tarefa is None:
+            self._fila = asyncio.Queue()
+            self._tarefa = asyncio.create_task(self._laco())
+        futuro = asyncio.get_running_loop().create_future()
+        await self._fila.put((item, futuro))
+        return await futuro
+
+    async def _laco(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = [await self._fila.get()]
+            prazo = loop.time() + self.espera
+            while len(lote) < self.tamanho_lote:
+                restante = prazo - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._fila.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+
+            itens = [item for item, _ in lote]
+            try:
+                resultados = await asyncio.to_thread(self.funcao_lote, itens)
+            except Exception as e:
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+            self.lotes += 1
+            self.itens += len(itens)
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+    def fechar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            self._tarefa = None
+
+
+class PoolNavegadores:
+    """
+    Navegadores Chromium residentes, cada um preso à sua thread.
+
+    Args:
+        tamanho (int): Quantidade de navegadores (capturas simultâneas)
+        headless (bool): Sem janela (padrão: True)
+    """
+
+    def __init__(self, tamanho: int = 2, headless: bool = True):
+        self.tamanho = tamanho
+        self.headless = headless
+        self._executores = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"navegador-{i}")
+                            for i in range(tamanho)]
+        self._locais = threading.local()
+        self._livres: queue.SimpleQueue = queue.SimpleQueue()
+        for indice in range(tamanho):
+            self._livres.put(indice)
+
+    def _navegador_da_thread(self):
+        # Lançado na primeira captura da thread e mantido aberto
+        if getattr(self._locais, "navegador", None) is None:
+            from playwright.sync_api import sync_playwright
+
+            playwright = sync_playwright().start()
+            self._locais.playwright = playwright
+            self._locais.navegador = playwright.chromium.launch(headless=self.headless)
+            logger.info("Navegador residente iniciado em %s", threading.current_thread().name)
+        return self._locais.navegador
+
+    async def executar(self, funcao: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Roda `funcao(*args, navegador=..., **kwargs)` em um navegador livre.
+
+        Returns:
+            O retorno de `funcao`
+        """
+        loop = asyncio.get_running_loop()
+        indice = await loop.run_in_executor(None, self._livres.get)
+        try:
+            return await loop.run_in_executor(
+                self._executores[indice],
+                lambda: funcao(*args, navegador=self._navegador_da_thread(), **kwargs),
+            )
+        finally:
+            self._livres.put(indice)
+
+    def fechar(self) -> None:
+        for executor in self._executores:
+            # Cada navegador é fechado pela própria thread
+            executor.submit(self._fechar_da_thread).result()
+            executor.shutdown()
+
+    def _fechar_da_thread(self) -> None:
+        navegador = getattr(self._locais, "navegador", None)
+        if navegador is not None:
+            navegador.close()
+            self._locais.playwright.stop()
+            self._locais.navegador = None
+
+
+def _arquivo_imagem(dados: dict) -> tuple[str, bool]:
+    """Caminho da imagem da requisição; grava `imagem_base64` em arquivo temporário."""
+    if dados.get("caminho"):
+        return dados["caminho"], False
+    if dados.get("imagem_base64"):
+        descritor, caminho = tempfile.mkstemp(suffix=".png", prefix="servico_")
+        with os.fdopen(descritor, "wb") as f:
+            f.write(base64.b64decode(dados["imagem_base64"]))
+        return caminho, True
+    raise ValueError("Informe 'caminho' ou 'imagem_base64'")
+
+
+class Recursos:
+    """
+    Modelos e navegadores residentes, com limite de concorrência por tipo.
+
+    Args:
+        classificador: Objeto com `predict_batch(textos)` (padrão: `get_classifier()`)
+        navegadores (int): Tamanho do pool de navegadores (padrão: env SERVICO_NAVEGADORES ou 2)
+        limite_ollama (int): Chamadas simultâneas ao Ollama (padrão: env OLLAMA_NUM_PARALLEL ou 1)
+        limite_transcricao (int): Transcrições simultâneas (padrão: 1)
+        tamanho_lote (int): Máximo de textos por lote do classificador (padrão: 32)
+    """
+
+    def __init__(
+        self,
+        classificador=None,
+        navegadores: Optional[int] = None,
+        limite_ollama: Optional[int] = None,
+        limite_transcricao: int = 1,
+        tamanho_lote: int = 32,
+    ):
+        self._classificador = classificador
+        self.tamanho_lote = tamanho_lote
+        self.pool = PoolNavegadores(navegadores or int(os.getenv("SERVICO_NAVEGADORES", "2")))
+        self.sem_ollama = asyncio.Semaphore(limite_ollama or int(os.getenv("OLLAMA_NUM_PARALLEL", "1")))
+        self.sem_transcricao = asyncio.Semaphore(limite_transcricao)
+        self._lote: Optional[LoteDinamico] = None
+        self._latencias: dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self._contagem: dict[str, dict] = defaultdict(lambda: {"requisicoes": 0, "erros": 0, "em_andamento": 0})
+
+    @property
+    def classificador(self):
+        if self._classificador is None:
+            from classificator.bert_classificator import get_classifier
+
+            self._classificador = get_classifier()
+        return self._classificador
+
+    async def preparar(self, transcricao: bool = False) -> float:
+        """
+        Carrega os modelos antes da primeira requisição.
+
+        Args:
+            transcricao (bool): Também carrega o pipeline de transcrição (pesado)
+
+        Returns:
+            float: Segundos gastos carregando
+        """
+        inicio = time.perf_counter()
+        await asyncio.to_thread(lambda: self.classificador)
+        self._lote = LoteDinamico(self.classificador.predict_batch, self.tamanho_lote)
+        if transcricao:
+            from interpretador_tela.qwen_image_to_text import get_pipeline
+
+            await asyncio.to_thread(get_pipeline)
+        segundos = time.perf_counter() - inicio
+        logger.info("Modelos carregados em %.1fs", segundos)
+        return segundos
+
+    async def medir(self, nome: str, corrotina) -> Any:
+        """Executa a corrotina registrando latência, erros e requisições em andamento."""
+        contagem = self._contagem[nome]
+        contagem["requisicoes"] += 1
+        contagem["em_andamento"] += 1
+        inicio = time.perf_counter()
+        try:
+            return await corrotina
+        except Exception:
+            contagem["erros"] += 1
+            raise
+        finally:
+            contagem["em_andamento"] -= 1
+            self._latencias[nome].append(time.perf_counter() - inicio)
+
+    # ==============================
+    # Capacidades
+    # ==============================
+
+    async def classify(self, texto: str) -> dict:
+        if self._lote is None:
+            await self.preparar()
+        is_fake, confianca = await self._lote.submeter(texto)
+        return {"is_fake": is_fake, "confianca": confianca}
+
+    async def classify_batch(self, textos: list[str]) -> list[dict]:
+        # Passa pelo mesmo lote dinâmico: lotes de clientes diferentes se juntam
+        return await asyncio.gather(*(self.classify(texto) for texto in textos))
+
+    async def extract_post(self, url: str, processar: bool = True) -> dict:
+        from extrator_instagram.instagram_scraper_completo import capturar_texto_instagram, processar_com_gemma
+
+        dados_brutos = await self.pool.executar(capturar_texto_instagram, url)
+        if not dados_brutos or not dados_brutos.get("texto_bruto"):
+            raise RuntimeError(f"Falha ao capturar texto de {url}")
+        if not processar:
+            return dados_brutos
+        async with self.sem_ollama:
+            dados = await asyncio.to_thread(processar_com_gemma, dados_brutos["texto_bruto"])
+        if not dados:
+            raise RuntimeError("Falha ao processar o texto com o Ollama")
+        dados["url_original"] = url
+        dados["tamanho_texto_capturado"] = dados_brutos.get("tamanho_texto", 0)
+        return dados
+
+    async def analyze_screenshot(self, dados: dict) -> dict:
+        from interpretador_tela.instagram_analyzer import analisar_instagram
+
+        temporario = False
+        if dados.get("url"):
+            from extrator.scraper_print import capturar_screenshot
+
+            descritor, caminho = tempfile.mkstemp(suffix=".png", prefix="servico_")
+            os.close(descritor)
+            temporario = True
+            if not await self.pool.executar(capturar_screenshot, dados["url"], caminho):
+                os.remove(caminho)
+                raise RuntimeError(f"Falha ao capturar screenshot de {dados['url']}")
+        else:
+            caminho, temporario = _arquivo_imagem(dados)
+        try:
+            async with self.sem_ollama:
+                resultado = await asyncio.to_thread(analisar_instagram, caminho)
+        finally:
+            if temporario:
+                os.remove(caminho)
+        if not resultado:
+            raise RuntimeError("Falha ao analisar a imagem")
+        return resultado
+
+    async def transcribe(self, dados: dict) -> dict:
+        caminho, temporario = _arquivo_imagem(dados)
+        argumentos = [caminho] + ([dados["prompt"]] if dados.get("prompt") else [])
+        try:
+            from interpretador_tela.qwen_image_to_text import transcrever_imagem
+
+            async with self.sem_transcricao:
+                texto = await asyncio.to_thread(transcrever_imagem, *argumentos)
+        finally:
+            if temporario:
+                os.remove(caminho)
+        return {"texto": texto}
+
+    # ==============================
+    # Métricas
+    # ==============================
+
+    def metricas(self) -> dict:
+        """
+        Requisições, erros, em andamento e latência p50/p95 por capacidade.
+
+        Returns:
+            dict: {capacidade: {...}, "lotes_classificador": {lotes, itens, media}}
+        """
+        saida = {}
+        for nome, contagem in self._contagem.items():
+            latencias = list(self._latencias[nome])
+            saida[nome] = {
+                **contagem,
+                "p50_ms": round(percentil(latencias, 0.50) * 1000, 1) if latencias else None,
+                "p95_ms": round(percentil(latencias, 0.95) * 1000, 1) if latencias else None,
+            }
+        if self._lote is not None and self._lote.lotes:
+            saida["lotes_classificador"] = {
+                "lotes": self._lote.lotes,
+                "itens": self._lote.itens,
+                "media": round(self._lote.itens / self._lote.lotes, 1),
+            }
+        return saida
+
+    def fechar(self) -> None:
+        if self._lote is not None:
+            self._lote.fechar()
+        self.pool.fechar()
@@ -0,0 +1,235 @@
+"""
+Serviço local de análise de posts (HTTP e MCP).
+
+Mantém o classificador e os navegadores residentes (ver `servico.recursos`) e
+expõe as capacidades que antes eram scripts `__main__`:
+
+    POST /classify            {"texto": "..."}
+    POST /classify_batch      {"textos": ["...", ...]}
+    POST /extract_post        {"url": "...", "processar": true}
+    POST /analyze_screenshot  {"caminho": "..."} | {"imagem_base64": "..."} | {"url": "..."}
+    POST /transcribe          {"caminho": "..."} | {"imagem_base64": "...", "prompt": "..."}
+    GET  /saude               métricas por capacidade (requisições, erros, p50/p95)
+
+As respostas são JSON: {"resultado": ...} ou {"erro": "..."}. O servidor HTTP é
+asyncio puro (HTTP/1.1 com keep-alive), então cada requisição só ocupa uma
+corrotina enquanto espera o modelo. Com `--mcp` as mesmas ferramentas também
+são servidas por MCP (stdio) no mesmo processo.
+
+Uso:
+    python -m servico.servidor [--porta 8765] [--mcp] [--transcricao]
+"""
+
+import asyncio
+import json
+import logging
+import sys
+import time
+from io import TextIOWrapper
+from typing import Optional
+
+from servico.recursos import Recursos
+
+logger = logging.getLogger(__name__)
+
+PORTA_PADRAO = 8765
+TAMANHO_MAXIMO_CORPO = 20 * 1024 * 1024  # imagens em base64
+
+MENSAGENS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+             500: "Internal Server Error"}
+
+
+def _rotas(recursos: Recursos) -> dict:
+    """Endpoint -> função que recebe o corpo JSON e devolve uma corrotina."""
+    return {
+        "/classify": lambda dados: recursos.classify(dados["texto"]),
+        "/classify_batch": lambda dados: recursos.classify_batch(dados["textos"]),
+        "/extract_post": lambda dados: recursos.extract_post(dados["url"], dados.get("processar", True)),
+        "/analyze_screenshot": recursos.analyze_screenshot,
+        "/transcribe": recursos.transcribe,
+    }
+
+
+class ServidorHTTP:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio para as rotas JSON do serviço.
+
+    Args:
+        recursos (Recursos): Modelos e navegadores residentes
+        host (str): Endereço de escuta (padrão: "127.0.0.1")
+        porta (int): Porta de escuta (padrão: 8765)
+    """
+
+    def __init__(self, recursos: Recursos, host: str = "127.0.0.1", porta: int = PORTA_PADRAO):
+        self.recursos = recursos
+        self.host = host
+        self.porta = porta
+        self.rotas = _rotas(recursos)
+        self._servidor: Optional[asyncio.AbstractServer] = None
+
+    async def iniciar(self) -> None:
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        # Porta 0 = porta livre escolhida pelo sistema
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        print(f"🚀 Serviço HTTP em http://{self.host}:{self.porta}")
+
+    async def servir(self) -> None:
+        await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def fechar(self) -> None:
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                metodo, caminho, _ = linha.decode("latin-1").split(" ", 2)
+                cabecalhos = {}
+                while (linha := await leitor.readline()) not in (b"\r\n", b"\n", b""):
+                    nome, _, valor = linha.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+
+                tamanho = int(cabecalhos.get("content-length", 0))
+                if tamanho > TAMANHO_MAXIMO_CORPO:
+                    await self._responder(escritor, 413, {"erro": "Corpo da requisição grande demais"}, False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+
+                status, resposta = await self._despachar(metodo, caminho.split("?", 1)[0], corpo)
+                manter = cabecalhos.get("connection", "").lower() != "close"
+                await self._responder(escritor, status, resposta, manter)
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _despachar(self, metodo: str, caminho: str, corpo: bytes) -> tuple[int, dict]:
+        if metodo == "GET" and caminho == "/saude":
+            return 200, {"resultado": self.recursos.metricas()}
+        rota = self.rotas.get(caminho)
+        if metodo != "POST" or rota is None:
+            return 404, {"erro": f"Rota não encontrada: {metodo} {caminho}"}
+        try:
+            dados = json.loads(corpo or b"{}")
+            corrotina = rota(dados)
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            return 400, {"erro": f"Requisição inválida: {e}"}
+        try:
+            return 200, {"resultado": await self.recursos.medir(caminho.strip("/"), corrotina)}
+        except ValueError as e:
+            return 400, {"erro": str(e)}
+        except Exception as e:
+            logger.exception("Erro em %s", caminho)
+            return 500, {"erro": f"{type(e).__name__}: {e}"}
+
+    @staticmethod
+    async def _responder(escritor: asyncio.StreamWriter, status: int, resposta: dict, manter: bool) -> None:
+        corpo = json.dumps(resposta, ensure_ascii=False).encode("utf-8")
+        escritor.write(
+            f"HTTP/1.1 {status} {MENSAGENS[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode("latin-1") + corpo
+        )
+        await escritor.drain()
+
+
+def criar_mcp(recursos: Recursos):
+    """
+    Servidor MCP (FastMCP) com as mesmas ferramentas do HTTP.
+
+    Args:
+        recursos (Recursos): Modelos e navegadores residentes, compartilhados com o HTTP
+
+    Returns:
+        FastMCP: Servidor com as ferramentas registradas
+    """
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("analise-posts")
+
+    @mcp.tool()
+    async def classify(texto: str) -> dict:
+        """Classifica um texto como fake news ou não (is_fake, confianca)."""
+        return await recursos.medir("classify", recursos.classify(texto))
+
+    @mcp.tool()
+    async def classify_batch(textos: list[str]) -> list[dict]:
+        """Classifica vários textos de uma vez."""
+        return await recursos.medir("classify_batch", recursos.classify_batch(textos))
+
+    @mcp.tool()
+    async def extract_post(url: str, processar: bool = True) -> dict:
+        """Captura o texto de um post do Instagram e estrutura com o Ollama."""
+        return await recursos.medir("extract_post", recursos.extract_post(url, processar))
+
+    @mcp.tool()
+    async def analyze_screenshot(caminho: str = "", url: str = "", imagem_base64: str = "") -> dict:
+        """Analisa um screenshot de post (arquivo, URL a capturar ou imagem em base64)."""
+        dados = {"caminho": caminho, "url": url, "imagem_base64": imagem_base64}
+        return await recursos.medir("analyze_screenshot", recursos.analyze_screenshot(dados))
+
+    @mcp.tool()
+    async def transcribe(caminho: str = "", imagem_base64: str = "", prompt: str = "") -> dict:
+        """Transcreve o texto visível de uma imagem."""
+        dados = {"caminho": caminho, "imagem_base64": imagem_base64, "prompt": prompt}
+        return await recursos.medir("transcribe", recursos.transcribe(dados))
+
+    return mcp
+
+
+async def servir_mcp(recursos: Recursos, saida) -> None:
+    """
+    Serve as ferramentas MCP por stdio, escrevendo o protocolo em `saida`.
+
+    Args:
+        recursos (Recursos): Modelos e navegadores residentes
+        saida: Stream binário do protocolo (o stdout original do processo)
+    """
+    import anyio
+    from mcp.server.stdio import stdio_server
+
+    servidor = criar_mcp(recursos)._mcp_server
+    async with stdio_server(stdout=anyio.wrap_file(TextIOWrapper(saida, encoding="utf-8"))) as (leitura, escrita):
+        await servidor.run(leitura, escrita, servidor.create_initialization_options())
+
+
+async def main(porta: int, com_mcp: bool, transcricao: bool) -> None:
+    saida_mcp = None
+    if com_mcp:
+        # Os prints dos extratores corromperiam o protocolo: o MCP fica com o
+        # stdout original e o resto do processo passa a escrever no stderr
+        saida_mcp = sys.stdout.buffer
+        sys.stdout = sys.stderr
+
+    recursos = Recursos()
+    inicio = time.perf_counter()
+    await recursos.preparar(transcricao=transcricao)
+    print(f"✓ Modelos residentes em {time.perf_counter() - inicio:.1f}s")
+
+    servidor = ServidorHTTP(recursos, porta=porta)
+    tarefas = [servidor.servir()]
+    if com_mcp:
+        tarefas.append(servir_mcp(recursos, saida_mcp))
+    try:
+        await asyncio.gather(*tarefas)
+    finally:
+        await servidor.fechar()
+        recursos.fechar()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    porta = int(sys.argv[sys.argv.index("--porta") + 1]) if "--porta" in sys.argv else PORTA_PADRAO
+    try:
+        asyncio.run(main(porta, "--mcp" in sys.argv, "--transcricao" in sys.argv))
+    except KeyboardInterrupt:
+        print("\n👋 Serviço encerrado")